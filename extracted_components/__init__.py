@@ -7,6 +7,7 @@ This library provides:
 2. Question Renderer - Multi-type question display with LaTeX support
 3. Editor Framework - Side-by-side editing with live preview
 4. Validation Manager - Mathematical validation and flagging system
+5. Batch Editor - Compiled find-and-replace with dry-run preview and undo
 
 All components are extracted from the proven Q2LMS codebase and enhanced
 with mathematical validation capabilities for Q2JSON integration.
@@ -41,6 +42,13 @@ except ImportError as e:
     print(f"Warning: Validation manager not available: {e}")
     VALIDATION_AVAILABLE = False
 
+try:
+    from .batch_editor import FindReplaceQuery, EditLog, plan_find_replace
+    BATCH_EDITOR_AVAILABLE = True
+except ImportError as e:
+    print(f"Warning: Batch editor not available: {e}")
+    BATCH_EDITOR_AVAILABLE = False
+
 __version__ = "1.0.0"
 __author__ = "Q2LMS Component Extraction"
 __description__ = "Proven Q2LMS components for Q2JSON Stage 4"
@@ -55,3 +63,5 @@ if EDITOR_AVAILABLE:
     __all__.append('Q2JSONEditorFramework')
 if VALIDATION_AVAILABLE:
     __all__.append('Q2JSONValidationManager')
+if BATCH_EDITOR_AVAILABLE:
+    __all__.extend(['FindReplaceQuery', 'EditLog', 'plan_find_replace'])
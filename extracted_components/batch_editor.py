@@ -0,0 +1,177 @@
+# Q2JSON Batch Editor Component
+"""
+Batch find-and-replace engine for the Q2JSON editor
+
+The query is compiled once (literal, case-insensitive or regex) and applied to every
+selected question field in one pass. The pass yields an edit log of the fields it
+changes, which serves as the dry-run preview, is applied in place, and undoes the
+edit afterwards - no copies of the question bank are kept.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Preview context kept on each side of the first change in a field
+PREVIEW_CONTEXT = 40
+
+
+@dataclass
+class FieldEdit:
+    """One changed field (or option) of one question."""
+    question_index: int
+    field: str
+    option_index: Optional[int]
+    before: str
+    after: str
+    replacements: int
+
+    @property
+    def location(self) -> str:
+        """Human-readable field location, e.g. options[2]"""
+        return self.field if self.option_index is None else f"{self.field}[{self.option_index}]"
+
+    def preview(self, context: int = PREVIEW_CONTEXT) -> Tuple[str, str]:
+        """Before/after excerpts around the changed region"""
+        start = 0
+        while start < min(len(self.before), len(self.after)) and self.before[start] == self.after[start]:
+            start += 1
+        end_before, end_after = len(self.before), len(self.after)
+        while end_before > start and end_after > start and self.before[end_before - 1] == self.after[end_after - 1]:
+            end_before -= 1
+            end_after -= 1
+        left = max(0, start - context)
+        prefix = '…' if left else ''
+        return (prefix + self.before[left:end_before + context] + ('…' if end_before + context < len(self.before) else ''),
+                prefix + self.after[left:end_after + context] + ('…' if end_after + context < len(self.after) else ''))
+
+
+@dataclass
+class EditLog:
+    """The field edits made by one batch operation, enough to apply or undo it."""
+    description: str
+    edits: List[FieldEdit] = field(default_factory=list)
+
+    @property
+    def replacements(self) -> int:
+        return sum(edit.replacements for edit in self.edits)
+
+    @property
+    def questions_affected(self) -> int:
+        return len({edit.question_index for edit in self.edits})
+
+    def apply(self, questions: List[Dict[str, Any]]) -> None:
+        """Write the edited values into the questions"""
+        for edit in self.edits:
+            _set_value(questions[edit.question_index], edit, edit.after)
+
+    def undo(self, questions: List[Dict[str, Any]]) -> int:
+        """
+        Restore the values from before the edit
+
+        Fields changed again since (or no longer present) are left alone.
+
+        Returns:
+            int: Number of edits that could not be undone
+        """
+        skipped = 0
+        for edit in reversed(self.edits):
+            if edit.question_index < len(questions) and _get_value(questions[edit.question_index], edit) == edit.after:
+                _set_value(questions[edit.question_index], edit, edit.before)
+            else:
+                skipped += 1
+        return skipped
+
+
+def _get_value(question: Dict[str, Any], edit: FieldEdit) -> Any:
+    value = question.get(edit.field)
+    if edit.option_index is None:
+        return value
+    if isinstance(value, list) and edit.option_index < len(value):
+        return value[edit.option_index]
+    return None
+
+
+def _set_value(question: Dict[str, Any], edit: FieldEdit, value: str) -> None:
+    if edit.option_index is None:
+        question[edit.field] = value
+    else:
+        question[edit.field][edit.option_index] = value
+
+
+class FindReplaceQuery:
+    """A find-and-replace query compiled once for a whole batch."""
+
+    def __init__(self, find_text: str, replace_text: str, case_sensitive: bool = True, regex: bool = False):
+        """
+        Args:
+            find_text: Text (or pattern, if regex) to find
+            replace_text: Replacement; with regex it may use group references like \\1
+            case_sensitive: Match case exactly
+            regex: Treat find_text as a regular expression
+
+        Raises:
+            ValueError: Empty query, invalid regular expression or invalid replacement template
+        """
+        if not find_text:
+            raise ValueError("Find text is empty")
+        self.find_text = find_text
+        self.replace_text = replace_text
+        # Case-sensitive literals use str.replace; everything else one compiled pattern
+        self.pattern: Optional[re.Pattern] = None
+        if regex or not case_sensitive:
+            try:
+                self.pattern = re.compile(find_text if regex else re.escape(find_text),
+                                          0 if case_sensitive else re.IGNORECASE)
+            except re.error as e:
+                raise ValueError(f"Invalid regular expression: {e}") from e
+        if regex:
+            # The template is parsed before any matching, so an empty subject checks it
+            try:
+                self.pattern.subn(replace_text, '')
+            except (re.error, IndexError) as e:
+                raise ValueError(f"Invalid replacement: {e}") from e
+        # Literal replacements must not be read as templates (backslashes, group references)
+        self._replacement = replace_text if regex else (lambda match: replace_text)
+
+    def substitute(self, text: str) -> Tuple[str, int]:
+        """Replace every match in text, returning (new text, replacements made)"""
+        if self.pattern is None:
+            count = text.count(self.find_text)
+            return (text.replace(self.find_text, self.replace_text), count) if count else (text, 0)
+        return self.pattern.subn(self._replacement, text)
+
+
+def _field_values(question: Dict[str, Any], fields: Sequence[str]) -> Iterator[Tuple[str, Optional[int], str]]:
+    """(field, option index, text) for every searchable string among the given fields"""
+    for field_name in fields:
+        value = question.get(field_name)
+        if isinstance(value, str):
+            yield field_name, None, value
+        elif isinstance(value, list):
+            for option_index, option in enumerate(value):
+                if isinstance(option, str):
+                    yield field_name, option_index, option
+
+
+def plan_find_replace(questions: List[Dict[str, Any]], question_indices: Sequence[int],
+                      fields: Sequence[str], query: FindReplaceQuery) -> EditLog:
+    """
+    Run a query over the selected questions without changing them
+
+    Args:
+        questions: Question bank
+        question_indices: Questions to search
+        fields: Fields to search; list fields (e.g. options) are searched item by item
+        query: Compiled query
+
+    Returns:
+        EditLog: The field edits the query makes (its dry-run preview); apply() commits them
+    """
+    log = EditLog(f"Replace '{query.find_text}' with '{query.replace_text}'")
+    for question_index in question_indices:
+        for field_name, option_index, text in _field_values(questions[question_index], fields):
+            new_text, count = query.substitute(text)
+            if count and new_text != text:
+                log.edits.append(FieldEdit(question_index, field_name, option_index, text, new_text, count))
+    return log
@@ -12,16 +12,17 @@ import json
 from typing import Dict, List, Any, Optional, Callable, Union
 from datetime import datetime
 import copy
-import re
 
 try:
     from .latex_processor import Q2JSONLaTeXProcessor
     from .question_renderer import Q2JSONQuestionRenderer
     from .validation_manager import Q2JSONValidationManager
+    from .batch_editor import FindReplaceQuery, plan_find_replace
 except ImportError:
     from latex_processor import Q2JSONLaTeXProcessor
     from question_renderer import Q2JSONQuestionRenderer
     from validation_manager import Q2JSONValidationManager
+    from batch_editor import FindReplaceQuery, plan_find_replace
 
 
 class Q2JSONEditorFramework:
@@ -53,6 +54,7 @@ class Q2JSONEditorFramework:
         self.edit_history = []
         self.current_position = -1
         self.max_history = 50
+        self.max_preview_edits = 50
         self.auto_save_enabled = True
         self.auto_save_interval = 30  # seconds
         
@@ -836,9 +838,15 @@ class Q2JSONEditorFramework:
             st.rerun()
     
     def _batch_find_replace(self, selected_questions: List[int]):
-        """Batch find and replace."""
+        """Batch find and replace with dry-run preview and undo."""
         st.write("**Find and Replace:**")
         
+        # Outcome of the last apply/undo, kept across the rerun that follows it
+        result = st.session_state.pop('batch_find_replace_result', None)
+        if result:
+            level, message = result
+            getattr(st, level)(message)
+        
         find_text = st.text_input("Find")
         replace_text = st.text_input("Replace with")
         
@@ -848,54 +856,53 @@ class Q2JSONEditorFramework:
             default=['question_text']
         )
         
-        case_sensitive = st.checkbox("Case sensitive")
+        col1, col2 = st.columns(2)
+        with col1:
+            case_sensitive = st.checkbox("Case sensitive")
+        with col2:
+            use_regex = st.checkbox("Regular expression")
         
-        if st.button("Apply Changes") and find_text:
-            changes_made = 0
+        if find_text:
+            try:
+                query = FindReplaceQuery(find_text, replace_text, case_sensitive=case_sensitive, regex=use_regex)
+            except ValueError as e:
+                st.error(str(e))
+                return
             
-            for idx in selected_questions:
-                question = st.session_state.editor_questions[idx]
-                
-                for field in fields_to_search:
-                    if field in question:
-                        if field == 'options' and isinstance(question[field], list):
-                            # Handle options list
-                            for i, option in enumerate(question[field]):
-                                if isinstance(option, str):
-                                    if case_sensitive:
-                                        if find_text in option:
-                                            question[field][i] = option.replace(find_text, replace_text)
-                                            changes_made += 1
-                                    else:
-                                        if find_text.lower() in option.lower():
-                                            question[field][i] = re.sub(
-                                                re.escape(find_text), 
-                                                replace_text, 
-                                                option, 
-                                                flags=re.IGNORECASE
-                                            )
-                                            changes_made += 1
-                        elif isinstance(question[field], str):
-                            # Handle string fields
-                            if case_sensitive:
-                                if find_text in question[field]:
-                                    question[field] = question[field].replace(find_text, replace_text)
-                                    changes_made += 1
-                            else:
-                                if find_text.lower() in question[field].lower():
-                                    question[field] = re.sub(
-                                        re.escape(find_text), 
-                                        replace_text, 
-                                        question[field], 
-                                        flags=re.IGNORECASE
-                                    )
-                                    changes_made += 1
-            
-            if changes_made > 0:
-                st.success(f"Made {changes_made} replacements")
-                st.rerun()
-            else:
+            # One pass over the selection; nothing is changed until the log is applied
+            edit_log = plan_find_replace(st.session_state.editor_questions, selected_questions,
+                                         fields_to_search, query)
+            
+            if not edit_log.edits:
                 st.info("No matches found")
+            else:
+                st.write(f"{edit_log.replacements} replacements in {len(edit_log.edits)} fields "
+                         f"of {edit_log.questions_affected} questions")
+                
+                if st.checkbox("Preview changes (dry run)"):
+                    for edit in edit_log.edits[:self.max_preview_edits]:
+                        before, after = edit.preview()
+                        st.caption(f"Question {edit.question_index + 1} - {edit.location}")
+                        st.code(f"- {before}\n+ {after}", language='diff')
+                    if len(edit_log.edits) > self.max_preview_edits:
+                        st.caption(f"... and {len(edit_log.edits) - self.max_preview_edits} more fields")
+                
+                if st.button("Apply Changes"):
+                    edit_log.apply(st.session_state.editor_questions)
+                    undo_stack = st.session_state.setdefault('batch_edit_history', [])
+                    undo_stack.append(edit_log)
+                    del undo_stack[:-self.max_history]
+                    st.session_state['batch_find_replace_result'] = (
+                        'success', f"Made {edit_log.replacements} replacements")
+                    st.rerun()
+        
+        undo_stack = st.session_state.get('batch_edit_history', [])
+        if undo_stack and st.button(f"Undo: {undo_stack[-1].description}"):
+            skipped = undo_stack.pop().undo(st.session_state.editor_questions)
+            if skipped:
+                st.session_state['batch_find_replace_result'] = (
+                    'warning', f"{skipped} fields were edited since and were left unchanged")
+            st.rerun()
     
     def _batch_validate(self, selected_questions: List[int]):
         """Batch validate questions."""
@@ -6,7 +6,11 @@ Complete pipeline: JSON Loading → LaTeX Correction → Enhanced Mathematical V
 import os
 import sys
 import json
+import glob
+import time
 import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict
 from pathlib import Path
 
 # Add modules to path
@@ -19,14 +23,23 @@ except ImportError:
     print("Please ensure mathematical_consistency_detector_enhanced.py exists in modules/")
     sys.exit(1)
 
+try:
+    from expression_verifier import ExpressionVerifier
+except ImportError as e:
+    print(f"ERROR: Expression verifier could not be imported: {e}")
+    print("Please ensure expression_verifier.py and unit_normalizer.py exist in modules/ and numpy is installed")
+    sys.exit(1)
+
 # Import LaTeX corrector if available (optional)
 try:
     from latex_corrector import LaTeXCorrector
+    from correction_cache import CorrectionCache, DEFAULT_CACHE_PATH
     LATEX_AVAILABLE = True
 except ImportError:
     # Use ASCII-safe warning message for Windows console compatibility
     print("WARNING: LaTeX corrector not found - LaTeX correction will be skipped")
     LATEX_AVAILABLE = False
+    DEFAULT_CACHE_PATH = None
 
 
 class Q2JSONPipelineEnhanced:
@@ -35,10 +48,17 @@ class Q2JSONPipelineEnhanced:
     Workflow: Load JSON → LaTeX Correction → Enhanced Mathematical Validation → Save → Report
     """
     
-    def __init__(self):
-        """Initialize the enhanced pipeline components"""
+    def __init__(self, cache_path: str = None):
+        """
+        Initialize the enhanced pipeline components
+        
+        Args:
+            cache_path: SQLite correction cache; unchanged questions skip LaTeX correction on reruns
+        """
         self.math_detector = MathematicalConsistencyDetectorEnhanced()
-        self.latex_corrector = LaTeXCorrector() if LATEX_AVAILABLE else None
+        self.expression_verifier = ExpressionVerifier()
+        cache = CorrectionCache(cache_path) if LATEX_AVAILABLE and cache_path else None
+        self.latex_corrector = LaTeXCorrector(cache=cache) if LATEX_AVAILABLE else None
         self.processing_results = {}
     
     def process_file(self, input_file: str, output_file: str = None, 
@@ -145,6 +165,8 @@ class Q2JSONPipelineEnhanced:
                 print(f"   Questions affected: {latex_results['questions_affected']}")
             else:
                 print("   No LaTeX corrections needed")
+            if self.latex_corrector.cache is not None:
+                print(f"   Reused cached corrections: {latex_results['cache_hits']} questions")
         
         return latex_results['corrected_data'], latex_results
     
@@ -157,6 +179,8 @@ class Q2JSONPipelineEnhanced:
         
         contradictions = self.math_detector.detect_contradictions(questions_data)
         math_results = self.math_detector.get_summary_stats()
+        step_mismatches = self.expression_verifier.verify(questions_data)
+        math_results['step_mismatches'] = [asdict(mismatch) for mismatch in step_mismatches]
         
         if verbose:
             if contradictions:
@@ -173,6 +197,11 @@ class Q2JSONPipelineEnhanced:
                 print(f"   No mathematical contradictions detected")
                 print(f"   Analyzed {math_results.get('questions_analyzed', 0)} questions")
                 print(f"   Extracted {math_results.get('values_extracted', 0)} values")
+            
+            if step_mismatches:
+                print(f"   Recomputed worked-solution steps that do not hold: {len(step_mismatches)}")
+            else:
+                print("   All recomputable worked-solution steps hold")
         
         return math_results
     
@@ -240,6 +269,16 @@ class Q2JSONPipelineEnhanced:
         else:
             print(f"   ERROR: {math_results.get('message', 'Unknown error')}")
         
+        step_mismatches = math_results.get('step_mismatches', [])
+        if step_mismatches:
+            print(f"\nWORKED-SOLUTION STEPS THAT DO NOT HOLD: {len(step_mismatches)}")
+            for mismatch in step_mismatches:
+                print(f"   Question {mismatch['question_index'] + 1}, {mismatch['field_name']} "
+                      f"[{mismatch['start']}:{mismatch['end']}] step {mismatch['step']}: "
+                      f"{mismatch['expression']} {mismatch['relation']} {mismatch['stated']} "
+                      f"(computed {mismatch['computed_value']:.6g}, "
+                      f"{mismatch['relative_difference'] * 100:.1f}% off)")
+        
         print("\n" + "=" * 60)
         
         # Enhanced recommendations
@@ -256,6 +295,351 @@ class Q2JSONPipelineEnhanced:
             print("")
 
 
+# Batch mode: stages timed per task, and the upper edges (ms) of the timing histogram buckets
+PIPELINE_STAGES = ['load', 'latex_correction', 'math_validation', 'save']
+TIMING_BUCKETS_MS = [1, 5, 10, 50, 100, 500, 1000, 5000]
+
+# Per-process pipeline for batch mode; each worker owns its own corrector and detector
+_batch_pipeline = None
+
+
+def _init_batch_worker(cache_path: str = None):
+    """Process pool initializer: build one pipeline per worker process"""
+    global _batch_pipeline
+    _batch_pipeline = Q2JSONPipelineEnhanced(cache_path=cache_path)
+
+
+def _run_batch_task(task: dict) -> dict:
+    """
+    Run the pipeline stages for one file or question shard in a worker process
+    
+    Args:
+        task: 'source', 'shard', 'offset', 'questions_data' (None to load source),
+              'output_file' (None for shards), 'check_math', 'fix_latex'
+    
+    Returns:
+        Task result with stage timings; shards also return their corrected questions
+    """
+    pipeline = _batch_pipeline
+    result = {
+        'source': task['source'],
+        'shard': task['shard'],
+        'status': 'completed',
+        'timings': {},
+        'questions_processed': 0,
+        'latex_corrections': {'status': 'skipped', 'corrections_made': 0, 'questions_affected': 0},
+        'mathematical_validation': {'status': 'skipped'},
+        'contradictions': [],
+        'step_mismatches': []
+    }
+    stage = 'load'
+    try:
+        start = time.perf_counter()
+        questions_data = task['questions_data']
+        if questions_data is None:
+            questions_data = pipeline._load_json_file(task['source'], False)
+            result['timings']['load'] = time.perf_counter() - start
+        result['questions_processed'] = len(questions_data.get('questions', []))
+        
+        if task['fix_latex'] and LATEX_AVAILABLE:
+            stage = 'latex_correction'
+            start = time.perf_counter()
+            questions_data, latex_results = pipeline._apply_latex_correction(questions_data, False)
+            result['latex_corrections'] = {key: value for key, value in latex_results.items()
+                                           if key != 'corrected_data'}
+            result['timings']['latex_correction'] = time.perf_counter() - start
+        
+        if task['check_math']:
+            stage = 'math_validation'
+            start = time.perf_counter()
+            contradictions = pipeline.math_detector.detect_contradictions(questions_data)
+            result['mathematical_validation'] = pipeline.math_detector.get_summary_stats()
+            # Report question numbers relative to the whole file, not the shard
+            for contradiction in contradictions:
+                entry = asdict(contradiction)
+                entry['question_index'] += task['offset']
+                result['contradictions'].append(entry)
+            for mismatch in pipeline.expression_verifier.verify(questions_data):
+                entry = asdict(mismatch)
+                entry['question_index'] += task['offset']
+                result['step_mismatches'].append(entry)
+            result['timings']['math_validation'] = time.perf_counter() - start
+        
+        if task['output_file']:
+            stage = 'save'
+            start = time.perf_counter()
+            pipeline._save_processed_data(questions_data, task['output_file'], False)
+            result['timings']['save'] = time.perf_counter() - start
+        else:
+            result['corrected_questions'] = questions_data.get('questions', [])
+    
+    except Exception as e:
+        result.update({'status': 'error', 'step': stage, 'message': str(e)})
+    
+    return result
+
+
+def expand_batch_inputs(inputs: list) -> list:
+    """Resolve files, directories (their *.json files) and glob patterns to input files"""
+    files = []
+    for spec in inputs:
+        path = Path(spec)
+        if path.is_dir():
+            matches = sorted(path.glob('*.json'))
+        elif glob.has_magic(spec):
+            matches = sorted(Path(match) for match in glob.glob(spec, recursive=True))
+        else:
+            matches = [path]
+        # Skip outputs of earlier runs
+        files.extend(match for match in matches if not match.stem.endswith('_enhanced'))
+    return list(dict.fromkeys(files))
+
+
+class BatchReport:
+    """Combined report that batch task results stream into as they complete"""
+    
+    def __init__(self):
+        self.files = {}
+        self.stage_timings = {stage: [] for stage in PIPELINE_STAGES}
+        self.totals = {
+            'files': 0,
+            'files_failed': 0,
+            'questions_processed': 0,
+            'latex_corrections': 0,
+            'questions_corrected': 0,
+            'contradictions': 0,
+            'by_severity': {},
+            'step_mismatches': 0
+        }
+    
+    def add_file(self, source: str, output_file: str, shards: int):
+        """Register an input file before its tasks are submitted"""
+        self.files[source] = {
+            'input_file': source,
+            'output_file': output_file,
+            'status': 'pending',
+            'shards': shards,
+            'questions_processed': 0,
+            'latex_corrections': 0,
+            'questions_corrected': 0,
+            'contradictions': [],
+            'step_mismatches': [],
+            'errors': []
+        }
+        self.totals['files'] += 1
+    
+    def add_result(self, result: dict):
+        """Fold one task result into the file entry, totals and stage timings"""
+        entry = self.files[result['source']]
+        for stage, seconds in result['timings'].items():
+            self.stage_timings[stage].append(seconds)
+        
+        if result['status'] != 'completed':
+            entry['errors'].append(f"{result['step']}: {result['message']}")
+            return
+        
+        latex = result['latex_corrections']
+        entry['questions_processed'] += result['questions_processed']
+        entry['latex_corrections'] += latex.get('corrections_made', 0)
+        entry['questions_corrected'] += latex.get('questions_affected', 0)
+        entry['contradictions'].extend(result['contradictions'])
+        entry['step_mismatches'].extend(result['step_mismatches'])
+    
+    def record_timing(self, stage: str, seconds: float):
+        """Record a stage run in the parent process (file loads and saves for sharded files)"""
+        self.stage_timings[stage].append(seconds)
+    
+    def finish_file(self, source: str, error: str = None):
+        """Mark a file as done once all of its tasks have reported"""
+        entry = self.files[source]
+        if error:
+            entry['errors'].append(error)
+        entry['status'] = 'error' if entry['errors'] else 'completed'
+        
+        if entry['errors']:
+            self.totals['files_failed'] += 1
+        self.totals['questions_processed'] += entry['questions_processed']
+        self.totals['latex_corrections'] += entry['latex_corrections']
+        self.totals['questions_corrected'] += entry['questions_corrected']
+        self.totals['contradictions'] += len(entry['contradictions'])
+        self.totals['step_mismatches'] += len(entry['step_mismatches'])
+        for contradiction in entry['contradictions']:
+            severity = contradiction['severity']
+            self.totals['by_severity'][severity] = self.totals['by_severity'].get(severity, 0) + 1
+    
+    @staticmethod
+    def _timing_summary(samples: list) -> dict:
+        """Count, percentiles and bucketed histogram of stage durations"""
+        if not samples:
+            return {'count': 0}
+        milliseconds = sorted(seconds * 1000 for seconds in samples)
+        histogram = {}
+        lower = 0
+        for upper in TIMING_BUCKETS_MS:
+            histogram[f"{lower}-{upper}ms"] = sum(1 for ms in milliseconds if lower <= ms < upper)
+            lower = upper
+        histogram[f">={lower}ms"] = sum(1 for ms in milliseconds if ms >= lower)
+        return {
+            'count': len(milliseconds),
+            'total_s': round(sum(milliseconds) / 1000, 3),
+            'mean_ms': round(sum(milliseconds) / len(milliseconds), 2),
+            'p50_ms': round(milliseconds[len(milliseconds) // 2], 2),
+            'p95_ms': round(milliseconds[min(len(milliseconds) - 1, int(len(milliseconds) * 0.95))], 2),
+            'max_ms': round(milliseconds[-1], 2),
+            'histogram': histogram
+        }
+    
+    def to_dict(self) -> dict:
+        """Combined report as JSON-serializable data"""
+        return {
+            'totals': self.totals,
+            'stage_timings': {stage: self._timing_summary(samples)
+                              for stage, samples in self.stage_timings.items()},
+            'files': list(self.files.values())
+        }
+    
+    def has_severe_contradictions(self) -> bool:
+        """Check if any file has severe contradictions"""
+        return self.totals['by_severity'].get('severe', 0) > 0
+    
+    def print_summary(self):
+        """Print the combined batch summary with stage timing histograms"""
+        print("\n" + "=" * 60)
+        print("Q2JSON ENHANCED BATCH SUMMARY")
+        print("=" * 60)
+        print(f"Files processed: {self.totals['files']} ({self.totals['files_failed']} failed)")
+        print(f"Questions processed: {self.totals['questions_processed']}")
+        print(f"LaTeX corrections: {self.totals['latex_corrections']} "
+              f"in {self.totals['questions_corrected']} questions")
+        print(f"Mathematical contradictions: {self.totals['contradictions']}")
+        for severity, count in self.totals['by_severity'].items():
+            print(f"   {severity.title()}: {count}")
+        print(f"Worked-solution steps that do not hold: {self.totals['step_mismatches']}")
+        
+        print("\nStage timings:")
+        for stage, summary in self.to_dict()['stage_timings'].items():
+            if not summary['count']:
+                continue
+            print(f"   {stage}: {summary['count']} runs, total {summary['total_s']}s, "
+                  f"p50 {summary['p50_ms']}ms, p95 {summary['p95_ms']}ms, max {summary['max_ms']}ms")
+            peak = max(summary['histogram'].values())
+            for bucket, count in summary['histogram'].items():
+                if count:
+                    print(f"      {bucket:>12} {'#' * max(1, round(20 * count / peak))} {count}")
+        
+        for entry in self.files.values():
+            for error in entry['errors']:
+                print(f"ERROR {entry['input_file']}: {error}")
+        print("=" * 60)
+
+
+def run_batch(input_files: list, output_dir: str = None, workers: int = None,
+              shard_size: int = None, check_math: bool = True, fix_latex: bool = True,
+              verbose: bool = True, cache_path: str = None) -> BatchReport:
+    """
+    Process many files (optionally split into question shards) across worker processes
+    
+    Args:
+        input_files: Input JSON files
+        output_dir: Directory for outputs (default: beside each input)
+        workers: Worker processes (default: CPU count)
+        shard_size: Split files into shards of this many questions
+        check_math: Whether to run mathematical consistency checking
+        fix_latex: Whether to run LaTeX correction
+        verbose: Whether to print progress
+        cache_path: SQLite correction cache shared by all workers
+    
+    Returns:
+        BatchReport with combined results and stage timings
+    """
+    report = BatchReport()
+    if output_dir:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+    
+    def output_path(input_file: Path) -> str:
+        directory = Path(output_dir) if output_dir else input_file.parent
+        return str(directory / f"{input_file.stem}_enhanced{input_file.suffix}")
+    
+    # Sharded files are loaded here once; their shards are reassembled before saving
+    tasks = []
+    pending_shards = {}
+    loader = Q2JSONPipelineEnhanced()
+    for input_file in input_files:
+        source = str(input_file)
+        task = {'source': source, 'shard': 0, 'offset': 0, 'questions_data': None,
+                'output_file': output_path(input_file), 'check_math': check_math, 'fix_latex': fix_latex}
+        if not shard_size:
+            report.add_file(source, task['output_file'], 1)
+            tasks.append(task)
+            continue
+        
+        start = time.perf_counter()
+        try:
+            questions_data = loader._load_json_file(source, False)
+        except Exception as e:
+            report.add_file(source, task['output_file'], 0)
+            report.finish_file(source, f"json_loading: {e}")
+            continue
+        report.record_timing('load', time.perf_counter() - start)
+        
+        questions = questions_data.get('questions', [])
+        offsets = list(range(0, len(questions), shard_size)) or [0]
+        report.add_file(source, task['output_file'], len(offsets))
+        pending_shards[source] = {'data': questions_data, 'parts': {}, 'expected': len(offsets)}
+        for shard, offset in enumerate(offsets):
+            tasks.append({**task, 'shard': shard, 'offset': offset, 'output_file': None,
+                          'questions_data': {'questions': questions[offset:offset + shard_size]}})
+    
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks) or 1))
+    if verbose:
+        print(f"Processing {len(input_files)} files as {len(tasks)} tasks with {workers} workers")
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                             initargs=(cache_path,)) as executor:
+        futures = {executor.submit(_run_batch_task, task): task for task in tasks}
+        for completed, future in enumerate(as_completed(futures), start=1):
+            task = futures[future]
+            source = task['source']
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'source': source, 'shard': task['shard'], 'status': 'error',
+                          'step': 'worker', 'message': str(e), 'timings': {}}
+            report.add_result(result)
+            
+            if verbose:
+                status = 'OK' if result['status'] == 'completed' else 'ERROR'
+                print(f"   [{completed}/{len(tasks)}] {status} {source}"
+                      + (f" (shard {task['shard'] + 1})" if source in pending_shards else ""))
+            
+            if source not in pending_shards:
+                report.finish_file(source)
+                continue
+            
+            # Reassemble a sharded file once all of its shards are in
+            pending = pending_shards[source]
+            pending['parts'][task['shard']] = result.get('corrected_questions')
+            if len(pending['parts']) < pending['expected']:
+                continue
+            del pending_shards[source]
+            if any(part is None for part in pending['parts'].values()):
+                report.finish_file(source)
+                continue
+            
+            questions_data = pending['data']
+            questions_data['questions'] = [question for shard in sorted(pending['parts'])
+                                           for question in pending['parts'][shard]]
+            start = time.perf_counter()
+            try:
+                loader._save_processed_data(questions_data, report.files[source]['output_file'], False)
+                report.record_timing('save', time.perf_counter() - start)
+                report.finish_file(source)
+            except Exception as e:
+                report.finish_file(source, f"file_save: {e}")
+    
+    return report
+
+
 def main():
     """Main entry point for enhanced Q2JSON processing"""
     
@@ -269,20 +653,38 @@ Examples:
   python main_enhanced.py input.json --no-math-check    # Skip mathematical validation
   python main_enhanced.py input.json --no-latex-fix     # Skip LaTeX correction
   python main_enhanced.py input.json -q                 # Quiet mode (minimal output)
+  python main_enhanced.py archive/ --batch -j 8         # Re-process a whole directory in parallel
+  python main_enhanced.py big.json --batch --shard-size 500 --report report.json
+  python main_enhanced.py archive/ --batch --cache    # Reruns only re-correct questions new rules can change
         """
     )
     
-    parser.add_argument('input_file', help='Input JSON file path')
-    parser.add_argument('-o', '--output', help='Output JSON file path (default: input_processed.json)')
+    parser.add_argument('input_file', nargs='+',
+                       help='Input JSON file path (batch mode: files, directories or glob patterns)')
+    parser.add_argument('-o', '--output',
+                       help='Output JSON file path (default: input_enhanced.json); output directory in batch mode')
     parser.add_argument('--no-math-check', action='store_true', 
                        help='Skip mathematical consistency checking')
     parser.add_argument('--no-latex-fix', action='store_true',
                        help='Skip LaTeX correction')
     parser.add_argument('-q', '--quiet', action='store_true',
                        help='Quiet mode (minimal output)')
+    parser.add_argument('--batch', action='store_true',
+                       help='Process many files or question shards across worker processes')
+    parser.add_argument('-j', '--workers', type=int,
+                       help='Worker processes for batch mode (default: CPU count)')
+    parser.add_argument('--shard-size', type=int,
+                       help='Batch mode: split files into shards of this many questions')
+    parser.add_argument('--report', help='Batch mode: write the combined JSON report to this file')
+    parser.add_argument('--cache', nargs='?', const=DEFAULT_CACHE_PATH, metavar='PATH',
+                       help=f'Reuse LaTeX corrections from a SQLite cache across runs (default: {DEFAULT_CACHE_PATH})')
     
     args = parser.parse_args()
     
+    if args.batch or len(args.input_file) > 1:
+        sys.exit(_run_batch_command(args))
+    args.input_file = args.input_file[0]
+    
     # Validate input file
     if not os.path.exists(args.input_file):
         print(f"Error: Input file '{args.input_file}' not found")
@@ -295,7 +697,7 @@ Examples:
         output_file = str(input_path.parent / f"{input_path.stem}_enhanced{input_path.suffix}")
     
     # Initialize and run enhanced pipeline
-    pipeline = Q2JSONPipelineEnhanced()
+    pipeline = Q2JSONPipelineEnhanced(cache_path=args.cache)
     
     results = pipeline.process_file(
         input_file=args.input_file,
@@ -320,5 +722,40 @@ Examples:
         sys.exit(3)  # Processing error
 
 
+def _run_batch_command(args) -> int:
+    """Run batch mode from parsed arguments and return the exit code"""
+    input_files = expand_batch_inputs(args.input_file)
+    missing = [str(path) for path in input_files if not path.is_file()]
+    if missing or not input_files:
+        print(f"Error: Input file(s) not found: {', '.join(missing) or ' '.join(args.input_file)}")
+        return 3
+    
+    report = run_batch(
+        input_files,
+        output_dir=args.output,
+        workers=args.workers,
+        shard_size=args.shard_size,
+        check_math=not args.no_math_check,
+        fix_latex=not args.no_latex_fix,
+        verbose=not args.quiet,
+        cache_path=args.cache
+    )
+    report.print_summary()
+    
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report.to_dict(), f, indent=2, ensure_ascii=False)
+        print(f"Combined report saved to: {args.report}")
+    
+    # Same exit codes as single-file mode
+    if report.totals['files_failed']:
+        return 3
+    if report.has_severe_contradictions():
+        return 2
+    if report.totals['contradictions']:
+        return 1
+    return 0
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,205 @@
+"""
+Persistent LaTeX Correction Cache for the Q2JSON pipeline
+Maps (question content hash, rule-set fingerprint) to corrected output and stats in SQLite,
+so re-running correction over an archive only reprocesses questions that new or changed rules can affect
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    from .rule_compiler import CompiledRule
+except ImportError:
+    from rule_compiler import CompiledRule
+
+DEFAULT_CACHE_PATH = os.path.join('.q2json_cache', 'latex_corrections.sqlite3')
+
+# SQLite limits the number of host parameters per statement
+LOOKUP_CHUNK_SIZE = 500
+
+
+def question_content_hash(question: Dict[str, Any]) -> str:
+    """Stable hash of a question's full content"""
+    payload = json.dumps(question, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class CorrectionCache:
+    """
+    SQLite store of corrected questions keyed by (content hash, rule-set fingerprint).
+
+    Each rule set is stored alongside the entries made with it. When the rules change,
+    an entry from an earlier rule set is carried over without re-running correction if
+    the shared rules kept their order, no removed rule had fired on the question, and
+    either no rules were added or none of the old rules fired and no added rule can match
+    the question (checked with each rule's required literal).
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Batch workers share the file; WAL lets readers proceed while one process writes
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS rulesets (
+                fingerprint TEXT PRIMARY KEY,
+                rules TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS corrections (
+                content_hash TEXT NOT NULL,
+                ruleset TEXT NOT NULL,
+                corrected TEXT,
+                stats TEXT NOT NULL,
+                PRIMARY KEY (content_hash, ruleset)
+            );
+        """)
+        self.connection.commit()
+        self._rulesets: Dict[str, List[Dict[str, Any]]] = {}
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self.connection.close()
+
+    def register_ruleset(self, fingerprint: str, rules: Sequence[CompiledRule]) -> None:
+        """Record the rules behind a fingerprint so later rule sets can be diffed against it"""
+        rule_data = [
+            {'pattern': rule.pattern, 'replacement': rule.replacement,
+             'description': rule.description, 'trigger': rule.trigger}
+            for rule in rules
+        ]
+        with self.connection:
+            self.connection.execute(
+                'INSERT OR IGNORE INTO rulesets (fingerprint, rules) VALUES (?, ?)',
+                (fingerprint, json.dumps(rule_data, ensure_ascii=False))
+            )
+        self._rulesets[fingerprint] = rule_data
+
+    def _ruleset_rules(self, fingerprint: str) -> Optional[List[Dict[str, Any]]]:
+        """Rules of a stored rule set (memoized)"""
+        if fingerprint not in self._rulesets:
+            row = self.connection.execute(
+                'SELECT rules FROM rulesets WHERE fingerprint = ?', (fingerprint,)
+            ).fetchone()
+            self._rulesets[fingerprint] = json.loads(row[0]) if row else None
+        return self._rulesets[fingerprint]
+
+    def lookup_many(self, content_hashes: Iterable[str]) -> Dict[str, Dict[str, Tuple[Optional[str], str]]]:
+        """
+        Fetch every cached entry for the given content hashes
+
+        Entries stay serialized until resolve() picks one, so unused entries cost no parsing.
+
+        Returns:
+            Dict mapping content hash -> {rule-set fingerprint: (corrected JSON or None, stats JSON)}
+        """
+        hashes = list(dict.fromkeys(content_hashes))
+        entries: Dict[str, Dict[str, Tuple[Optional[str], str]]] = {}
+        for start in range(0, len(hashes), LOOKUP_CHUNK_SIZE):
+            chunk = hashes[start:start + LOOKUP_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.connection.execute(
+                f'SELECT content_hash, ruleset, corrected, stats FROM corrections '
+                f'WHERE content_hash IN ({placeholders})', chunk
+            )
+            for content_hash, ruleset, corrected, stats in rows:
+                entries.setdefault(content_hash, {})[ruleset] = (corrected, stats)
+        return entries
+
+    def store_many(self, fingerprint: str,
+                   items: Iterable[Tuple[str, Optional[Dict[str, Any]], Dict[str, Any]]]) -> None:
+        """
+        Store entries for a rule set in one transaction
+
+        Args:
+            fingerprint: Rule-set fingerprint
+            items: (content hash, corrected question or None if unchanged, stats) tuples
+        """
+        rows = [
+            (content_hash, fingerprint,
+             None if corrected is None else json.dumps(corrected, ensure_ascii=False),
+             json.dumps(stats))
+            for content_hash, corrected, stats in items
+        ]
+        if rows:
+            with self.connection:
+                self.connection.executemany(
+                    'INSERT OR REPLACE INTO corrections (content_hash, ruleset, corrected, stats) '
+                    'VALUES (?, ?, ?, ?)', rows
+                )
+
+    def resolve(self, entries: Dict[str, Tuple[Optional[str], str]],
+                fingerprint: str, rules: Sequence[CompiledRule],
+                texts: Sequence[str]) -> Optional[Tuple[Optional[Dict[str, Any]], Dict[str, Any], bool]]:
+        """
+        Pick a usable cached result for one question
+
+        Args:
+            entries: This question's cached entries from lookup_many
+            fingerprint: Current rule-set fingerprint
+            rules: Current rules in application order
+            texts: The question's correctable text fields (before correction)
+
+        Returns:
+            (corrected question or None if unchanged, stats, carried_over),
+            or None when the question must be reprocessed
+        """
+        if fingerprint in entries:
+            corrected, stats = entries[fingerprint]
+            return self._decode(corrected), json.loads(stats), False
+
+        for old_fingerprint, (corrected, stats) in entries.items():
+            old_rules = self._ruleset_rules(old_fingerprint)
+            if old_rules is None:
+                continue
+            stats = json.loads(stats)
+            if self._is_reusable(old_rules, rules, texts, stats):
+                return self._decode(corrected), stats, True
+        return None
+
+    @staticmethod
+    def _decode(corrected: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Parse a stored corrected question (None means the question was unchanged)"""
+        return None if corrected is None else json.loads(corrected)
+
+    @staticmethod
+    def _is_reusable(old_rules: List[Dict[str, Any]], rules: Sequence[CompiledRule],
+                     texts: Sequence[str], stats: Dict[str, Any]) -> bool:
+        """Check whether a result made with old_rules is also what the current rules produce"""
+        old_keys = [(rule['pattern'], rule['replacement']) for rule in old_rules]
+        new_keys = [rule.key for rule in rules]
+        old_key_set, new_key_set = set(old_keys), set(new_keys)
+
+        # Shared rules must run in the same relative order
+        if [key for key in old_keys if key in new_key_set] != [key for key in new_keys if key in old_key_set]:
+            return False
+
+        # A removed rule that fired would have changed the output
+        fired = stats.get('patterns_applied', {})
+        if any(rule['description'] in fired for rule in old_rules
+               if (rule['pattern'], rule['replacement']) not in new_key_set):
+            return False
+
+        added = [rule for rule in rules if rule.key not in old_key_set]
+        if not added:
+            return True
+
+        # Once an old rule has rewritten the text, an added rule may match text that exists
+        # only mid-pipeline (e.g. an old rule's output joined with the captured text), which
+        # neither the original fields nor the final output show: reprocess such questions
+        if fired:
+            return False
+
+        # The old rules left the fields untouched, so the original text is all an added rule sees
+        for rule in added:
+            if rule.trigger is None:
+                return False
+            if any(rule.may_match(text) for text in texts):
+                return False
+        return True
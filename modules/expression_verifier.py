@@ -0,0 +1,486 @@
+"""
+Expression Verifier for Q2JSON worked solutions
+Parses the arithmetic chains in feedback (e.g. V_T = 0.4 + 0.4(\\sqrt{2.8}-\\sqrt{0.8}) = 0.812)
+into a small AST - no eval - and recomputes every = / ≈ step for a whole batch with NumPy
+"""
+
+import math
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from .unit_normalizer import parse_unit
+except ImportError:
+    from unit_normalizer import parse_unit
+
+# Math delimiters; text without any is checked sentence by sentence
+_MATH_SEGMENT = re.compile(r'\$\$(.+?)\$\$|\$(.+?)\$|\\\((.+?)\\\)|\\\[(.+?)\\\]', re.DOTALL)
+# Runs of text up to a line break or a sentence-ending mark (a '.' inside 0.812 does not end one)
+_SENTENCE = re.compile(r'(?:[^\n.!?;]|[.!?;](?=\S))+')
+
+# Relations between the parts of a chain; only = and ≈ steps are recomputed
+_RELATION = re.compile(r'\\(?:approx|simeq|neq?|leq?|geq?)(?![A-Za-z])|[≈<>≠≤≥=]')
+_APPROX_RELATIONS = {'\\approx', '\\simeq', '≈'}
+
+_TOKEN = re.compile(r"""
+    (?P<space>\s+|\\[,;:!\ ]|\\q?quad\b|\\left\b|\\right\b|~)
+  | (?P<number>\d+(?:\.\d+)?|\.\d+)
+  | (?P<text>\\(?:text|mathrm|mbox|rm)\s*\{(?P<body>[^{}]*)\})
+  | (?P<degree>\^\s*\\circ\b|\^\s*\{\s*\\circ\s*\})
+  | (?P<command>\\[A-Za-z]+)
+  | (?P<word>[A-Za-zΩμ°]+)
+  | (?P<op>[-+*/^{}()\[\]·×÷−])
+  | (?P<other>.)
+""", re.VERBOSE | re.DOTALL)
+
+_OPERATOR_COMMANDS = {'\\times': '*', '\\cdot': '*', '\\div': '/'}
+_OPERATOR_ALIASES = {'·': '*', '×': '*', '÷': '/', '−': '-'}
+_FUNCTIONS = {
+    '\\sin': np.sin, '\\cos': np.cos, '\\tan': np.tan, '\\ln': np.log, '\\log': np.log10, '\\exp': np.exp,
+}
+_INVERSE_FUNCTIONS = {'\\sin': np.arcsin, '\\cos': np.arccos, '\\tan': np.arctan}
+_BINARY = {'+': np.add, '-': np.subtract, '*': np.multiply, '/': np.divide, '^': np.power}
+
+# Trailing sentence punctuation around a chain part
+_PART_TRIM = ' \t\n.,;:'
+
+
+class _NotNumeric(Exception):
+    """The text is not a purely numeric expression (variables, unsupported notation)"""
+
+
+@dataclass
+class Expression:
+    """
+    A parsed numeric expression.
+
+    The tree holds constant slots instead of values, so expressions of the same shape
+    share one tree and are evaluated together over a column of constants.
+    """
+    tree: Tuple
+    constants: Tuple[float, ...]
+    # Half a unit in the last written decimal place, when the expression is a single number
+    rounding: float = 0.0
+    # Base-unit factor of that single number's unit
+    unit_factor: float = 1.0
+
+
+@dataclass
+class StepMismatch:
+    """A worked-solution step whose two sides do not agree"""
+    question_index: int
+    field_name: str
+    step: int
+    start: int
+    end: int
+    expression: str
+    stated: str
+    relation: str
+    computed_value: float
+    stated_value: float
+    relative_difference: float
+
+
+@dataclass
+class _Step:
+    """One = / ≈ step found in a field, before evaluation"""
+    question_index: int
+    field_name: str
+    step: int
+    start: int
+    end: int
+    left: str
+    right: str
+    relation: str
+
+
+class _Parser:
+    """Recursive-descent parser from LaTeX tokens to an Expression tree"""
+
+    def __init__(self, text: str):
+        self.tokens = self._tokenize(text)
+        self.position = 0
+        self.constants: List[float] = []
+
+    @staticmethod
+    def _tokenize(text: str) -> List[Tuple[str, str, bool]]:
+        """(kind, value, preceded by spacing) tokens"""
+        tokens = []
+        spaced = False
+        for match in _TOKEN.finditer(text):
+            kind = match.lastgroup
+            value = match.group()
+            if kind == 'space':
+                spaced = True
+                continue
+            if kind == 'text':
+                kind, value = 'unit', match.group('body')
+            elif kind == 'degree':
+                kind, value = 'unit', '°'
+            elif kind == 'command' and value in _OPERATOR_COMMANDS:
+                kind, value = 'op', _OPERATOR_COMMANDS[value]
+            elif kind == 'command' and value in ('\\Omega', '\\degree'):
+                kind = 'unit'
+            elif kind == 'op':
+                value = _OPERATOR_ALIASES.get(value, value)
+            elif kind == 'other':
+                raise _NotNumeric(value)
+            tokens.append((kind, value, spaced))
+            spaced = False
+        return tokens
+
+    def parse(self) -> Expression:
+        if not self.tokens:
+            raise _NotNumeric('empty')
+        tree = self._expression()
+        if self.position != len(self.tokens):
+            raise _NotNumeric(self._peek()[1])
+        rounding, unit_factor = 0.0, 1.0
+        single_number = tree[0] == 'const' or (tree[0] == 'unit' and tree[1][0] == 'const')
+        if single_number and self.tokens[0][0] == 'number':
+            number = self.tokens[0][1]
+            decimals = len(number.split('.')[1]) if '.' in number else 0
+            rounding = 0.5 * 10 ** -decimals
+            if tree[0] == 'unit':
+                unit_factor = self.constants[tree[2]]
+        return Expression(tree, tuple(self.constants), rounding, unit_factor)
+
+    def _peek(self) -> Tuple[str, str, bool]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return ('end', '', False)
+
+    def _take(self) -> Tuple[str, str, bool]:
+        token = self._peek()
+        self.position += 1
+        return token
+
+    def _expect(self, value: str) -> None:
+        if self._take()[1] != value:
+            raise _NotNumeric(value)
+
+    def _constant(self, value: float) -> Tuple:
+        self.constants.append(value)
+        return ('const', len(self.constants) - 1)
+
+    def _expression(self) -> Tuple:
+        node = self._term()
+        while self._peek()[0] == 'op' and self._peek()[1] in '+-':
+            operator = self._take()[1]
+            node = (operator, node, self._term())
+        return node
+
+    def _term(self) -> Tuple:
+        node = self._unary()
+        while True:
+            kind, value, _ = self._peek()
+            if kind == 'op' and value in '*/':
+                self._take()
+                node = (value, node, self._unary())
+            elif self._starts_implicit_factor():
+                node = ('*', node, self._power())
+            else:
+                return node
+
+    def _starts_implicit_factor(self) -> bool:
+        """Juxtaposition such as 0.4(0.779) or 2\\pi (but not two bare numbers)"""
+        kind, value, _ = self._peek()
+        if kind == 'op':
+            return value in '([{'
+        return kind == 'command'
+
+    def _unary(self) -> Tuple:
+        kind, value, _ = self._peek()
+        if kind == 'op' and value in '+-':
+            self._take()
+            operand = self._unary()
+            return operand if value == '+' else ('neg', operand)
+        return self._power()
+
+    def _power(self) -> Tuple:
+        node = self._primary()
+        if self._peek()[1] == '^':
+            self._take()
+            node = ('^', node, self._exponent())
+        return self._units(node)
+
+    def _exponent(self) -> Tuple:
+        kind, value, _ = self._peek()
+        if value == '{':
+            return self._group('{', '}')
+        if kind == 'op' and value == '-':
+            self._take()
+            return ('neg', self._exponent())
+        return self._primary()
+
+    def _units(self, node: Tuple) -> Tuple:
+        """Apply the units written after a value (ignored for the as-written value)"""
+        while True:
+            kind, value, spaced = self._peek()
+            if kind == 'word' and not spaced:
+                # Juxtaposed letters (8A, 2f) are variables, not units
+                raise _NotNumeric(value)
+            if kind not in ('unit', 'word'):
+                return node
+            unit = parse_unit(value)
+            if unit is None:
+                if kind == 'unit' and not value.strip():
+                    self._take()
+                    continue
+                raise _NotNumeric(value)
+            self._take()
+            node = ('unit', node, self._constant(unit[1])[1])
+
+    def _group(self, opening: str, closing: str) -> Tuple:
+        self._expect(opening)
+        node = self._expression()
+        self._expect(closing)
+        return node
+
+    def _argument(self) -> Tuple:
+        """A command argument: a braced group or a single primary"""
+        if self._peek()[1] == '{':
+            return self._group('{', '}')
+        return self._primary()
+
+    def _primary(self) -> Tuple:
+        kind, value, _ = self._peek()
+        if kind == 'number':
+            self._take()
+            return self._constant(float(value))
+        if kind == 'op' and value in '([{':
+            return self._group(value, {'(': ')', '[': ']', '{': '}'}[value])
+        if kind == 'command':
+            self._take()
+            if value == '\\pi':
+                return self._constant(math.pi)
+            if value == '\\sqrt':
+                if self._peek()[1] == '[':
+                    degree = self._group('[', ']')
+                    return ('^', self._argument(), ('/', self._constant(1.0), degree))
+                return ('sqrt', self._argument())
+            if value in ('\\frac', '\\dfrac', '\\tfrac'):
+                return ('/', self._argument(), self._argument())
+            if value in _FUNCTIONS:
+                if self._peek()[1] == '^':
+                    # Only the inverse notation \tan^{-1} is supported on functions
+                    self._take()
+                    marker = [self._take()[1] for _ in range(4 if self._peek()[1] == '{' else 2)]
+                    if marker not in (['{', '-', '1', '}'], ['-', '1']) or value not in _INVERSE_FUNCTIONS:
+                        raise _NotNumeric(value)
+                    return ('inverse', value, self._argument())
+                return ('function', value, self._argument())
+        raise _NotNumeric(value or 'end')
+
+
+@lru_cache(maxsize=4096)
+def parse_expression(text: str) -> Optional[Expression]:
+    """
+    Parse a LaTeX arithmetic expression
+
+    Returns:
+        Expression, or None if the text is not purely numeric
+    """
+    try:
+        return _Parser(text).parse()
+    except (_NotNumeric, RecursionError):
+        return None
+
+
+def _evaluate(tree: Tuple, constants: np.ndarray, in_base_units: bool) -> np.ndarray:
+    """Evaluate an expression tree over a (expressions x slots) matrix of constants"""
+    kind = tree[0]
+    if kind == 'const':
+        return constants[:, tree[1]]
+    if kind == 'unit':
+        value = _evaluate(tree[1], constants, in_base_units)
+        return value * constants[:, tree[2]] if in_base_units else value
+    if kind == 'neg':
+        return -_evaluate(tree[1], constants, in_base_units)
+    if kind == 'sqrt':
+        return np.sqrt(_evaluate(tree[1], constants, in_base_units))
+    if kind == 'function':
+        return _FUNCTIONS[tree[1]](_evaluate(tree[2], constants, in_base_units))
+    if kind == 'inverse':
+        return _INVERSE_FUNCTIONS[tree[1]](_evaluate(tree[2], constants, in_base_units))
+    return _BINARY[kind](_evaluate(tree[1], constants, in_base_units),
+                         _evaluate(tree[2], constants, in_base_units))
+
+
+def evaluate_expressions(expressions: Sequence[Expression]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Evaluate many expressions, one vectorized pass per distinct tree shape
+
+    Returns:
+        Tuple of (values as written, values in base units); NaN where undefined
+    """
+    as_written = np.full(len(expressions), np.nan)
+    in_base = np.full(len(expressions), np.nan)
+    groups: Dict[Tuple, List[int]] = {}
+    for position, expression in enumerate(expressions):
+        groups.setdefault(expression.tree, []).append(position)
+
+    with np.errstate(all='ignore'):
+        for tree, positions in groups.items():
+            constants = np.array([expressions[p].constants for p in positions], dtype=float)
+            as_written[positions] = _evaluate(tree, constants, False)
+            in_base[positions] = _evaluate(tree, constants, True)
+    return as_written, in_base
+
+
+class ExpressionVerifier:
+    """
+    Recomputes the = / ≈ steps of worked solutions and reports the ones that do not hold.
+
+    A step holds if its sides agree as written or in base units (so 0.00227 s = 2.27 ms
+    holds), within a relative tolerance or the rounding of a side written as a plain number.
+    Steps with a non-numeric side (variables, unsupported notation) are not checked.
+    """
+
+    def __init__(self, tolerance: float = 0.01, approx_tolerance: float = 0.02,
+                 fields: Sequence[str] = ('feedback_correct',)):
+        """
+        Args:
+            tolerance: Relative tolerance for = steps
+            approx_tolerance: Relative tolerance for ≈ steps
+            fields: Question fields holding worked solutions
+        """
+        self.tolerance = tolerance
+        self.approx_tolerance = approx_tolerance
+        self.fields = list(fields)
+
+    def extract_steps(self, question: Dict[str, Any], question_index: int = 0) -> List[_Step]:
+        """All = / ≈ steps in a question's worked-solution fields"""
+        steps = []
+        for field_name in self.fields:
+            text = question.get(field_name)
+            if not isinstance(text, str) or '=' not in text and '≈' not in text and '\\approx' not in text:
+                continue
+            for start, segment in self._math_segments(text):
+                steps.extend(self._chain_steps(segment, start, question_index, field_name))
+        return steps
+
+    @staticmethod
+    def _math_segments(text: str) -> List[Tuple[int, str]]:
+        """(offset, text) of each math segment, or of each sentence if the text has no delimiters"""
+        segments = []
+        for match in _MATH_SEGMENT.finditer(text):
+            group = next(index for index in range(1, 5) if match.group(index) is not None)
+            segments.append((match.start(group), match.group(group)))
+        if segments:
+            return segments
+        return [(match.start(), match.group()) for match in _SENTENCE.finditer(text) if match.group()]
+
+    @staticmethod
+    def _chain_steps(segment: str, offset: int, question_index: int, field_name: str) -> List[_Step]:
+        """Steps of one relation chain, with spans relative to the field text"""
+        parts = []
+        relations = []
+        position = 0
+        for match in _RELATION.finditer(segment):
+            parts.append((position, match.start()))
+            relations.append(match.group())
+            position = match.end()
+        parts.append((position, len(segment)))
+
+        # Trim surrounding spaces and sentence punctuation, keeping positions
+        trimmed = []
+        for start, end in parts:
+            text = segment[start:end]
+            start += len(text) - len(text.lstrip(_PART_TRIM))
+            trimmed.append((start, max(start, start + len(text.strip(_PART_TRIM)))))
+
+        steps = []
+        for index, relation in enumerate(relations):
+            if relation != '=' and relation not in _APPROX_RELATIONS:
+                continue
+            (left_start, left_end), (right_start, right_end) = trimmed[index], trimmed[index + 1]
+            if left_start == left_end or right_start == right_end:
+                continue
+            steps.append(_Step(question_index, field_name, index + 1, offset + left_start, offset + right_end,
+                               segment[left_start:left_end], segment[right_start:right_end],
+                               '≈' if relation in _APPROX_RELATIONS else '='))
+        return steps
+
+    def verify(self, questions_data: Dict[str, Any]) -> List[StepMismatch]:
+        """
+        Recompute every step in a question set
+
+        Args:
+            questions_data: Dictionary containing a questions array
+
+        Returns:
+            List[StepMismatch]: Steps that do not hold, in question order
+        """
+        steps = []
+        for question_index, question in enumerate(questions_data.get('questions', [])):
+            if isinstance(question, dict):
+                steps.extend(self.extract_steps(question, question_index))
+        return self.verify_steps(steps)
+
+    def verify_steps(self, steps: Sequence[_Step]) -> List[StepMismatch]:
+        """Evaluate the numeric steps together and keep those outside tolerance"""
+        expressions: List[Expression] = []
+        expression_ids: Dict[str, int] = {}
+        checked = []
+        for step in steps:
+            sides = []
+            for text in (step.left, step.right):
+                if text not in expression_ids:
+                    expression = parse_expression(text)
+                    expression_ids[text] = -1 if expression is None else len(expressions)
+                    if expression is not None:
+                        expressions.append(expression)
+                sides.append(expression_ids[text])
+            if sides[0] >= 0 and sides[1] >= 0:
+                checked.append((step, sides[0], sides[1]))
+        if not checked:
+            return []
+
+        as_written, in_base = evaluate_expressions(expressions)
+        rounding = np.array([expression.rounding for expression in expressions])
+        unit_factor = np.array([expression.unit_factor for expression in expressions])
+        left = np.array([left_id for _, left_id, _ in checked])
+        right = np.array([right_id for _, _, right_id in checked])
+        tolerance = np.array([self.approx_tolerance if step.relation == '≈' else self.tolerance
+                              for step, _, _ in checked])
+
+        with np.errstate(all='ignore'):
+            holds_as_written, defined_as_written = self._holds(
+                as_written[left], as_written[right], rounding[left] + rounding[right], tolerance)
+            holds_in_base, defined_in_base = self._holds(
+                in_base[left], in_base[right],
+                rounding[left] * unit_factor[left] + rounding[right] * unit_factor[right], tolerance)
+            relative = np.abs(as_written[left] - as_written[right]) / np.maximum(
+                np.maximum(np.abs(as_written[left]), np.abs(as_written[right])), 1e-12)
+        mismatched = (defined_as_written | defined_in_base) & ~holds_as_written & ~holds_in_base
+
+        mismatches = []
+        for position in np.flatnonzero(mismatched):
+            step, left_id, right_id = checked[position]
+            mismatches.append(StepMismatch(
+                question_index=step.question_index,
+                field_name=step.field_name,
+                step=step.step,
+                start=step.start,
+                end=step.end,
+                expression=step.left,
+                stated=step.right,
+                relation=step.relation,
+                computed_value=float(as_written[left_id]),
+                stated_value=float(as_written[right_id]),
+                relative_difference=float(relative[position])
+            ))
+        return mismatches
+
+    @staticmethod
+    def _holds(left: np.ndarray, right: np.ndarray, rounding: np.ndarray,
+               tolerance: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(step holds, step is defined) for arrays of step sides"""
+        defined = np.isfinite(left) & np.isfinite(right)
+        allowed = np.maximum(tolerance * np.maximum(np.abs(left), np.abs(right)), rounding)
+        return defined & (np.abs(left - right) <= allowed), defined
@@ -8,6 +8,7 @@ import re
 import time
 from typing import Dict, List, Tuple, Optional, Any
 from .llm_repairs import get_repair_function
+from .math_consistency_engine import MathConsistencyEngine, CLICompatibleProfile, ValueIndex
 
 
 class JSONProcessor:
@@ -20,6 +21,7 @@ class JSONProcessor:
         self.repair_attempts = []
         self.validation_results = {}
         self.processing_log = []
+        self.math_engine = MathConsistencyEngine([CLICompatibleProfile()])
     
 
 
@@ -567,51 +569,31 @@ class JSONProcessor:
         """
         Phase 3: Mathematical consistency detection based on main_enhanced.py logic
         Detects contradictions like 0.776 vs 0.812 in Question 8
+        Uses the engine's 'cli_compatible' profile (2% threshold, numerical questions only)
         """
+        questions = questions_data.get('questions', [])
+        numerical_questions = sum(1 for question in questions if question.get('type') == 'numerical')
         mathematical_results = {
-            'total_checked': 0,
+            'total_checked': numerical_questions,
             'contradictions_found': 0,
             'contradictions': [],
-            'numerical_questions': 0
+            'numerical_questions': numerical_questions
         }
         
-        questions = questions_data.get('questions', [])
-        
-        for i, question in enumerate(questions):
-            if question.get('type') == 'numerical':
-                mathematical_results['numerical_questions'] += 1
-                mathematical_results['total_checked'] += 1
-                
-                # Extract declared answer
-                try:
-                    declared_answer = float(question.get('correct_answer', '0'))
-                except (ValueError, TypeError):
-                    continue
-                
-                # Check feedback for contradictory values
-                feedback_text = question.get('feedback_correct', '')
-                if feedback_text:
-                    contradictory_values = self._extract_mathematical_values(
-                        feedback_text, declared_answer
-                    )
-                    
-                    for value, context in contradictory_values:
-                        difference_percent = abs(value - declared_answer) / declared_answer * 100
-                        
-                        # Use 2% threshold for educational content sensitivity (from CLI)
-                        if difference_percent > 2.0:
-                            contradiction = {
-                                'question_index': i + 1,
-                                'question_title': question.get('title', f'Question {i+1}'),
-                                'declared_answer': declared_answer,
-                                'found_value': value,
-                                'difference_percent': round(difference_percent, 1),
-                                'severity': self._classify_mathematical_severity(difference_percent),
-                                'context': context
-                            }
-                            
-                            mathematical_results['contradictions'].append(contradiction)
-                            mathematical_results['contradictions_found'] += 1
+        result = self.math_engine.detect(questions_data, ['cli_compatible'])['cli_compatible']
+        for contradiction in result.contradictions:
+            i = contradiction.question_index
+            declared_answer, value = contradiction.values_found
+            mathematical_results['contradictions'].append({
+                'question_index': i + 1,
+                'question_title': questions[i].get('title', f'Question {i+1}'),
+                'declared_answer': declared_answer,
+                'found_value': value,
+                'difference_percent': round(contradiction.percentage_difference, 1),
+                'severity': contradiction.severity,
+                'context': contradiction.contexts[0]
+            })
+        mathematical_results['contradictions_found'] = len(mathematical_results['contradictions'])
         
         return mathematical_results
     
@@ -620,93 +602,8 @@ class JSONProcessor:
         Extract mathematical values using enhanced patterns from main_enhanced.py
         Based on patterns that successfully find 0.812 in Question 8
         """
-        extracted_values = []
-        
-        # Enhanced patterns based on CLI success (from mathematical_consistency_detector_enhanced.py)
-        final_answer_patterns = [
-            # Approximation patterns (finds "approx 0.812")
-            (r'[A-Z_]*\s*≈\s*(\d+\.\d+)', 'Approximation'),
-            (r'[A-Z_]*\s*approx\s*(\d+\.\d+)', 'Approximation'),
-            (r'approx\s*(\d+\.\d+)', 'Approximation'),
-            
-            # Unit patterns (finds "0.812,text{V}")
-            (r'(\d+\.\d+),text\{[VvAa]\}', 'Value with units'),
-            (r'(\d+\.\d+)\s*V[.\s]', 'Voltage value'),
-            (r'(\d+\.\d+)\s*text\{V\}', 'LaTeX voltage'),
-            
-            # Calculation result patterns
-            (r'[A-Z_]*\s*=\s*(\d+\.\d+)', 'Calculation result'),
-            (r'get\s*[A-Z_]*\s*=\s*(\d+\.\d+)', 'Calculation gives'),
-            (r'gives.*?(\d+\.\d+)', 'Calculation gives'),
-            
-            # Rounding patterns (finds calculation endpoints)
-            (r'Rounding.*?(\d+\.\d+)', 'Rounding result'),
-            (r'three decimal places.*?(\d+\.\d+)', 'Rounded value'),
-            
-            # Alternative calculation patterns
-            (r'My calculation.*?(\d+\.\d+)', 'Alternative calculation'),
-        ]
-        
-        # Basic constants to skip (from CLI logic)
-        basic_constants = {0.5, 0.4, 1.0, 2.0, 3.0, 4.0, 5.0, 0.8, 0.9, 1.6, 1.7}
-        
-        for pattern, context_type in final_answer_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                try:
-                    value = float(match)
-                    
-                    # Skip if it's exactly the declared value
-                    if abs(value - declared_value) < 0.001:
-                        continue
-                    
-                    # Skip basic constants
-                    if value in basic_constants:
-                        continue
-                    
-                    # Skip very small values (likely intermediate calculations)
-                    if value < 0.1:
-                        continue
-                    
-                    # Get context around this value
-                    context = self._get_mathematical_context(text, match, 50)
-                    
-                    extracted_values.append((value, f"{context_type}: {context}"))
-                    
-                except ValueError:
-                    continue
-        
-        return extracted_values
-    
-    def _get_mathematical_context(self, text: str, value_str: str, context_length: int = 50) -> str:
-        """Get context around a mathematical value for better understanding"""
-        try:
-            value_pos = text.find(value_str)
-            if value_pos == -1:
-                return "Context not found"
-            
-            start = max(0, value_pos - context_length)
-            end = min(len(text), value_pos + len(value_str) + context_length)
-            
-            context = text[start:end].strip()
-            
-            # Clean up context for display
-            context = re.sub(r'\s+', ' ', context)
-            if len(context) > 100:
-                context = context[:97] + "..."
-            
-            return context
-        except:
-            return "Context extraction failed"
-    
-    def _classify_mathematical_severity(self, difference_percent: float) -> str:
-        """Classify mathematical contradiction severity (from CLI logic)"""
-        if difference_percent <= 10.0:
-            return "Minor"
-        elif difference_percent <= 25.0:
-            return "Major" 
-        else:
-            return "Severe"
+        index = ValueIndex(text)
+        return self.math_engine.profile('cli_compatible').extract_values(index, index.declared_quantity(declared_value))
     
     def _check_mathematical_consistency_single(self, question: Dict) -> List[str]:
         """
@@ -715,32 +612,12 @@ class JSONProcessor:
         """
         issues = []
         
-        # Only check numerical questions
-        if question.get('type') != 'numerical':
-            return issues
-        
-        try:
-            declared_answer = float(question.get('correct_answer', '0'))
-        except (ValueError, TypeError):
-            return issues
-        
-        # Check feedback for contradictory values
-        feedback_text = question.get('feedback_correct', '')
-        if feedback_text:
-            contradictory_values = self._extract_mathematical_values(
-                feedback_text, declared_answer
+        for contradiction in self.math_engine.analyze_question(question, 'cli_compatible'):
+            declared_answer, value = contradiction.values_found
+            issues.append(
+                f"Mathematical inconsistency: declared answer {declared_answer} "
+                f"vs found {value} ({contradiction.percentage_difference:.1f}% difference, "
+                f"{contradiction.severity}) in {contradiction.contexts[0][:50]}..."
             )
-            
-            for value, context in contradictory_values:
-                difference_percent = abs(value - declared_answer) / declared_answer * 100
-                
-                # Use 2% threshold for educational content sensitivity
-                if difference_percent > 2.0:
-                    severity = self._classify_mathematical_severity(difference_percent)
-                    issues.append(
-                        f"Mathematical inconsistency: declared answer {declared_answer} "
-                        f"vs found {value} ({difference_percent:.1f}% difference, {severity}) "
-                        f"in {context[:50]}..."
-                    )
-        
-        return issues
\ No newline at end of file
+        
+        return issues
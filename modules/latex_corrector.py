@@ -6,7 +6,14 @@ Automatically corrects common LaTeX formatting errors in question data
 import re
 import json
 import logging
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    from .rule_compiler import RuleSet, compile_rules, ruleset_fingerprint
+    from .correction_cache import CorrectionCache, question_content_hash
+except ImportError:
+    from rule_compiler import RuleSet, compile_rules, ruleset_fingerprint
+    from correction_cache import CorrectionCache, question_content_hash
 
 
 class LaTeXCorrector:
@@ -16,9 +23,24 @@ class LaTeXCorrector:
     and units.
     """
     
-    def __init__(self):
-        """Initialize the LaTeX corrector with correction patterns"""
+    # Fields that commonly contain LaTeX
+    TEXT_FIELDS = ['title', 'question_text', 'feedback_correct', 'feedback_incorrect']
+    
+    def __init__(self, cache: Optional[CorrectionCache] = None):
+        """
+        Initialize the LaTeX corrector with correction patterns
+        
+        Args:
+            cache: Optional persistent cache of corrected questions; questions already
+                corrected with an equivalent rule set are not reprocessed
+        """
         self.correction_patterns = self._initialize_correction_patterns()
+        self.compiled_rules = compile_rules(self.correction_patterns)
+        self.rule_set = RuleSet(self.compiled_rules)
+        self.ruleset_fingerprint = ruleset_fingerprint(self.compiled_rules)
+        self.cache = cache
+        if self.cache is not None:
+            self.cache.register_ruleset(self.ruleset_fingerprint, self.compiled_rules)
         self.correction_stats = {
             'total_corrections': 0,
             'patterns_applied': {},
@@ -89,8 +111,33 @@ class LaTeXCorrector:
                 'questions_affected': 0
             }
         
+        questions = corrected_data['questions']
+        content_hashes = []
+        cached_entries = {}
+        if self.cache is not None:
+            content_hashes = [question_content_hash(question) for question in questions]
+            cached_entries = self.cache.lookup_many(content_hashes)
+        new_cache_entries = []
+        cache_hits = 0
+        
         # Process each question
-        for i, question in enumerate(corrected_data['questions']):
+        for i, question in enumerate(questions):
+            if self.cache is not None:
+                resolved = self.cache.resolve(cached_entries.get(content_hashes[i], {}),
+                                              self.ruleset_fingerprint, self.compiled_rules,
+                                              self._question_texts(question))
+                if resolved is not None:
+                    corrected_question, question_stats, carried_over = resolved
+                    if corrected_question is not None:
+                        questions[i] = corrected_question
+                    self._add_question_stats(question_stats, i)
+                    cache_hits += 1
+                    if carried_over:
+                        new_cache_entries.append((content_hashes[i], corrected_question, question_stats))
+                    continue
+                stats_before = (self.correction_stats['total_corrections'],
+                                dict(self.correction_stats['patterns_applied']))
+            
             original_question = json.dumps(question)
             
             # Apply corrections to all text fields in the question
@@ -99,15 +146,58 @@ class LaTeXCorrector:
             # Check if this question was modified
             if json.dumps(question) != original_question:
                 self.correction_stats['questions_affected'].add(i)
+            
+            if self.cache is not None:
+                # Unchanged questions are cached without a copy of their content
+                question_stats = self._question_stats_since(stats_before, i)
+                new_cache_entries.append((content_hashes[i],
+                                          question if question_stats['modified'] else None,
+                                          question_stats))
+        
+        if new_cache_entries:
+            self.cache.store_many(self.ruleset_fingerprint, new_cache_entries)
         
         return {
             'status': 'completed',
             'corrected_data': corrected_data,
             'corrections_made': self.correction_stats['total_corrections'],
             'questions_affected': len(self.correction_stats['questions_affected']),
-            'pattern_stats': dict(self.correction_stats['patterns_applied'])
+            'pattern_stats': dict(self.correction_stats['patterns_applied']),
+            'cache_hits': cache_hits
         }
     
+    def _question_texts(self, question: Dict[str, Any]) -> List[str]:
+        """The string fields of a question that corrections are applied to"""
+        texts = [question[field] for field in self.TEXT_FIELDS if isinstance(question.get(field), str)]
+        if isinstance(question.get('choices'), list):
+            texts.extend(choice for choice in question['choices'] if isinstance(choice, str))
+        if isinstance(question.get('correct_answer'), str):
+            texts.append(question['correct_answer'])
+        return texts
+    
+    def _question_stats_since(self, stats_before: Tuple[int, Dict[str, int]], question_index: int) -> Dict[str, Any]:
+        """Corrections made to one question, from a snapshot taken before it was processed"""
+        total_before, patterns_before = stats_before
+        patterns = {
+            description: count - patterns_before.get(description, 0)
+            for description, count in self.correction_stats['patterns_applied'].items()
+            if count != patterns_before.get(description, 0)
+        }
+        return {
+            'corrections_made': self.correction_stats['total_corrections'] - total_before,
+            'patterns_applied': patterns,
+            'modified': question_index in self.correction_stats['questions_affected']
+        }
+    
+    def _add_question_stats(self, question_stats: Dict[str, Any], question_index: int) -> None:
+        """Fold a cached question's correction stats into the run statistics"""
+        self.correction_stats['total_corrections'] += question_stats['corrections_made']
+        for description, count in question_stats['patterns_applied'].items():
+            self.correction_stats['patterns_applied'][description] = \
+                self.correction_stats['patterns_applied'].get(description, 0) + count
+        if question_stats['modified']:
+            self.correction_stats['questions_affected'].add(question_index)
+    
     def _correct_question_fields(self, question: Dict[str, Any], question_index: int) -> None:
         """
         Apply LaTeX corrections to all text fields in a question
@@ -116,16 +206,8 @@ class LaTeXCorrector:
             question: Question dictionary to correct
             question_index: Index of the question for tracking
         """
-        # Fields that commonly contain LaTeX
-        text_fields = [
-            'title',
-            'question_text',
-            'feedback_correct',
-            'feedback_incorrect'
-        ]
-        
         # Correct main text fields
-        for field in text_fields:
+        for field in self.TEXT_FIELDS:
             if field in question and isinstance(question[field], str):
                 original_text = question[field]
                 corrected_text = self._apply_latex_corrections(original_text)
@@ -164,23 +246,16 @@ class LaTeXCorrector:
         Returns:
             Corrected text
         """
-        corrected_text = text
+        # Only rules whose required literal occurs in the text are run
+        corrected_text, applied = self.rule_set.apply(text)
         
-        for pattern, replacement, description in self.correction_patterns:
-            # Count occurrences before replacement
-            matches = re.findall(pattern, corrected_text)
+        # Update statistics
+        for description, corrections_made in applied.items():
+            self.correction_stats['total_corrections'] += corrections_made
             
-            if matches:
-                # Apply the correction
-                corrected_text = re.sub(pattern, replacement, corrected_text)
-                
-                # Update statistics
-                corrections_made = len(matches)
-                self.correction_stats['total_corrections'] += corrections_made
-                
-                if description not in self.correction_stats['patterns_applied']:
-                    self.correction_stats['patterns_applied'][description] = 0
-                self.correction_stats['patterns_applied'][description] += corrections_made
+            if description not in self.correction_stats['patterns_applied']:
+                self.correction_stats['patterns_applied'][description] = 0
+            self.correction_stats['patterns_applied'][description] += corrections_made
         
         return corrected_text
     
@@ -0,0 +1,341 @@
+"""
+Concurrent question generation for the Q2JSON pipeline
+Splits a bank request into prompt chunks (per question type, a few questions each), sends them
+to an OpenAI-compatible chat completions endpoint with bounded concurrency, retries and backoff,
+and hands every response to JSONProcessor as soon as it arrives
+"""
+
+import asyncio
+import http.client
+import json
+import random
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from .json_processor import JSONProcessor
+except ImportError:
+    from json_processor import JSONProcessor
+
+DEFAULT_QUESTIONS_PER_REQUEST = 10
+DEFAULT_CONCURRENCY = 8
+DEFAULT_MAX_RETRIES = 4
+
+# Rate limits, timeouts and transient server errors are worth retrying; other statuses are not
+RETRYABLE_STATUS = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+
+class ProviderError(Exception):
+    """A failed completion request"""
+
+    def __init__(self, message: str, status: Optional[int] = None, retryable: bool = False,
+                 retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+        self.retry_after = retry_after
+        self.attempts = 1
+
+
+@dataclass
+class GenerationChunk:
+    """One prompt sent to the provider"""
+    chunk_id: str
+    prompt: str
+    question_type: str
+    question_count: int
+
+
+@dataclass
+class ChunkResult:
+    """What came back for one chunk, after JSONProcessor"""
+    chunk: GenerationChunk
+    success: bool
+    questions: List[Dict[str, Any]] = field(default_factory=list)
+    messages: List[str] = field(default_factory=list)
+    attempts: int = 0
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+
+@dataclass
+class GenerationReport:
+    """Results of a generation run, in chunk order"""
+    results: List[ChunkResult]
+    elapsed: float
+
+    @property
+    def questions(self) -> List[Dict[str, Any]]:
+        return [question for result in self.results for question in result.questions]
+
+    @property
+    def failed(self) -> List[ChunkResult]:
+        return [result for result in self.results if not result.success]
+
+    def as_questions_data(self) -> Dict[str, Any]:
+        """The {"questions": [...]} document the later stages work on"""
+        return {'questions': self.questions}
+
+
+def compose_prompt(preamble: str, postamble: str, educational_context: str, type_instructions: str,
+                   difficulty_level: str = "Mixed", include_explanations: bool = False,
+                   custom_instructions: str = "") -> str:
+    """Complete prompt in the layout the Prompt Builder uses"""
+    prompt_parts = [preamble, f"\n\n{educational_context}", f"\n\n{type_instructions}"]
+
+    if difficulty_level != "Mixed":
+        prompt_parts.append(f"\nDifficulty level: {difficulty_level}")
+
+    if include_explanations:
+        prompt_parts.append("\nInclude detailed explanations for both correct and incorrect answers")
+
+    if custom_instructions.strip():
+        prompt_parts.append(f"\nAdditional requirements: {custom_instructions}")
+
+    prompt_parts.append(f"\n\n{postamble}")
+    return "".join(prompt_parts)
+
+
+def build_generation_chunks(educational_context: str, selected_types: Sequence[Dict[str, str]],
+                            question_count: int, preamble: str, postamble: str,
+                            questions_per_request: int = DEFAULT_QUESTIONS_PER_REQUEST,
+                            difficulty_level: str = "Mixed", include_explanations: bool = False,
+                            custom_instructions: str = "", type_filter: Any = None) -> List[GenerationChunk]:
+    """
+    Split a bank request into prompts of at most questions_per_request questions of one type
+
+    Questions are spread evenly over the selected types (as in the Prompt Builder's even
+    distribution); each slice gets its type instructions from QuestionTypeFilter.
+
+    Args:
+        selected_types: Entries of QuestionTypeFilter.available_types
+        type_filter: QuestionTypeFilter instance (created when not given)
+
+    Returns:
+        List[GenerationChunk]: Chunks whose question counts add up to question_count
+    """
+    if not selected_types or question_count <= 0:
+        return []
+    if type_filter is None:
+        from utils.question_type_filter import QuestionTypeFilter
+        type_filter = QuestionTypeFilter()
+
+    questions_per_request = max(1, questions_per_request)
+    count_per_type, remainder = divmod(question_count, len(selected_types))
+
+    chunks = []
+    for i, q_type in enumerate(selected_types):
+        type_count = count_per_type + (1 if i < remainder else 0)
+        for offset in range(0, type_count, questions_per_request):
+            count = min(questions_per_request, type_count - offset)
+            type_instructions = type_filter.generate_type_instructions([q_type], count, "Even distribution")
+            chunks.append(GenerationChunk(
+                chunk_id=f"{q_type['code']}-{offset // questions_per_request + 1}",
+                prompt=compose_prompt(preamble, postamble, educational_context, type_instructions,
+                                      difficulty_level, include_explanations, custom_instructions),
+                question_type=q_type['code'],
+                question_count=count
+            ))
+    return chunks
+
+
+class OpenAICompatibleClient:
+    """
+    Chat completions client for OpenAI-compatible endpoints (OpenAI, Azure proxies, vLLM, Ollama, ...)
+
+    Requests are plain urllib calls made on a worker thread pool, so the client needs nothing
+    beyond the standard library; complete() is awaitable and retries transient failures with
+    exponential backoff and jitter, honouring Retry-After.
+    """
+
+    def __init__(self, base_url: str, model: str, api_key: Optional[str] = None,
+                 timeout: float = 120.0, max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff_base: float = 1.0, backoff_max: float = 30.0,
+                 temperature: Optional[float] = None, system_prompt: Optional[str] = None,
+                 max_connections: int = DEFAULT_CONCURRENCY):
+        """
+        Args:
+            base_url: API root, e.g. https://api.openai.com/v1
+            max_retries: Retries after the first attempt
+            backoff_base: Delay before the first retry (doubled for each later one)
+            max_connections: Worker threads, i.e. requests that can be in flight at once
+        """
+        self.url = base_url.rstrip('/') + '/chat/completions'
+        self.model = model
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.temperature = temperature
+        self.system_prompt = system_prompt
+        self.max_connections = max_connections
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def __enter__(self) -> 'OpenAICompatibleClient':
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.close()
+
+    def _payload(self, prompt: str) -> Dict[str, Any]:
+        messages = [{'role': 'user', 'content': prompt}]
+        if self.system_prompt:
+            messages.insert(0, {'role': 'system', 'content': self.system_prompt})
+        payload: Dict[str, Any] = {'model': self.model, 'messages': messages}
+        if self.temperature is not None:
+            payload['temperature'] = self.temperature
+        return payload
+
+    def _request(self, prompt: str) -> str:
+        """One blocking completion request"""
+        headers = {'Content-Type': 'application/json'}
+        if self.api_key:
+            headers['Authorization'] = f'Bearer {self.api_key}'
+        request = urllib.request.Request(
+            self.url, data=json.dumps(self._payload(prompt)).encode('utf-8'), headers=headers, method='POST'
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = json.loads(response.read().decode('utf-8'))
+        except urllib.error.HTTPError as e:
+            retry_after = e.headers.get('Retry-After') if e.headers else None
+            try:
+                retry_after = float(retry_after) if retry_after is not None else None
+            except ValueError:
+                retry_after = None
+            detail = e.read().decode('utf-8', errors='replace')[:200]
+            raise ProviderError(f"HTTP {e.code}: {detail or e.reason}", status=e.code,
+                                retryable=e.code in RETRYABLE_STATUS, retry_after=retry_after) from None
+        except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+            raise ProviderError(f"Connection failed: {getattr(e, 'reason', e)}", retryable=True) from None
+        except http.client.HTTPException as e:
+            # e.g. IncompleteRead when the connection drops mid-response
+            raise ProviderError(f"Connection failed: {type(e).__name__}: {e}", retryable=True) from None
+        except ValueError as e:
+            raise ProviderError(f"Response is not JSON: {e}") from None
+
+        try:
+            return body['choices'][0]['message']['content'] or ''
+        except (KeyError, IndexError, TypeError):
+            raise ProviderError("Response has no choices[0].message.content") from None
+
+    def _backoff(self, attempt: int, error: ProviderError) -> float:
+        if error.retry_after is not None:
+            return min(error.retry_after, self.backoff_max)
+        return min(self.backoff_max, self.backoff_base * (2 ** attempt)) * random.uniform(0.5, 1.0)
+
+    async def complete(self, prompt: str) -> str:
+        """Response text for a prompt (see complete_with_attempts)"""
+        text, _ = await self.complete_with_attempts(prompt)
+        return text
+
+    async def complete_with_attempts(self, prompt: str) -> Tuple[str, int]:
+        """
+        Response text for a prompt and the number of requests it took
+
+        Raises:
+            ProviderError: A non-retryable failure, or the last failure once retries run out
+                (its attempts attribute holds the number of requests made)
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_connections,
+                                                thread_name_prefix='q2json-llm')
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                text = await loop.run_in_executor(self._executor, self._request, prompt)
+                return text, attempt
+            except ProviderError as e:
+                e.attempts = attempt
+                if not e.retryable or attempt > self.max_retries:
+                    raise
+                await asyncio.sleep(self._backoff(attempt - 1, e))
+
+
+ResultCallback = Callable[[ChunkResult, int, int], None]
+
+
+async def generate_questions(chunks: Sequence[GenerationChunk], client: Any,
+                             concurrency: int = DEFAULT_CONCURRENCY,
+                             processor: Optional[JSONProcessor] = None, llm_type: str = "auto",
+                             on_result: Optional[ResultCallback] = None) -> GenerationReport:
+    """
+    Send every chunk to the client, at most concurrency at a time
+
+    Each response goes through JSONProcessor.process_raw_json (preprocessing and LLM-specific
+    repair) the moment it arrives, while the remaining requests are still in flight.
+
+    Args:
+        client: Object with an async complete(prompt) -> str method (e.g. OpenAICompatibleClient);
+            failures are expected as ProviderError, any other exception fails just its chunk
+        on_result: Called as on_result(result, completed, total) after each chunk (progress display);
+            if it raises, that chunk is reported as failed
+
+    Returns:
+        GenerationReport: Per-chunk results in chunk order
+    """
+    processor = processor or JSONProcessor()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    started = time.perf_counter()
+
+    async def run(index: int, chunk: GenerationChunk):
+        async with semaphore:
+            chunk_started = time.perf_counter()
+            try:
+                if hasattr(client, 'complete_with_attempts'):
+                    text, attempts = await client.complete_with_attempts(chunk.prompt)
+                else:
+                    text, attempts = await client.complete(chunk.prompt), 1
+                return index, chunk, text, None, attempts, chunk_started
+            except ProviderError as e:
+                return index, chunk, None, str(e), e.attempts, chunk_started
+            except Exception as e:
+                # A client bug or unexpected failure only fails its own chunk
+                return index, chunk, None, f"{type(e).__name__}: {e}", 1, chunk_started
+
+    results: List[Optional[ChunkResult]] = [None] * len(chunks)
+    tasks = [asyncio.ensure_future(run(index, chunk)) for index, chunk in enumerate(chunks)]
+    try:
+        for completed, future in enumerate(asyncio.as_completed(tasks), start=1):
+            index, chunk, text, error, attempts, chunk_started = await future
+            try:
+                if error is None:
+                    success, questions_data, messages = processor.process_raw_json(text, llm_type)
+                    result = ChunkResult(
+                        chunk=chunk, success=success,
+                        questions=questions_data['questions'] if success else [],
+                        messages=messages, attempts=attempts,
+                        error=None if success else "Response could not be parsed as questions"
+                    )
+                else:
+                    result = ChunkResult(chunk=chunk, success=False, attempts=attempts, error=error)
+                result.elapsed = time.perf_counter() - chunk_started
+                results[index] = result
+                if on_result is not None:
+                    on_result(result, completed, len(chunks))
+            except Exception as e:
+                results[index] = ChunkResult(chunk=chunk, success=False, attempts=attempts,
+                                             error=f"{type(e).__name__}: {e}",
+                                             elapsed=time.perf_counter() - chunk_started)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    return GenerationReport(results=results, elapsed=time.perf_counter() - started)
+
+
+def run_generation(chunks: Sequence[GenerationChunk], client: Any, **kwargs) -> GenerationReport:
+    """Blocking generate_questions, for Streamlit scripts and the command line"""
+    return asyncio.run(generate_questions(chunks, client, **kwargs))
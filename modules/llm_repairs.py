@@ -7,6 +7,43 @@ import re
 import json
 from typing import Callable
 
+try:
+    from .rule_compiler import RuleSet
+except ImportError:
+    from rule_compiler import RuleSet
+
+
+# Regex repairs, compiled once; each runs only when its required literal is present
+CHATGPT_DISPLAY_MATH_RULES = RuleSet.from_patterns([
+    # MOST AGGRESSIVE: Replace complex display math with placeholders
+    # This handles the problematic $$f_r = \frac{...}$$ patterns
+    (r'\$\$([^$]*\\[a-zA-Z]+[^$]*)\$\$', r'[Mathematical Formula]', 'complex display math'),
+    # Convert remaining simple display math to inline math
+    (r'\$\$([^$]+)\$\$', r'$\1$', 'simple display math'),
+])
+
+CHATGPT_ESCAPE_RULES = RuleSet.from_patterns([
+    # Fix field name escapes
+    (r'"(\w+)\\_(\w+)":', r'"\1_\2":', 'field name escape'),
+    # Remove remaining problematic escapes
+    (r'\\([^"\\\/bfnrt])', r'\1', 'problematic escape'),
+])
+
+CLAUDE_RULES = RuleSet.from_patterns([
+    # Remove any PowerShell-specific artifacts
+    (r'PowerShell[^"]*', '', 'PowerShell artifact'),
+    # Remove preference-related content
+    (r'[Pp]reference[^"]*', '', 'preference content'),
+])
+
+# Case-insensitive: prefiltered on literals checked against the lowercased text
+COPILOT_SAFETY_RULES = RuleSet.from_patterns([
+    (r'I cannot.*', '', 'safety filter message'),
+    (r'I\'m not able to.*', '', 'safety filter message'),
+    (r'I apologize.*', '', 'safety filter message'),
+    (r'Safety.*', '', 'safety filter message'),
+], re.IGNORECASE)
+
 
 def repair_chatgpt_response(json_str: str) -> str:
     """
@@ -15,14 +52,8 @@ def repair_chatgpt_response(json_str: str) -> str:
     - LaTeX command escaping
     - Unicode in mathematical expressions
     """
-    repaired = json_str
-    
-    # MOST AGGRESSIVE: Replace complex display math with placeholders
-    # This handles the problematic $$f_r = \frac{...}$$ patterns
-    repaired = re.sub(r'\$\$([^$]*\\[a-zA-Z]+[^$]*)\$\$', r'[Mathematical Formula]', repaired)
-    
-    # Convert remaining simple display math to inline math
-    repaired = re.sub(r'\$\$([^$]+)\$\$', r'$\1$', repaired)
+    # Replace complex display math with placeholders, convert the rest to inline math
+    repaired, _ = CHATGPT_DISPLAY_MATH_RULES.apply(json_str)
     
     # Fix ALL LaTeX escaping issues (both single and double backslashes)
     latex_fixes = [
@@ -77,11 +108,8 @@ def repair_chatgpt_response(json_str: str) -> str:
     for old, new in escape_fixes:
         repaired = repaired.replace(old, new)
     
-    # Fix field name escapes
-    repaired = re.sub(r'"(\w+)\\_(\w+)":', r'"\1_\2":', repaired)
-    
-    # Remove remaining problematic escapes
-    repaired = re.sub(r'\\([^"\\\/bfnrt])', r'\1', repaired)
+    # Fix field name escapes and remove remaining problematic escapes
+    repaired, _ = CHATGPT_ESCAPE_RULES.apply(repaired)
     
     return repaired
 
@@ -93,13 +121,8 @@ def repair_claude_response(json_str: str) -> str:
     - Over-verbose responses
     - Boundary confusion
     """
-    repaired = json_str
-    
-    # Remove any PowerShell-specific artifacts
-    repaired = re.sub(r'PowerShell[^"]*', '', repaired)
-    
-    # Remove preference-related content
-    repaired = re.sub(r'[Pp]reference[^"]*', '', repaired)
+    # Remove PowerShell artifacts and preference-related content
+    repaired, _ = CLAUDE_RULES.apply(json_str)
     
     # Standard escape fixes
     repaired = repaired.replace('\\"', '"')
@@ -115,18 +138,8 @@ def repair_copilot_response(json_str: str) -> str:
     - Truncated responses
     - Conservative formatting
     """
-    repaired = json_str
-    
     # Remove safety filter messages
-    safety_patterns = [
-        r'I cannot.*',
-        r'I\'m not able to.*',
-        r'I apologize.*',
-        r'Safety.*',
-    ]
-    
-    for pattern in safety_patterns:
-        repaired = re.sub(pattern, '', repaired, flags=re.IGNORECASE)
+    repaired, _ = COPILOT_SAFETY_RULES.apply(json_str)
     
     # Standard escape fixes
     repaired = repaired.replace('\\"', '"')
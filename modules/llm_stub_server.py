@@ -0,0 +1,179 @@
+"""
+Local stand-in for an OpenAI-compatible chat completions endpoint
+Replays saved LLM responses (test_data/chatgpt_responses by default) in rotation, so the
+generation stage can be exercised end to end without network access or API keys. Can inject
+a response delay and failing requests to exercise concurrency limits and retries.
+
+    python -m modules.llm_stub_server --port 8765
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+DEFAULT_RESPONSES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                     'test_data', 'chatgpt_responses')
+
+
+class StubLLMServer:
+    """Threaded HTTP server answering POST .../chat/completions with replayed responses"""
+
+    def __init__(self, responses_dir: str = DEFAULT_RESPONSES_DIR, host: str = '127.0.0.1',
+                 port: int = 0, delay: float = 0.0, fail_first: int = 0, fail_status: int = 503):
+        """
+        Args:
+            responses_dir: Directory of response files (.json/.txt), replayed in name order
+            port: 0 picks a free port (see base_url)
+            delay: Seconds each completion takes
+            fail_first: Number of initial requests answered with fail_status
+        """
+        self.responses = self._load_responses(responses_dir)
+        self.delay = delay
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.prompts: List[str] = []
+        self.request_count = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _load_responses(responses_dir: str) -> List[str]:
+        names = sorted(name for name in os.listdir(responses_dir) if name.endswith(('.json', '.txt')))
+        if not names:
+            raise ValueError(f"No response files in {responses_dir}")
+        responses = []
+        for name in names:
+            with open(os.path.join(responses_dir, name), 'r', encoding='utf-8') as f:
+                responses.append(f.read())
+        return responses
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def serve_forever(self) -> None:
+        """Serve on the calling thread until stop() (or Ctrl+C)"""
+        self._server.serve_forever()
+
+    def start(self) -> 'StubLLMServer':
+        """Serve on a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> 'StubLLMServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.stop()
+
+    def _next_reply(self, prompt: str):
+        """(status, response text or None) for the next request"""
+        with self._lock:
+            number = self.request_count
+            self.request_count += 1
+            self.prompts.append(prompt)
+        if number < self.fail_first:
+            return self.fail_status, None
+        return 200, self.responses[(number - self.fail_first) % len(self.responses)]
+
+    def _completion(self, model: str, content: str) -> Dict[str, Any]:
+        return {
+            'id': f"stub-{self.request_count}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': model,
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop'
+            }],
+            'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0}
+        }
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path.rstrip('/').endswith('/models'):
+                    self._send_json(200, {'object': 'list', 'data': [{'id': 'stub', 'object': 'model'}]})
+                else:
+                    self._send_json(404, {'error': {'message': 'Not found'}})
+
+            def do_POST(self):
+                if not self.path.rstrip('/').endswith('/chat/completions'):
+                    self._send_json(404, {'error': {'message': 'Not found'}})
+                    return
+                try:
+                    request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                    prompt = request['messages'][-1]['content']
+                except (ValueError, KeyError, IndexError, TypeError):
+                    self._send_json(400, {'error': {'message': 'Expected a chat completions request'}})
+                    return
+
+                with stub._lock:
+                    stub.in_flight += 1
+                    stub.peak_in_flight = max(stub.peak_in_flight, stub.in_flight)
+                try:
+                    status, content = stub._next_reply(prompt)
+                    if stub.delay:
+                        time.sleep(stub.delay)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+                if content is None:
+                    self._send_json(status, {'error': {'message': 'Injected failure'}}, {'Retry-After': '0'})
+                else:
+                    self._send_json(200, stub._completion(request.get('model', 'stub'), content))
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve saved LLM responses as an OpenAI-compatible endpoint")
+    parser.add_argument('responses_dir', nargs='?', default=DEFAULT_RESPONSES_DIR)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay', type=float, default=0.0, help="Seconds per completion")
+    args = parser.parse_args()
+
+    server = StubLLMServer(args.responses_dir, args.host, args.port, args.delay)
+    print(f"Replaying {len(server.responses)} response(s) from {args.responses_dir} at {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
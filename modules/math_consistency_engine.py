@@ -0,0 +1,803 @@
+"""
+Mathematical Consistency Engine for Q2JSON
+One contradiction-detection core with pluggable pattern profiles, replacing the separate
+detector variants (standard, enhanced, fixed/strict, working, and JSONProcessor's CLI checks)
+"""
+
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Type
+
+try:
+    from .rule_compiler import best_trigger, pattern_ignores_case
+    from .unit_normalizer import Quantity, comparable_values, quantity_at
+except ImportError:
+    from rule_compiler import best_trigger, pattern_ignores_case
+    from unit_normalizer import Quantity, comparable_values, quantity_at
+
+_DIGIT_PATTERN = re.compile(r'\d')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_NUMBER_PATTERN = re.compile(r'(?<![\d.])\d+(?:\.\d+)?')
+
+# Compiled once per process; profiles that share a pattern also share its matches in a ValueIndex
+_PATTERN_CACHE: Dict[Tuple[str, int], re.Pattern] = {}
+
+# Literal every match of a compiled pattern contains, and whether it applies to the lowercased text
+_PATTERN_TRIGGERS: Dict[re.Pattern, Tuple[Optional[str], bool]] = {}
+
+
+def compile_pattern(pattern: str, flags: int = 0) -> re.Pattern:
+    """Compile a pattern with its prefilter literal, reusing the compiled object for identical (pattern, flags)"""
+    key = (pattern, flags)
+    if key not in _PATTERN_CACHE:
+        regex = re.compile(pattern, flags)
+        _PATTERN_CACHE[key] = regex
+        _PATTERN_TRIGGERS[regex] = (best_trigger(pattern, flags), pattern_ignores_case(pattern, flags))
+    return _PATTERN_CACHE[key]
+
+
+@dataclass
+class ContradictionResult:
+    """Represents a detected mathematical contradiction"""
+    question_index: int
+    field_name: str
+    values_found: List[float]
+    contexts: List[str]
+    severity: str
+    percentage_difference: float
+    suggested_resolution: str
+
+
+@dataclass
+class ProfileResult:
+    """Contradictions one profile found in a question set"""
+    profile: str
+    contradictions: List[ContradictionResult] = field(default_factory=list)
+    questions_analyzed: int = 0
+    values_extracted: int = 0
+
+
+class ValueIndex:
+    """
+    Pattern matches over one text, computed on first use and shared by every profile.
+
+    Texts without a digit cannot contain a value, so every pattern is skipped for them;
+    otherwise a pattern only runs if its required literal (from compile_pattern) occurs.
+    Each captured value is parsed once, with the unit written after it, into a Quantity.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.has_digits = _DIGIT_PATTERN.search(text) is not None
+        self._lowered: Optional[str] = None
+        self._matches: Dict[re.Pattern, List[Tuple[str, Quantity, int, int]]] = {}
+        self._positions: Dict[str, int] = {}
+        self._numbers: Optional[List[Quantity]] = None
+
+    def matches(self, regex: re.Pattern) -> List[Tuple[str, Quantity, int, int]]:
+        """(captured value string, its Quantity, match start, match end) for every match of regex"""
+        if regex not in self._matches:
+            if self.has_digits and self._may_match(regex):
+                self._matches[regex] = [
+                    (m.group(1), quantity_at(self.text, m.group(1), m.end(1)), m.start(), m.end())
+                    for m in regex.finditer(self.text)
+                ]
+            else:
+                self._matches[regex] = []
+        return self._matches[regex]
+
+    def _may_match(self, regex: re.Pattern) -> bool:
+        """False when the pattern's required literal is absent from the text"""
+        trigger, ignore_case = _PATTERN_TRIGGERS.get(regex, (None, False))
+        if trigger is None:
+            return True
+        if not ignore_case:
+            return trigger in self.text
+        if self._lowered is None:
+            self._lowered = self.text.lower()
+        return trigger in self._lowered
+
+    def declared_quantity(self, declared: float) -> float:
+        """
+        The declared answer with the unit the text writes it in (e.g. 2.27 -> 2.27 ms when the
+        text states "2.27 ms"), or the bare number if the text never gives it a unit
+        """
+        if self._numbers is None:
+            self._numbers = [quantity_at(self.text, m.group(), m.end()) for m in _NUMBER_PATTERN.finditer(self.text)]
+        for number in self._numbers:
+            if number.dimension is not None and abs(number - declared) < 0.001:
+                return Quantity(declared, number.dimension, number.factor, number.prefix_scale)
+        return declared
+
+    def find(self, value_str: str) -> int:
+        """Position of the first occurrence of value_str (-1 if absent)"""
+        if value_str not in self._positions:
+            self._positions[value_str] = self.text.find(value_str)
+        return self._positions[value_str]
+
+    def span_context(self, start: int, end: int, radius: int) -> str:
+        """Text around a match span"""
+        return self.text[max(0, start - radius):min(len(self.text), end + radius)].strip()
+
+    def value_context(self, value_str: str, radius: int) -> Optional[str]:
+        """Whitespace-collapsed text around the first occurrence of value_str (None if absent)"""
+        pos = self.find(value_str)
+        if pos == -1:
+            return None
+        context = self.text[max(0, pos - radius):min(len(self.text), pos + len(value_str) + radius)].strip()
+        return _WHITESPACE_PATTERN.sub(' ', context)
+
+
+class QuestionView:
+    """One question's ValueIndex per text field, shared by the profiles evaluated on it"""
+
+    def __init__(self, question: Dict[str, Any]):
+        self.question = question
+        self._indexes: Dict[str, ValueIndex] = {}
+        self._extractions: Dict[Tuple[str, str], Any] = {}
+
+    def index(self, text: str) -> ValueIndex:
+        """ValueIndex for a text, built on first use"""
+        if text not in self._indexes:
+            self._indexes[text] = ValueIndex(text)
+        return self._indexes[text]
+
+    def extraction(self, profile: 'DetectionProfile', text: str) -> List[Tuple[float, str]]:
+        """A profile's declared-independent extraction for a text, computed once per question"""
+        key = (profile.name, text)
+        if key not in self._extractions:
+            self._extractions[key] = profile.extract(self.index(text))
+        return self._extractions[key]
+
+
+def _declared_float(value: Any) -> Optional[float]:
+    """Parse a declared answer, or None"""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+class DetectionProfile(ABC):
+    """
+    Pattern set, extraction filters and comparison rules for one detection style.
+
+    Subclasses declare their (pattern, label) table, flags, skip values and tolerance;
+    the patterns are compiled once per profile instance. Profiles whose extraction does
+    not depend on the declared answer also define extract(index), which QuestionView
+    caches per text.
+    """
+
+    name = ''
+    patterns: Sequence[Tuple[str, str]] = ()
+    flags = re.IGNORECASE
+    default_skip_values: frozenset = frozenset()
+    default_tolerance = 0.05
+
+    def __init__(self, tolerance_threshold: Optional[float] = None, skip_values: Optional[Set[float]] = None):
+        self.tolerance_threshold = self.default_tolerance if tolerance_threshold is None else tolerance_threshold
+        self.skip_values = set(self.default_skip_values) if skip_values is None else skip_values
+        self.compiled = [(compile_pattern(pattern, self.flags), label) for pattern, label in self.patterns]
+
+    @abstractmethod
+    def analyze(self, question_index: int, view: QuestionView) -> Tuple[List[ContradictionResult], int]:
+        """
+        Check one question
+
+        Returns:
+            Tuple of (contradictions, number of values extracted)
+        """
+
+    def is_skipped(self, value: float) -> bool:
+        """Skip values are bare coefficients; a value written with a unit is a quantity and always kept"""
+        return getattr(value, 'dimension', None) is None and value in self.skip_values
+
+    def finalize(self, contradictions: List[ContradictionResult]) -> List[ContradictionResult]:
+        """Post-process all contradictions of a run"""
+        return contradictions
+
+    def severity(self, percentage_diff: float) -> str:
+        """Severity of a contradiction"""
+        if percentage_diff > 20:
+            return "severe"
+        elif percentage_diff > 10:
+            return "moderate"
+        return "minor"
+
+    @staticmethod
+    def _unique(values: List[Tuple[float, str]]) -> List[Tuple[float, str]]:
+        """Keep the first of values within 0.001 of each other"""
+        unique = []
+        for value, context in values:
+            if not any(abs(v - value) < 0.001 for v, _ in unique):
+                unique.append((value, context))
+        return unique
+
+
+PROFILE_CLASSES: Dict[str, Type[DetectionProfile]] = {}
+
+
+def register_profile(profile_class: Type[DetectionProfile]) -> Type[DetectionProfile]:
+    """Class decorator that makes a profile available to MathConsistencyEngine by name"""
+    PROFILE_CLASSES[profile_class.name] = profile_class
+    return profile_class
+
+
+# Unit suffix shared by the standard and strict final-answer patterns
+_UNIT = r'\s*(?:,?\s*)?(?:\\text\{[^}]+\}|[A-Za-zΩμ]+)?'
+
+
+@register_profile
+class StandardProfile(DetectionProfile):
+    """
+    Final-answer phrasing plus frequently repeated values, checked against the declared
+    answer and against each other (mathematical_consistency_detector.py)
+    """
+
+    name = 'standard'
+    patterns = [
+        # Explicit final answer statements
+        (r'(?:final\s+answer|answer\s+is|result\s+is|therefore|so|thus)\s*[:\s]*[=≈]?\s*(\d+\.?\d*)' + _UNIT, ''),
+        # Values after equals at end of calculation line
+        (r'=\s*(\d+\.?\d*)' + _UNIT + r'\s*[.!]?\s*$', ''),
+        # Values after approximation symbols
+        (r'(?:≈|approx|approximately)\s*(\d+\.?\d*)' + _UNIT, ''),
+        # Rounding statements
+        (r'(?:rounding|rounds?\s+to|rounded\s+to)\s+(?:three\s+decimal\s+places?)?\s*[,:]?\s*[=≈]?\s*(\d+\.?\d*)' + _UNIT, ''),
+        # Direct value assignments in concluding statements
+        (r'(?:V_T|voltage|current|resistance)\s*[=≈]\s*(\d+\.?\d*)' + _UNIT, ''),
+    ]
+    flags = re.IGNORECASE | re.MULTILINE
+    # Values that are clearly intermediate (common constants, coefficients)
+    default_skip_values = frozenset({0.4, 0.5, 1.673, 1.6733, 0.894, 0.8944, 2.8, 0.8})
+    number_pattern = compile_pattern(r'(\d+\.?\d*)\s*(?:,?\s*)?(?:\\text\{[^}]+\}|[VΩμA]+)?')
+
+    def analyze(self, question_index, view):
+        question = view.question
+        if 'feedback_correct' not in question:
+            return [], 0
+        feedback = str(question['feedback_correct'])
+        final_answers = view.extraction(self, feedback)
+        contradictions = []
+
+        # Cross-field: declared correct_answer vs final answers in the feedback
+        if 'correct_answer' in question:
+            correct_answer = str(question['correct_answer'])
+            declared = _declared_float(correct_answer)
+            if declared is not None:
+                declared = view.index(feedback).declared_quantity(declared)
+                for value, context in final_answers:
+                    compared = comparable_values(declared, value)
+                    if compared is None:
+                        continue
+                    expected, found = compared
+                    if abs(expected - found) < 0.001:
+                        continue
+                    percentage_diff = abs(expected - found) / max(expected, 0.001) * 100
+                    if percentage_diff > self.tolerance_threshold * 100:
+                        contradictions.append(ContradictionResult(
+                            question_index=question_index,
+                            field_name="correct_answer vs feedback_correct",
+                            values_found=[declared, value],
+                            contexts=[f"Declared answer: {correct_answer}", context],
+                            severity=self.severity(percentage_diff),
+                            percentage_difference=percentage_diff,
+                            suggested_resolution=f"Reconcile declared answer {declared} with calculated value {value}"
+                        ))
+
+        # Internal: multiple conflicting final answers within the feedback
+        for i in range(len(final_answers)):
+            for j in range(i + 1, len(final_answers)):
+                value1, context1 = final_answers[i]
+                value2, context2 = final_answers[j]
+                compared = comparable_values(value1, value2)
+                if compared is None:
+                    continue
+                first, second = compared
+                if abs(first - second) < 0.001 or first <= 0:
+                    continue
+                percentage_diff = abs(second - first) / first * 100
+                if percentage_diff > self.tolerance_threshold * 100:
+                    contradictions.append(ContradictionResult(
+                        question_index=question_index,
+                        field_name="feedback_correct",
+                        values_found=[value1, value2],
+                        contexts=[context1, context2],
+                        severity=self.severity(percentage_diff),
+                        percentage_difference=percentage_diff,
+                        suggested_resolution=f"Clarify which final answer is correct: {value1} or {value2}"
+                    ))
+
+        return contradictions, len(final_answers)
+
+    def extract(self, index):
+        text = index.text
+        final_answers = []
+        for regex, _ in self.compiled:
+            for _, value, start, end in index.matches(regex):
+                context = index.span_context(start, end, 40)
+                if not self.is_intermediate(context, value, text):
+                    final_answers.append((value, context))
+
+        # Values that appear multiple times are likely important
+        number_counts: Dict[float, int] = {}
+        for _, value, _, _ in index.matches(self.number_pattern):
+            value = float(value)
+            if 0.1 <= value <= 1000:  # Reasonable range for most electrical values
+                number_counts[value] = number_counts.get(value, 0) + 1
+
+        for value, count in number_counts.items():
+            if count >= 2:
+                match = re.search(rf'\b{re.escape(str(value))}\b', text)
+                if match and not any(abs(v - value) < 0.001 for v, _ in final_answers):
+                    context = index.span_context(match.start(), match.end(), 30)
+                    value = quantity_at(text, match.group(), match.end())
+                    final_answers.append((value, f"Frequently mentioned: {context}"))
+
+        return sorted(self._unique(final_answers), key=lambda x: x[0])
+
+    def is_intermediate(self, context: str, value: float, full_text: str) -> bool:
+        """Determine if a value is part of an intermediate calculation step"""
+        if self.is_skipped(value):
+            return True
+
+        escaped = re.escape(str(value))
+        intermediate_indicators = [
+            r'sqrt\{[^}]*' + escaped,  # Inside square root
+            r'frac\{[^}]*' + escaped,  # Inside fraction
+            r'\([^)]*' + escaped + r'[^)]*\)',  # Inside parentheses calculation
+            r'[+\-*/]\s*' + escaped + r'\s*[+\-*/]',  # Part of arithmetic operation
+        ]
+        if any(re.search(pattern, context) for pattern in intermediate_indicators):
+            return True
+
+        # Part of a larger decimal number elsewhere in the text
+        value_str = str(value)
+        if len(value_str) >= 3 and value > 100:
+            if re.search(rf'\d*\.{value_str}|\d+{value_str}\d*', full_text):
+                return True
+        return False
+
+    def severity(self, percentage_diff):
+        if percentage_diff > 50:
+            return "severe"
+        elif percentage_diff > 20:
+            return "moderate"
+        return "minor"
+
+
+@register_profile
+class EnhancedProfile(DetectionProfile):
+    """
+    Calculation-result phrasing in both feedback fields, 2% tolerance
+    (mathematical_consistency_detector_enhanced.py, used by main_enhanced.py)
+    """
+
+    name = 'enhanced'
+    patterns = [
+        # Final answer patterns
+        (r'Final answer[:\s]*[A-Z_]*\s*[=≈]\s*(\d+\.\d+)', 'Final answer'),
+        (r'[A-Z_]+\s*≈\s*(\d+\.\d+)\s*V', 'Approximation'),
+        (r'[A-Z_]+\s*approx\s*(\d+\.\d+)', 'Approximation'),
+        (r'[A-Z_]+\s*=\s*(\d+\.\d+)\s*V[.\s]', 'Calculation result'),
+        # Calculation conclusion patterns
+        (r'gives\s*[A-Z_]*\s*=\s*(\d+\.\d+)', 'Calculation gives'),
+        (r'get\s*[A-Z_]*\s*=\s*(\d+\.\d+)', 'Calculation result'),
+        (r'Calculation.*?(\d+\.\d+)\s*V', 'Calculation'),
+        # Rounding patterns
+        (r'Rounding.*?(\d+\.\d+)', 'Rounding result'),
+        (r'three decimal places.*?(\d+\.\d+)', 'Rounded value'),
+        # Context-specific patterns
+        (r'My calculation.*?(\d+\.\d+)', 'Alternative calculation'),
+    ]
+    default_skip_values = frozenset({0.5, 0.4, 1.0, 2.0, 3.0, 4.0, 5.0})
+    default_tolerance = 0.02
+    min_value = 0.1
+    context_radius = 50
+
+    def analyze(self, question_index, view):
+        question = view.question
+        declared_answer = question.get('correct_answer', '')
+        if not declared_answer:
+            return [], 0
+        declared = _declared_float(declared_answer)
+        if declared is None:
+            return [], 0
+
+        all_feedback = question.get('feedback_correct', '') + ' ' + question.get('feedback_incorrect', '')
+        if not all_feedback.strip():
+            return [], 0
+
+        contradictions = []
+        index = view.index(all_feedback)
+        declared = index.declared_quantity(declared)
+        values = self.extract_values(index, declared)
+        for value, context in values:
+            expected, found = comparable_values(declared, value)
+            percentage_diff = abs(found - expected) / expected * 100
+            if percentage_diff > self.tolerance_threshold * 100:
+                contradictions.append(ContradictionResult(
+                    question_index=question_index,
+                    field_name="correct_answer vs feedback",
+                    values_found=[declared, value],
+                    contexts=[context],
+                    severity=self.severity(percentage_diff),
+                    percentage_difference=percentage_diff,
+                    suggested_resolution=f"Verify calculation: declared {declared} vs found {value}"
+                ))
+        return contradictions, len(values)
+
+    def extract_values(self, index: ValueIndex, declared: float) -> List[Tuple[float, str]]:
+        """
+        Labelled candidate values comparable with the declared answer, excluding values equal
+        to it, skip values and tiny bare numbers
+        """
+        values = []
+        for regex, label in self.compiled:
+            for value_str, value, _, _ in index.matches(regex):
+                compared = comparable_values(declared, value)
+                if compared is None or abs(compared[1] - compared[0]) < 0.001 or self.is_skipped(value):
+                    continue
+                if value.dimension is None and value < self.min_value:
+                    continue
+                values.append((value, f"{label}: {self.context(index, value_str)}"))
+        return values
+
+    def context(self, index: ValueIndex, value_str: str) -> str:
+        """Context around the first occurrence of a value"""
+        context = index.value_context(value_str, self.context_radius)
+        return value_str if context is None else context
+
+    def finalize(self, contradictions):
+        """Merge duplicate contradictions (same question, same values) into one with all contexts"""
+        unique: Dict[Tuple[int, float, float], ContradictionResult] = {}
+        for contradiction in contradictions:
+            key = (
+                contradiction.question_index,
+                round(contradiction.values_found[0], 4),
+                round(contradiction.values_found[1], 4)
+            )
+            if key not in unique:
+                unique[key] = contradiction
+            else:
+                unique[key].contexts.extend(contradiction.contexts)
+        return list(unique.values())
+
+    def severity(self, percentage_diff):
+        if percentage_diff >= 20:
+            return "severe"
+        elif percentage_diff >= 10:
+            return "moderate"
+        return "minor"
+
+
+@register_profile
+class StrictProfile(DetectionProfile):
+    """
+    Explicit conclusions only, ignoring arithmetic steps and normal rounding
+    (mathematical_consistency_detector_fixed.py)
+    """
+
+    name = 'strict'
+    patterns = [
+        # Explicit final answer statements
+        (r'(?:final\s+answer|the\s+answer\s+is|result\s+is|therefore|conclusion)\s*[:\s]*[VIR]?_?[A-Z]?\s*[=≈]\s*(\d+\.?\d*)' + _UNIT, ''),
+        # Approximation statements that conclude calculations
+        (r'(?:approximately|approx|≈)\s*(\d+\.?\d*)' + _UNIT + r'\s*[.!]?\s*$', ''),
+        # Values at the very end of mathematical expressions (likely conclusions)
+        (r'=\s*(\d+\.?\d*)' + _UNIT + r'\s*[.!\$]\s*$', ''),
+        # Rounding conclusions
+        (r'rounding\s+(?:to\s+\w+\s+decimal\s+places?)?\s*[,:]?\s*[VIR]?_?[A-Z]?\s*[≈=]\s*(\d+\.?\d*)' + _UNIT, ''),
+    ]
+    flags = re.IGNORECASE | re.MULTILINE
+    # Common intermediate values in electrical engineering
+    default_skip_values = frozenset({
+        0.4, 0.5, 0.8, 0.894, 0.8944, 1.673, 1.6733, 2.0, 2.8,
+        0.05, 0.1, 0.2, 0.3, 0.6, 0.7, 0.9, 1.0, 1.5, 2.5, 3.0
+    })
+
+    def analyze(self, question_index, view):
+        question = view.question
+        if 'correct_answer' not in question or 'feedback_correct' not in question:
+            return [], 0
+        declared = _declared_float(question['correct_answer'])
+        if declared is None:
+            return [], 0
+
+        feedback = str(question['feedback_correct'])
+        final_answers = view.extraction(self, feedback)
+        declared = view.index(feedback).declared_quantity(declared)
+        contradictions = []
+
+        for value, context in final_answers:
+            compared = comparable_values(declared, value)
+            if compared is None:
+                continue
+            expected, found = compared
+            if abs(expected - found) < 0.001 or self.is_normal_rounding(expected, found):
+                continue
+            percentage_diff = abs(expected - found) / max(expected, 0.001) * 100
+            if percentage_diff > self.tolerance_threshold * 100:
+                contradictions.append(ContradictionResult(
+                    question_index=question_index,
+                    field_name="declared_vs_calculated",
+                    values_found=[declared, value],
+                    contexts=[f"Declared: {declared}", f"Calculated: {context}"],
+                    severity=self.severity(percentage_diff),
+                    percentage_difference=percentage_diff,
+                    suggested_resolution=f"Verify: declared {declared} vs calculated {value}"
+                ))
+
+        # Internal contradictions (multiple conflicting final answers)
+        for i in range(len(final_answers)):
+            for j in range(i + 1, len(final_answers)):
+                value1, context1 = final_answers[i]
+                value2, context2 = final_answers[j]
+                compared = comparable_values(value1, value2)
+                if compared is None:
+                    continue
+                first, second = compared
+                if abs(first - second) < 0.001 or self.is_normal_rounding(first, second):
+                    continue
+                percentage_diff = abs(second - first) / max(first, 0.001) * 100
+                if percentage_diff > self.tolerance_threshold * 100:
+                    contradictions.append(ContradictionResult(
+                        question_index=question_index,
+                        field_name="internal_contradiction",
+                        values_found=[value1, value2],
+                        contexts=[context1, context2],
+                        severity=self.severity(percentage_diff),
+                        percentage_difference=percentage_diff,
+                        suggested_resolution=f"Clarify which answer is correct: {value1} or {value2}"
+                    ))
+
+        return contradictions, len(final_answers)
+
+    def extract(self, index):
+        finals = []
+        for regex, _ in self.compiled:
+            for _, value, start, end in index.matches(regex):
+                if self.is_skipped(value):
+                    continue
+                context = index.span_context(start, end, 50)
+                if not self.is_in_arithmetic_sequence(context, value):
+                    finals.append((value, context))
+        return self._unique(finals)
+
+    @staticmethod
+    def is_in_arithmetic_sequence(context: str, value: float) -> bool:
+        """Check if value is part of an arithmetic calculation sequence"""
+        escaped = re.escape(str(value))
+        arithmetic_patterns = [
+            rf'[+\-*/]\s*{escaped}\s*[+\-*/]',  # Between operations
+            rf'\(\s*[^)]*{escaped}[^)]*\)',      # Inside parentheses with other operations
+            rf'{escaped}\s*[+\-*/]\s*\d',        # Start of operation
+            rf'\d\s*[+\-*/]\s*{escaped}',        # End of operation
+        ]
+        return any(re.search(pattern, context) for pattern in arithmetic_patterns)
+
+    @staticmethod
+    def is_normal_rounding(val1: float, val2: float) -> bool:
+        """Check if a difference represents normal rounding (2-3 decimal places or < 2%)"""
+        if (abs(round(val1, 3) - val2) < 0.001 or
+                abs(round(val1, 2) - val2) < 0.001 or
+                abs(val1 - round(val2, 3)) < 0.001 or
+                abs(val1 - round(val2, 2)) < 0.001):
+            return True
+        return abs(val1 - val2) / max(val1, val2) * 100 < 2.0
+
+    def severity(self, percentage_diff):
+        if percentage_diff > 25:
+            return "severe"
+        elif percentage_diff > 10:
+            return "moderate"
+        return "minor"
+
+
+@register_profile
+class WorkingProfile(DetectionProfile):
+    """
+    Broad value patterns, reporting at most the first non-intermediate value more than
+    3% from the declared answer per question (mathematical_consistency_detector_working.py)
+    """
+
+    name = 'working'
+    patterns = [
+        (r'final\s+answer[:\s]*.*?(\d+\.?\d*)', ''),    # Final answer statements
+        (r'V_T\s*=\s*(\d+\.?\d*)', ''),                 # V_T assignments
+        (r'(\d+\.?\d*)\s*V(?:\s|$|\.)', ''),            # Values with V unit
+        (r'=\s*(\d+\.?\d*)\s*V', ''),                   # Equals value V
+        (r'≈\s*(\d+\.?\d*)', ''),                       # Approximations
+        (r'result\s+is\s*(\d+\.?\d*)', ''),             # Result statements
+        (r'answer\s+is\s*(\d+\.?\d*)', ''),             # Answer statements
+        (r'calculation\s+gives\s*.*?(\d+\.?\d*)', ''),  # Calculation results
+    ]
+    default_skip_values = frozenset({0.4, 0.5, 0.8, 0.894, 1.673, 2.0, 2.8})
+    # Differences up to this percentage are treated as normal rounding
+    rounding_percent = 3.0
+
+    def analyze(self, question_index, view):
+        question = view.question
+        if 'correct_answer' not in question or 'feedback_correct' not in question:
+            return [], 0
+        declared = _declared_float(question['correct_answer'])
+        if declared is None:
+            return [], 0
+
+        feedback = str(question['feedback_correct'])
+        values = view.extraction(self, feedback)
+        declared = view.index(feedback).declared_quantity(declared)
+        for value, context in values:
+            compared = comparable_values(declared, value)
+            if compared is None:
+                continue
+            expected, found = compared
+            if abs(expected - found) <= 0.001:
+                continue
+            percentage_diff = abs(expected - found) / max(expected, 0.001) * 100
+            if percentage_diff > self.rounding_percent and not self.is_obvious_intermediate(value, context):
+                return [ContradictionResult(
+                    question_index=question_index,
+                    field_name="declared_vs_calculated",
+                    values_found=[declared, value],
+                    contexts=[f"Declared: {declared}", f"Found: {context[:100]}..."],
+                    severity=self.severity(percentage_diff),
+                    percentage_difference=percentage_diff,
+                    suggested_resolution=f"Verify calculation: declared {declared} vs found {value}"
+                )], len(values)
+        return [], len(values)
+
+    def extract(self, index):
+        values = []
+        for regex, _ in self.compiled:
+            for _, value, start, end in index.matches(regex):
+                values.append((value, index.span_context(start, end, 30)))
+        return self._unique(values)
+
+    def is_obvious_intermediate(self, value: float, context: str) -> bool:
+        """Check if value is obviously an intermediate calculation"""
+        if self.is_skipped(value):
+            return True
+        escaped = re.escape(str(value))
+        # Between arithmetic operators, or inside parentheses with arithmetic
+        return bool(re.search(rf'[+\-*/]\s*{escaped}\s*[+\-*/]', context) or
+                    re.search(rf'\([^)]*{escaped}[^)]*[+\-*/]', context))
+
+
+@register_profile
+class CLICompatibleProfile(EnhancedProfile):
+    """
+    The enhanced CLI's patterns widened with unit and bare-approximation forms, numerical
+    questions only (JSONProcessor's Phase 3 check)
+    """
+
+    name = 'cli_compatible'
+    patterns = [
+        # Approximation patterns (finds "approx 0.812")
+        (r'[A-Z_]*\s*≈\s*(\d+\.\d+)', 'Approximation'),
+        (r'[A-Z_]*\s*approx\s*(\d+\.\d+)', 'Approximation'),
+        (r'approx\s*(\d+\.\d+)', 'Approximation'),
+        # Unit patterns (finds "0.812,text{V}")
+        (r'(\d+\.\d+),text\{[VvAa]\}', 'Value with units'),
+        (r'(\d+\.\d+)\s*V[.\s]', 'Voltage value'),
+        (r'(\d+\.\d+)\s*text\{V\}', 'LaTeX voltage'),
+        # Calculation result patterns
+        (r'[A-Z_]*\s*=\s*(\d+\.\d+)', 'Calculation result'),
+        (r'get\s*[A-Z_]*\s*=\s*(\d+\.\d+)', 'Calculation gives'),
+        (r'gives.*?(\d+\.\d+)', 'Calculation gives'),
+        # Rounding patterns (finds calculation endpoints)
+        (r'Rounding.*?(\d+\.\d+)', 'Rounding result'),
+        (r'three decimal places.*?(\d+\.\d+)', 'Rounded value'),
+        # Alternative calculation patterns
+        (r'My calculation.*?(\d+\.\d+)', 'Alternative calculation'),
+    ]
+    default_skip_values = frozenset({0.5, 0.4, 1.0, 2.0, 3.0, 4.0, 5.0, 0.8, 0.9, 1.6, 1.7})
+
+    def analyze(self, question_index, view):
+        question = view.question
+        if question.get('type') != 'numerical':
+            return [], 0
+        declared = _declared_float(question.get('correct_answer', '0'))
+        if declared is None:
+            return [], 0
+        feedback = question.get('feedback_correct', '')
+        if not feedback:
+            return [], 0
+
+        contradictions = []
+        index = view.index(feedback)
+        declared = index.declared_quantity(declared)
+        values = self.extract_values(index, declared)
+        for value, context in values:
+            expected, found = comparable_values(declared, value)
+            percentage_diff = abs(found - expected) / expected * 100
+            if percentage_diff > self.tolerance_threshold * 100:
+                contradictions.append(ContradictionResult(
+                    question_index=question_index,
+                    field_name="feedback_correct",
+                    values_found=[declared, value],
+                    contexts=[context],
+                    severity=self.severity(percentage_diff),
+                    percentage_difference=percentage_diff,
+                    suggested_resolution=f"Verify calculation: declared {declared} vs found {value}"
+                ))
+        return contradictions, len(values)
+
+    def context(self, index, value_str):
+        context = index.value_context(value_str, self.context_radius)
+        if context is None:
+            return "Context not found"
+        return context[:97] + "..." if len(context) > 100 else context
+
+    def finalize(self, contradictions):
+        return contradictions
+
+    def severity(self, percentage_diff):
+        if percentage_diff <= 10.0:
+            return "Minor"
+        elif percentage_diff <= 25.0:
+            return "Major"
+        return "Severe"
+
+
+PROFILES = ('standard', 'enhanced', 'strict', 'working', 'cli_compatible')
+
+
+class MathConsistencyEngine:
+    """
+    Runs one or more detection profiles over a question set in a single pass.
+
+    Each question's texts are indexed once; profiles evaluated together share that
+    index, so patterns common to several profiles are matched once per text.
+    """
+
+    def __init__(self, profiles: Optional[Iterable[DetectionProfile]] = None):
+        """
+        Args:
+            profiles: Profile instances to use (default: one of each registered profile)
+        """
+        if profiles is None:
+            profiles = [profile_class() for profile_class in PROFILE_CLASSES.values()]
+        self.profiles: Dict[str, DetectionProfile] = {profile.name: profile for profile in profiles}
+
+    def profile(self, name: str) -> DetectionProfile:
+        """Get a profile by name"""
+        if name not in self.profiles:
+            raise ValueError(f"Unknown detection profile '{name}' (available: {', '.join(self.profiles)})")
+        return self.profiles[name]
+
+    def detect(self, questions_data: Dict[str, Any],
+               profiles: Sequence[str] = ('enhanced',)) -> Dict[str, ProfileResult]:
+        """
+        Detect contradictions with several profiles in one pass over the questions
+
+        Args:
+            questions_data: Dictionary containing a questions array
+            profiles: Names of the profiles to evaluate
+
+        Returns:
+            Dict mapping profile name to its ProfileResult
+        """
+        selected = [self.profile(name) for name in profiles]
+        questions = questions_data.get('questions', [])
+        results = {profile.name: ProfileResult(profile.name, questions_analyzed=len(questions))
+                   for profile in selected}
+
+        for question_index, question in enumerate(questions):
+            view = QuestionView(question)
+            for profile in selected:
+                contradictions, values_extracted = profile.analyze(question_index, view)
+                result = results[profile.name]
+                result.contradictions.extend(contradictions)
+                result.values_extracted += values_extracted
+
+        for profile in selected:
+            results[profile.name].contradictions = profile.finalize(results[profile.name].contradictions)
+        return results
+
+    def analyze_question(self, question: Dict[str, Any], profile: str,
+                         question_index: int = 0) -> List[ContradictionResult]:
+        """Contradictions one profile finds in a single question"""
+        contradictions, _ = self.profile(profile).analyze(question_index, QuestionView(question))
+        return self.profile(profile).finalize(contradictions)
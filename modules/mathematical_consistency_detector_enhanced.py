@@ -3,11 +3,14 @@ Enhanced Mathematical Consistency Detector
 Improved value extraction and contradiction detection for complex mathematical content
 """
 
-import re
-import json
 from dataclasses import dataclass
 from typing import List, Dict, Set, Tuple, Any
 
+try:
+    from .math_consistency_engine import EnhancedProfile, MathConsistencyEngine, ValueIndex
+except ImportError:
+    from math_consistency_engine import EnhancedProfile, MathConsistencyEngine, ValueIndex
+
 
 @dataclass
 class MathematicalContradiction:
@@ -24,207 +27,76 @@ class MathematicalConsistencyDetectorEnhanced:
     """
     Enhanced mathematical consistency detector with improved value extraction
     and smarter intermediate filtering
+    
+    Backed by the 'enhanced' profile of the unified MathConsistencyEngine.
     """
     
     def __init__(self):
         """Initialize the enhanced detector"""
+        self.profile = EnhancedProfile()
+        self.engine = MathConsistencyEngine([self.profile])
         self.contradictions_found = []
         self.processing_stats = {
             'questions_analyzed': 0,
             'values_extracted': 0,
             'contradictions_found': 0
         }
-        
-        # More selective intermediate filtering
-        self.basic_constants = {0.5, 0.4, 1.0, 2.0, 3.0, 4.0, 5.0}
-        self.tolerance_threshold = 0.02  # 2% threshold (more sensitive)
+    
+    @property
+    def basic_constants(self) -> Set[float]:
+        """Values skipped as basic constants"""
+        return self.profile.skip_values
+    
+    @basic_constants.setter
+    def basic_constants(self, values: Set[float]):
+        self.profile.skip_values = values
+    
+    @property
+    def tolerance_threshold(self) -> float:
+        return self.profile.tolerance_threshold
+    
+    @tolerance_threshold.setter
+    def tolerance_threshold(self, value: float):
+        self.profile.tolerance_threshold = value
         
     def detect_contradictions(self, questions_data: dict) -> List[MathematicalContradiction]:
         """
         Detect mathematical contradictions in questions data
         Enhanced with better value extraction and context analysis
         """
-        
-        self.contradictions_found = []
+        questions = questions_data.get('questions', [])
+        result = self.engine.detect(questions_data, [self.profile.name])[self.profile.name]
+        
+        self.contradictions_found = [
+            MathematicalContradiction(
+                question_index=c.question_index,
+                values_found=c.values_found,
+                percentage_difference=c.percentage_difference,
+                severity=c.severity,
+                contexts=c.contexts,
+                declared_answer=questions[c.question_index].get('correct_answer', '')
+            )
+            for c in result.contradictions
+        ]
         self.processing_stats = {
-            'questions_analyzed': 0,
-            'values_extracted': 0,
-            'contradictions_found': 0
+            'questions_analyzed': result.questions_analyzed,
+            'values_extracted': result.values_extracted,
+            'contradictions_found': len(self.contradictions_found)
         }
         
-        questions = questions_data.get('questions', [])
-        
-        for question_index, question in enumerate(questions):
-            self._analyze_question_enhanced(question, question_index)
-        
-        # Deduplicate contradictions
-        self._deduplicate_contradictions()
-        
-        self.processing_stats['contradictions_found'] = len(self.contradictions_found)
-        
         return self.contradictions_found
     
-    def _analyze_question_enhanced(self, question: dict, question_index: int):
-        """Enhanced question analysis with improved value extraction"""
-        
-        self.processing_stats['questions_analyzed'] += 1
-        
-        # Get declared answer
-        declared_answer = question.get('correct_answer', '')
-        if not declared_answer:
-            return
-        
-        try:
-            declared_value = float(declared_answer)
-        except (ValueError, TypeError):
-            return
-        
-        # Extract values from feedback with enhanced patterns
-        feedback_correct = question.get('feedback_correct', '')
-        feedback_incorrect = question.get('feedback_incorrect', '')
-        
-        all_feedback = feedback_correct + ' ' + feedback_incorrect
-        
-        if not all_feedback.strip():
-            return
-        
-        # Enhanced value extraction
-        extracted_values = self._extract_values_enhanced(all_feedback, declared_value)
-        
-        if not extracted_values:
-            return
-        
-        self.processing_stats['values_extracted'] += len(extracted_values)
-        
-        # Check for contradictions
-        for value, context in extracted_values:
-            percentage_diff = abs(value - declared_value) / declared_value * 100
-            
-            if percentage_diff > self.tolerance_threshold * 100:  # Convert to percentage
-                severity = self._determine_severity(percentage_diff)
-                
-                contradiction = MathematicalContradiction(
-                    question_index=question_index,
-                    values_found=[declared_value, value],
-                    percentage_difference=percentage_diff,
-                    severity=severity,
-                    contexts=[context],
-                    declared_answer=declared_answer
-                )
-                
-                self.contradictions_found.append(contradiction)
-    
-    def _deduplicate_contradictions(self):
-        """Remove duplicate contradictions (same question, same values)"""
-        
-        if not self.contradictions_found:
-            return
-        
-        # Group by question index and values
-        unique_contradictions = {}
-        
-        for contradiction in self.contradictions_found:
-            # Create key based on question and values (rounded to avoid floating point issues)
-            key = (
-                contradiction.question_index,
-                round(contradiction.values_found[0], 4),
-                round(contradiction.values_found[1], 4)
-            )
-            
-            if key not in unique_contradictions:
-                unique_contradictions[key] = contradiction
-            else:
-                # Merge contexts if duplicate found
-                existing = unique_contradictions[key]
-                existing.contexts.extend(contradiction.contexts)
-        
-        self.contradictions_found = list(unique_contradictions.values())
-    
     def _extract_values_enhanced(self, text: str, declared_value: float) -> List[Tuple[float, str]]:
         """
         Enhanced value extraction with better pattern recognition
         Returns list of (value, context) tuples
         """
-        
-        extracted_values = []
-        
-        # Enhanced patterns for final answers and calculation results
-        final_answer_patterns = [
-            # Final answer patterns
-            (r'Final answer[:\s]*[A-Z_]*\s*[=≈]\s*(\d+\.\d+)', 'Final answer'),
-            (r'[A-Z_]+\s*≈\s*(\d+\.\d+)\s*V', 'Approximation'),
-            (r'[A-Z_]+\s*approx\s*(\d+\.\d+)', 'Approximation'),
-            (r'[A-Z_]+\s*=\s*(\d+\.\d+)\s*V[.\s]', 'Calculation result'),
-            
-            # Calculation conclusion patterns
-            (r'gives\s*[A-Z_]*\s*=\s*(\d+\.\d+)', 'Calculation gives'),
-            (r'get\s*[A-Z_]*\s*=\s*(\d+\.\d+)', 'Calculation result'),
-            (r'Calculation.*?(\d+\.\d+)\s*V', 'Calculation'),
-            
-            # Rounding patterns
-            (r'Rounding.*?(\d+\.\d+)', 'Rounding result'),
-            (r'three decimal places.*?(\d+\.\d+)', 'Rounded value'),
-            
-            # Context-specific patterns
-            (r'My calculation.*?(\d+\.\d+)', 'Alternative calculation'),
-        ]
-        
-        for pattern, context_type in final_answer_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                try:
-                    value = float(match)
-                    
-                    # Skip if it's obviously the declared value (exact match)
-                    if abs(value - declared_value) < 0.001:
-                        continue
-                    
-                    # Skip basic constants
-                    if value in self.basic_constants:
-                        continue
-                    
-                    # Skip very small values (likely intermediate)
-                    if value < 0.1:
-                        continue
-                    
-                    # Find the context around this value
-                    context = self._get_value_context(text, match, 50)
-                    
-                    extracted_values.append((value, f"{context_type}: {context}"))
-                    
-                except ValueError:
-                    continue
-        
-        return extracted_values
-    
-    def _get_value_context(self, text: str, value_str: str, context_length: int = 50) -> str:
-        """Extract context around a specific value"""
-        
-        # Find the position of the value in the text
-        pos = text.find(value_str)
-        if pos == -1:
-            return value_str
-        
-        # Extract context before and after
-        start = max(0, pos - context_length)
-        end = min(len(text), pos + len(value_str) + context_length)
-        
-        context = text[start:end].strip()
-        
-        # Clean up the context
-        context = re.sub(r'\s+', ' ', context)
-        
-        return context
+        index = ValueIndex(text)
+        return self.profile.extract_values(index, index.declared_quantity(declared_value))
     
     def _determine_severity(self, percentage_difference: float) -> str:
         """Determine the severity of a contradiction based on percentage difference"""
-        
-        if percentage_difference >= 20:
-            return "severe"
-        elif percentage_difference >= 10:
-            return "moderate"
-        else:
-            return "minor"
+        return self.profile.severity(percentage_difference)
     
     def get_summary_stats(self) -> dict:
         """Get summary statistics of the analysis"""
@@ -3,34 +3,26 @@ Working Mathematical Consistency Detector for Q2JSON Pipeline
 High precision detection with zero false positives
 """
 
-import re
-import json
-from typing import Dict, List, Tuple, Optional, Any
-from dataclasses import dataclass
+from typing import Dict, List, Tuple, Any, Set
 
-
-@dataclass
-class ContradictionResult:
-    """Represents a detected mathematical contradiction"""
-    question_index: int
-    field_name: str
-    values_found: List[float]
-    contexts: List[str]
-    severity: str
-    percentage_difference: float
-    suggested_resolution: str
+try:
+    from .math_consistency_engine import ContradictionResult, MathConsistencyEngine, WorkingProfile, ValueIndex
+except ImportError:
+    from math_consistency_engine import ContradictionResult, MathConsistencyEngine, WorkingProfile, ValueIndex
 
 
 class MathematicalConsistencyDetectorWorking:
     """
     Production-ready mathematical consistency detector
     Proven to find real contradictions while avoiding false positives
+    
+    Backed by the 'working' profile of the unified MathConsistencyEngine.
     """
     
     def __init__(self, tolerance_threshold: float = 0.05):
         """Initialize with 5% default tolerance"""
-        self.tolerance_threshold = tolerance_threshold
-        self.common_intermediates = {0.4, 0.5, 0.8, 0.894, 1.673, 2.0, 2.8}
+        self.profile = WorkingProfile(tolerance_threshold=tolerance_threshold)
+        self.engine = MathConsistencyEngine([self.profile])
         self.contradictions_found = []
         self.processing_stats = {
             'questions_analyzed': 0,
@@ -38,6 +30,23 @@ class MathematicalConsistencyDetectorWorking:
             'contradictions_found': 0
         }
     
+    @property
+    def common_intermediates(self) -> Set[float]:
+        """Common intermediate values in electrical engineering (never reported)"""
+        return self.profile.skip_values
+    
+    @common_intermediates.setter
+    def common_intermediates(self, values: Set[float]):
+        self.profile.skip_values = values
+    
+    @property
+    def tolerance_threshold(self) -> float:
+        return self.profile.tolerance_threshold
+    
+    @tolerance_threshold.setter
+    def tolerance_threshold(self, value: float):
+        self.profile.tolerance_threshold = value
+    
     def detect_contradictions(self, questions_data: Dict) -> List[ContradictionResult]:
         """
         Detect mathematical contradictions in questions data
@@ -59,122 +68,27 @@ class MathematicalConsistencyDetectorWorking:
         if 'questions' not in questions_data:
             return []
         
-        questions = questions_data['questions']
-        self.processing_stats['questions_analyzed'] = len(questions)
-        
-        for i, question in enumerate(questions):
-            contradiction_result = self._analyze_question(i, question)
-            if contradiction_result:
-                self.contradictions_found.append(contradiction_result)
-                self.processing_stats['contradictions_found'] += 1
+        result = self.engine.detect(questions_data, [self.profile.name])[self.profile.name]
+        self.contradictions_found = result.contradictions
+        self.processing_stats = {
+            'questions_analyzed': result.questions_analyzed,
+            'values_extracted': result.values_extracted,
+            'contradictions_found': len(self.contradictions_found)
+        }
         
         return self.contradictions_found
     
-    def _analyze_question(self, question_index: int, question: Dict) -> Optional[ContradictionResult]:
-        """Analyze a single question for mathematical contradictions"""
-        
-        if 'correct_answer' not in question or 'feedback_correct' not in question:
-            return None
-        
-        try:
-            declared_answer = float(question['correct_answer'])
-        except (ValueError, TypeError):
-            return None
-        
-        feedback_content = str(question['feedback_correct'])
-        
-        # Extract meaningful values from feedback
-        meaningful_values = self._extract_meaningful_values(feedback_content)
-        self.processing_stats['values_extracted'] += len(meaningful_values)
-        
-        # Check for contradictions with declared answer
-        for value, context in meaningful_values:
-            if abs(declared_answer - value) > 0.001:  # Not the same value
-                percentage_diff = abs(declared_answer - value) / max(declared_answer, 0.001) * 100
-                
-                # Skip normal rounding (< 3% difference)
-                if percentage_diff > 3.0:
-                    # Skip obvious intermediate values
-                    if not self._is_obvious_intermediate(value, context):
-                        return ContradictionResult(
-                            question_index=question_index,
-                            field_name="declared_vs_calculated",
-                            values_found=[declared_answer, value],
-                            contexts=[f"Declared: {declared_answer}", f"Found: {context[:100]}..."],
-                            severity=self._determine_severity(percentage_diff),
-                            percentage_difference=percentage_diff,
-                            suggested_resolution=f"Verify calculation: declared {declared_answer} vs found {value}"
-                        )
-        
-        return None
-    
     def _extract_meaningful_values(self, text: str) -> List[Tuple[float, str]]:
         """Extract meaningful numerical values that could be final answers"""
-        
-        values = []
-        
-        # Reliable patterns proven to work
-        patterns = [
-            r'final\s+answer[:\s]*.*?(\d+\.?\d*)',  # Final answer statements
-            r'V_T\s*=\s*(\d+\.?\d*)',               # V_T assignments
-            r'(\d+\.?\d*)\s*V(?:\s|$|\.)',          # Values with V unit
-            r'=\s*(\d+\.?\d*)\s*V',                 # Equals value V
-            r'≈\s*(\d+\.?\d*)',                     # Approximations
-            r'result\s+is\s*(\d+\.?\d*)',           # Result statements
-            r'answer\s+is\s*(\d+\.?\d*)',           # Answer statements
-            r'calculation\s+gives\s*.*?(\d+\.?\d*)', # Calculation results
-        ]
-        
-        for pattern in patterns:
-            for match in re.finditer(pattern, text, re.IGNORECASE):
-                try:
-                    value = float(match.group(1))
-                    
-                    # Get context around the match
-                    start = max(0, match.start() - 30)
-                    end = min(len(text), match.end() + 30)
-                    context = text[start:end].strip()
-                    
-                    values.append((value, context))
-                    
-                except (ValueError, IndexError):
-                    continue
-        
-        # Remove duplicates (keep unique values within 0.001 tolerance)
-        unique_values = []
-        for value, context in values:
-            if not any(abs(v - value) < 0.001 for v, _ in unique_values):
-                unique_values.append((value, context))
-        
-        return unique_values
+        return self.profile.extract(ValueIndex(text))
     
     def _is_obvious_intermediate(self, value: float, context: str) -> bool:
         """Check if value is obviously an intermediate calculation"""
-        
-        # Common intermediate values in electrical engineering
-        if value in self.common_intermediates:
-            return True
-        
-        # Values that appear in arithmetic operations (between operators)
-        value_str = str(value)
-        if re.search(rf'[+\-*/]\s*{re.escape(value_str)}\s*[+\-*/]', context):
-            return True
-        
-        # Values inside parentheses with arithmetic operations
-        if re.search(rf'\([^)]*{re.escape(value_str)}[^)]*[+\-*/]', context):
-            return True
-        
-        return False
+        return self.profile.is_obvious_intermediate(value, context)
     
     def _determine_severity(self, percentage_diff: float) -> str:
         """Determine severity based on percentage difference"""
-        
-        if percentage_diff > 20:
-            return "severe"
-        elif percentage_diff > 10:
-            return "moderate"
-        else:
-            return "minor"
+        return self.profile.severity(percentage_diff)
     
     def generate_detailed_report(self) -> str:
         """Generate detailed report for user review"""
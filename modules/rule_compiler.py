@@ -0,0 +1,235 @@
+"""
+Rule Compiler for Q2JSON correction rules
+Extracts the literal substrings a regex rule cannot match without, applies rule sets behind
+a combined literal prefilter, and fingerprints rule sets
+"""
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import re._parser as sre_parse  # Python 3.11+
+    from re._constants import (LITERAL, SUBPATTERN, MAX_REPEAT, MIN_REPEAT,
+                               ASSERT, ASSERT_NOT, AT)
+except ImportError:
+    import sre_parse
+    from sre_constants import (LITERAL, SUBPATTERN, MAX_REPEAT, MIN_REPEAT,
+                               ASSERT, ASSERT_NOT, AT)
+
+
+@dataclass
+class CompiledRule:
+    """A regex correction rule with its prefilter literal"""
+    pattern: str
+    replacement: str
+    description: str
+    regex: re.Pattern
+    trigger: Optional[str]
+    # Case-insensitive triggers are lowercase and must be looked up in the lowercased text
+    ignore_case: bool = False
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        """Identity of the rule: what it matches and what it produces"""
+        return (self.pattern, self.replacement)
+
+    def may_match(self, text: str, lowered: Optional[str] = None) -> bool:
+        """False when the rule's trigger proves it cannot match text (lowered: text.lower(), if at hand)"""
+        if self.trigger is None:
+            return True
+        if self.ignore_case:
+            return self.trigger in (text.lower() if lowered is None else lowered)
+        return self.trigger in text
+
+
+def _case_insensitive_char(char: str) -> Optional[str]:
+    """
+    Lowercase form of a character matched case-insensitively, or None if it cannot be
+    used in a prefilter.
+
+    Caseless characters match only themselves. ASCII letters match characters that all
+    lowercase to the same letter, except 'i' and 's', which also match the dotless i
+    and long s; those, like other letters, break a literal run.
+    """
+    if char.lower() == char and char.upper() == char:
+        return char
+    lower = char.lower()
+    if char.isascii() and lower not in ('i', 's'):
+        return lower
+    return None
+
+
+def _literal_runs(tokens, runs: List[str], current: List[str], ignore_case: bool = False) -> None:
+    """Collect runs of consecutive literal characters every match must contain"""
+    for op, value in tokens:
+        if op == LITERAL:
+            char = chr(value)
+            if ignore_case:
+                char = _case_insensitive_char(char)
+                if char is None:
+                    _flush(runs, current)
+                    continue
+            current.append(char)
+        elif op in (ASSERT, ASSERT_NOT, AT):
+            # Zero-width: constrains the match but does not separate adjacent literals
+            continue
+        elif op == SUBPATTERN:
+            if len(value) == 4 and (value[1] | value[2]) & re.IGNORECASE:
+                # Scoped case flag: its literals are not comparable with the rest, so skip them
+                _flush(runs, current)
+            else:
+                # Plain group: its contents are part of the sequence
+                _literal_runs(value[-1], runs, current, ignore_case)
+        elif op in (MAX_REPEAT, MIN_REPEAT) and value[0] >= 1:
+            # Repeated at least once: the first repetition is required, but what
+            # follows it is not adjacent to a fixed position
+            _flush(runs, current)
+            inner: List[str] = []
+            _literal_runs(value[2], runs, inner, ignore_case)
+            _flush(runs, inner)
+        else:
+            _flush(runs, current)
+
+
+def _flush(runs: List[str], current: List[str]) -> None:
+    """End the current literal run"""
+    if current:
+        runs.append(''.join(current))
+        current.clear()
+
+
+def required_literals(pattern: str, flags: int = 0) -> List[str]:
+    """
+    Literal substrings that appear in every match of a regex
+
+    Args:
+        pattern: Regular expression source
+        flags: re flags the pattern is compiled with
+
+    Returns:
+        List[str]: Required literal runs; for case-insensitive patterns they are lowercase
+            and hold for the lowercased text (see pattern_ignores_case)
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except re.error:
+        return []
+
+    runs: List[str] = []
+    current: List[str] = []
+    _literal_runs(list(parsed), runs, current, bool(parsed.state.flags & re.IGNORECASE))
+    _flush(runs, current)
+    return runs
+
+
+def pattern_ignores_case(pattern: str, flags: int = 0) -> bool:
+    """Whether a pattern is case-insensitive as a whole (via flags or a leading inline flag)"""
+    try:
+        return bool(sre_parse.parse(pattern, flags).state.flags & re.IGNORECASE)
+    except re.error:
+        return bool(flags & re.IGNORECASE)
+
+
+def best_trigger(pattern: str, flags: int = 0) -> Optional[str]:
+    """Longest required literal of a pattern (the most selective prefilter), or None"""
+    literals = required_literals(pattern, flags)
+    return max(literals, key=len) if literals else None
+
+
+def compile_rules(patterns: Sequence[Tuple[str, str, str]], flags: int = 0) -> List[CompiledRule]:
+    """
+    Compile (pattern, replacement, description) rules with their prefilter literals
+
+    Args:
+        patterns: Correction rules in application order
+        flags: re flags for every pattern
+
+    Returns:
+        List[CompiledRule]: Rules in the same order
+    """
+    return [
+        CompiledRule(pattern, replacement, description,
+                     re.compile(pattern, flags), best_trigger(pattern, flags),
+                     pattern_ignores_case(pattern, flags))
+        for pattern, replacement, description in patterns
+    ]
+
+
+class RuleSet:
+    """
+    Ordered rules applied behind one combined literal prefilter.
+
+    Checking the distinct trigger literals (case-insensitive ones against the lowercased
+    text) with str.find rejects most texts before any regex runs (for a handful of short
+    literals this beats one alternation regex, which Python's re does not compile to an
+    automaton). Otherwise only the rules whose trigger
+    occurs in the current text run; triggers are checked against the text as it stands
+    when each rule's turn comes, since an earlier replacement can introduce a later
+    rule's trigger. Rules without a provable literal always run.
+    """
+
+    def __init__(self, rules: Sequence[CompiledRule]):
+        self.rules = list(rules)
+        self.has_unfiltered_rules = any(rule.trigger is None for rule in self.rules)
+        self.triggers = self._distinct(rule.trigger for rule in self.rules
+                                       if rule.trigger and not rule.ignore_case)
+        # Triggers of case-insensitive rules, looked up in the lowercased text
+        self.lowered_triggers = self._distinct(rule.trigger for rule in self.rules
+                                               if rule.trigger and rule.ignore_case)
+
+    @staticmethod
+    def _distinct(triggers) -> Tuple[str, ...]:
+        """Distinct triggers, dropping any that contain a shorter one (the shorter check covers them)"""
+        kept: Tuple[str, ...] = ()
+        for trigger in sorted(set(triggers), key=len):
+            if not any(shorter in trigger for shorter in kept):
+                kept += (trigger,)
+        return kept
+
+    @classmethod
+    def from_patterns(cls, patterns: Sequence[Tuple[str, str, str]], flags: int = 0) -> 'RuleSet':
+        """Compile (pattern, replacement, description) rules into a RuleSet"""
+        return cls(compile_rules(patterns, flags))
+
+    def may_match(self, text: str) -> bool:
+        """False when no rule can match the text"""
+        if self.has_unfiltered_rules or any(trigger in text for trigger in self.triggers):
+            return True
+        if self.lowered_triggers:
+            lowered = text.lower()
+            return any(trigger in lowered for trigger in self.lowered_triggers)
+        return False
+
+    def apply(self, text: str) -> Tuple[str, Dict[str, int]]:
+        """
+        Apply the rules in order
+
+        Args:
+            text: Text to transform
+
+        Returns:
+            Tuple of (transformed text, {rule description: replacements made})
+        """
+        applied: Dict[str, int] = {}
+        if not self.may_match(text):
+            return text, applied
+        lowered = None
+        for rule in self.rules:
+            if rule.ignore_case and lowered is None:
+                lowered = text.lower()
+            if not rule.may_match(text, lowered):
+                continue
+            text, count = rule.regex.subn(rule.replacement, text)
+            if count:
+                applied[rule.description] = applied.get(rule.description, 0) + count
+                lowered = None
+        return text, applied
+
+
+def ruleset_fingerprint(rules: Sequence[CompiledRule]) -> str:
+    """Stable hash of an ordered rule set; changes whenever a rule is added, edited or moved"""
+    payload = json.dumps([list(rule.key) for rule in rules], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
@@ -0,0 +1,160 @@
+"""
+Unit Normalizer for Q2JSON numeric comparisons
+Reads the unit written after a number (SI prefix plus unit, bare or in \\text{...}) through a
+lookup table built once at import, so values like 812 mV and 0.812 V compare as equal and
+values of different dimensions are not compared at all
+"""
+
+import math
+import re
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+SI_PREFIXES: Dict[str, float] = {
+    'T': 1e12, 'G': 1e9, 'M': 1e6, 'k': 1e3,
+    'm': 1e-3, 'μ': 1e-6, 'u': 1e-6, 'n': 1e-9, 'p': 1e-12, 'f': 1e-15,
+}
+
+# Unit symbol: (dimension, factor to the dimension's base unit, accepts SI prefixes)
+BASE_UNITS: Dict[str, Tuple[str, float, bool]] = {
+    'V': ('voltage', 1.0, True),
+    'A': ('current', 1.0, True),
+    'Ω': ('resistance', 1.0, True),
+    'S': ('conductance', 1.0, True),
+    'H': ('inductance', 1.0, True),
+    'F': ('capacitance', 1.0, True),
+    'C': ('charge', 1.0, True),
+    'Hz': ('frequency', 1.0, True),
+    's': ('time', 1.0, True),
+    'W': ('power', 1.0, True),
+    'VA': ('apparent power', 1.0, True),
+    'VAR': ('reactive power', 1.0, True),
+    'J': ('energy', 1.0, True),
+    'm': ('length', 1.0, True),
+    'rad': ('angle', 1.0, True),
+    '°': ('angle', math.pi / 180, False),
+    'rad/s': ('angular frequency', 1.0, False),
+    'dB': ('level', 1.0, False),
+}
+
+# Spelled-out and alternative spellings of base units
+UNIT_ALIASES: Dict[str, str] = {
+    'volt': 'V', 'volts': 'V', 'amp': 'A', 'amps': 'A', 'ampere': 'A', 'amperes': 'A',
+    'ohm': 'Ω', 'ohms': 'Ω', 'hertz': 'Hz', 'var': 'VAR', 'VAr': 'VAR',
+    'deg': '°', 'degree': '°', 'degrees': '°', 'sec': 's',
+}
+
+
+def _build_unit_table() -> Dict[str, Tuple[str, float, float]]:
+    """Every recognised unit spelling -> (dimension, factor to base units, SI prefix scale)"""
+    table: Dict[str, Tuple[str, float, float]] = {}
+    for symbol, (dimension, factor, prefixable) in BASE_UNITS.items():
+        if prefixable:
+            for prefix, scale in SI_PREFIXES.items():
+                table.setdefault(prefix + symbol, (dimension, factor * scale, scale))
+    # Unprefixed symbols win over prefix + symbol spellings (e.g. 'm' is metre, not milli-)
+    for symbol, (dimension, factor, _) in BASE_UNITS.items():
+        table[symbol] = (dimension, factor, 1.0)
+    for alias, symbol in UNIT_ALIASES.items():
+        table[alias] = table[symbol]
+    return table
+
+
+UNIT_TABLE = _build_unit_table()
+
+# Optional LaTeX spacing, then a \text{...}-style group or a bare unit word; a plain comma is
+# accepted only before a group (",text{V}" is how escaped LaTeX often arrives from LLMs)
+_UNIT_AFTER_NUMBER = re.compile(
+    r'[ \t]*(?:(?:\\[,;:!]|\\ |~|,)[ \t]*)?\\?(?:text|mathrm|mbox|rm)[ \t]*\{([^{}]*)\}'
+    r'|[ \t]*(?:(?:\\[,;:!]|\\ |~)[ \t]*)?'
+    r'(\\Omega|\\mu[ \t]*[A-Za-z]+|\^\\circ|\^\{\\circ\}|[A-Za-zΩμµ°]+(?:/[A-Za-z]+)?)'
+)
+_UNIT_SPELLINGS = [
+    (re.compile(r'\\Omega'), 'Ω'),
+    (re.compile(r'\\mu|µ'), 'μ'),
+    (re.compile(r'\\degree|\^\{?\\circ\}?|\\circ'), '°'),
+    (re.compile(r'\\[,;:! ]|\s'), ''),
+]
+
+
+@lru_cache(maxsize=1024)
+def parse_unit(unit_text: str) -> Optional[Tuple[str, float, float]]:
+    """
+    Look up a unit as written (e.g. 'mV', '\\text{kHz}' contents, '\\Omega')
+
+    Returns:
+        (dimension, factor to base units, SI prefix scale), or None if the text is not a known unit
+    """
+    for pattern, replacement in _UNIT_SPELLINGS:
+        unit_text = pattern.sub(replacement, unit_text)
+    return UNIT_TABLE.get(unit_text)
+
+
+class Quantity(float):
+    """A number as written, with the dimension, base-unit factor and SI prefix of the unit that followed it"""
+
+    def __new__(cls, value: float, dimension: Optional[str] = None, factor: float = 1.0, prefix_scale: float = 1.0):
+        quantity = super().__new__(cls, value)
+        quantity.dimension = dimension
+        quantity.factor = factor
+        quantity.prefix_scale = prefix_scale
+        return quantity
+
+    def __reduce__(self):
+        return (Quantity, (float(self), self.dimension, self.factor, self.prefix_scale))
+
+    @property
+    def base_value(self) -> float:
+        """Value in the dimension's base unit (as written if the unit is unknown)"""
+        return float(self) * self.factor
+
+    @property
+    def unprefixed_value(self) -> float:
+        """Value in the same unit without its SI prefix (812 mV -> 0.812)"""
+        return float(self) * self.prefix_scale
+
+
+def quantity_at(text: str, value_str: str, end: int) -> Quantity:
+    """
+    Parse a number together with the unit written right after it
+
+    Args:
+        text: Text containing the number
+        value_str: The number as matched
+        end: Position just past the number in text
+    """
+    match = _UNIT_AFTER_NUMBER.match(text, end)
+    if match:
+        unit = parse_unit(match.group(1) if match.group(1) is not None else match.group(2))
+        if unit is not None:
+            return Quantity(float(value_str), *unit)
+    return Quantity(float(value_str))
+
+
+def _closest(candidates: Tuple[float, float], target: float) -> float:
+    """Candidate nearest to target"""
+    return min(candidates, key=lambda candidate: abs(candidate - target))
+
+
+def comparable_values(a: float, b: float) -> Optional[Tuple[float, float]]:
+    """
+    Express two values in a common unit for comparison
+
+    Values with known units are compared in a's unit. When only one side has a unit,
+    the bare number may be in the written unit or the same unit without its SI prefix
+    (0.812 against 812 mV), so the closer reading is used.
+
+    Returns:
+        (a, b) in a common unit, or None if their dimensions differ
+    """
+    dimension_a = getattr(a, 'dimension', None)
+    dimension_b = getattr(b, 'dimension', None)
+    if dimension_a is not None and dimension_b is not None:
+        if dimension_a != dimension_b:
+            return None
+        return float(a), b.base_value / a.factor
+    if dimension_a is not None:
+        return _closest((float(a), a.unprefixed_value), float(b)), float(b)
+    if dimension_b is not None:
+        return float(a), _closest((float(b), b.unprefixed_value), float(a))
+    return float(a), float(b)
@@ -14,11 +14,15 @@ if sys.platform == 'win32':
 
 # Rest of your imports...
 import argparse
+import contextlib
+import glob
+import io
 import json
 import sys
 from datetime import datetime
 from typing import Dict, List, Any, Tuple
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # Import from Q2LMS modules (single source of truth)
 sys.path.insert(0, str(Path(__file__).parent.parent / "q2lms"))
@@ -26,6 +30,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "q2lms"))
 try:
     from modules.schema_validator import JSONSchemaValidator
     from modules.unicode_converter import get_unicode_converter
+    from modules.lazy_loader import LazyQuestionFile
 except ImportError as e:
     print(f"Error: Cannot import from Q2LMS modules: {e}")
     print("Make sure Q2LMS is in the parent directory and has the required modules")
@@ -35,75 +40,91 @@ except ImportError as e:
     print("  └── q2validate/q2validate_cli.py")
     sys.exit(1)
 
+# Per-file summary counters added up by batch runs
+BATCH_COUNTER_KEYS = ['total_questions', 'schema_valid', 'unicode_issues', 'auto_fixed', 'ready_for_q2lms']
+
 class Q2ValidateCLI:
     def __init__(self):
         """Initialize using Q2LMS modules"""
         self.validator = JSONSchemaValidator()
         self.converter = get_unicode_converter()
+        # Summary counters of the most recently processed file
+        self.last_results = None
     
     def validate_and_process_questions(self, questions: List[Dict[str, Any]], auto_fix_unicode: bool = True) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """Validate and process questions using Q2LMS validation logic"""
         
-        results = {
-            'total_questions': len(questions),
-            'schema_valid': 0,
-            'unicode_issues': 0,
-            'auto_fixed': 0,
-            'ready_for_q2lms': 0,
-            'question_results': []
-        }
-        
+        results = self.create_results(len(questions))
         processed_questions = []
         
         for i, question in enumerate(questions):
-            # Schema validation using Q2LMS validator
-            is_schema_valid, schema_errors = self.validator.validate_question_schema(question)
-            
-            # Unicode detection using Q2LMS converter
-            unicode_issues = self.converter.detect_issues(question)
-            has_unicode = len(unicode_issues) > 0
-            
-            # Auto-fix Unicode if requested and available
-            final_question = question.copy()
-            conversion_report = {}
-            
-            if auto_fix_unicode and has_unicode and hasattr(self.converter, 'convert_question'):
-                final_question, conversion_report = self.converter.convert_question(question)
-                # Re-check after conversion
-                remaining_unicode = self.converter.detect_issues(final_question)
-                has_unicode_after = len(remaining_unicode) > 0
-            else:
-                has_unicode_after = has_unicode
-                conversion_report = {'conversion_successful': not has_unicode}
-            
-            # Update counters
-            if is_schema_valid:
-                results['schema_valid'] += 1
-            if has_unicode:
-                results['unicode_issues'] += 1
-            if auto_fix_unicode and conversion_report.get('conversion_successful', False):
-                results['auto_fixed'] += 1
-            if is_schema_valid and not has_unicode_after:
-                results['ready_for_q2lms'] += 1
+            final_question, question_result = self.validate_question(question, i, auto_fix_unicode)
+            self.update_counters(results, question_result, auto_fix_unicode)
             
             # Store individual results
-            question_result = {
-                'index': i,
-                'title': question.get('title', f'Question {i+1}'),
-                'schema_valid': is_schema_valid,
-                'schema_errors': schema_errors,
-                'had_unicode': has_unicode,
-                'has_unicode_after': has_unicode_after,
-                'unicode_issues': unicode_issues,
-                'conversion_report': conversion_report,
-                'ready_for_q2lms': is_schema_valid and not has_unicode_after
-            }
-            
             results['question_results'].append(question_result)
             processed_questions.append(final_question)
         
         return processed_questions, results
     
+    def create_results(self, total_questions: int = 0) -> Dict[str, Any]:
+        """Create an empty results structure"""
+        return {
+            'total_questions': total_questions,
+            'schema_valid': 0,
+            'unicode_issues': 0,
+            'auto_fixed': 0,
+            'ready_for_q2lms': 0,
+            'question_results': []
+        }
+    
+    def validate_question(self, question: Dict[str, Any], index: int, auto_fix_unicode: bool = True) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Validate and (optionally) Unicode-fix a single question"""
+        # Schema validation using Q2LMS validator
+        is_schema_valid, schema_errors = self.validator.validate_question_schema(question)
+        
+        # Unicode detection using Q2LMS converter
+        unicode_issues = self.converter.detect_issues(question)
+        has_unicode = len(unicode_issues) > 0
+        
+        # Auto-fix Unicode if requested and available
+        final_question = question.copy()
+        conversion_report = {}
+        
+        if auto_fix_unicode and has_unicode and hasattr(self.converter, 'convert_question'):
+            final_question, conversion_report = self.converter.convert_question(question)
+            # Re-check after conversion
+            remaining_unicode = self.converter.detect_issues(final_question)
+            has_unicode_after = len(remaining_unicode) > 0
+        else:
+            has_unicode_after = has_unicode
+            conversion_report = {'conversion_successful': not has_unicode}
+        
+        question_result = {
+            'index': index,
+            'title': question.get('title', f'Question {index+1}'),
+            'schema_valid': is_schema_valid,
+            'schema_errors': schema_errors,
+            'had_unicode': has_unicode,
+            'has_unicode_after': has_unicode_after,
+            'unicode_issues': unicode_issues,
+            'conversion_report': conversion_report,
+            'ready_for_q2lms': is_schema_valid and not has_unicode_after
+        }
+        
+        return final_question, question_result
+    
+    def update_counters(self, results: Dict[str, Any], question_result: Dict[str, Any], auto_fix_unicode: bool = True):
+        """Add one question's outcome to the summary counters"""
+        if question_result['schema_valid']:
+            results['schema_valid'] += 1
+        if question_result['had_unicode']:
+            results['unicode_issues'] += 1
+        if auto_fix_unicode and question_result['conversion_report'].get('conversion_successful', False):
+            results['auto_fixed'] += 1
+        if question_result['ready_for_q2lms']:
+            results['ready_for_q2lms'] += 1
+    
     def create_export_data(self, questions: List[Dict[str, Any]], results: Dict[str, Any]) -> Dict[str, Any]:
         """Create export data structure compatible with Q2LMS"""
         
@@ -157,20 +178,25 @@ class Q2ValidateCLI:
             
             for result in results['question_results']:
                 if not result['ready_for_q2lms']:
-                    print(f"\nQuestion {result['index'] + 1}: {result['title']}")
-                    if not result['schema_valid']:
-                        print("  ❌ Schema errors:")
-                        for error in result['schema_errors']:
-                            print(f"    • {error}")
-                    if result['has_unicode_after']:
-                        print("  ⚠️  Unicode issues:")
-                        for field, chars in result['unicode_issues'].items():
-                            print(f"    • {field}: {', '.join(chars)}")
+                    self.print_question_issues(result)
+    
+    def print_question_issues(self, result: Dict[str, Any]):
+        """Print the issues of one question that is not ready"""
+        print(f"\nQuestion {result['index'] + 1}: {result['title']}")
+        if not result['schema_valid']:
+            print("  ❌ Schema errors:")
+            for error in result['schema_errors']:
+                print(f"    • {error}")
+        if result['has_unicode_after']:
+            print("  ⚠️  Unicode issues:")
+            for field, chars in result['unicode_issues'].items():
+                print(f"    • {field}: {', '.join(chars)}")
     
     def process_file(self, input_file: str, output_file: str = None, 
                     auto_fix: bool = True, verbose: bool = False, 
                     ready_only: bool = False) -> bool:
         """Process input file and generate output"""
+        self.last_results = None
         
         # Read input file
         try:
@@ -179,8 +205,8 @@ class Q2ValidateCLI:
                 print(f"❌ Error: Input file '{input_file}' not found")
                 return False
             
-            with open(input_path, 'r', encoding='utf-8') as f:
-                questions_data = json.load(f)
+            # Memory-mapped and indexed; each question is parsed as it is validated
+            questions = LazyQuestionFile.open(input_path)
             
             print(f"Loaded: {input_file}")
             
@@ -191,25 +217,27 @@ class Q2ValidateCLI:
             print(f"Error reading '{input_file}': {e}")
             return False
         
-        # Handle different JSON structures
-        if isinstance(questions_data, dict) and 'questions' in questions_data:
-            questions = questions_data['questions']
-        elif isinstance(questions_data, list):
-            questions = questions_data
-        else:
-            print("❌ Error: Unexpected JSON structure. Expected {'questions': [...]} or [...]")
-            return False
-        
-        if not questions:
-            print("⚠️  Warning: No questions found in JSON")
-            return False
-        
-        print(f"🔄 Processing {len(questions)} questions using Q2LMS validation...")
-        
-        # Process questions
-        processed_questions, validation_results = self.validate_and_process_questions(
-            questions, auto_fix
-        )
+        with questions:
+            # Handle different JSON structures
+            if not questions.has_questions:
+                print("❌ Error: Unexpected JSON structure. Expected {'questions': [...]} or [...]")
+                return False
+            
+            if not questions:
+                print("⚠️  Warning: No questions found in JSON")
+                return False
+            
+            print(f"🔄 Processing {len(questions)} questions using Q2LMS validation...")
+            
+            # Process questions
+            try:
+                processed_questions, validation_results = self.validate_and_process_questions(
+                    questions, auto_fix
+                )
+            except json.JSONDecodeError as e:
+                print(f"❌ Error: Invalid JSON in '{input_file}': {e}")
+                return False
+        self.last_results = validation_results
         
         # Filter for ready questions only if requested
         if ready_only:
@@ -246,6 +274,218 @@ class Q2ValidateCLI:
         
         # Return success status
         return validation_results['ready_for_q2lms'] > 0
+    
+    def process_ndjson_file(self, input_file: str, output_file: str = None,
+                            auto_fix: bool = True, verbose: bool = False,
+                            ready_only: bool = False) -> bool:
+        """
+        Process a JSON Lines file (one question per line) in constant memory
+        
+        Each question is validated, converted and written out immediately; only the
+        summary counters are kept. Malformed lines are reported and skipped.
+        """
+        self.last_results = None
+        input_path = Path(input_file)
+        if not input_path.exists():
+            print(f"❌ Error: Input file '{input_file}' not found")
+            return False
+        
+        print(f"🔄 Streaming questions from {input_file} using Q2LMS validation...")
+        
+        results = self.create_results()
+        self.last_results = results
+        invalid_lines = 0
+        written = 0
+        output_path = Path(output_file) if output_file else None
+        
+        try:
+            if output_path:
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            with open(input_path, 'r', encoding='utf-8') as infile, \
+                 (open(output_path, 'w', encoding='utf-8') if output_path else contextlib.nullcontext()) as outfile:
+                for line_number, line in enumerate(infile, start=1):
+                    if not line.strip():
+                        continue
+                    
+                    try:
+                        question = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        invalid_lines += 1
+                        print(f"❌ Line {line_number}: invalid JSON ({e})")
+                        continue
+                    if not isinstance(question, dict):
+                        invalid_lines += 1
+                        print(f"❌ Line {line_number}: expected a JSON object")
+                        continue
+                    
+                    index = results['total_questions']
+                    results['total_questions'] += 1
+                    final_question, question_result = self.validate_question(question, index, auto_fix)
+                    self.update_counters(results, question_result, auto_fix)
+                    
+                    if verbose and not question_result['ready_for_q2lms']:
+                        self.print_question_issues(question_result)
+                    
+                    if outfile is not None and (question_result['ready_for_q2lms'] or not ready_only):
+                        outfile.write(json.dumps(final_question, ensure_ascii=False))
+                        outfile.write('\n')
+                        written += 1
+        
+        except Exception as e:
+            print(f"❌ Error processing '{input_file}': {e}")
+            return False
+        
+        if invalid_lines:
+            print(f"⚠️  Skipped {invalid_lines} malformed line(s)")
+        
+        if results['total_questions'] == 0:
+            print("⚠️  Warning: No questions found in input")
+            return False
+        
+        # Issues were already printed while streaming
+        self.print_summary(results, verbose=False)
+        
+        if output_path:
+            if ready_only and written == 0:
+                print("❌ Error: No questions are ready for export")
+                return False
+            print(f"\n📤 Output saved: {output_file} ({written} questions, JSON Lines)")
+            print(f"✅ Ready for import into Q2LMS")
+        
+        return results['ready_for_q2lms'] > 0
+
+# Per-process CLI instance for batch mode: validators are built once per worker, not per file
+_worker_cli = None
+
+
+def _init_batch_worker():
+    """Process pool initializer: build the validator and Unicode converter once"""
+    global _worker_cli
+    _worker_cli = Q2ValidateCLI()
+
+
+def _validate_file_task(input_file: str, output_file: str, auto_fix: bool,
+                        ready_only: bool, ndjson: bool) -> Dict[str, Any]:
+    """Validate one file in a batch worker and return its summary"""
+    log = io.StringIO()
+    summary = {
+        'input': input_file,
+        'output': output_file,
+        'success': False,
+        'error': None
+    }
+    try:
+        with contextlib.redirect_stdout(log):
+            process = _worker_cli.process_ndjson_file if ndjson else _worker_cli.process_file
+            summary['success'] = process(input_file=input_file, output_file=output_file,
+                                         auto_fix=auto_fix, verbose=False, ready_only=ready_only)
+    except Exception as e:
+        summary['error'] = str(e)
+    
+    results = _worker_cli.last_results or _worker_cli.create_results()
+    for key in BATCH_COUNTER_KEYS:
+        summary[key] = results[key]
+    if not summary['success']:
+        summary['log'] = log.getvalue()
+        if not summary['error']:
+            error_lines = [line.strip() for line in summary['log'].splitlines() if '❌' in line]
+            summary['error'] = error_lines[-1] if error_lines else "No questions ready for Q2LMS"
+    return summary
+
+
+def expand_input_paths(input_spec: str, ndjson: bool = False) -> List[Path]:
+    """
+    Resolve a file, directory or glob pattern to input files
+    
+    Directories yield their *.json files (*.jsonl/*.ndjson with --ndjson), sorted by name.
+    """
+    path = Path(input_spec)
+    if path.is_dir():
+        patterns = ['*.jsonl', '*.ndjson'] if ndjson else ['*.json']
+        files = {match for pattern in patterns for match in path.glob(pattern)}
+    elif glob.has_magic(input_spec):
+        files = {Path(match) for match in glob.glob(input_spec, recursive=True) if Path(match).is_file()}
+    else:
+        return [path]
+    # Skip outputs of earlier batch runs and batch reports
+    return sorted(file for file in files
+                  if not file.stem.endswith('_validated') and file.name != 'q2validate_report.json')
+
+
+def batch_output_path(input_path: Path, output_dir: str = None) -> Path:
+    """Output file for a batch input: '<name>_validated<ext>' beside the input or in output_dir"""
+    name = f"{input_path.stem}_validated{input_path.suffix}"
+    return Path(output_dir) / name if output_dir else input_path.with_name(name)
+
+
+def run_batch(cli: Q2ValidateCLI, input_files: List[Path], output_dir: str = None,
+              report_file: str = None, auto_fix: bool = True, verbose: bool = False,
+              ready_only: bool = False, ndjson: bool = False, workers: int = None) -> bool:
+    """
+    Validate many files in a process pool
+    
+    Outputs are written beside each input (or into output_dir). One aggregated summary
+    is printed and a JSON report is written.
+    
+    Returns:
+        bool: True when every file produced questions ready for Q2LMS
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, len(input_files)))
+    print(f"🔄 Validating {len(input_files)} files with {workers} worker(s)...")
+    
+    tasks = [(str(path), str(batch_output_path(path, output_dir)), auto_fix, ready_only, ndjson)
+             for path in input_files]
+    file_summaries = [None] * len(tasks)
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker) as executor:
+        futures = {executor.submit(_validate_file_task, *task): position
+                   for position, task in enumerate(tasks)}
+        for completed, future in enumerate(as_completed(futures), start=1):
+            position = futures[future]
+            try:
+                file_summaries[position] = future.result()
+            except Exception as e:
+                file_summaries[position] = {
+                    'input': tasks[position][0], 'output': tasks[position][1],
+                    'success': False, 'error': str(e), **{key: 0 for key in BATCH_COUNTER_KEYS}
+                }
+            status = "✅" if file_summaries[position]['success'] else "❌"
+            print(f"  [{completed}/{len(tasks)}] {status} {tasks[position][0]}")
+    
+    totals = cli.create_results()
+    for summary in file_summaries:
+        for key in BATCH_COUNTER_KEYS:
+            totals[key] += summary[key]
+    cli.print_summary(totals, verbose=False)
+    
+    failed = [summary for summary in file_summaries if not summary['success']]
+    print(f"📁 Files: {len(file_summaries) - len(failed)} succeeded, {len(failed)} failed")
+    for summary in failed:
+        print(f"  ❌ {summary['input']}" + (f": {summary['error']}" if summary['error'] else ""))
+        if verbose and summary.get('log'):
+            print(summary['log'])
+    
+    report = {
+        'processed_by': 'q2validate_cli',
+        'processing_date': datetime.now().isoformat(),
+        'files_processed': len(file_summaries),
+        'files_failed': len(failed),
+        'totals': {key: totals[key] for key in BATCH_COUNTER_KEYS},
+        'all_ready': not failed,
+        'files': file_summaries
+    }
+    report_path = Path(report_file) if report_file else Path(output_dir or '.') / 'q2validate_report.json'
+    try:
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n📄 Report saved: {report_path}")
+    except Exception as e:
+        print(f"❌ Error writing report '{report_path}': {e}")
+        return False
+    
+    return not failed
 
 def main():
     parser = argparse.ArgumentParser(
@@ -257,19 +497,27 @@ Examples:
   python q2validate_cli.py input.json --output validated.json
   python q2validate_cli.py input.json --output ready.json --ready-only
   python q2validate_cli.py input.json --no-auto-fix --verbose
+  python q2validate_cli.py archive.jsonl --ndjson --output validated.jsonl
+  python q2validate_cli.py question_banks/ --workers 8 --report report.json
+  python q2validate_cli.py "banks/**/*.json" --output validated/
 
 This tool uses the same validation logic as Q2LMS to ensure compatibility.
         """
     )
     
-    parser.add_argument('input', help='Input JSON file from q2prompt')
-    parser.add_argument('-o', '--output', help='Output JSON file (optional)')
+    parser.add_argument('input', help='Input JSON file from q2prompt, or a directory / glob pattern for batch mode')
+    parser.add_argument('-o', '--output', help='Output JSON file (optional); output directory in batch mode')
     parser.add_argument('--no-auto-fix', action='store_true', 
                        help='Disable automatic Unicode to LaTeX conversion')
     parser.add_argument('--ready-only', action='store_true',
                        help='Export only questions ready for Q2LMS')
     parser.add_argument('-v', '--verbose', action='store_true',
                        help='Show detailed error information')
+    parser.add_argument('--ndjson', action='store_true',
+                       help='Treat input and output as JSON Lines (one question per line), streamed in constant memory')
+    parser.add_argument('-j', '--workers', type=int,
+                       help='Worker processes for batch mode (default: CPU count)')
+    parser.add_argument('--report', help='JSON report file for batch mode (default: q2validate_report.json)')
     parser.add_argument('--version', action='version', version='q2validate_cli 1.0.0')
     
     args = parser.parse_args()
@@ -277,8 +525,27 @@ This tool uses the same validation logic as Q2LMS to ensure compatibility.
     # Create validator instance
     validator = Q2ValidateCLI()
     
+    # Directory or glob input: validate every matching file in a process pool
+    input_files = expand_input_paths(args.input, args.ndjson)
+    if Path(args.input).is_dir() or glob.has_magic(args.input):
+        if not input_files:
+            print(f"❌ Error: No input files match '{args.input}'")
+            sys.exit(1)
+        success = run_batch(
+            validator, input_files,
+            output_dir=args.output,
+            report_file=args.report,
+            auto_fix=not args.no_auto_fix,
+            verbose=args.verbose,
+            ready_only=args.ready_only,
+            ndjson=args.ndjson,
+            workers=args.workers
+        )
+        sys.exit(0 if success else 1)
+    
     # Process file
-    success = validator.process_file(
+    process = validator.process_ndjson_file if args.ndjson else validator.process_file
+    success = process(
         input_file=args.input,
         output_file=args.output,
         auto_fix=not args.no_auto_fix,
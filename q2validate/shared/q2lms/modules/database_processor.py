@@ -6,9 +6,49 @@ Handles database loading, processing, validation, and transformations
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import json
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Sequence, Tuple, Any, Union
+
+try:
+    from .search_index import update_search_index_row
+    from .dedup_engine import DuplicateDetector, question_fingerprint
+    from .edit_tracker import mark_rows_dirty
+    from .question_store import QuestionConflictError, get_question_store
+    from .lazy_loader import LazyQuestionFile
+    from .dtype_schema import CATEGORY_COLUMNS, category_values, compact_dtypes, set_cell
+except ImportError:
+    from search_index import update_search_index_row
+    from dedup_engine import DuplicateDetector, question_fingerprint
+    from edit_tracker import mark_rows_dirty
+    from question_store import QuestionConflictError, get_question_store
+    from lazy_loader import LazyQuestionFile
+    from dtype_schema import CATEGORY_COLUMNS, category_values, compact_dtypes, set_cell
+
+# Editor change keys -> (DataFrame columns, question JSON key)
+QUESTION_CHANGE_FIELDS = {
+    'title': (['Title'], 'title'),
+    'question_type': (['Type'], 'type'),
+    'difficulty': (['Difficulty'], 'difficulty'),
+    'points': (['Points'], 'points'),
+    'topic': (['Topic'], 'topic'),
+    'subtopic': (['Subtopic'], 'subtopic'),
+    'question_text': (['Question_Text'], 'question_text'),
+    'choice_a': (['Choice_A'], None),
+    'choice_b': (['Choice_B'], None),
+    'choice_c': (['Choice_C'], None),
+    'choice_d': (['Choice_D'], None),
+    'correct_answer': (['Correct_Answer'], 'correct_answer'),
+    'tolerance': (['Tolerance'], 'tolerance'),
+    'correct_feedback': (['Correct_Feedback', 'Feedback'], 'feedback_correct'),
+    'incorrect_feedback': (['Incorrect_Feedback'], 'feedback_incorrect'),
+}
+
+CHOICE_CHANGE_KEYS = ['choice_a', 'choice_b', 'choice_c', 'choice_d']
+
+# Session state built from (or keyed by rows of) the loaded DataFrame
+DERIVED_STATE_KEYS = ['filter_index', 'search_index', 'dirty_rows', 'export_sync_cache', 'flag_bitmap']
 
 def find_correct_letter(correct_text: str, choices: List[str]) -> str:
     """Convert correct answer text to letter (A, B, C, D)"""
@@ -29,21 +69,208 @@ def find_correct_letter(correct_text: str, choices: List[str]) -> str:
     print(f"⚠️ Could not match '{correct_text}' to choices: {choices}")
     return 'A'  # Fallback
 
-def load_database_from_json(json_content: str) -> Tuple[Optional[pd.DataFrame], Dict, List, List]:
-    """Load and process JSON database content with automatic LaTeX processing"""
+CHOICE_COLUMNS = ['Choice_A', 'Choice_B', 'Choice_C', 'Choice_D']
+CHOICE_LETTERS = np.array(['A', 'B', 'C', 'D'], dtype=object)
+
+def _image_file_value(image_file: Any) -> str:
+    """Image file column value (the field could be a list, string, or None)"""
+    if image_file is None:
+        return ''
+    if isinstance(image_file, list):
+        return image_file[0] if image_file else ''
+    if not isinstance(image_file, str):
+        return str(image_file) if image_file else ''
+    return image_file
+
+def _correct_letters(answers: List[Any], choices: List[np.ndarray]) -> np.ndarray:
+    """
+    Vectorized find_correct_letter over a column of answers
+    
+    Args:
+        answers: Correct answer values (letters or choice text)
+        choices: The Choice_A..Choice_D columns as object arrays
+    """
+    cleaned = np.array([str(answer).strip().lower() if answer else '' for answer in answers], dtype=object)
+    choice_matrix = np.stack([
+        np.array([choice.strip().lower() for choice in column], dtype=object) for column in choices
+    ])
+    # Empty choices never match
+    matches = (choice_matrix == cleaned) & np.stack([column != '' for column in choices])
+    
+    letters = CHOICE_LETTERS[matches.argmax(axis=0)]
+    letters[~matches.any(axis=0)] = 'A'  # Fallback
+    
+    upper = np.array([answer.upper() for answer in cleaned], dtype=object)
+    is_letter = np.isin(upper, CHOICE_LETTERS)
+    letters[is_letter] = upper[is_letter]
+    
+    empty = cleaned == ''
+    for i in np.flatnonzero(~is_letter & ~matches.any(axis=0) & ~empty):
+        print(f"⚠️ Could not match '{answers[i]}' to choices: {[column[i] for column in choices]}")
+    letters[empty] = 'A'
+    return letters
+
+def questions_to_dataframe(questions: Sequence[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    DataFrame rows for questions, numbered from 1
+    
+    Built column by column: each field is extracted in one pass, choices are expanded
+    into Choice_A-Choice_D and correct answers are mapped to letters with array
+    operations. Columns get the compact dtypes of modules/dtype_schema.py, with the
+    categorical columns built as categoricals directly.
+    """
+    n = len(questions)
+    positions = range(1, n + 1)
+    
+    question_types = [q.get('type', 'multiple_choice') for q in questions]
+    
+    # Choices padded to 4 (missing or non-list choices count as none)
+    choice_lists = [q.get('choices') for q in questions]
+    choice_lists = [c if isinstance(c, list) else [] for c in choice_lists]
+    choices = [
+        np.array([str(c[k]) if len(c) > k and c[k] else '' for c in choice_lists], dtype=object)
+        for k in range(len(CHOICE_COLUMNS))
+    ]
+    
+    # Convert correct answer text to letter for multiple choice
+    raw_answers = [q.get('correct_answer', '') for q in questions]
+    correct_answers = np.array([str(a) if a else '' for a in raw_answers], dtype=object)
+    is_mc = np.array([t == 'multiple_choice' for t in question_types], dtype=bool)
+    if is_mc.any():
+        mc_rows = np.flatnonzero(is_mc)
+        correct_answers[mc_rows] = _correct_letters(
+            [raw_answers[i] for i in mc_rows], [column[mc_rows] for column in choices]
+        )
+    
+    # Handle None values for tolerance and points
+    points = [q.get('points', 1) for q in questions]
+    tolerances = [q.get('tolerance', 0.05) for q in questions]
+    
+    # Extract feedback fields (handle None values)
+    feedback_correct = [q.get('feedback_correct', '') or '' for q in questions]
+    
+    columns = {
+        'ID': [f"Q_{i:05d}" for i in positions],
+        'Type': question_types,
+        'Title': [q.get('title', f"Question {i}") for q, i in zip(questions, positions)],
+        'Question_Text': [q.get('question_text', '') for q in questions],
+        **dict(zip(CHOICE_COLUMNS, choices)),
+        'Correct_Answer': correct_answers,
+        'Points': [1 if p is None else p for p in points],
+        'Tolerance': [0.05 if t is None else t for t in tolerances],
+        'Feedback': feedback_correct,  # Use correct feedback as default
+        'Correct_Feedback': feedback_correct,
+        'Incorrect_Feedback': [q.get('feedback_incorrect', '') or '' for q in questions],
+        'Image_File': [_image_file_value(q.get('image_file', [])) for q in questions],
+        'Topic': [q.get('topic', 'General') for q in questions],
+        'Subtopic': [q.get('subtopic', '') for q in questions],
+        'Difficulty': [q.get('difficulty', 'Easy') for q in questions],
+    }
+    if n == 0:
+        return pd.DataFrame()
+    for column in CATEGORY_COLUMNS:
+        columns[column] = pd.Categorical(category_values(columns[column]))
+    return compact_dtypes(pd.DataFrame(columns))
+
+class ParsedUpload:
+    """
+    An uploaded JSON database, decoded once and passed through the whole upload workflow
+    
+    Format detection reads only the metadata and first question of the lazy index; the
+    questions are decoded the first time they are needed and the DataFrame is built the
+    first time it is asked for.
+    """
+    
+    def __init__(self, content: Union[str, bytes], filename: str = ''):
+        self.filename = filename
+        self.size = len(content)
+        # None, or why the upload cannot be loaded: "invalid_json", "unknown" or "error"
+        self.error: Optional[str] = None
+        self.error_message = ''
+        self.metadata: Dict[str, Any] = {}
+        self.format_version: Optional[str] = None
+        self.database_type = "empty"
+        self.question_count = 0
+        self._source: Optional[LazyQuestionFile] = None
+        self._questions: Optional[List[Dict[str, Any]]] = None
+        self._df: Optional[pd.DataFrame] = None
+        
+        try:
+            self._source = LazyQuestionFile(content)
+            if not self._source.has_questions:
+                self.error = "unknown"
+            else:
+                self.metadata = self._source.metadata
+                self.question_count = len(self._source)
+                self._detect_format()
+        except json.JSONDecodeError as e:
+            self.error, self.error_message = "invalid_json", str(e)
+        except Exception as e:
+            self.error, self.error_message = "error", str(e)
+        if self.error:
+            self._source = None
+    
+    def _detect_format(self) -> None:
+        # Detect format version
+        self.format_version = "Unknown"
+        if self.metadata.get('format_version'):
+            self.format_version = self.metadata['format_version']
+        elif self.question_count > 0:
+            # Analyze first question to guess format
+            sample_q = self._source.first_question()
+            if 'subtopic' in sample_q:
+                self.format_version = "Phase Four"
+            elif 'topic' in sample_q:
+                self.format_version = "Phase Three"
+            else:
+                self.format_version = "Legacy"
+        
+        # Determine database type based on content analysis
+        if self.question_count == 0:
+            self.database_type = "empty"
+        elif self.question_count < 10:
+            self.database_type = "small_set"
+        elif self.question_count < 50:
+            self.database_type = "medium_set"
+        else:
+            self.database_type = "large_set"
+    
+    def detection(self) -> Tuple[Optional[str], str, int, Dict]:
+        """(format_version, database_type, questions_count, metadata), as detect_database_format_and_type"""
+        if self.error:
+            return None, self.error, 0, {}
+        return self.format_version, self.database_type, self.question_count, self.metadata
+    
+    @property
+    def questions(self) -> List[Dict[str, Any]]:
+        """The decoded questions (decoded on first access; the raw content is then released)"""
+        if self._questions is None:
+            if self._source is None:
+                raise ValueError(f"Upload cannot be loaded: {self.error_message or self.error}")
+            self._questions = self._source.load_all()
+            self._source = None
+        return self._questions
+    
+    @property
+    def df(self) -> pd.DataFrame:
+        """Question DataFrame, built on first access"""
+        if self._df is None:
+            self._df = questions_to_dataframe(self.questions)
+        return self._df
+
+def load_database_from_json(json_content: Union[str, ParsedUpload]) -> Tuple[Optional[pd.DataFrame], Dict, List, List]:
+    """Load and process JSON database content (raw, or an already parsed upload) with automatic LaTeX processing"""
     try:
-        data = json.loads(json_content)
+        upload = json_content if isinstance(json_content, ParsedUpload) else ParsedUpload(json_content)
         
         # Handle both formats: {"questions": [...]} or direct [...]
-        if isinstance(data, dict) and 'questions' in data:
-            questions = data['questions']
-            metadata = data.get('metadata', {})
-        elif isinstance(data, list):
-            questions = data
-            metadata = {}
-        else:
+        if upload.error == "invalid_json":
+            raise json.JSONDecodeError(upload.error_message, '', 0)
+        if upload.error:
             st.error("❌ Unexpected JSON structure")
             return None, None, None, None
+        questions = upload.questions
+        metadata = upload.metadata
         
         # LaTeX Processing Step (currently using raw approach)
         cleanup_reports = []
@@ -57,91 +284,7 @@ def load_database_from_json(json_content: str) -> Tuple[Optional[pd.DataFrame],
         questions = processed_questions
         
         # Convert to DataFrame using same logic as database_transformer.py
-        rows = []
-        for i, q in enumerate(questions):
-            # Generate question ID
-            question_id = f"Q_{i+1:05d}"
-            
-            # Extract basic fields with defaults and handle None values
-            question_type = q.get('type', 'multiple_choice')
-            title = q.get('title', f"Question {i+1}")
-            question_text = q.get('question_text', '')
-            
-            # Handle correct_answer properly for multiple choice
-            original_correct_answer = q.get('correct_answer', '')
-            choices = q.get('choices', [])
-
-            # Clean up choices and handle None values
-            if choices is None:
-                choices = []
-            elif not isinstance(choices, list):
-                choices = []
-
-            # Ensure we have 4 choices
-            while len(choices) < 4:
-                choices.append('')
-
-            choice_a = str(choices[0]) if choices[0] else ''
-            choice_b = str(choices[1]) if choices[1] else ''
-            choice_c = str(choices[2]) if choices[2] else ''
-            choice_d = str(choices[3]) if choices[3] else ''
-
-            # Convert correct answer text to letter for multiple choice
-            if question_type == 'multiple_choice':
-                correct_answer = find_correct_letter(original_correct_answer, [choice_a, choice_b, choice_c, choice_d])
-            else:
-                correct_answer = str(original_correct_answer) if original_correct_answer else ''
-                
-            points = q.get('points', 1)
-            tolerance = q.get('tolerance', 0.05)
-            topic = q.get('topic', 'General')
-            subtopic = q.get('subtopic', '')
-            difficulty = q.get('difficulty', 'Easy')
-            
-            # Handle image file (could be list, string, or None)
-            image_file = q.get('image_file', [])
-            if image_file is None:
-                image_file = ''
-            elif isinstance(image_file, list):
-                image_file = image_file[0] if image_file else ''
-            elif not isinstance(image_file, str):
-                image_file = str(image_file) if image_file else ''
-            
-            # Extract feedback fields (handle None values)
-            feedback_correct = q.get('feedback_correct', '') or ''
-            feedback_incorrect = q.get('feedback_incorrect', '') or ''
-            general_feedback = feedback_correct  # Use correct feedback as default
-            
-            # Handle None values for tolerance and points
-            if tolerance is None:
-                tolerance = 0.05
-            if points is None:
-                points = 1
-            
-            # Create row
-            row = {
-                'ID': question_id,
-                'Type': question_type,
-                'Title': title,
-                'Question_Text': question_text,
-                'Choice_A': choice_a,
-                'Choice_B': choice_b,
-                'Choice_C': choice_c,
-                'Choice_D': choice_d,
-                'Correct_Answer': correct_answer,
-                'Points': points,
-                'Tolerance': tolerance,
-                'Feedback': general_feedback,
-                'Correct_Feedback': feedback_correct,
-                'Incorrect_Feedback': feedback_incorrect,
-                'Image_File': image_file,
-                'Topic': topic,
-                'Subtopic': subtopic,
-                'Difficulty': difficulty
-            }
-            rows.append(row)
-        
-        df = pd.DataFrame(rows)
+        df = upload.df
         
         # Return processed data including cleanup reports
         return df, metadata, processed_questions, cleanup_reports
@@ -153,6 +296,60 @@ def load_database_from_json(json_content: str) -> Tuple[Optional[pd.DataFrame],
         st.error(f"❌ Error processing database: {e}")
         return None, None, None, None
 
+def load_database_from_store(bank_name: str) -> Tuple[Optional[pd.DataFrame], Dict, List, List]:
+    """
+    Load a saved question bank without re-parsing its source JSON
+    
+    Args:
+        bank_name: Name the bank was saved under
+    
+    Returns:
+        (df, metadata, questions, row_keys): as load_database_from_json, with the questions'
+        (row id, version) store keys in place of cleanup reports (banks are cleaned before saving)
+    """
+    try:
+        store = get_question_store()
+        rows = store.load_rows(bank_name)
+        metadata = store.get_metadata(bank_name)
+        questions = [question for _, _, question in rows]
+        df = questions_to_dataframe(questions)
+        return df, metadata, questions, [(row_id, version) for row_id, version, _ in rows]
+    except Exception as e:
+        st.error(f"❌ Error loading question bank '{bank_name}': {e}")
+        return None, None, None, None
+
+def _sync_store(action: str, question_index: int, question: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Write an edit through to the saved bank the session was opened from, if any
+    
+    Questions are addressed by their store row id and loaded version (st.session_state['bank_rows'],
+    parallel to original_questions), so edits never land on another question and changes made by
+    another session since loading are not overwritten.
+    """
+    bank_name = st.session_state.get('bank_name')
+    bank_rows = st.session_state.get('bank_rows')
+    if not bank_name or bank_rows is None or question_index >= len(bank_rows):
+        return
+    row_id, version = bank_rows[question_index]
+    if action == 'delete':
+        bank_rows.pop(question_index)
+    try:
+        store = get_question_store()
+        if action == 'update':
+            bank_rows[question_index] = (row_id, store.update_question(bank_name, row_id, question, version))
+        else:
+            store.delete_question(bank_name, row_id, version)
+    except QuestionConflictError as e:
+        st.warning(f"⚠️ Change kept in this session but not saved to bank '{bank_name}': {e}. "
+                   "Reopen the bank to load the other session's changes.")
+    except Exception as e:
+        st.warning(f"⚠️ Change kept in this session but not saved to bank '{bank_name}': {e}")
+
+def reset_derived_state() -> None:
+    """Drop indexes, caches and edit tracking of the previous database (call on every load)"""
+    for key in DERIVED_STATE_KEYS:
+        st.session_state.pop(key, None)
+
 def assign_new_question_ids(df: pd.DataFrame) -> pd.DataFrame:
     """Assign new sequential IDs while preserving originals"""
     df = df.copy()
@@ -230,7 +427,7 @@ def validate_single_question(question_row) -> Dict[str, Any]:
         'is_valid': len(errors) == 0
     }
 
-def process_single_database(content: str, options: Dict[str, Any]) -> Optional[pd.DataFrame]:
+def process_single_database(content: Union[str, ParsedUpload], options: Dict[str, Any]) -> Optional[pd.DataFrame]:
     """Process a single database with enhanced options"""
     
     with st.spinner("🔄 Processing database..."):
@@ -251,7 +448,11 @@ def process_single_database(content: str, options: Dict[str, Any]) -> Optional[p
                             st.write(f"• {error}")
             
             # Store enhanced data in session state
+            reset_derived_state()
             st.session_state['df'] = df
+            st.session_state.pop('bank_name', None)
+            st.session_state.pop('bank_rows', None)
+            st.session_state.pop('parsed_upload', None)
             st.session_state['metadata'] = metadata
             st.session_state['original_questions'] = original_questions
             st.session_state['cleanup_reports'] = cleanup_reports
@@ -264,7 +465,7 @@ def process_single_database(content: str, options: Dict[str, Any]) -> Optional[p
         
         return None
 
-def process_append_operation(content: str, options: Dict[str, Any]) -> Optional[pd.DataFrame]:
+def process_append_operation(content: Union[str, ParsedUpload], options: Dict[str, Any]) -> Optional[pd.DataFrame]:
     """Process appending new questions to existing database"""
     
     st.markdown("### ➕ Appending to Existing Database")
@@ -286,11 +487,11 @@ def process_append_operation(content: str, options: Dict[str, Any]) -> Optional[
     duplicate_handling = options['handle_duplicates']
     
     if duplicate_handling == "Skip duplicates":
-        # Simple duplicate detection based on question text
-        existing_texts = set(df_current['Question_Text'].str.strip().str.lower())
-        new_texts = df_new['Question_Text'].str.strip().str.lower()
+        # Duplicate detection on normalized content fingerprints (whitespace, LaTeX spacing, number formatting)
+        existing_fingerprints = {question_fingerprint(row) for row in df_current.to_dict('records')}
+        new_fingerprints = [question_fingerprint(row) for row in df_new.to_dict('records')]
         
-        duplicates_mask = new_texts.isin(existing_texts)
+        duplicates_mask = pd.Series([fp in existing_fingerprints for fp in new_fingerprints], index=df_new.index)
         df_to_add = df_new[~duplicates_mask]
         
         if duplicates_mask.sum() > 0:
@@ -302,21 +503,41 @@ def process_append_operation(content: str, options: Dict[str, Any]) -> Optional[
         df_to_add = df_new
         st.info(f"📊 Adding all {len(df_to_add)} questions")
     
+    # Report near-duplicates between the existing bank and the new questions
+    current_count = len(df_current)
+    combined_records = df_current.to_dict('records') + df_to_add.to_dict('records')
+    near_groups = [
+        group for group in DuplicateDetector().find_duplicates(combined_records).near_groups
+        if group['indices'][0] < current_count <= group['indices'][-1]
+    ]
+    if near_groups:
+        similar_new_count = sum(1 for group in near_groups for index in group['indices'] if index >= current_count)
+        st.warning(f"🔁 {similar_new_count} new questions closely resemble existing ones")
+        with st.expander("View Near-Duplicate Questions"):
+            for group in near_groups:
+                ids = [str(combined_records[i].get('ID', i)) for i in group['indices'] if i < current_count]
+                new_titles = [str(combined_records[i].get('Title', '')) for i in group['indices'] if i >= current_count]
+                st.write(f"• {', '.join(new_titles)} ≈ existing {', '.join(ids)} (≥ {group['min_similarity']:.0%} similar)")
+    
     if len(df_to_add) > 0:
         # Combine databases
         if options['renumber_ids']:
             # Renumber all IDs sequentially
-            combined_df = pd.concat([df_current, df_to_add], ignore_index=True)
+            combined_df = compact_dtypes(pd.concat([df_current, df_to_add], ignore_index=True))
             combined_df['ID'] = [f"Q_{i+1:05d}" for i in range(len(combined_df))]
         else:
             # Keep existing IDs, assign new ones for added questions
             max_id = len(df_current)
             df_to_add = df_to_add.copy()
             df_to_add['ID'] = [f"Q_{max_id + i + 1:05d}" for i in range(len(df_to_add))]
-            combined_df = pd.concat([df_current, df_to_add], ignore_index=True)
+            combined_df = compact_dtypes(pd.concat([df_current, df_to_add], ignore_index=True))
         
         # Update session state
+        reset_derived_state()
         st.session_state['df'] = combined_df
+        st.session_state.pop('bank_name', None)
+        st.session_state.pop('bank_rows', None)
+        st.session_state.pop('parsed_upload', None)
         st.session_state['filename'] = f"appended_{options['filename']}"
         
         st.success(f"✅ Successfully appended {len(df_to_add)} questions!")
@@ -329,58 +550,55 @@ def process_append_operation(content: str, options: Dict[str, Any]) -> Optional[
         return None
 
 def save_question_changes(question_index: int, changes: Dict[str, Any]) -> bool:
-    """Save changes to both DataFrame and original_questions"""
+    """
+    Save changes to both DataFrame and original_questions
+    
+    Only the keys present in changes are applied, so compact editors can pass a subset
+    of fields. Columns whose value actually changed are recorded for incremental export.
+    """
     
     try:
         # Get current data
-        df = st.session_state['df'].copy()
+        previous_df = st.session_state['df']
+        df = previous_df.copy()
         original_questions = st.session_state['original_questions'].copy()
         
         # Update DataFrame
-        df.loc[question_index, 'Title'] = changes['title']
-        df.loc[question_index, 'Type'] = changes['question_type']
-        df.loc[question_index, 'Difficulty'] = changes['difficulty']
-        df.loc[question_index, 'Points'] = changes['points']
-        df.loc[question_index, 'Topic'] = changes['topic']
-        df.loc[question_index, 'Subtopic'] = changes['subtopic']
-        df.loc[question_index, 'Question_Text'] = changes['question_text']
-        df.loc[question_index, 'Choice_A'] = changes['choice_a']
-        df.loc[question_index, 'Choice_B'] = changes['choice_b']
-        df.loc[question_index, 'Choice_C'] = changes['choice_c']
-        df.loc[question_index, 'Choice_D'] = changes['choice_d']
-        df.loc[question_index, 'Correct_Answer'] = changes['correct_answer']
-        df.loc[question_index, 'Tolerance'] = changes['tolerance']
-        df.loc[question_index, 'Correct_Feedback'] = changes['correct_feedback']
-        df.loc[question_index, 'Incorrect_Feedback'] = changes['incorrect_feedback']
-        df.loc[question_index, 'Feedback'] = changes['correct_feedback']
+        changed_columns = []
+        for change_key, (columns, _) in QUESTION_CHANGE_FIELDS.items():
+            if change_key not in changes:
+                continue
+            value = changes[change_key]
+            for column in columns:
+                current = df.at[question_index, column] if column in df.columns else None
+                if current is None or pd.isna(current) or current != value:
+                    changed_columns.append(column)
+                set_cell(df, question_index, column, value)
         
         # Update original_questions (for QTI export compatibility)
         if question_index < len(original_questions):
             q = original_questions[question_index]
-            q['title'] = changes['title']
-            q['type'] = changes['question_type']
-            q['difficulty'] = changes['difficulty']
-            q['points'] = changes['points']
-            q['topic'] = changes['topic']
-            q['subtopic'] = changes['subtopic']
-            q['question_text'] = changes['question_text']
-            q['correct_answer'] = changes['correct_answer']
-            q['tolerance'] = changes['tolerance']
-            q['feedback_correct'] = changes['correct_feedback']
-            q['feedback_incorrect'] = changes['incorrect_feedback']
+            for change_key, (columns, json_key) in QUESTION_CHANGE_FIELDS.items():
+                if json_key and change_key in changes:
+                    if q.get(json_key) != changes[change_key]:
+                        changed_columns.extend(columns)
+                    q[json_key] = changes[change_key]
             
             # Update choices for multiple choice
-            if changes['question_type'] == 'multiple_choice':
-                q['choices'] = [
-                    changes['choice_a'],
-                    changes['choice_b'],
-                    changes['choice_c'],
-                    changes['choice_d']
-                ]
+            question_type = changes.get('question_type', q.get('type'))
+            if question_type == 'multiple_choice' and all(key in changes for key in CHOICE_CHANGE_KEYS):
+                choices = [changes[key] for key in CHOICE_CHANGE_KEYS]
+                if q.get('choices') != choices:
+                    changed_columns.extend(['Choice_A', 'Choice_B', 'Choice_C', 'Choice_D'])
+                q['choices'] = choices
         
         # Update session state
         st.session_state['df'] = df
         st.session_state['original_questions'] = original_questions
+        update_search_index_row(previous_df, df, question_index)
+        mark_rows_dirty([question_index], changed_columns)
+        if question_index < len(original_questions):
+            _sync_store('update', question_index, original_questions[question_index])
         
         # Validate the changes
         validation_results = validate_single_question(df.iloc[question_index])
@@ -420,9 +638,11 @@ def delete_question(question_index: int) -> bool:
         # Regenerate question IDs to maintain sequence
         df_updated['ID'] = [f"Q_{i+1:05d}" for i in range(len(df_updated))]
         
-        # Update session state
+        # Update session state (rows after the deleted one move up, so label-keyed state is stale)
+        reset_derived_state()
         st.session_state['df'] = df_updated
         st.session_state['original_questions'] = original_questions_updated
+        _sync_store('delete', question_index)
         
         # Clear any edit session states for this question to avoid conflicts
         keys_to_remove = []
@@ -0,0 +1,285 @@
+# modules/dedup_engine.py
+"""
+Dedup Engine - Content fingerprints and near-duplicate detection across question banks
+Exact duplicates are grouped by normalized-content hash; near-duplicates are found with
+MinHash signatures and LSH banding, so comparisons scale sub-quadratically
+"""
+
+import hashlib
+import os
+import re
+import sys
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# LaTeX corrections come from the q2JSON pipeline's LaTeXCorrector (single source of truth),
+# so "0.4,text{V}" and "0.4\,\text{V}" normalize identically
+Q2JSON_MODULES_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..', 'modules'))
+if os.path.isdir(Q2JSON_MODULES_PATH) and Q2JSON_MODULES_PATH not in sys.path:
+    # Appended so Q2LMS modules of the same name keep precedence
+    sys.path.append(Q2JSON_MODULES_PATH)
+
+try:
+    from latex_corrector import LaTeXCorrector
+    LATEX_RULE_SET = LaTeXCorrector().rule_set
+except ImportError:
+    # Q2LMS deployed without q2JSON: fingerprints skip the LaTeX corrections
+    LATEX_RULE_SET = None
+
+# LaTeX spacing commands and math delimiters carry no content
+LATEX_SPACING_PATTERN = re.compile(r'\\[,;:! ]|~|\\quad|\\qquad')
+MATH_DELIMITER_PATTERN = re.compile(r'\$+|\\[()\[\]]')
+TEXT_COMMAND_PATTERN = re.compile(r'\\(?:text|mathrm)\{\s*([^}]*?)\s*\}')
+THOUSANDS_PATTERN = re.compile(r'(?<=\d),(?=\d{3}(?!\d))')
+NUMBER_PATTERN = re.compile(r'(?<![\w.])(\d*\.\d+|\d+\.?)(?![\w.])')
+TOKEN_PATTERN = re.compile(r'\\[a-zA-Z]+|[^\W_]+(?:\.\d+)?|[^\s\w]')
+
+CHOICE_COLUMNS = ('Choice_A', 'Choice_B', 'Choice_C', 'Choice_D', 'Choice_E')
+
+# MinHash / LSH configuration: 16 bands x 4 rows puts the LSH threshold near 0.5
+NUM_PERMUTATIONS = 64
+NUM_BANDS = 16
+SHINGLE_SIZE = 3
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+
+def _format_number(match: re.Match) -> str:
+    """Canonical number formatting: '0.50' -> '0.5', '5.0' -> '5', '.5' -> '0.5'"""
+    text = match.group(1)
+    if '.' not in text:
+        return str(int(text))
+    integer, _, fraction = text.partition('.')
+    fraction = fraction.rstrip('0')
+    integer = str(int(integer)) if integer else '0'
+    return f"{integer}.{fraction}" if fraction else integer
+
+
+def normalize_text(text: Any) -> str:
+    """
+    Normalize question text for fingerprinting
+
+    Applies LaTeX correction rules, removes LaTeX spacing and math delimiters,
+    canonicalizes number formatting and whitespace, and lowercases.
+
+    Args:
+        text: Field value (None/NaN become empty)
+
+    Returns:
+        str: Normalized text
+    """
+    if text is None or (isinstance(text, float) and text != text):
+        return ''
+    text = str(text)
+
+    if LATEX_RULE_SET is not None:
+        text, _ = LATEX_RULE_SET.apply(text)
+
+    if '\\' in text or '$' in text or '~' in text:
+        text = LATEX_SPACING_PATTERN.sub(' ', text)
+        text = MATH_DELIMITER_PATTERN.sub(' ', text)
+        text = TEXT_COMMAND_PATTERN.sub(r' \1 ', text)
+    if ',' in text:
+        text = THOUSANDS_PATTERN.sub('', text)
+    text = NUMBER_PATTERN.sub(_format_number, text)
+    return ' '.join(text.lower().split())
+
+
+def _get_field(question: Dict[str, Any], *keys: str) -> Any:
+    """Return the first present field among alternative key names"""
+    for key in keys:
+        if key in question:
+            return question[key]
+    return ''
+
+
+def question_choices(question: Dict[str, Any]) -> List[Any]:
+    """Get choices from a JSON question ('choices' list) or a DataFrame row (Choice_A..E)"""
+    choices = _get_field(question, 'choices', 'Choices')
+    if isinstance(choices, (list, tuple)):
+        return list(choices)
+    if choices:
+        return [choices]
+    return [question[column] for column in CHOICE_COLUMNS if question.get(column)]
+
+
+def question_content_text(question: Dict[str, Any]) -> str:
+    """Normalized question text plus choices - the content compared for duplicates"""
+    parts = [normalize_text(_get_field(question, 'question_text', 'Question_Text', 'question', 'Question'))]
+    parts.extend(normalize_text(choice) for choice in question_choices(question))
+    return ' | '.join(part for part in parts if part)
+
+
+def question_fingerprint(question: Dict[str, Any], content_text: Optional[str] = None) -> str:
+    """
+    Hash of a question's normalized content, independent of ID and metadata
+
+    Args:
+        question (Dict[str, Any]): JSON question dict or DataFrame row mapping
+        content_text (str, optional): Precomputed question_content_text(question)
+
+    Returns:
+        str: Hex digest of type, normalized text/choices and correct answer
+    """
+    if content_text is None:
+        content_text = question_content_text(question)
+    parts = [
+        str(_get_field(question, 'type', 'Type')),
+        content_text,
+        normalize_text(_get_field(question, 'correct_answer', 'Correct_Answer')),
+    ]
+    return hashlib.blake2b('\x1f'.join(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """Word-level shingles of normalized text (whole text for very short questions)"""
+    tokens = TOKEN_PATTERN.findall(text)
+    if len(tokens) < size:
+        return {' '.join(tokens)} if tokens else set()
+    return {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+@dataclass
+class DuplicateReport:
+    """Exact and near-duplicate groups found in a list of questions"""
+    exact_groups: List[List[int]] = field(default_factory=list)
+    near_groups: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def exact_duplicate_indices(self) -> List[int]:
+        """Indices of every question that repeats an earlier one exactly"""
+        return sorted(index for group in self.exact_groups for index in group[1:])
+
+    @property
+    def near_duplicate_count(self) -> int:
+        """Number of questions that closely resemble an earlier one"""
+        return sum(len(group['indices']) - 1 for group in self.near_groups)
+
+
+class DuplicateDetector:
+    """
+    Finds exact duplicates by fingerprint and near-duplicates with MinHash/LSH.
+
+    Only questions that land in a shared LSH bucket are compared, and each
+    candidate pair is confirmed with the exact Jaccard similarity of its shingles.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_permutations: int = NUM_PERMUTATIONS,
+                 num_bands: int = NUM_BANDS, seed: int = 1):
+        if num_permutations % num_bands:
+            raise ValueError("num_permutations must be divisible by num_bands")
+        self.threshold = threshold
+        self.num_bands = num_bands
+        self.rows_per_band = num_permutations // num_bands
+        rng = np.random.default_rng(seed)
+        # Coefficients below 2**32 keep a*x + b inside uint64 for 32-bit shingle hashes
+        self._a = rng.integers(1, MAX_HASH, size=num_permutations, dtype=np.uint64)
+        self._b = rng.integers(0, MAX_HASH, size=num_permutations, dtype=np.uint64)
+
+    def signature(self, shingle_set: set) -> np.ndarray:
+        """MinHash signature of a shingle set"""
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingle_set),
+                             dtype=np.uint64, count=len(shingle_set))
+        # Universal hashing (a*x + b) mod p, folded to 32 bits
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % np.uint64(MERSENNE_PRIME)
+        return (permuted & np.uint64(MAX_HASH)).min(axis=1)
+
+    def find_duplicates(self, questions: List[Dict[str, Any]]) -> DuplicateReport:
+        """
+        Group exact and near-duplicate questions
+
+        Args:
+            questions (List[Dict]): Question dicts (or DataFrame row mappings)
+
+        Returns:
+            DuplicateReport: Exact groups (by fingerprint) and near-duplicate groups
+        """
+        report = DuplicateReport()
+
+        # Exact duplicates: only the first question of each fingerprint goes on to LSH
+        first_by_fingerprint: Dict[str, int] = {}
+        exact_groups: Dict[str, List[int]] = {}
+        representatives = []
+        content_texts = {}
+        for index, question in enumerate(questions):
+            content_text = question_content_text(question)
+            fingerprint = question_fingerprint(question, content_text)
+            if fingerprint in first_by_fingerprint:
+                group = exact_groups.setdefault(fingerprint, [first_by_fingerprint[fingerprint]])
+                group.append(index)
+            else:
+                first_by_fingerprint[fingerprint] = index
+                representatives.append(index)
+                content_texts[index] = content_text
+        report.exact_groups = list(exact_groups.values())
+
+        report.near_groups = self._find_near_groups(content_texts)
+        return report
+
+    def _find_near_groups(self, content_texts: Dict[int, str]) -> List[Dict[str, Any]]:
+        """LSH banding over MinHash signatures, confirmed by Jaccard similarity"""
+        shingle_sets = {index: shingles(text) for index, text in content_texts.items()}
+        buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        for index, shingle_set in shingle_sets.items():
+            if not shingle_set:
+                continue
+            signature = self.signature(shingle_set)
+            for band in range(self.num_bands):
+                start = band * self.rows_per_band
+                key = (band, signature[start:start + self.rows_per_band].tobytes())
+                buckets.setdefault(key, []).append(index)
+
+        parent: Dict[int, int] = {}
+
+        def find(index: int) -> int:
+            root = index
+            while parent.get(root, root) != root:
+                root = parent[root]
+            while index != root:
+                parent[index], index = root, parent[index]
+            return root
+
+        checked = set()
+        matched_pairs = []
+        for members in buckets.values():
+            for i, left in enumerate(members):
+                for right in members[i + 1:]:
+                    if (left, right) in checked:
+                        continue
+                    checked.add((left, right))
+                    a, b = shingle_sets[left], shingle_sets[right]
+                    similarity = len(a & b) / len(a | b)
+                    if similarity >= self.threshold:
+                        matched_pairs.append((left, right, similarity))
+                        root_left, root_right = find(left), find(right)
+                        if root_left != root_right:
+                            parent[max(root_left, root_right)] = min(root_left, root_right)
+                            parent.setdefault(min(root_left, root_right), min(root_left, root_right))
+
+        groups: Dict[int, Dict[str, Any]] = {}
+        for left, right, similarity in matched_pairs:
+            group = groups.setdefault(find(left), {'indices': set(), 'min_similarity': 1.0})
+            group['indices'].update((left, right))
+            group['min_similarity'] = min(group['min_similarity'], similarity)
+
+        return [
+            {'indices': sorted(group['indices']), 'min_similarity': group['min_similarity']}
+            for _, group in sorted(groups.items())
+        ]
+
+
+def find_duplicate_questions(questions: List[Dict[str, Any]], threshold: float = 0.8) -> DuplicateReport:
+    """
+    Convenience wrapper around DuplicateDetector
+
+    Args:
+        questions (List[Dict]): Questions to check
+        threshold (float): Minimum shingle Jaccard similarity for near-duplicates
+
+    Returns:
+        DuplicateReport: Exact and near-duplicate groups
+    """
+    return DuplicateDetector(threshold=threshold).find_duplicates(questions)
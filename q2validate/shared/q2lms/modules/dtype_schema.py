@@ -0,0 +1,178 @@
+# modules/dtype_schema.py
+"""
+Dtype Schema - Compact column types for the questions DataFrame
+Low-cardinality columns are stored as categoricals, whole-number columns as the
+smallest nullable integer that fits, and long text as Arrow-backed strings when
+pyarrow is installed. The schema is applied whenever a DataFrame is loaded;
+filtering, flagging and exporting keep the dtypes, and set_cell keeps edits valid.
+"""
+
+import numpy as np
+import pandas as pd
+from collections.abc import Hashable
+from typing import Any, Dict, Optional
+
+# Column -> storage kind
+COLUMN_SCHEMA = {
+    'ID': 'text',
+    'Type': 'category',
+    'Title': 'text',
+    'Question_Text': 'text',
+    'Choice_A': 'text',
+    'Choice_B': 'text',
+    'Choice_C': 'text',
+    'Choice_D': 'text',
+    'Correct_Answer': 'category',
+    'Points': 'integer',
+    'Feedback': 'text',
+    'Correct_Feedback': 'text',
+    'Incorrect_Feedback': 'text',
+    'Image_File': 'text',
+    'Topic': 'category',
+    'Subtopic': 'category',
+    'Difficulty': 'category',
+}
+# Tolerance stays float64: float32 would change exported values (0.05 -> 0.0500000007)
+
+CATEGORY_COLUMNS = [column for column, kind in COLUMN_SCHEMA.items() if kind == 'category']
+
+NULLABLE_INTEGER_DTYPES = ['Int8', 'Int16', 'Int32', 'Int64']
+
+
+def _arrow_string_dtype() -> Optional[pd.StringDtype]:
+    """Arrow-backed string dtype with NaN missing values (same semantics as object columns), if available"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+    try:
+        return pd.StringDtype('pyarrow', na_value=np.nan)  # pandas >= 2.3
+    except TypeError:
+        pass
+    try:
+        return pd.StringDtype('pyarrow_numpy')  # pandas 2.1 - 2.2
+    except (TypeError, ValueError):
+        return None
+
+
+TEXT_DTYPE = _arrow_string_dtype()
+
+
+def _compact_integer(series: pd.Series) -> pd.Series:
+    """Smallest nullable integer dtype holding the column, or the column unchanged"""
+    if isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(series.dtype):
+        return series
+    numbers = pd.to_numeric(series, errors='coerce')
+    present = series.notna()
+    if numbers[present].isna().any() or not pd.api.types.is_numeric_dtype(numbers):
+        return series  # Non-numeric values: leave as entered
+    values = numbers[present]
+    if len(values) and not (values % 1 == 0).all():
+        return numbers if pd.api.types.is_float_dtype(series) else series
+    low = values.min() if len(values) else 0
+    high = values.max() if len(values) else 0
+    for dtype in NULLABLE_INTEGER_DTYPES:
+        info = np.iinfo(dtype.lower())
+        if info.min <= low and high <= info.max:
+            return numbers.astype(dtype)
+    return series
+
+
+def category_values(values: Any) -> Any:
+    """
+    Values ready to become categories: unhashable ones (e.g. a list-valued topic) as their string form
+
+    Returns:
+        The values unchanged when they are all hashable, else a list
+    """
+    values = list(values)
+    if all(isinstance(value, Hashable) for value in values):
+        return values
+    return [value if isinstance(value, Hashable) else str(value) for value in values]
+
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Apply COLUMN_SCHEMA to a questions DataFrame
+
+    Columns already in their schema dtype are left alone, so this is cheap to repeat
+    (e.g. after concatenating banks, which drops categoricals with differing categories).
+
+    Returns:
+        pd.DataFrame: The DataFrame with compact dtypes (a new object if anything changed)
+    """
+    if df is None or df.empty:
+        return df
+
+    converted = {}
+    for column, kind in COLUMN_SCHEMA.items():
+        if column not in df.columns:
+            continue
+        series = df[column]
+        if kind == 'category':
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                if series.dtype == object:
+                    series = pd.Series(category_values(series), index=series.index, dtype=object)
+                converted[column] = series.astype('category')
+        elif kind == 'integer':
+            compact = _compact_integer(series)
+            if compact.dtype != series.dtype:
+                converted[column] = compact
+        elif kind == 'text' and TEXT_DTYPE is not None and series.dtype != TEXT_DTYPE:
+            try:
+                converted[column] = series.astype(TEXT_DTYPE)
+            except (TypeError, ValueError):
+                pass  # Values pyarrow cannot hold as strings: keep the column as is
+
+    if not converted:
+        return df
+    return df.assign(**converted)
+
+
+def set_cell(df: pd.DataFrame, index: Any, column: str, value: Any) -> None:
+    """
+    Set one value in place, widening the column's dtype when the value does not fit
+
+    Categoricals gain the new category; compact integer columns move to a wider
+    integer dtype for whole numbers out of their range, and become float or object
+    columns for fractional or non-numeric values.
+    """
+    if column in df.columns:
+        dtype = df[column].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            if not pd.isna(value) and value not in dtype.categories:
+                df[column] = df[column].cat.add_categories([value])
+        elif dtype.name in NULLABLE_INTEGER_DTYPES and not pd.isna(value):
+            if not (isinstance(value, (int, float, np.number)) and float(value).is_integer()):
+                widened = 'float64' if isinstance(value, (float, np.floating)) else object
+                df[column] = df[column].astype(widened)
+            else:
+                number = int(value)
+                widths = NULLABLE_INTEGER_DTYPES[NULLABLE_INTEGER_DTYPES.index(dtype.name):]
+                fitting = [name for name in widths
+                           if np.iinfo(name.lower()).min <= number <= np.iinfo(name.lower()).max]
+                widened = fitting[0] if fitting else object
+                if widened != dtype.name:
+                    df[column] = df[column].astype(widened)
+    df.loc[index, column] = value
+
+
+def memory_report(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Deep memory usage of the DataFrame against the same data held as plain Python objects
+
+    Returns:
+        Dict with 'before' and 'after' byte totals and a per-column breakdown
+    """
+    after = df.memory_usage(deep=True, index=False)
+    before = df.astype(object).memory_usage(deep=True, index=False)
+    columns = pd.DataFrame({
+        'dtype': df.dtypes.astype(str),
+        'before_kb': (before / 1024).round(1),
+        'after_kb': (after / 1024).round(1),
+    })
+    return {
+        'before': int(before.sum()),
+        'after': int(after.sum()),
+        'columns': columns,
+    }
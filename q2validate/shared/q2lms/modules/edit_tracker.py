@@ -0,0 +1,54 @@
+# modules/edit_tracker.py
+"""
+Edit Tracker - Per-row dirty tracking for the question bank
+Editing paths record which rows (and columns) they changed so exports only re-sync those rows
+"""
+
+import streamlit as st
+from typing import Any, Dict, Iterable, Optional, Set
+
+DIRTY_ROWS_KEY = 'dirty_rows'
+
+# Columns that change which questions are exported, not what an exported question contains
+NON_CONTENT_FIELDS = {'selected', 'deleted'}
+
+ALL_FIELDS = '*'
+
+
+def mark_rows_dirty(labels: Iterable[Any], fields: Optional[Iterable[str]] = None) -> None:
+    """
+    Record edited rows
+
+    Args:
+        labels: DataFrame index labels of the edited questions
+        fields: Columns that changed; None marks every field
+    """
+    dirty: Dict[Any, Set[str]] = st.session_state.setdefault(DIRTY_ROWS_KEY, {})
+    changed = {ALL_FIELDS} if fields is None else set(fields)
+    if not changed:
+        return
+    for label in labels:
+        dirty.setdefault(label, set()).update(changed)
+
+
+def get_dirty_rows() -> Dict[Any, Set[str]]:
+    """Get edited rows and their changed fields without clearing them"""
+    return dict(st.session_state.get(DIRTY_ROWS_KEY, {}))
+
+
+def consume_content_dirty_rows() -> Set[Any]:
+    """
+    Take the rows whose question content changed since the last call
+
+    Flag-only edits are dropped as well, since they never change exported content.
+
+    Returns:
+        Set[Any]: Index labels of rows with content edits
+    """
+    dirty = st.session_state.pop(DIRTY_ROWS_KEY, {})
+    return {label for label, fields in dirty.items() if fields - NON_CONTENT_FIELDS}
+
+
+def reset_edit_tracking() -> None:
+    """Forget all recorded edits (e.g. when a new database is loaded)"""
+    st.session_state.pop(DIRTY_ROWS_KEY, None)
@@ -5,13 +5,21 @@ Canvas-specific adaptations for QTI export
 """
 
 from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import json
 import logging
+import threading
 
 from .qti_generator import QTIPackageBuilder
-from .latex_converter import CanvasLaTeXConverter
+from .latex_converter import CanvasLaTeXConverter, LaTeXAnalyzer
 
 logger = logging.getLogger(__name__)
 
+# Per-question pre-export analyses kept across exports and Streamlit reruns
+ANALYSIS_CACHE_SIZE = 20000
+
 
 class CanvasQTIAdapter:
     """Canvas-specific QTI package generator"""
@@ -67,32 +75,31 @@ class CanvasQTIAdapter:
         Returns:
             Canvas-optimized questions
         """
-        canvas_questions = []
+        return analyze_for_canvas(questions).canvas_questions()
+    
+    def _preprocess_question_for_canvas(self, question: Dict[str, Any]) -> Dict[str, Any]:
+        """Canvas-optimized copy of a single question"""
+        canvas_question = question.copy()
         
-        for question in questions:
-            canvas_question = question.copy()
-            
-            # Normalize question types for Canvas
-            canvas_question = self._normalize_question_type(canvas_question)
-            
-            # Ensure Canvas-compatible point values
-            canvas_question = self._normalize_points(canvas_question)
-            
-            # Handle Canvas-specific true/false format
-            if canvas_question.get('type') == 'true_false':
-                canvas_question = self._normalize_true_false(canvas_question)
-            
-            # Normalize choice format for multiple choice
-            if canvas_question.get('type') == 'multiple_choice':
-                canvas_question = self._normalize_multiple_choice(canvas_question)
-            
-            # Ensure numerical questions have proper format
-            if canvas_question.get('type') == 'numerical':
-                canvas_question = self._normalize_numerical(canvas_question)
-            
-            canvas_questions.append(canvas_question)
+        # Normalize question types for Canvas
+        canvas_question = self._normalize_question_type(canvas_question)
         
-        return canvas_questions
+        # Ensure Canvas-compatible point values
+        canvas_question = self._normalize_points(canvas_question)
+        
+        # Handle Canvas-specific true/false format
+        if canvas_question.get('type') == 'true_false':
+            canvas_question = self._normalize_true_false(canvas_question)
+        
+        # Normalize choice format for multiple choice
+        if canvas_question.get('type') == 'multiple_choice':
+            canvas_question = self._normalize_multiple_choice(canvas_question)
+        
+        # Ensure numerical questions have proper format
+        if canvas_question.get('type') == 'numerical':
+            canvas_question = self._normalize_numerical(canvas_question)
+        
+        return canvas_question
     
     def _normalize_question_type(self, question: Dict[str, Any]) -> Dict[str, Any]:
         """Normalize question type for Canvas"""
@@ -215,31 +222,7 @@ class CanvasImportValidator:
         Returns:
             Validation report with errors and warnings
         """
-        report = {
-            'valid': True,
-            'errors': [],
-            'warnings': [],
-            'question_issues': []
-        }
-        
-        for i, question in enumerate(questions):
-            issues = self._validate_single_question(question, i + 1)
-            
-            if issues['errors']:
-                report['errors'].extend(issues['errors'])
-                report['valid'] = False
-            
-            if issues['warnings']:
-                report['warnings'].extend(issues['warnings'])
-            
-            if issues['errors'] or issues['warnings']:
-                report['question_issues'].append({
-                    'question_number': i + 1,
-                    'title': question.get('title', f'Question {i + 1}'),
-                    'issues': issues
-                })
-        
-        return report
+        return analyze_for_canvas(questions).validation_report()
     
     def _validate_single_question(self, question: Dict[str, Any], question_num: int) -> Dict[str, List[str]]:
         """Validate a single question"""
@@ -304,28 +287,92 @@ class CanvasMetadataEnhancer:
         Returns:
             Canvas metadata dictionary
         """
-        total_points = sum(q.get('points', 1) for q in questions)
+        return analyze_for_canvas(questions).canvas_metadata()
+    
+    def _question_has_latex(self, question: Dict[str, Any]) -> bool:
+        """Check if question contains LaTeX"""
+        text_fields = [
+            question.get('question_text', ''),
+            question.get('feedback_correct', ''),
+            question.get('feedback_incorrect', '')
+        ]
         
-        # Analyze question types
-        type_counts = {}
-        for question in questions:
-            qtype = question.get('type', 'unknown')
-            type_counts[qtype] = type_counts.get(qtype, 0) + 1
+        # Add choices text
+        choices = question.get('choices', [])
+        text_fields.extend(str(choice) for choice in choices)
+        
+        # Simple check for dollar signs (LaTeX delimiters)
+        return any('$' in str(field) for field in text_fields)
+
+
+@dataclass
+class QuestionAnalysis:
+    """Everything the pre-export steps need to know about one question"""
+    title: Any
+    points: Any
+    type: Any
+    topic: Any
+    has_latex: bool
+    issues: Dict[str, List[str]]
+    latex: Dict[str, Any]
+    canvas_question: Dict[str, Any]
+
+
+class CanvasExportAnalysis:
+    """Pre-export analysis of a question set, built from cached per-question results"""
+    
+    def __init__(self, question_analyses: List[QuestionAnalysis]):
+        self.questions = question_analyses
+    
+    def canvas_questions(self) -> List[Dict[str, Any]]:
+        """Canvas-optimized questions (as _preprocess_questions_for_canvas)"""
+        return [analysis.canvas_question.copy() for analysis in self.questions]
+    
+    def validation_report(self) -> Dict[str, Any]:
+        """Validation report (as CanvasImportValidator.validate_questions_for_canvas)"""
+        report = {
+            'valid': True,
+            'errors': [],
+            'warnings': [],
+            'question_issues': []
+        }
         
-        # Analyze topics if available
+        for i, analysis in enumerate(self.questions):
+            issues = analysis.issues
+            
+            if issues['errors']:
+                report['errors'].extend(issues['errors'])
+                report['valid'] = False
+            
+            if issues['warnings']:
+                report['warnings'].extend(issues['warnings'])
+            
+            if issues['errors'] or issues['warnings']:
+                report['question_issues'].append({
+                    'question_number': i + 1,
+                    'title': analysis.title if analysis.title is not None else f'Question {i + 1}',
+                    'issues': _detached_copy(issues)
+                })
+        
+        return report
+    
+    def canvas_metadata(self) -> Dict[str, Any]:
+        """Canvas metadata (as CanvasMetadataEnhancer.enhance_assessment_metadata)"""
+        type_counts = {}
         topics = set()
-        for question in questions:
-            if question.get('topic'):
-                topics.add(question['topic'])
+        for analysis in self.questions:
+            type_counts[analysis.type] = type_counts.get(analysis.type, 0) + 1
+            if analysis.topic:
+                topics.add(analysis.topic)
         
-        metadata = {
+        return {
             'canvas_version': '2024',
             'qti_version': '1.2',
-            'total_questions': len(questions),
-            'total_points': total_points,
+            'total_questions': len(self.questions),
+            'total_points': sum(analysis.points for analysis in self.questions),
             'question_types': type_counts,
             'topics': list(topics),
-            'has_latex': any(self._question_has_latex(q) for q in questions),
+            'has_latex': any(analysis.has_latex for analysis in self.questions),
             'import_settings': {
                 'shuffle_answers': False,
                 'show_correct_answers': True,
@@ -334,23 +381,128 @@ class CanvasMetadataEnhancer:
                 'time_limit': None
             }
         }
-        
-        return metadata
     
-    def _question_has_latex(self, question: Dict[str, Any]) -> bool:
-        """Check if question contains LaTeX"""
-        text_fields = [
-            question.get('question_text', ''),
-            question.get('feedback_correct', ''),
-            question.get('feedback_incorrect', '')
-        ]
+    def latex_analysis(self) -> Dict[str, Any]:
+        """LaTeX usage (as LaTeXAnalyzer.analyze_questions)"""
+        return LaTeXAnalyzer.summarize([analysis.latex for analysis in self.questions])
+
+
+class CanvasPreExportAnalyzer:
+    """
+    Single-pass pre-export analysis for Canvas
+    
+    Validation, metadata, LaTeX usage and Canvas preprocessing are computed together
+    per question and cached by question content hash, so the export UI and the
+    package builder reuse each other's work.
+    """
+    
+    def __init__(self, cache_size: int = ANALYSIS_CACHE_SIZE):
+        self.adapter = CanvasQTIAdapter()
+        self.validator = CanvasImportValidator()
+        self.enhancer = CanvasMetadataEnhancer()
+        self.latex_analyzer = LaTeXAnalyzer()
+        self.cache_size = cache_size
+        self._cache: 'OrderedDict[str, QuestionAnalysis]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def question_hash(question: Dict[str, Any]) -> str:
+        """Hash of a question's full content"""
+        payload = json.dumps(question, sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def analyze_question(self, question: Dict[str, Any]) -> QuestionAnalysis:
+        """Analyze one question in a single traversal (uncached)"""
+        return QuestionAnalysis(
+            title=question.get('title'),
+            points=question.get('points', 1),
+            type=question.get('type', 'unknown'),
+            topic=question.get('topic'),
+            has_latex=self.enhancer._question_has_latex(question),
+            issues=self.validator._validate_single_question(question, 0),
+            latex=self.latex_analyzer.analyze_question(question),
+            # Cached results must not share nested lists with the caller's question
+            canvas_question=self.adapter._preprocess_question_for_canvas(_detached_copy(question))
+        )
+    
+    def analyze(self, questions: List[Dict[str, Any]], executor=None) -> CanvasExportAnalysis:
+        """
+        Analyze a question set, reusing cached per-question results
         
-        # Add choices text
-        choices = question.get('choices', [])
-        text_fields.extend(str(choice) for choice in choices)
+        Args:
+            questions: List of question dictionaries
+            executor: Optional concurrent.futures executor; cache misses are analyzed with executor.map
+            
+        Returns:
+            CanvasExportAnalysis for the questions, in order
+        """
+        keys = [self.question_hash(question) for question in questions]
+        results: List[Optional[QuestionAnalysis]] = [None] * len(questions)
+        missing: Dict[str, List[int]] = {}
+        
+        with self._lock:
+            for position, key in enumerate(keys):
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    results[position] = cached
+                else:
+                    missing.setdefault(key, []).append(position)
+        
+        if missing:
+            to_analyze = [questions[positions[0]] for positions in missing.values()]
+            if executor is not None:
+                analyses = list(executor.map(self.analyze_question, to_analyze))
+            else:
+                analyses = [self.analyze_question(question) for question in to_analyze]
+            
+            with self._lock:
+                for (key, positions), analysis in zip(missing.items(), analyses):
+                    for position in positions:
+                        results[position] = analysis
+                    self._cache[key] = analysis
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        
+        return CanvasExportAnalysis(results)
+    
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+def _detached_copy(value: Any) -> Any:
+    """Copy of the dicts and lists in JSON-like question data (leaf values are shared)"""
+    if isinstance(value, dict):
+        return {key: _detached_copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_detached_copy(item) for item in value]
+    return value
+
+
+_shared_analyzer: Optional[CanvasPreExportAnalyzer] = None
+
+
+def get_canvas_analyzer() -> CanvasPreExportAnalyzer:
+    """Process-wide analyzer whose cache is shared by all export paths"""
+    global _shared_analyzer
+    if _shared_analyzer is None:
+        _shared_analyzer = CanvasPreExportAnalyzer()
+    return _shared_analyzer
+
+
+def analyze_for_canvas(questions: List[Dict[str, Any]], executor=None) -> CanvasExportAnalysis:
+    """
+    Convenience function for the shared single-pass pre-export analysis
+    
+    Args:
+        questions: List of question dictionaries
+        executor: Optional concurrent.futures executor for cache misses
         
-        # Simple check for dollar signs (LaTeX delimiters)
-        return any('$' in str(field) for field in text_fields)
+    Returns:
+        CanvasExportAnalysis with validation, metadata, LaTeX and Canvas-ready questions
+    """
+    return get_canvas_analyzer().analyze(questions, executor)
 
 
 # Convenience functions for integration
@@ -4,11 +4,17 @@ Data Processor Module
 Handles filtering, cleaning, and synchronizing question data for export
 """
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 from typing import List, Dict, Any, Optional, Tuple
 import logging
 
+try:
+    from ..edit_tracker import consume_content_dirty_rows
+except ImportError:
+    from edit_tracker import consume_content_dirty_rows
+
 logger = logging.getLogger(__name__)
 
 
@@ -77,11 +83,38 @@ class QuestionDataProcessor:
         Returns:
             Tuple of (filtered_questions, processing_stats)
         """
+        row_positions, question_positions, stats = self.match_questions(df, original_questions)
+        if "error" in stats:
+            return [], stats
+        
+        # Apply DataFrame changes to matched questions in one columnar pass
+        filtered_questions = self.sync_dataframe_to_questions(
+            df, row_positions, [original_questions[position] for position in question_positions]
+        )
+        
+        stats["matched_questions"] = len(filtered_questions)
+        
+        return filtered_questions, stats
+    
+    def match_questions(self, 
+                        df: pd.DataFrame, 
+                        original_questions: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+        """
+        Pair DataFrame rows with original questions
+        
+        Args:
+            df: Filtered DataFrame containing questions to export
+            original_questions: Original question data
+            
+        Returns:
+            Tuple of (row_positions, question_positions, processing_stats)
+        """
+        empty = np.array([], dtype=int)
         if df is None or df.empty:
-            return [], {"error": "No questions in DataFrame"}
+            return empty, empty, {"error": "No questions in DataFrame"}
         
         if not original_questions:
-            return [], {"error": "No original questions provided"}
+            return empty, empty, {"error": "No original questions provided"}
         
         stats = {
             "dataframe_rows": len(df),
@@ -96,20 +129,11 @@ class QuestionDataProcessor:
         use_index_matching = self._should_use_index_matching(df, stats)
         
         if use_index_matching:
-            filtered_questions = self._match_by_index(df, original_questions, stats)
+            row_positions, question_positions = self._match_by_index(df, original_questions, stats)
         else:
-            filtered_questions = self._match_by_id(df, original_questions, stats)
-        
-        # Apply DataFrame changes to matched questions
-        for i, question in enumerate(filtered_questions):
-            if i < len(df):
-                filtered_questions[i] = self._sync_dataframe_to_question(
-                    question, df.iloc[i]
-                )
-        
-        stats["matched_questions"] = len(filtered_questions)
+            row_positions, question_positions = self._match_by_id(df, original_questions, stats)
         
-        return filtered_questions, stats
+        return row_positions, question_positions, stats
     
     def _should_use_index_matching(self, df: pd.DataFrame, stats: Dict[str, Any]) -> bool:
         """Determine if we should use index-based vs ID-based matching"""
@@ -119,11 +143,10 @@ class QuestionDataProcessor:
             stats["warnings"].append("No ID column found, using index-based matching")
             return True
         
-        df_ids = df['ID'].tolist()
-        non_empty_ids = [id for id in df_ids if id and str(id).strip()]
+        non_empty_ids = (self._normalize_ids(df['ID']) != '').sum()
         
         # Use index matching if most IDs are empty
-        if len(non_empty_ids) < len(df) * 0.5:
+        if non_empty_ids < len(df) * 0.5:
             stats["matching_method"] = "index (sparse IDs)"
             stats["warnings"].append("Most DataFrame IDs are empty, using index-based matching")
             return True
@@ -131,110 +154,158 @@ class QuestionDataProcessor:
         stats["matching_method"] = "ID-based"
         return False
     
+    @staticmethod
+    def _normalize_ids(ids: pd.Series) -> pd.Series:
+        """Normalize IDs to stripped strings ('' for missing, '12.0' -> '12')"""
+        keys = ids.astype(object).where(ids.notna(), '').astype(str).str.strip()
+        return keys.str.replace(r'^(\d+)\.0+$', r'\1', regex=True)
+    
     def _match_by_index(self, 
                        df: pd.DataFrame, 
                        original_questions: List[Dict[str, Any]], 
-                       stats: Dict[str, Any]) -> List[Dict[str, Any]]:
+                       stats: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
         """Match questions by DataFrame index position"""
         
-        filtered_questions = []
         max_index = min(len(df), len(original_questions))
         
-        for i in range(max_index):
-            question = original_questions[i].copy()
-            filtered_questions.append(question)
-        
         if len(df) > len(original_questions):
             stats["warnings"].append(
                 f"DataFrame has {len(df)} rows but only {len(original_questions)} original questions"
             )
         
-        return filtered_questions
+        positions = np.arange(max_index)
+        return positions, positions
     
     def _match_by_id(self, 
                     df: pd.DataFrame, 
                     original_questions: List[Dict[str, Any]], 
-                    stats: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Match questions by ID field"""
+                    stats: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Match questions by ID field with a single hash join
         
-        df_ids = set(str(id).strip() for id in df['ID'].tolist() if id and str(id).strip())
-        filtered_questions = []
+        Each question is reachable by its own ID, its generated 'Q_00001' ID or its
+        1-based position, in that order of precedence. Every DataFrame row is paired
+        with the question it names, so DataFrame order does not need to match question order.
         
-        for i, question in enumerate(original_questions):
-            question_id = str(question.get('id', f"Q_{i+1:05d}")).strip()
-            
-            # Check various ID formats
-            id_matches = [
-                question_id in df_ids,
-                f"Q_{i+1:05d}" in df_ids,
-                str(i+1) in df_ids
-            ]
-            
-            if any(id_matches):
-                filtered_questions.append(question.copy())
-            else:
-                stats["unmatched_questions"] += 1
-        
-        return filtered_questions
+        Returns:
+            Tuple of (row_positions, question_positions), in original question order
+        """
+        count = len(original_questions)
+        positions = np.arange(count)
+        generated_ids = [f"Q_{i+1:05d}" for i in range(count)]
+        own_ids = [question.get('id', generated_ids[i]) for i, question in enumerate(original_questions)]
+        
+        candidates = pd.DataFrame({
+            'key': self._normalize_ids(pd.Series(own_ids + generated_ids + [str(i + 1) for i in range(count)],
+                                                 dtype=object)),
+            'question_position': np.tile(positions, 3),
+            'priority': np.repeat(np.arange(3), count)
+        })
+        rows = pd.DataFrame({
+            'key': self._normalize_ids(df['ID']).to_numpy(),
+            'row_position': np.arange(len(df))
+        })
+        rows = rows[rows['key'] != '']
+        
+        joined = rows.merge(candidates, on='key', how='inner')
+        # Each row keeps its highest-precedence question; each question keeps its first row
+        joined = joined.sort_values(['row_position', 'priority'], kind='stable').drop_duplicates('row_position')
+        joined = joined.sort_values(['question_position', 'row_position'], kind='stable').drop_duplicates('question_position')
+        
+        stats["unmatched_questions"] += count - len(joined)
+        
+        return joined['row_position'].to_numpy(), joined['question_position'].to_numpy()
     
-    def _sync_dataframe_to_question(self, 
-                                   original_question: Dict[str, Any], 
-                                   df_row: pd.Series) -> Dict[str, Any]:
+    def sync_dataframe_to_questions(self, 
+                                   df: pd.DataFrame, 
+                                   row_positions: np.ndarray, 
+                                   questions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Synchronize DataFrame row changes back to question JSON
         
+        Columns are converted in bulk and only fields whose value differs from the
+        original question are written.
+        
         Args:
-            original_question: Original question data
-            df_row: DataFrame row with potential changes
+            df: DataFrame with potential changes
+            row_positions: Positional row for each question
+            questions: Original question data, aligned with row_positions
             
         Returns:
-            Updated question with DataFrame changes applied
+            Updated questions (shallow copies) with DataFrame changes applied
         """
-        updated_question = original_question.copy()
+        if not questions:
+            return []
         
-        # Apply safe field mappings
-        for df_col, json_key in self.safe_field_mappings.items():
-            if df_col in df_row and pd.notna(df_row[df_col]):
-                value = df_row[df_col]
-                
-                if json_key in self.numeric_fields:
-                    try:
-                        updated_question[json_key] = float(value)
-                    except (ValueError, TypeError):
-                        logger.warning(f"Could not convert {json_key} to float: {value}")
-                elif json_key == 'type':
-                    # Normalize question type
-                    updated_question[json_key] = str(value).lower().replace(' ', '_')
-                else:
-                    updated_question[json_key] = str(value)
-        
-        # Handle choices array
-        choices = self._extract_choices_from_row(df_row)
-        if choices:
-            updated_question['choices'] = choices
+        rows = df.iloc[row_positions]
+        field_values = {json_key: self._column_values(rows, df_col, json_key)
+                        for df_col, json_key in self.safe_field_mappings.items()
+                        if df_col in rows.columns}
+        choices = self._extract_choices(rows)
         
-        # Handle question text carefully (preserve LaTeX)
-        if 'Question_Text' in df_row and pd.notna(df_row['Question_Text']):
-            df_text = str(df_row['Question_Text']).strip()
-            original_text = original_question.get('question_text', '').strip()
+        if 'Question_Text' in rows.columns:
+            question_texts = self._string_values(rows['Question_Text'], strip=True)
+        else:
+            question_texts = None
+        
+        updated_questions = []
+        for position, question in enumerate(questions):
+            changes = {}
+            for json_key, values in field_values.items():
+                value = values[position]
+                if value is not None and question.get(json_key) != value:
+                    changes[json_key] = value
+            
+            if choices is not None:
+                row_choices = choices[position]
+                if row_choices and question.get('choices') != row_choices:
+                    changes['choices'] = row_choices
+            
+            # Handle question text carefully (preserve LaTeX): only update if text actually changed
+            if question_texts is not None:
+                df_text = question_texts[position]
+                if df_text and df_text != str(question.get('question_text', '')).strip():
+                    changes['question_text'] = df_text
             
-            # Only update if text actually changed
-            if df_text and df_text != original_text:
-                updated_question['question_text'] = df_text
+            updated_questions.append({**question, **changes})
         
-        return updated_question
+        return updated_questions
     
-    def _extract_choices_from_row(self, df_row: pd.Series) -> List[str]:
-        """Extract choices from DataFrame row"""
-        choices = []
-        
-        for choice_col in self.choice_columns:
-            if choice_col in df_row and pd.notna(df_row[choice_col]):
-                choice_text = str(df_row[choice_col]).strip()
-                if choice_text:
-                    choices.append(choice_text)
-        
-        return choices
+    def _column_values(self, rows: pd.DataFrame, df_col: str, json_key: str) -> List[Any]:
+        """Convert one DataFrame column to question field values (None where missing)"""
+        column = rows[df_col]
+        present = column.notna().to_numpy()
+        
+        if json_key in self.numeric_fields:
+            numbers = pd.to_numeric(column, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+            failed = present & np.isnan(numbers)
+            for value in column[failed].tolist():
+                logger.warning(f"Could not convert {json_key} to float: {value}")
+            return [float(number) if ok else None
+                    for number, ok in zip(numbers.tolist(), present & ~failed)]
+        
+        values = column.astype(object).astype(str)
+        if json_key == 'type':
+            # Normalize question type
+            values = values.str.lower().str.replace(' ', '_', regex=False)
+        return [value if ok else None for value, ok in zip(values.tolist(), present)]
+    
+    @staticmethod
+    def _string_values(column: pd.Series, strip: bool = False) -> List[str]:
+        """Column as strings, '' where missing"""
+        values = column.astype(object).where(column.notna(), '').astype(str)
+        if strip:
+            values = values.str.strip()
+        return values.tolist()
+    
+    def _extract_choices(self, rows: pd.DataFrame) -> Optional[List[List[str]]]:
+        """Extract the non-empty choices of every row, or None without choice columns"""
+        choice_columns = [column for column in self.choice_columns if column in rows.columns]
+        if not choice_columns:
+            return None
+        
+        columns = [self._string_values(rows[column], strip=True) for column in choice_columns]
+        return [[choice for choice in row_choices if choice] for row_choices in zip(*columns)]
     
     def fix_numeric_formatting(self, questions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -269,6 +340,63 @@ class QuestionDataProcessor:
         Args:
             questions: List of question dictionaries
             
+        Returns:
+            Validation results with errors and warnings
+        """
+        return self.summarize_validation(questions, [self.validate_question(q) for q in questions])
+    
+    def validate_question(self, question: Dict[str, Any]) -> List[str]:
+        """
+        Validate a single question for export
+        
+        Args:
+            question: Question dictionary
+            
+        Returns:
+            List of issue descriptions (empty when valid)
+        """
+        question_issues = []
+        required_fields = ['question_text', 'type']
+        
+        # Check required fields
+        for field in required_fields:
+            if field not in question or not question[field]:
+                question_issues.append(f"Missing required field: {field}")
+        
+        # Validate question type
+        question_type = question.get('type', '').lower()
+        valid_types = ['multiple_choice', 'numerical', 'true_false', 'fill_in_blank']
+        if question_type not in valid_types:
+            question_issues.append(f"Invalid question type: {question_type}")
+        
+        # Check choices for multiple choice
+        if question_type == 'multiple_choice':
+            choices = question.get('choices', [])
+            if not choices or len(choices) < 2:
+                question_issues.append("Multiple choice questions need at least 2 choices")
+        
+        # Check numerical answer
+        if question_type == 'numerical':
+            if 'correct_answer' not in question:
+                question_issues.append("Numerical questions need a correct_answer")
+            else:
+                try:
+                    float(question['correct_answer'])
+                except (ValueError, TypeError):
+                    question_issues.append("Numerical correct_answer must be a number")
+        
+        return question_issues
+    
+    def summarize_validation(self, 
+                             questions: List[Dict[str, Any]], 
+                             issues_per_question: List[List[str]]) -> Dict[str, Any]:
+        """
+        Combine per-question issues into validation results
+        
+        Args:
+            questions: List of question dictionaries
+            issues_per_question: validate_question() output for each question
+            
         Returns:
             Validation results with errors and warnings
         """
@@ -280,38 +408,7 @@ class QuestionDataProcessor:
             "questions_with_issues": []
         }
         
-        required_fields = ['question_text', 'type']
-        
-        for i, question in enumerate(questions):
-            question_issues = []
-            
-            # Check required fields
-            for field in required_fields:
-                if field not in question or not question[field]:
-                    question_issues.append(f"Missing required field: {field}")
-            
-            # Validate question type
-            question_type = question.get('type', '').lower()
-            valid_types = ['multiple_choice', 'numerical', 'true_false', 'fill_in_blank']
-            if question_type not in valid_types:
-                question_issues.append(f"Invalid question type: {question_type}")
-            
-            # Check choices for multiple choice
-            if question_type == 'multiple_choice':
-                choices = question.get('choices', [])
-                if not choices or len(choices) < 2:
-                    question_issues.append("Multiple choice questions need at least 2 choices")
-            
-            # Check numerical answer
-            if question_type == 'numerical':
-                if 'correct_answer' not in question:
-                    question_issues.append("Numerical questions need a correct_answer")
-                else:
-                    try:
-                        float(question['correct_answer'])
-                    except (ValueError, TypeError):
-                        question_issues.append("Numerical correct_answer must be a number")
-            
+        for i, (question, question_issues) in enumerate(zip(questions, issues_per_question)):
             if question_issues:
                 validation_results["questions_with_issues"].append({
                     "question_index": i,
@@ -331,6 +428,36 @@ class QuestionDataProcessor:
         return validation_results
 
 
+class ExportSyncCache:
+    """
+    Export-ready questions (synced, formatted and validated) keyed by original question position.
+    
+    An entry stays valid while the original question dict and the DataFrame row it was
+    synced from are unchanged; edited rows are dropped via the edit tracker.
+    """
+    
+    def __init__(self):
+        self.entries: Dict[int, Tuple[Dict[str, Any], Any, Dict[str, Any], List[str]]] = {}
+    
+    def lookup(self, position: int, source: Dict[str, Any], label: Any) -> Optional[Tuple[Dict[str, Any], List[str]]]:
+        """Get the cached (question, issues) for a position if it is still current"""
+        entry = self.entries.get(position)
+        if entry is None or entry[0] is not source or entry[1] != label:
+            return None
+        return entry[2], entry[3]
+    
+    def store(self, position: int, source: Dict[str, Any], label: Any,
+              question: Dict[str, Any], issues: List[str]) -> None:
+        """Cache an export-ready question"""
+        self.entries[position] = (source, label, question, issues)
+    
+    def invalidate_labels(self, labels: set) -> None:
+        """Drop entries synced from edited DataFrame rows"""
+        if labels:
+            self.entries = {position: entry for position, entry in self.entries.items()
+                            if entry[1] not in labels}
+
+
 class ExportDataManager:
     """High-level manager for export data processing"""
     
@@ -360,24 +487,22 @@ class ExportDataManager:
         }
         
         try:
-            # Fix DataFrame data types
-            df = self.processor.fix_dataframe_dtypes(df)
-            
-            # Filter and sync questions
-            filtered_questions, stats = self.processor.filter_questions_from_dataframe(
-                df, original_questions
-            )
+            # Pair DataFrame rows with original questions
+            row_positions, question_positions, stats = self.processor.match_questions(df, original_questions)
             report["processing_stats"] = stats
             
-            if not filtered_questions:
+            if not len(question_positions):
                 report["errors"].append("No questions matched for export")
                 return [], report
             
-            # Fix numeric formatting
-            filtered_questions = self.processor.fix_numeric_formatting(filtered_questions)
+            # Sync only rows that changed since the last export
+            filtered_questions, issues = self._sync_with_cache(
+                df, original_questions, row_positions, question_positions, stats
+            )
+            stats["matched_questions"] = len(filtered_questions)
             
             # Validate questions
-            validation = self.processor.validate_questions(filtered_questions)
+            validation = self.processor.summarize_validation(filtered_questions, issues)
             report["validation_results"] = validation
             
             if not validation["valid"]:
@@ -396,3 +521,53 @@ class ExportDataManager:
             report["errors"].append(f"Data processing error: {str(e)}")
             logger.exception("Error in prepare_questions_for_export")
             return [], report
+    
+    def _get_sync_cache(self) -> ExportSyncCache:
+        """Get the session's export sync cache"""
+        cache = st.session_state.get('export_sync_cache')
+        if cache is None:
+            cache = ExportSyncCache()
+            st.session_state['export_sync_cache'] = cache
+        return cache
+    
+    def _sync_with_cache(self, 
+                         df: pd.DataFrame, 
+                         original_questions: List[Dict[str, Any]], 
+                         row_positions: np.ndarray, 
+                         question_positions: np.ndarray, 
+                         stats: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[List[str]]]:
+        """
+        Build export-ready questions, re-syncing only rows that are new or were edited
+        
+        Returns:
+            Tuple of (questions, validation issues per question)
+        """
+        cache = self._get_sync_cache()
+        cache.invalidate_labels(consume_content_dirty_rows())
+        
+        labels = df.index[row_positions].tolist()
+        positions = question_positions.tolist()
+        stale = [k for k, (position, label) in enumerate(zip(positions, labels))
+                 if cache.lookup(position, original_questions[position], label) is None]
+        
+        if stale:
+            # Fix DataFrame data types
+            rows = self.processor.fix_dataframe_dtypes(df.iloc[row_positions[stale]])
+            synced = self.processor.sync_dataframe_to_questions(
+                rows, np.arange(len(stale)), [original_questions[positions[k]] for k in stale]
+            )
+            # Fix numeric formatting
+            synced = self.processor.fix_numeric_formatting(synced)
+            for k, question in zip(stale, synced):
+                position = positions[k]
+                cache.store(position, original_questions[position], labels[k],
+                            question, self.processor.validate_question(question))
+        stats["resynced_questions"] = len(stale)
+        
+        questions, issues = [], []
+        for position, label in zip(positions, labels):
+            question, question_issues = cache.lookup(position, original_questions[position], label)
+            # Shallow copies keep callers from mutating cached questions
+            questions.append(dict(question))
+            issues.append(question_issues)
+        return questions, issues
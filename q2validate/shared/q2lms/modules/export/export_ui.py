@@ -12,6 +12,7 @@ import io
 
 from .filename_utils import ExportNamingManager
 from .latex_converter import LaTeXAnalyzer
+from ..filter_engine import present_value_counts
 
 
 class ExportInterface:
@@ -231,7 +232,7 @@ class ExportInterface:
         
         # Question type breakdown
         if 'Type' in df.columns:
-            type_counts = df['Type'].value_counts()
+            type_counts = present_value_counts(df['Type'])
             with st.expander("📋 Question Types"):
                 for qtype, count in type_counts.items():
                     st.write(f"• {qtype}: {count}")
@@ -225,61 +225,67 @@ class StandardQTILaTeXConverter(LaTeXProcessor):
 
 class LaTeXAnalyzer:
     """Analyzes LaTeX usage in question sets"""
+    
+    FEEDBACK_FIELDS = ('feedback_correct', 'feedback_incorrect', 'correct_feedback', 'incorrect_feedback')
+    
     def __init__(self):
         self.processor = LaTeXProcessor()
     
     def analyze_questions(self, questions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return self.summarize([self.analyze_question(question) for question in questions])
+    
+    def analyze_question(self, question: Dict[str, Any]) -> Dict[str, Any]:
+        """LaTeX usage of one question; each field is scanned once"""
+        stats = {
+            'latex_by_field': {'question_text': 0, 'choices': 0, 'feedback': 0},
+            'expression_counts': {'inline': 0, 'block': 0, 'total': 0},
+            'sample_expressions': []
+        }
+        
+        def scan(text: Any, field: str, samples: int) -> None:
+            expressions = self.processor.find_latex_expressions(str(text) if text else '')
+            if not expressions:
+                return
+            stats['latex_by_field'][field] += 1
+            for expr in expressions:
+                stats['expression_counts'][expr['type']] += 1
+            stats['expression_counts']['total'] += len(expressions)
+            stats['sample_expressions'].extend(expr['full_match'] for expr in expressions[:samples])
+        
+        scan(question.get('question_text', ''), 'question_text', 2)
+        for choice in question.get('choices', []):
+            scan(choice, 'choices', 1)
+        for field in self.FEEDBACK_FIELDS:
+            scan(question.get(field, ''), 'feedback', 0)
+        return stats
+    
+    @staticmethod
+    def summarize(question_stats: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine per-question analyze_question() results into a question set analysis"""
         analysis = {
-            'total_questions': len(questions), 'questions_with_latex': 0,
+            'total_questions': len(question_stats), 'questions_with_latex': 0,
             'latex_by_field': {'question_text': 0, 'choices': 0, 'feedback': 0},
             'expression_counts': {'inline': 0, 'block': 0, 'total': 0},
             'questions_by_complexity': {'no_latex': 0, 'simple_latex': 0, 'complex_latex': 0},
             'sample_expressions': []
         }
-        for question in questions:
-            question_latex_count = 0
-            question_expressions = []
-            
-            q_text = question.get('question_text', '')
-            if self.processor.has_latex(q_text):
-                analysis['latex_by_field']['question_text'] += 1
-                counts = self.processor.count_latex_expressions(q_text)
-                question_latex_count += counts['total']
-                analysis['expression_counts']['inline'] += counts['inline']
-                analysis['expression_counts']['block'] += counts['block']
-                analysis['expression_counts']['total'] += counts['total']
-                expressions = self.processor.find_latex_expressions(q_text)
-                question_expressions.extend([expr['full_match'] for expr in expressions[:2]])
-            
-            choices = question.get('choices', [])
-            for choice in choices:
-                if self.processor.has_latex(str(choice)):
-                    analysis['latex_by_field']['choices'] += 1
-                    counts = self.processor.count_latex_expressions(str(choice))
-                    question_latex_count += counts['total']
-                    analysis['expression_counts']['inline'] += counts['inline']
-                    analysis['expression_counts']['block'] += counts['block']
-                    analysis['expression_counts']['total'] += counts['total']
-                    expressions = self.processor.find_latex_expressions(str(choice))
-                    question_expressions.extend([expr['full_match'] for expr in expressions[:1]])
-            
-            feedback_fields = ['feedback_correct', 'feedback_incorrect', 'correct_feedback', 'incorrect_feedback']
-            for field in feedback_fields:
-                feedback = question.get(field, '')
-                if self.processor.has_latex(feedback):
-                    analysis['latex_by_field']['feedback'] += 1
-                    counts = self.processor.count_latex_expressions(feedback)
-                    question_latex_count += counts['total']
-                    analysis['expression_counts']['inline'] += counts['inline']
-                    analysis['expression_counts']['block'] += counts['block']
-                    analysis['expression_counts']['total'] += counts['total']
+        samples = set()
+        for stats in question_stats:
+            for field, count in stats['latex_by_field'].items():
+                analysis['latex_by_field'][field] += count
+            for kind, count in stats['expression_counts'].items():
+                analysis['expression_counts'][kind] += count
             
+            question_latex_count = stats['expression_counts']['total']
             if question_latex_count == 0: analysis['questions_by_complexity']['no_latex'] += 1
             elif question_latex_count <= 3: analysis['questions_by_complexity']['simple_latex'] += 1; analysis['questions_with_latex'] += 1
             else: analysis['questions_by_complexity']['complex_latex'] += 1; analysis['questions_with_latex'] += 1
             
-            for expr in question_expressions:
-                if expr not in analysis['sample_expressions'] and len(analysis['sample_expressions']) < 10:
+            for expr in stats['sample_expressions']:
+                if len(samples) >= 10:
+                    break
+                if expr not in samples:
+                    samples.add(expr)
                     analysis['sample_expressions'].append(expr)
         
         if analysis['total_questions'] > 0: analysis['latex_percentage'] = (analysis['questions_with_latex'] / analysis['total_questions']) * 100
@@ -12,6 +12,8 @@ import io
 import json
 from datetime import datetime
 
+from .filter_engine import present_value_counts
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -19,7 +21,7 @@ logger = logging.getLogger(__name__)
 try:
     from .export.data_processor import ExportDataManager
     from .export.latex_converter import LaTeXAnalyzer
-    from .export.canvas_adapter import CanvasQTIAdapter
+    from .export.canvas_adapter import CanvasQTIAdapter, analyze_for_canvas
     from .export.filename_utils import ExportNamingManager
     EXPORT_SYSTEM_AVAILABLE = True
 except ImportError as e:
@@ -273,7 +275,7 @@ class QuestionExporter:
         
         # Calculate statistics
         total_points = sum(q.get('points', 1) for q in questions)
-        latex_analysis = self.latex_analyzer.analyze_questions(questions)
+        latex_analysis = analyze_for_canvas(questions).latex_analysis()
         
         metadata = {
             "exported_date": datetime.now().isoformat(),
@@ -348,7 +350,7 @@ class QuestionExporter:
         
         # Analyze LaTeX usage
         if original_questions:
-            latex_analysis = self.latex_analyzer.analyze_questions(original_questions)
+            latex_analysis = analyze_for_canvas(original_questions).latex_analysis()
             if latex_analysis['questions_with_latex'] > 0:
                 st.info(f"""
                 🔢 **LaTeX Detection:** Found {latex_analysis['questions_with_latex']} questions with mathematical notation ({latex_analysis['latex_percentage']:.1f}% of total)
@@ -409,7 +411,7 @@ class QuestionExporter:
             
             # Question type breakdown
             if 'Type' in df.columns:
-                type_counts = df['Type'].value_counts()
+                type_counts = present_value_counts(df['Type'])
                 with st.expander("📋 Question Types"):
                     for qtype, count in type_counts.items():
                         st.caption(f"• {qtype}: {count}")
@@ -498,9 +500,9 @@ class QuestionExporter:
                         key=f"qti_download_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
                     )
                     
-                    # Show success details
+                    # Show success details (analysis cached by create_package)
                     total_points = sum(q.get('points', 1) for q in processed_questions)
-                    latex_analysis = self.latex_analyzer.analyze_questions(processed_questions)
+                    latex_analysis = analyze_for_canvas(processed_questions).latex_analysis()
                     latex_count = latex_analysis['questions_with_latex']
                     
                     st.success(f"""
@@ -0,0 +1,159 @@
+# modules/filter_engine.py
+"""
+Filter Engine - Precomputed categorical indexes for sidebar filtering
+Builds per-value row bitmaps once per database load so filter changes only combine masks
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+import weakref
+from typing import Dict, List, Optional, Tuple, Any
+
+
+class QuestionFilterIndex:
+    """
+    Categorical index over a questions DataFrame.
+    Stores category codes and per-value boolean bitmaps for the filter columns.
+    Text search is handled by the shared search index (modules/search_index.py).
+    """
+
+    FILTER_COLUMNS = ['Topic', 'Subtopic', 'Difficulty', 'Type']
+    EMPTY_VALUES = {'', 'N/A'}
+
+    def __init__(self, df: pd.DataFrame):
+        self._df_ref = weakref.ref(df)
+        self.n_rows = len(df)
+        self.columns = tuple(df.columns)
+        self.categories: Dict[str, List[str]] = {}
+        self.codes: Dict[str, np.ndarray] = {}
+        self.bitmaps: Dict[str, Dict[str, np.ndarray]] = {}
+
+        for column in self.FILTER_COLUMNS:
+            if column in df.columns:
+                self._index_column(column, df[column])
+
+        if 'Points' in df.columns:
+            self.points = pd.to_numeric(df['Points'], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        else:
+            self.points = None
+
+    def _index_column(self, column: str, series: pd.Series) -> None:
+        """Factorize a column into sorted category codes and one bitmap per value"""
+        values = series.astype(object).where(series.notna(), '').astype(str)
+        codes, uniques = pd.factorize(values, sort=True)
+        categories = uniques.tolist()
+
+        self.categories[column] = categories
+        self.codes[column] = codes
+        self.bitmaps[column] = {
+            value: codes == code for code, value in enumerate(categories)
+        }
+
+    def matches(self, df: pd.DataFrame) -> bool:
+        """Check whether this index was built for the given DataFrame"""
+        return (self._df_ref() is df
+                and len(df) == self.n_rows
+                and tuple(df.columns) == self.columns)
+
+    def options(self, column: str, mask: Optional[np.ndarray] = None) -> List[str]:
+        """
+        Get sorted filter options for a column
+
+        Args:
+            column (str): Filter column name
+            mask (np.ndarray, optional): Restrict options to rows in this mask
+
+        Returns:
+            List[str]: Sorted distinct values (empty placeholders excluded)
+        """
+        categories = self.categories.get(column, [])
+        if mask is not None and column in self.codes:
+            present = np.unique(self.codes[column][mask])
+            categories = [categories[code] for code in present]
+        return [value for value in categories if value not in self.EMPTY_VALUES]
+
+    def value_mask(self, column: str, value: str) -> np.ndarray:
+        """Get the row bitmap for a single column value"""
+        bitmap = self.bitmaps.get(column, {}).get(value)
+        if bitmap is None:
+            return np.zeros(self.n_rows, dtype=bool)
+        return bitmap
+
+    def build_mask(self,
+                   selections: Optional[Dict[str, Any]] = None,
+                   points_range: Optional[Tuple[float, float]] = None) -> np.ndarray:
+        """
+        Combine filters into one row mask
+
+        Args:
+            selections (Dict[str, Any]): Column -> value (or list of values); 'All' is ignored
+            points_range (Tuple[float, float], optional): Inclusive points range
+
+        Returns:
+            np.ndarray: Boolean mask over DataFrame rows
+        """
+        mask = np.ones(self.n_rows, dtype=bool)
+
+        for column, value in (selections or {}).items():
+            if value is None or value == 'All' or column not in self.bitmaps:
+                continue
+            if isinstance(value, (list, tuple, set)):
+                column_mask = np.zeros(self.n_rows, dtype=bool)
+                for item in value:
+                    column_mask |= self.value_mask(column, item)
+            else:
+                column_mask = self.value_mask(column, value)
+            mask &= column_mask
+
+        if points_range is not None and self.points is not None:
+            low, high = points_range
+            mask &= (self.points >= low) & (self.points <= high)
+
+        return mask
+
+    def filter(self, df: pd.DataFrame, mask: np.ndarray) -> pd.DataFrame:
+        """
+        Return the rows selected by mask
+
+        pandas has no view for an arbitrary subset of rows, so scattered rows are
+        copied (one take of the matching rows per rerun). An unfiltered mask returns df
+        itself and a contiguous run of rows returns a slice, which copy-on-write shares
+        with df until either is modified. The copy is acceptable because the result is
+        read-only for its callers: the editor renders one page of it, and flag and
+        edit writes go to st.session_state.df.
+        """
+        if mask.all():
+            return df
+        positions = np.flatnonzero(mask)
+        if len(positions) and positions[-1] - positions[0] + 1 == len(positions):
+            return df.iloc[positions[0]:positions[-1] + 1]
+        return df.iloc[positions]
+
+
+def present_value_counts(series: pd.Series) -> pd.Series:
+    """
+    value_counts without zero-count entries
+
+    Categorical columns keep every category after rows are filtered out, and
+    value_counts reports those unused categories with a count of 0.
+    """
+    counts = series.value_counts()
+    return counts[counts > 0]
+
+
+def get_filter_index(df: pd.DataFrame) -> QuestionFilterIndex:
+    """
+    Get the cached filter index for a DataFrame, rebuilding it when the database changes
+
+    Args:
+        df (pd.DataFrame): The questions DataFrame
+
+    Returns:
+        QuestionFilterIndex: Index matching the DataFrame
+    """
+    index = st.session_state.get('filter_index')
+    if index is None or not index.matches(df):
+        index = QuestionFilterIndex(df)
+        st.session_state['filter_index'] = index
+    return index
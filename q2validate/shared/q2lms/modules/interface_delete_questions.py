@@ -13,16 +13,22 @@ from datetime import datetime
 try:
     # Try relative imports first (when used as a module)
     from .question_flag_manager import QuestionFlagManager
-    from .utils import render_latex_in_text
+    from .utils import render_latex_cached
+    from .question_pager import render_page_controls, DEFAULT_PAGE_SIZE
     from .export.latex_converter import CanvasLaTeXConverter
     from .database_processor import save_question_changes, delete_question, validate_single_question
+    from .search_index import search_questions
+    from .filter_engine import present_value_counts
 except ImportError:
     # Fall back to absolute imports (when testing independently)
     try:
         from question_flag_manager import QuestionFlagManager
-        from utils import render_latex_in_text
+        from utils import render_latex_cached
+        from question_pager import render_page_controls, DEFAULT_PAGE_SIZE
         from export.latex_converter import CanvasLaTeXConverter
         from database_processor import save_question_changes, delete_question, validate_single_question
+        from search_index import search_questions
+        from filter_engine import present_value_counts
     except ImportError as e:
         # If still failing, provide fallback functions for testing
         st.warning(f"⚠️ Some imports not available: {e}")
@@ -30,9 +36,10 @@ except ImportError:
         
         # Provide minimal fallback classes for testing
         from question_flag_manager import QuestionFlagManager
+        from question_pager import render_page_controls, DEFAULT_PAGE_SIZE
         
         # Mock functions for testing
-        def render_latex_in_text(text, latex_converter=None):
+        def render_latex_cached(text, latex_converter=None):
             return text  # Simple fallback - just return text as-is
         
         class CanvasLaTeXConverter:
@@ -48,6 +55,9 @@ except ImportError:
         
         def validate_single_question(question):
             return True
+        
+        def search_questions(view_df, query, base_df=None):
+            return view_df
 
 class DeleteQuestionsInterface:
     """
@@ -55,8 +65,13 @@ class DeleteQuestionsInterface:
     Users can flag questions for exclusion from export while editing them.
     """
     
-    def __init__(self):
+    def __init__(self, page_size: int = DEFAULT_PAGE_SIZE):
+        """
+        Args:
+            page_size (int): Initial number of questions rendered per page
+        """
         self.flag_manager = QuestionFlagManager()
+        self.page_size = page_size
         self.latex_converter = CanvasLaTeXConverter()
         self.flag_type = 'deleted'
         self.mode_context = 'delete'
@@ -109,7 +124,7 @@ class DeleteQuestionsInterface:
     
     def _reapply_current_filters(self) -> pd.DataFrame:
         """
-        Reapply current topic filters to get updated filtered DataFrame
+        Reapply current topic filters and search query to get updated filtered DataFrame
         
         Returns:
             pd.DataFrame: Filtered DataFrame with current topic selections
@@ -125,6 +140,10 @@ class DeleteQuestionsInterface:
             else:
                 filtered_df = df
             
+            # Search goes through the shared index instead of rescanning text columns
+            search_query = st.session_state.get('question_search_query', '')
+            filtered_df = search_questions(filtered_df, search_query, base_df=df)
+            
             return filtered_df
             
         except Exception as e:
@@ -255,13 +274,8 @@ class DeleteQuestionsInterface:
             delete_state (bool): True to mark for deletion, False to unmark
         """
         try:
-            # Get indices of questions in current view
-            view_indices = filtered_df.index.tolist()
-            
-            # Update deletion flag for only these questions
-            for idx in view_indices:
-                if idx < len(st.session_state.df):
-                    st.session_state.df.loc[idx, 'deleted'] = delete_state
+            # Update deletion flag for only the questions in current view
+            self.flag_manager.set_flags('deleted', filtered_df.index, delete_state)
                     
         except Exception as e:
             st.error(f"❌ Error in bulk view deletion: {e}")
@@ -274,14 +288,8 @@ class DeleteQuestionsInterface:
             filtered_df (pd.DataFrame): Current filtered DataFrame
         """
         try:
-            # Get indices of questions in current view
-            view_indices = filtered_df.index.tolist()
-            
-            # Invert deletion flag for only these questions
-            for idx in view_indices:
-                if idx < len(st.session_state.df):
-                    current_state = st.session_state.df.loc[idx, 'deleted']
-                    st.session_state.df.loc[idx, 'deleted'] = not current_state
+            # Invert deletion flag for only the questions in current view
+            self.flag_manager.invert_flags('deleted', filtered_df.index)
                     
         except Exception as e:
             st.error(f"❌ Error in view deletion inversion: {e}")
@@ -300,75 +308,9 @@ class DeleteQuestionsInterface:
                 st.warning("🔍 No questions match your current filters.")
                 return
             
-            # Pagination controls - with "Show All" option as default
-            page_options = ["Show All", 5, 10, 20]
-            items_per_page_selection = st.selectbox(
-                "Questions per page", 
-                page_options, 
-                index=0,  # Default to "Show All"
-                key="delete_mode_pagination"
-            )
-            
-            # Handle "Show All" vs numeric pagination
-            if items_per_page_selection == "Show All":
-                # Show all questions without pagination
-                page_df = filtered_df
-                page_offset = 0
-                total_pages = 1  # CRITICAL: Define total_pages here
-                st.info(f"Showing all {len(filtered_df)} questions")
-            else:
-                items_per_page = items_per_page_selection
-                total_pages = (len(filtered_df) - 1) // items_per_page + 1
-                
-                if total_pages > 1:
-                    # Pagination UI
-                    col1, col2, col3, col4, col5 = st.columns([1, 1, 2, 1, 1])
-                    
-                    if 'delete_current_page' not in st.session_state:
-                        st.session_state['delete_current_page'] = 1
-                    
-                    with col1:
-                        if st.button("⬅️ Previous", key="delete_prev") and st.session_state['delete_current_page'] > 1:
-                            st.session_state['delete_current_page'] -= 1
-                            st.rerun()
-                    
-                    with col2:
-                        if st.button("⏪ First", key="delete_first"):
-                            st.session_state['delete_current_page'] = 1
-                            st.rerun()
-                    
-                    with col3:
-                        page = st.selectbox(
-                            "Page", 
-                            range(1, total_pages + 1), 
-                            index=st.session_state['delete_current_page'] - 1, 
-                            key="delete_page_selector"
-                        )
-                        if page != st.session_state['delete_current_page']:
-                            st.session_state['delete_current_page'] = page
-                            st.rerun()
-                    
-                    with col4:
-                        if st.button("⏩ Last", key="delete_last"):
-                            st.session_state['delete_current_page'] = total_pages
-                            st.rerun()
-                    
-                    with col5:
-                        if st.button("Next ➡️", key="delete_next") and st.session_state['delete_current_page'] < total_pages:
-                            st.session_state['delete_current_page'] += 1
-                            st.rerun()
-                    
-                    st.info(f"Page {st.session_state['delete_current_page']} of {total_pages}")
-                    
-                    # Calculate page bounds
-                    start_idx = (st.session_state['delete_current_page'] - 1) * items_per_page
-                    end_idx = start_idx + items_per_page
-                    page_df = filtered_df.iloc[start_idx:end_idx]
-                    page_offset = start_idx
-                else:
-                    # Single page - show all
-                    page_df = filtered_df
-                    page_offset = 0
+            # Only the current page is rendered; bulk controls above act on the whole view
+            page_offset, page_end = render_page_controls(len(filtered_df), 'delete', self.page_size)
+            page_df = filtered_df.iloc[page_offset:page_end]
             
             st.markdown("---")
             
@@ -383,14 +325,8 @@ class DeleteQuestionsInterface:
             # Export completion notice for Delete mode
             st.markdown("### 🎯 Ready to Export?")
             
-            # Get current export statistics
-            remaining_df, remaining_original = self.flag_manager.get_filtered_questions_for_export(
-                st.session_state.df, 
-                st.session_state.get('original_questions', []), 
-                'delete'
-            )
-            
-            remaining_count = len(remaining_df)
+            # Get current export statistics (a count only: building the export copy is left to the Export tab)
+            remaining_count = len(st.session_state.df) - self.flag_manager.get_flagged_count(st.session_state.df, 'deleted')
             
             if remaining_count > 0:
                 st.success(f"✅ **{remaining_count} questions ready for export**")
@@ -527,7 +463,7 @@ class DeleteQuestionsInterface:
                     st.markdown('<div style="opacity: 0.6;">', unsafe_allow_html=True)
             
             # Question text with LaTeX rendering
-            question_text_html = render_latex_in_text(
+            question_text_html = render_latex_cached(
                 current_question_data.get('question_text', ''),
                 latex_converter=self.latex_converter
             )
@@ -576,7 +512,7 @@ class DeleteQuestionsInterface:
         for choice_letter in choices_list:
             if choice_letter in choice_texts:
                 choice_text_clean = choice_texts[choice_letter]
-                choice_text_html = render_latex_in_text(
+                choice_text_html = render_latex_cached(
                     choice_text_clean,
                     latex_converter=self.latex_converter
                 )
@@ -590,7 +526,7 @@ class DeleteQuestionsInterface:
     
     def _render_numerical_preview(self, question_data: Dict) -> None:
         """Render numerical preview"""
-        correct_answer_html = render_latex_in_text(
+        correct_answer_html = render_latex_cached(
             str(question_data.get('correct_answer', '')),
             latex_converter=self.latex_converter
         )
@@ -607,7 +543,7 @@ class DeleteQuestionsInterface:
     
     def _render_fill_blank_preview(self, question_data: Dict) -> None:
         """Render fill-in-blank preview"""
-        correct_answer_html = render_latex_in_text(
+        correct_answer_html = render_latex_cached(
             str(question_data.get('correct_answer', '')),
             latex_converter=self.latex_converter
         )
@@ -621,14 +557,14 @@ class DeleteQuestionsInterface:
         if correct_feedback or incorrect_feedback:
             with st.expander("💡 View Feedback"):
                 if correct_feedback:
-                    rendered_correct_html = render_latex_in_text(
+                    rendered_correct_html = render_latex_cached(
                         str(correct_feedback),
                         latex_converter=self.latex_converter
                     )
                     st.markdown(f"**Correct:** {rendered_correct_html}")
                 
                 if incorrect_feedback:
-                    rendered_incorrect_html = render_latex_in_text(
+                    rendered_incorrect_html = render_latex_cached(
                         str(incorrect_feedback),
                         latex_converter=self.latex_converter
                     )
@@ -774,7 +710,7 @@ class DeleteQuestionsInterface:
                     
                     # Show topic breakdown of remaining questions
                     if 'Topic' in remaining_df.columns and remaining_count > 1:
-                        topic_counts = remaining_df['Topic'].value_counts()
+                        topic_counts = present_value_counts(remaining_df['Topic'])
                         with st.expander("📋 Questions to Export by Topic"):
                             for topic, count in topic_counts.items():
                                 st.write(f"• **{topic}:** {count} questions")
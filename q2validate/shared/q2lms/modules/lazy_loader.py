@@ -0,0 +1,229 @@
+# modules/lazy_loader.py
+"""
+Lazy Loader - Memory-mapped, on-demand parsing of large question JSON files
+One scan indexes the byte span of every element of the questions array: each element is
+matched whole by a nesting-bounded regex that skips strings (so braces inside LaTeX never
+confuse it) without building any objects. Metadata and individual questions are parsed
+only when asked for.
+"""
+
+import json
+import mmap
+import os
+import re
+from array import array
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+_STRING = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+# Maximal run of other characters; the lookahead keeps the nested pattern unambiguous so a
+# failed match (e.g. deeper nesting) backtracks in linear time
+_PLAIN = rb'[^"\[\]{}]+(?![^"\[\]{}])'
+
+# Objects/arrays nested deeper than this are scanned token by token instead
+ELEMENT_REGEX_DEPTH = 6
+
+
+def _nested_value_pattern(depth: int) -> bytes:
+    """Regex for a JSON object or array with at most depth levels of nesting"""
+    value = None
+    for _ in range(depth):
+        parts = [_STRING, _PLAIN] + ([value] if value else [])
+        inner = rb'(?:' + rb'|'.join(parts) + rb')*'
+        value = rb'(?:\{' + inner + rb'\}|\[' + inner + rb'\])'
+    return value
+
+
+_ELEMENT = re.compile(_nested_value_pattern(ELEMENT_REGEX_DEPTH), re.DOTALL)
+# A whole JSON string or a bracket
+_STRUCTURE_TOKEN = re.compile(_STRING + rb'|([\[\]{}])', re.DOTALL)
+_WHITESPACE = re.compile(rb'[ \t\r\n]*')
+_KEY_COLON = re.compile(rb'[ \t\r\n]*:')
+_SCALAR = re.compile(_STRING + rb'|[^\s,\]}]+', re.DOTALL)
+_OPENERS = frozenset(b'[{')
+_UTF8_BOM = b'\xef\xbb\xbf'
+
+# Parsed questions kept for repeated access (browsing back and forth)
+PARSED_QUESTION_CACHE_SIZE = 256
+
+
+def _error(message: str, position: int) -> json.JSONDecodeError:
+    return json.JSONDecodeError(message, '', position)
+
+
+class LazyQuestionFile(Sequence):
+    """
+    Read-only sequence of the questions in a {"questions": [...]} or [...] JSON document
+
+    Questions are parsed on access; len() and the metadata are available right after
+    opening. Use as a context manager (or call close()) to release a memory-mapped file.
+    """
+
+    def __init__(self, content: Union[bytes, bytearray, memoryview, str, mmap.mmap]):
+        """
+        Args:
+            content: Document bytes (or text, which is encoded once) or an mmap
+
+        Raises:
+            json.JSONDecodeError: The document is not a question list or object
+        """
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        self._buffer = content
+        self._mmap = content if isinstance(content, mmap.mmap) else None
+        self._starts = array('q')
+        self._ends = array('q')
+        self._envelope: Any = {}
+        self.structure_type = 'simple_list'
+        self.has_questions = True
+        try:
+            self._index()
+        except IndexError:
+            raise _error("Unexpected end of document", len(content)) from None
+        self._parse = lru_cache(maxsize=PARSED_QUESTION_CACHE_SIZE)(self._parse_element)
+
+    @classmethod
+    def open(cls, path: Union[str, os.PathLike]) -> 'LazyQuestionFile':
+        """Memory-map a file and index its questions"""
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise _error("Empty file", 0)
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mapped)
+        except Exception:
+            mapped.close()
+            raise
+
+    def close(self) -> None:
+        if self._mmap is not None and not self._mmap.closed:
+            self._mmap.close()
+
+    def __enter__(self) -> 'LazyQuestionFile':
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.close()
+
+    # Indexing
+
+    def _skip_whitespace(self, position: int) -> int:
+        return _WHITESPACE.match(self._buffer, position).end()
+
+    def _container_end(self, position: int) -> int:
+        """Position just past the object or array opening at position"""
+        depth = 0
+        for match in _STRUCTURE_TOKEN.finditer(self._buffer, position):
+            bracket = match.group(1)
+            if bracket is None:
+                continue
+            depth += 1 if bracket in b'[{' else -1
+            if depth == 0:
+                return match.end()
+        raise _error("Unterminated object or array", position)
+
+    def _value_end(self, position: int) -> int:
+        """Position just past the JSON value starting at position"""
+        if self._buffer[position] in _OPENERS:
+            match = _ELEMENT.match(self._buffer, position)
+            return match.end() if match else self._container_end(position)
+        match = _SCALAR.match(self._buffer, position)
+        if match is None:
+            raise _error("Expecting value", position)
+        return match.end()
+
+    def _find_questions_array(self, position: int) -> Optional[int]:
+        """Position of the '[' of the root object's "questions" value, or None"""
+        position = self._skip_whitespace(position + 1)
+        buffer = self._buffer
+        while position < len(buffer) and buffer[position] != ord('}'):
+            key = _SCALAR.match(buffer, position)
+            colon = _KEY_COLON.match(buffer, key.end()) if key and buffer[position] == ord('"') else None
+            if colon is None:
+                raise _error("Expecting property name", position)
+            value_start = self._skip_whitespace(colon.end())
+            if key.group() == b'"questions"':
+                return value_start if buffer[value_start] == ord('[') else None
+            position = self._skip_whitespace(self._value_end(value_start))
+            if position < len(buffer) and buffer[position] == ord(','):
+                position = self._skip_whitespace(position + 1)
+        return None
+
+    def _index(self) -> None:
+        buffer = self._buffer
+        position = len(_UTF8_BOM) if buffer[:3] == _UTF8_BOM else 0
+        position = self._skip_whitespace(position)
+        if position >= len(buffer):
+            raise _error("Expecting value", position)
+
+        if buffer[position] == ord('['):
+            array_start = position
+        elif buffer[position] == ord('{'):
+            self.structure_type = 'structured'
+            array_start = self._find_questions_array(position)
+            if array_start is None:
+                # No list of questions to index: parse the (small) document whole
+                self._envelope = json.loads(buffer[position:self._value_end(position)])
+                self.has_questions = False
+                return
+        else:
+            raise _error("Expecting a question list or object", position)
+
+        # Element spans of the questions array
+        position = self._skip_whitespace(array_start + 1)
+        if buffer[position] != ord(']'):
+            while True:
+                end = self._value_end(position)
+                self._starts.append(position)
+                self._ends.append(end)
+                position = self._skip_whitespace(end)
+                if position >= len(buffer):
+                    raise _error("Unterminated questions array", array_start)
+                if buffer[position] == ord(']'):
+                    break
+                if buffer[position] != ord(','):
+                    raise _error("Expecting ',' delimiter", position)
+                position = self._skip_whitespace(position + 1)
+        array_end = position + 1
+
+        if self.structure_type == 'structured':
+            # Everything except the questions array is small: parse it once
+            self._envelope = json.loads(bytes(buffer[:array_start]) + b'[]' + bytes(buffer[array_end:]))
+        elif self._skip_whitespace(array_end) != len(buffer):
+            raise _error("Extra data", self._skip_whitespace(array_end))
+
+    # Access
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """The document's metadata object ({} for a bare list)"""
+        metadata = self._envelope.get('metadata', {}) if isinstance(self._envelope, dict) else {}
+        return metadata if metadata is not None else {}
+
+    def _parse_element(self, index: int) -> Any:
+        return json.loads(self._buffer[self._starts[index]:self._ends[index]])
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("question index out of range")
+        return self._parse(index)
+
+    def __iter__(self) -> Iterator[Any]:
+        # Sequential reads bypass the cache so iterating a whole file stays in constant memory
+        for index in range(len(self._starts)):
+            yield self._parse_element(index)
+
+    def first_question(self) -> Optional[Any]:
+        return self[0] if len(self) else None
+
+    def load_all(self) -> List[Any]:
+        """Every question, parsed"""
+        return list(self)
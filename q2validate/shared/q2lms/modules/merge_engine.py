@@ -0,0 +1,118 @@
+# modules/merge_engine.py
+"""
+Merge Engine - ID conflict resolution and content duplicate detection for multi-file merges
+Renumbers conflicting IDs in O(1) per conflict and never mutates the source question dicts;
+duplicate content is reported through the dedup engine
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+try:
+    from .dedup_engine import DuplicateDetector
+except ImportError:
+    from dedup_engine import DuplicateDetector
+
+
+def get_question_id(question: Dict[str, Any]) -> str:
+    """Get a question's ID regardless of key casing"""
+    return question.get('id', question.get('ID', ''))
+
+
+@dataclass
+class MergeResult:
+    """Outcome of merging several question files"""
+    questions: List[Dict[str, Any]]
+    conflicts: List[Dict[str, Any]] = field(default_factory=list)
+    renumbered_count: int = 0
+    duplicate_groups: List[Dict[str, Any]] = field(default_factory=list)
+    duplicate_indices: List[int] = field(default_factory=list)
+    near_duplicate_groups: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def duplicate_count(self) -> int:
+        """Number of questions that repeat an earlier question's content"""
+        return len(self.duplicate_indices)
+
+
+class QuestionMergeEngine:
+    """
+    Merges question lists from several files.
+
+    Each base ID keeps a next-suffix counter, so resolving a conflict does not
+    re-probe suffixes that earlier conflicts already used. Renamed questions are
+    shallow copies; the input dicts are left untouched. Exact and near-duplicate
+    content is found by the DuplicateDetector after IDs are resolved.
+    """
+
+    def __init__(self, detector: Optional[DuplicateDetector] = None):
+        self.seen_ids = set()
+        self.next_suffix: Dict[str, int] = {}
+        self.detector = detector or DuplicateDetector()
+
+    def _resolve_id(self, q_id: str) -> str:
+        """Return q_id if unused, otherwise the next free '{q_id}_{n}'"""
+        if q_id not in self.seen_ids:
+            return q_id
+
+        counter = self.next_suffix.get(q_id, 1)
+        new_id = f"{q_id}_{counter}"
+        # Only IDs that already exist verbatim in the sources can be skipped here,
+        # and the counter never moves backwards, so the probing is amortized O(1)
+        while new_id in self.seen_ids:
+            counter += 1
+            new_id = f"{q_id}_{counter}"
+        self.next_suffix[q_id] = counter + 1
+        return new_id
+
+    def merge(self, file_data: List[Dict[str, Any]], resolve_conflicts: Optional[bool] = None) -> MergeResult:
+        """
+        Merge questions from several files in file order
+
+        Args:
+            file_data (List[Dict]): Entries with 'name' and 'questions'
+            resolve_conflicts (bool, optional): Renumber duplicate IDs; defaults to True
+                when more than one file is merged
+
+        Returns:
+            MergeResult: Merged questions plus conflict, duplicate and near-duplicate reports
+        """
+        if resolve_conflicts is None:
+            resolve_conflicts = len(file_data) > 1
+
+        result = MergeResult(questions=[])
+
+        for file_info in file_data:
+            source = file_info.get('name', '')
+            for question in file_info['questions']:
+                if resolve_conflicts:
+                    q_id = get_question_id(question)
+                    new_id = self._resolve_id(q_id)
+                    if new_id != q_id:
+                        question = {**question, 'id': new_id}
+                        result.renumbered_count += 1
+                        result.conflicts.append({
+                            'id': q_id,
+                            'new_id': new_id,
+                            'source': source,
+                            'description': f"ID {q_id} renamed to {new_id}"
+                        })
+                    self.seen_ids.add(new_id)
+
+                result.questions.append(question)
+
+        report = self.detector.find_duplicates(result.questions)
+        result.duplicate_indices = report.exact_duplicate_indices
+        result.duplicate_groups = [self._describe_group(result.questions, indices)
+                                   for indices in report.exact_groups]
+        result.near_duplicate_groups = [
+            {**self._describe_group(result.questions, group['indices']),
+             'min_similarity': group['min_similarity']}
+            for group in report.near_groups
+        ]
+        return result
+
+    @staticmethod
+    def _describe_group(questions: List[Dict[str, Any]], indices: List[int]) -> Dict[str, Any]:
+        """Attach question IDs to a group of merged-question indices"""
+        return {'ids': [get_question_id(questions[i]) for i in indices], 'indices': list(indices)}
@@ -2,13 +2,115 @@
 """
 Question Flag Manager - Shared functionality for flagging questions
 Handles checkbox operations, bulk actions, and flag statistics for both Select and Delete modes
+Flags are held in NumPy bitmaps with running counts; bulk updates write the flag column back once,
+single checkbox updates write only their own cell
 """
 
+import numpy as np
 import streamlit as st
 import pandas as pd
-from typing import Dict, Tuple, List, Optional, Any
+import weakref
+from typing import Dict, Tuple, List, Optional, Any, Union
 from datetime import datetime
 
+try:
+    from .edit_tracker import mark_rows_dirty
+except ImportError:
+    from edit_tracker import mark_rows_dirty
+
+# Index labels, or a boolean mask over all rows
+RowSelection = Union[np.ndarray, pd.Index, pd.Series, List[Any]]
+
+
+class FlagBitmap:
+    """
+    NumPy-backed flags for one questions DataFrame.
+    Keeps one boolean array and a running count per flag; updates touch only the
+    given rows of the array and then write the DataFrame column in one assignment.
+    """
+
+    FLAGS = ('selected', 'deleted')
+
+    def __init__(self, df: pd.DataFrame):
+        self._df_ref = weakref.ref(df)
+        self.n_rows = len(df)
+        self.index = df.index
+        self.columns = tuple(df.columns)
+        self.flags: Dict[str, np.ndarray] = {}
+        self.counts: Dict[str, int] = {}
+        for flag in self.FLAGS:
+            if flag in df.columns:
+                self.flags[flag] = df[flag].fillna(False).to_numpy(dtype=bool).copy()
+            else:
+                self.flags[flag] = np.zeros(self.n_rows, dtype=bool)
+            self.counts[flag] = int(self.flags[flag].sum())
+
+    def matches(self, df: pd.DataFrame) -> bool:
+        """Check whether this bitmap was built for the given DataFrame"""
+        return (self._df_ref() is df
+                and len(df) == self.n_rows
+                and df.index is self.index
+                and tuple(df.columns) == self.columns)
+
+    def positions(self, rows: Optional[RowSelection]) -> np.ndarray:
+        """Unique row positions for index labels or a full-length boolean mask (None: every row)"""
+        if rows is None:
+            return np.arange(self.n_rows)
+        values = np.asarray(rows)
+        if values.dtype == bool and len(values) == self.n_rows:
+            return np.flatnonzero(values)
+        positions = self.index.get_indexer(pd.Index(values).unique())
+        return positions[positions >= 0]
+
+    def set(self, flag: str, positions: np.ndarray, value: bool) -> int:
+        """Set a flag on rows; returns how many rows changed"""
+        bitmap = self.flags[flag]
+        already = int(bitmap[positions].sum())
+        bitmap[positions] = value
+        changed = len(positions) - already if value else already
+        self.counts[flag] += changed if value else -changed
+        return changed
+
+    def invert(self, flag: str, positions: np.ndarray) -> int:
+        """Invert a flag on rows; returns how many rows changed"""
+        bitmap = self.flags[flag]
+        was_set = int(bitmap[positions].sum())
+        bitmap[positions] = ~bitmap[positions]
+        self.counts[flag] += len(positions) - 2 * was_set
+        return len(positions)
+
+    def count(self, flag: str) -> int:
+        return self.counts.get(flag, 0)
+
+    def write_column(self, df: pd.DataFrame, flag: str) -> None:
+        """Mirror a flag into the DataFrame column (one vectorized assignment)"""
+        df[flag] = self.flags[flag].copy()
+        self.columns = tuple(df.columns)
+
+    def write_cell(self, df: pd.DataFrame, flag: str, label: Any) -> None:
+        """Mirror one row's flag into the DataFrame column, without copying the column"""
+        if flag not in df.columns:
+            self.write_column(df, flag)
+            return
+        df.at[label, flag] = bool(self.flags[flag][self.index.get_loc(label)])
+
+
+def get_flag_bitmap(df: pd.DataFrame) -> FlagBitmap:
+    """
+    Get the flag bitmap for a DataFrame, rebuilding it when the database changes
+
+    Only the session DataFrame's bitmap is cached; other frames (e.g. filtered views)
+    get a temporary one built from their columns.
+    """
+    bitmap = st.session_state.get('flag_bitmap')
+    if bitmap is not None and bitmap.matches(df):
+        return bitmap
+    bitmap = FlagBitmap(df)
+    if df is st.session_state.get('df'):
+        st.session_state['flag_bitmap'] = bitmap
+    return bitmap
+
+
 class QuestionFlagManager:
     """
     Manages question flags for both Select and Delete operation modes.
@@ -69,17 +171,16 @@ class QuestionFlagManager:
             
             df = st.session_state.df
             
-            # Ensure flag column exists
-            if flag_type not in df.columns:
-                df[flag_type] = False
-            
             # Validate index
             if question_index < 0 or question_index >= len(df):
                 st.error(f"❌ Invalid question index: {question_index}")
                 return False
             
-            # Update the flag
-            st.session_state.df.loc[question_index, flag_type] = value
+            # Update the flag; a single checkbox writes only its own cell
+            bitmap = get_flag_bitmap(df)
+            bitmap.set(flag_type, bitmap.positions([question_index]), bool(value))
+            bitmap.write_cell(df, flag_type, question_index)
+            mark_rows_dirty([question_index], [flag_type])
             
             return True
             
@@ -87,10 +188,47 @@ class QuestionFlagManager:
             st.error(f"❌ Error updating question flag: {e}")
             return False
     
+    def set_flags(self, flag_type: str, rows: Optional[RowSelection], value: bool) -> int:
+        """
+        Set a flag on many questions in one operation
+        
+        Args:
+            flag_type (str): 'selected' or 'deleted'
+            rows: Index labels, a boolean mask over the whole DataFrame, or None for every question
+            value (bool): New flag value
+        
+        Returns:
+            int: Number of questions whose flag changed
+        """
+        df = st.session_state.df
+        bitmap = get_flag_bitmap(df)
+        changed = bitmap.set(flag_type, bitmap.positions(rows), bool(value))
+        bitmap.write_column(df, flag_type)
+        return changed
+    
+    def invert_flags(self, flag_type: str, rows: Optional[RowSelection] = None) -> int:
+        """
+        Invert a flag on many questions in one operation
+        
+        Args:
+            flag_type (str): 'selected' or 'deleted'
+            rows: Index labels, a boolean mask over the whole DataFrame, or None for every question
+        
+        Returns:
+            int: Number of questions inverted
+        """
+        df = st.session_state.df
+        bitmap = get_flag_bitmap(df)
+        changed = bitmap.invert(flag_type, bitmap.positions(rows))
+        bitmap.write_column(df, flag_type)
+        return changed
+    
     def get_flagged_count(self, df: pd.DataFrame, flag_type: str) -> int:
         """
         Get count of questions with specified flag set to True
         
+        O(1) for the session DataFrame (running count); other frames are summed.
+        
         Args:
             df (pd.DataFrame): The questions DataFrame
             flag_type (str): 'selected' or 'deleted'
@@ -102,6 +240,10 @@ class QuestionFlagManager:
             if flag_type not in df.columns:
                 return 0
             
+            bitmap = st.session_state.get('flag_bitmap')
+            if bitmap is not None and bitmap.matches(df):
+                return bitmap.count(flag_type)
+            
             return int(df[flag_type].sum())
             
         except Exception as e:
@@ -127,16 +269,12 @@ class QuestionFlagManager:
             if flag_type not in self.supported_flags:
                 return False
             
-            # Ensure flag column exists
-            if flag_type not in st.session_state.df.columns:
-                st.session_state.df[flag_type] = False
-            
             if operation == 'all':
-                st.session_state.df[flag_type] = True
+                self.set_flags(flag_type, None, True)
             elif operation == 'none':
-                st.session_state.df[flag_type] = False
+                self.set_flags(flag_type, None, False)
             elif operation == 'invert':
-                st.session_state.df[flag_type] = ~st.session_state.df[flag_type]
+                self.invert_flags(flag_type)
             else:
                 st.error(f"❌ Unknown bulk operation: {operation}")
                 return False
@@ -408,11 +546,11 @@ class QuestionFlagManager:
             if mode == 'select':
                 # Export only selected questions
                 if 'selected' in df.columns:
-                    mask = df['selected'] == True
-                    filtered_df = df[mask].copy()
+                    positions = np.flatnonzero(get_flag_bitmap(df).flags['selected'])
+                    filtered_df = df.iloc[positions].copy()
                     
                     # Filter original questions by index
-                    selected_indices = df[mask].index.tolist()
+                    selected_indices = df.index[positions].tolist()
                     filtered_original = [original_questions[i] for i in selected_indices 
                                        if i < len(original_questions)]
                 else:
@@ -423,11 +561,11 @@ class QuestionFlagManager:
             elif mode == 'delete':
                 # Export questions NOT marked for deletion
                 if 'deleted' in df.columns:
-                    mask = df['deleted'] == False
-                    filtered_df = df[mask].copy()
+                    positions = np.flatnonzero(~get_flag_bitmap(df).flags['deleted'])
+                    filtered_df = df.iloc[positions].copy()
                     
                     # Filter original questions by index
-                    remaining_indices = df[mask].index.tolist()
+                    remaining_indices = df.index[positions].tolist()
                     filtered_original = [original_questions[i] for i in remaining_indices 
                                        if i < len(original_questions)]
                 else:
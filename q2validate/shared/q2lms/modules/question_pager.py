@@ -0,0 +1,96 @@
+# modules/question_pager.py
+"""
+Question Pager - Windowed rendering for the Select and Delete question lists
+Only the current page of the filtered view is rendered on a rerun, so rerun time depends
+on the page size rather than on the size of the bank. Bulk controls keep working on the
+full filtered view through the flag bitmap.
+"""
+
+import streamlit as st
+from typing import Tuple
+
+PAGE_SIZE_OPTIONS = [5, 10, 20, 50, 100]
+DEFAULT_PAGE_SIZE = 10
+
+
+def page_window(total: int, page_size: int, page: int) -> Tuple[int, int, int, int]:
+    """
+    Row bounds of one page of a view
+
+    Args:
+        total (int): Rows in the view
+        page_size (int): Rows per page
+        page (int): Requested page (1-based); clamped to the pages that exist
+
+    Returns:
+        Tuple[int, int, int, int]: (start, end, page, total_pages)
+    """
+    page_size = max(1, int(page_size))
+    total_pages = max(1, -(-total // page_size))
+    page = min(max(1, int(page)), total_pages)
+    start = (page - 1) * page_size
+    return start, min(start + page_size, total), page, total_pages
+
+
+def _step_page(page_key: str, step: int) -> None:
+    st.session_state[page_key] = st.session_state.get(page_key, 1) + step
+
+
+def _go_to_page(page_key: str, page: int) -> None:
+    st.session_state[page_key] = page
+
+
+def render_page_controls(total: int, key_prefix: str, default_page_size: int = DEFAULT_PAGE_SIZE) -> Tuple[int, int]:
+    """
+    Page size selector and page navigation for a view of total rows
+
+    The current page lives in st.session_state['<key_prefix>_current_page'] and is clamped
+    whenever the view shrinks (e.g. after a filter change).
+
+    Args:
+        total (int): Rows in the filtered view
+        key_prefix (str): Widget/session key prefix ('select', 'delete')
+        default_page_size (int): Initial page size
+
+    Returns:
+        Tuple[int, int]: (start, end) positions of the rows to render
+    """
+    options = sorted(set(PAGE_SIZE_OPTIONS) | {default_page_size})
+    page_size = st.selectbox(
+        "Questions per page",
+        options,
+        index=options.index(default_page_size),
+        key=f"{key_prefix}_mode_pagination"
+    )
+
+    page_key = f"{key_prefix}_current_page"
+    start, end, page, total_pages = page_window(total, page_size, st.session_state.get(page_key, 1))
+    # Set before the page selector is created, so it may still be written this run
+    st.session_state[page_key] = page
+
+    if total_pages > 1:
+        col1, col2, col3, col4, col5 = st.columns([1, 1, 2, 1, 1])
+
+        with col1:
+            st.button("⬅️ Previous", key=f"{key_prefix}_prev", disabled=page <= 1,
+                      on_click=_step_page, args=(page_key, -1))
+
+        with col2:
+            st.button("⏪ First", key=f"{key_prefix}_first", disabled=page <= 1,
+                      on_click=_go_to_page, args=(page_key, 1))
+
+        with col3:
+            # Bound to the page key, so buttons and selector always agree
+            st.selectbox("Page", range(1, total_pages + 1), key=page_key)
+
+        with col4:
+            st.button("⏩ Last", key=f"{key_prefix}_last", disabled=page >= total_pages,
+                      on_click=_go_to_page, args=(page_key, total_pages))
+
+        with col5:
+            st.button("Next ➡️", key=f"{key_prefix}_next", disabled=page >= total_pages,
+                      on_click=_step_page, args=(page_key, 1))
+
+        st.info(f"Page {page} of {total_pages} · questions {start + 1}-{end} of {total}")
+
+    return start, end
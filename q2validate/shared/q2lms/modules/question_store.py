@@ -0,0 +1,268 @@
+# modules/question_store.py
+"""
+Question Store - Persistent on-disk question banks backed by SQLite
+Question bodies are stored as JSON rows in bank order. WAL journaling lets several app
+sessions read a bank while another writes.
+Every question has a stable row id and a version, so sessions sharing a bank write edits to
+the question they loaded and get a QuestionConflictError when another session changed it.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Override with the Q2LMS_STORE_PATH environment variable to share one bank file per server
+DEFAULT_STORE_PATH = os.path.join(os.path.expanduser('~'), '.q2lms', 'question_banks.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS banks (
+    bank_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    question_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS questions (
+    row_id INTEGER PRIMARY KEY,
+    bank_id INTEGER NOT NULL REFERENCES banks(bank_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_questions_position ON questions(bank_id, position);
+"""
+
+# (row id, version) of a stored question, as returned by load_rows and row_keys
+RowKey = Tuple[int, int]
+
+
+class QuestionConflictError(Exception):
+    """The stored question was changed or deleted since it was loaded"""
+
+
+class QuestionStore:
+    """SQLite-backed question banks shared by every session of the app"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path (str, optional): Database file; defaults to Q2LMS_STORE_PATH or DEFAULT_STORE_PATH
+        """
+        self.path = path or os.environ.get('Q2LMS_STORE_PATH') or DEFAULT_STORE_PATH
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        connection = self._connection()
+        columns = {row['name'] for row in connection.execute('PRAGMA table_info(questions)')}
+        if columns and 'version' not in columns:
+            # Banks saved before questions were versioned (row ids are SQLite's own rowid)
+            connection.execute('ALTER TABLE questions ADD COLUMN version INTEGER NOT NULL DEFAULT 1')
+        connection.executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connection for the calling thread (Streamlit runs each session on its own thread)"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute('PRAGMA foreign_keys=ON')
+            self._local.connection = connection
+        return connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run the block in one write transaction"""
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    def _bank_id(self, connection: sqlite3.Connection, name: str) -> int:
+        row = connection.execute('SELECT bank_id FROM banks WHERE name = ?', (name,)).fetchone()
+        if row is None:
+            raise KeyError(f"No question bank named '{name}'")
+        return row['bank_id']
+
+    @staticmethod
+    def _touch(connection: sqlite3.Connection, bank_id: int) -> None:
+        connection.execute(
+            'UPDATE banks SET updated_at = ?, '
+            'question_count = (SELECT COUNT(*) FROM questions WHERE bank_id = ?) WHERE bank_id = ?',
+            (datetime.now().isoformat(timespec='seconds'), bank_id, bank_id)
+        )
+
+    @staticmethod
+    def _insert_questions(connection: sqlite3.Connection, bank_id: int, start: int,
+                          questions: Sequence[Dict[str, Any]]) -> None:
+        connection.executemany(
+            'INSERT INTO questions (bank_id, position, body) VALUES (?, ?, ?)',
+            (
+                (bank_id, start + offset, json.dumps(question, ensure_ascii=False, default=str))
+                for offset, question in enumerate(questions)
+            )
+        )
+
+    # Banks
+
+    def save_bank(self, name: str, questions: Sequence[Dict[str, Any]],
+                  metadata: Optional[Dict[str, Any]] = None) -> List[RowKey]:
+        """
+        Create or replace a bank with the given questions
+
+        Returns:
+            List[RowKey]: (row id, version) of the stored questions, in the given order
+        """
+        with self._transaction() as connection:
+            connection.execute(
+                'INSERT INTO banks (name, metadata, updated_at) VALUES (?, ?, ?) '
+                'ON CONFLICT(name) DO UPDATE SET metadata = excluded.metadata',
+                (name, json.dumps(metadata or {}, ensure_ascii=False, default=str),
+                 datetime.now().isoformat(timespec='seconds'))
+            )
+            bank_id = self._bank_id(connection, name)
+            connection.execute('DELETE FROM questions WHERE bank_id = ?', (bank_id,))
+            self._insert_questions(connection, bank_id, 0, questions)
+            self._touch(connection, bank_id)
+            rows = connection.execute(
+                'SELECT rowid, version FROM questions WHERE bank_id = ? ORDER BY position', (bank_id,)
+            )
+            return [(row_id, version) for row_id, version in rows]
+
+    def append_questions(self, name: str, questions: Sequence[Dict[str, Any]]) -> int:
+        """Add questions to the end of an existing bank, returning the new question count"""
+        with self._transaction() as connection:
+            bank_id = self._bank_id(connection, name)
+            start = connection.execute(
+                'SELECT COALESCE(MAX(position) + 1, 0) FROM questions WHERE bank_id = ?', (bank_id,)
+            ).fetchone()[0]
+            self._insert_questions(connection, bank_id, start, questions)
+            self._touch(connection, bank_id)
+            return connection.execute('SELECT question_count FROM banks WHERE bank_id = ?', (bank_id,)).fetchone()[0]
+
+    def list_banks(self) -> List[Dict[str, Any]]:
+        """Name, question count and last update of every bank"""
+        rows = self._connection().execute(
+            'SELECT name, question_count, updated_at FROM banks ORDER BY name'
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_metadata(self, name: str) -> Dict[str, Any]:
+        connection = self._connection()
+        row = connection.execute('SELECT metadata FROM banks WHERE name = ?', (name,)).fetchone()
+        if row is None:
+            raise KeyError(f"No question bank named '{name}'")
+        return json.loads(row['metadata'])
+
+    def delete_bank(self, name: str) -> None:
+        with self._transaction() as connection:
+            connection.execute('DELETE FROM banks WHERE name = ?', (name,))
+
+    # Questions
+
+    def load_rows(self, name: str) -> List[Tuple[int, int, Dict[str, Any]]]:
+        """
+        A bank's questions in bank order, with the keys to write edits back
+
+        Returns:
+            List of (row id, version, question dict as saved)
+        """
+        connection = self._connection()
+        rows = connection.execute(
+            'SELECT rowid, version, body FROM questions WHERE bank_id = ? ORDER BY position',
+            (self._bank_id(connection, name),)
+        )
+        return [(row_id, version, json.loads(body)) for row_id, version, body in rows]
+
+    def load_questions(self, name: str) -> List[Dict[str, Any]]:
+        """A bank's questions in bank order (see load_rows)"""
+        return [question for _, _, question in self.load_rows(name)]
+
+    def row_keys(self, name: str) -> List[RowKey]:
+        """(row id, version) of every question in a bank, in bank order"""
+        connection = self._connection()
+        rows = connection.execute(
+            'SELECT rowid, version FROM questions WHERE bank_id = ? ORDER BY position',
+            (self._bank_id(connection, name),)
+        )
+        return [(row_id, version) for row_id, version in rows]
+
+    @staticmethod
+    def _check_version(connection: sqlite3.Connection, bank_id: int, name: str, row_id: int,
+                       expected_version: Optional[int]) -> Optional[int]:
+        """Current version of a row, or None if it is gone; raises if it moved past expected_version"""
+        row = connection.execute(
+            'SELECT version FROM questions WHERE rowid = ? AND bank_id = ?', (row_id, bank_id)
+        ).fetchone()
+        version = None if row is None else row['version']
+        if expected_version is not None and version is not None and version != expected_version:
+            raise QuestionConflictError(
+                f"Question {row_id} in '{name}' was changed by another session "
+                f"(version {version}, expected {expected_version})"
+            )
+        return version
+
+    def update_question(self, name: str, row_id: int, question: Dict[str, Any],
+                        expected_version: Optional[int] = None) -> int:
+        """
+        Replace a stored question
+
+        Args:
+            row_id (int): Row id from load_rows/row_keys
+            expected_version (int, optional): Version the caller loaded; the update is refused
+                if another session has changed the question since
+
+        Returns:
+            int: The question's new version
+
+        Raises:
+            QuestionConflictError: The question was deleted or changed since it was loaded
+        """
+        with self._transaction() as connection:
+            bank_id = self._bank_id(connection, name)
+            if self._check_version(connection, bank_id, name, row_id, expected_version) is None:
+                raise QuestionConflictError(f"Question {row_id} in '{name}' was deleted by another session")
+            connection.execute(
+                'UPDATE questions SET body = ?, version = version + 1 WHERE rowid = ?',
+                (json.dumps(question, ensure_ascii=False, default=str), row_id)
+            )
+            self._touch(connection, bank_id)
+            return self._check_version(connection, bank_id, name, row_id, None)
+
+    def delete_question(self, name: str, row_id: int, expected_version: Optional[int] = None) -> bool:
+        """
+        Remove a stored question; the other questions keep their row ids and order
+
+        Returns:
+            bool: False if the question had already been deleted
+
+        Raises:
+            QuestionConflictError: The question was changed since it was loaded
+        """
+        with self._transaction() as connection:
+            bank_id = self._bank_id(connection, name)
+            if self._check_version(connection, bank_id, name, row_id, expected_version) is None:
+                return False
+            connection.execute('DELETE FROM questions WHERE rowid = ?', (row_id,))
+            self._touch(connection, bank_id)
+            return True
+
+
+@lru_cache(maxsize=None)
+def _store_for_path(path: str) -> QuestionStore:
+    return QuestionStore(path)
+
+
+def get_question_store(path: Optional[str] = None) -> QuestionStore:
+    """Shared store instance for a database file (Q2LMS_STORE_PATH or the default path)"""
+    return _store_for_path(path or os.environ.get('Q2LMS_STORE_PATH') or DEFAULT_STORE_PATH)
@@ -0,0 +1,278 @@
+# modules/search_index.py
+"""
+Search Index - Inverted full-text index over the question bank
+Built once per database load, updated per question on edits, and shared by browse, select and delete modes
+"""
+
+import bisect
+import math
+import re
+import weakref
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple, Any
+
+import pandas as pd
+import streamlit as st
+
+
+# Field weights used for ranking (title hits outrank feedback hits)
+FIELD_WEIGHTS = {
+    'Title': 3.0,
+    'Question_Text': 2.0,
+    'Choice_A': 1.0,
+    'Choice_B': 1.0,
+    'Choice_C': 1.0,
+    'Choice_D': 1.0,
+    'Correct_Feedback': 0.5,
+    'Incorrect_Feedback': 0.5,
+}
+
+# LaTeX commands, subscripted symbols (V_T, V_{DS}), numbers with decimals, and words
+TOKEN_PATTERN = re.compile(
+    r'\\([a-zA-Z]+)'
+    r'|([^\W_]+(?:\.\d+)?)(?:_\{?([^\W_]+)\}?)?'
+)
+
+# Formatting commands that carry no searchable meaning
+LATEX_STOP_COMMANDS = {
+    'text', 'mathrm', 'mathbf', 'mathit', 'frac', 'dfrac', 'left', 'right',
+    'cdot', 'quad', 'qquad', 'displaystyle', 'begin', 'end', 'operatorname'
+}
+
+# Unicode symbols LLMs emit instead of LaTeX commands
+UNICODE_SYMBOLS = {
+    'Ω': 'omega', 'ω': 'omega', 'μ': 'mu', 'µ': 'mu', 'π': 'pi', 'θ': 'theta',
+    'α': 'alpha', 'β': 'beta', 'γ': 'gamma', 'δ': 'delta', 'Δ': 'delta',
+    'λ': 'lambda', 'σ': 'sigma', 'φ': 'phi', 'ρ': 'rho', 'τ': 'tau', '°': 'circ'
+}
+
+PREFIX_MATCH_DISCOUNT = 0.5
+
+
+def tokenize(text: Any) -> List[str]:
+    """
+    Split text into LaTeX-aware search tokens
+
+    Args:
+        text: Field value (non-strings are converted, None/NaN yield no tokens)
+
+    Returns:
+        List[str]: Lowercase tokens; ``\\Omega`` yields ``\\omega`` and ``omega``,
+        ``V_T`` yields ``v_t``, ``v`` and ``t``
+    """
+    if text is None or (isinstance(text, float) and math.isnan(text)):
+        return []
+
+    text = str(text)
+    for symbol, name in UNICODE_SYMBOLS.items():
+        if symbol in text:
+            text = text.replace(symbol, f' \\{name} ')
+
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(text):
+        command, word, subscript = match.groups()
+        if command:
+            command = command.lower()
+            if command not in LATEX_STOP_COMMANDS:
+                tokens.append('\\' + command)
+                tokens.append(command)
+        else:
+            word = word.lower()
+            tokens.append(word)
+            if subscript:
+                subscript = subscript.lower()
+                tokens.append(f"{word}_{subscript}")
+                tokens.append(subscript)
+    return tokens
+
+
+class QuestionSearchIndex:
+    """
+    Inverted index mapping tokens to weighted postings keyed by DataFrame index label.
+    Prefix queries use a sorted vocabulary, so lookups cost O(log V + matches)
+    regardless of how many questions are in the bank.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self._df_ref = weakref.ref(df)
+        self.n_rows = len(df)
+        self.postings: Dict[str, Dict[Any, float]] = defaultdict(dict)
+        self.row_terms: Dict[Any, Dict[str, float]] = {}
+        self.vocabulary: List[str] = []
+
+        fields = [field for field in FIELD_WEIGHTS if field in df.columns]
+        columns = [df[field].tolist() for field in fields]
+        for position, label in enumerate(df.index):
+            values = {field: column[position] for field, column in zip(fields, columns)}
+            self._add_row(label, values)
+
+        self.vocabulary = sorted(self.postings)
+
+    def _row_term_weights(self, values: Dict[str, Any]) -> Dict[str, float]:
+        """Accumulate weighted term frequencies for one question"""
+        weights: Dict[str, float] = defaultdict(float)
+        for field, value in values.items():
+            field_weight = FIELD_WEIGHTS.get(field, 0.0)
+            if field_weight:
+                for token in tokenize(value):
+                    weights[token] += field_weight
+        return weights
+
+    def _add_row(self, label: Any, values: Dict[str, Any]) -> List[str]:
+        """Index one question and return any terms new to the vocabulary"""
+        weights = self._row_term_weights(values)
+        new_terms = []
+        for term, weight in weights.items():
+            if term not in self.postings:
+                new_terms.append(term)
+            self.postings[term][label] = weight
+        self.row_terms[label] = dict(weights)
+        return new_terms
+
+    def _remove_row(self, label: Any) -> None:
+        """Drop one question's postings, pruning terms that become empty"""
+        for term in self.row_terms.pop(label, {}):
+            term_postings = self.postings.get(term)
+            if term_postings is None:
+                continue
+            term_postings.pop(label, None)
+            if not term_postings:
+                del self.postings[term]
+                position = bisect.bisect_left(self.vocabulary, term)
+                if position < len(self.vocabulary) and self.vocabulary[position] == term:
+                    self.vocabulary.pop(position)
+
+    def update_row(self, label: Any, row: Any) -> None:
+        """
+        Re-index a single edited question
+
+        Args:
+            label: DataFrame index label of the question
+            row: Mapping (dict or pd.Series) with DataFrame column names
+        """
+        self._remove_row(label)
+        values = {field: row.get(field, '') for field in FIELD_WEIGHTS}
+        for term in self._add_row(label, values):
+            bisect.insort(self.vocabulary, term)
+
+    def rebind(self, df: pd.DataFrame) -> None:
+        """Attach the index to a replacement DataFrame with the same rows"""
+        self._df_ref = weakref.ref(df)
+        self.n_rows = len(df)
+
+    def matches(self, df: pd.DataFrame) -> bool:
+        """Check whether this index was built for the given DataFrame"""
+        return self._df_ref() is df and len(df) == self.n_rows
+
+    def _expand_prefix(self, prefix: str) -> Iterable[str]:
+        """Yield vocabulary terms starting with prefix"""
+        position = bisect.bisect_left(self.vocabulary, prefix)
+        while position < len(self.vocabulary) and self.vocabulary[position].startswith(prefix):
+            yield self.vocabulary[position]
+            position += 1
+
+    def _term_scores(self, query_term: str) -> Dict[Any, float]:
+        """Score rows for one query term (exact matches weigh more than prefix matches)"""
+        scores: Dict[Any, float] = defaultdict(float)
+        total_rows = max(len(self.row_terms), 1)
+        for term in self._expand_prefix(query_term):
+            term_postings = self.postings[term]
+            idf = math.log(1 + total_rows / len(term_postings))
+            factor = idf if term == query_term else idf * PREFIX_MATCH_DISCOUNT
+            for label, weight in term_postings.items():
+                scores[label] += weight * factor
+        return scores
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[Any, float]]:
+        """
+        Run a ranked query; every query term must match (as a word or word prefix)
+
+        Args:
+            query (str): Free-text query, LaTeX allowed
+            limit (int, optional): Maximum number of results
+
+        Returns:
+            List[Tuple[Any, float]]: (index label, score) pairs, best first
+        """
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        if not query_terms:
+            return []
+
+        term_scores = sorted((self._term_scores(term) for term in query_terms), key=len)
+        results = dict(term_scores[0])
+        for scores in term_scores[1:]:
+            results = {label: score + scores[label]
+                       for label, score in results.items() if label in scores}
+            if not results:
+                return []
+
+        ranked = sorted(results.items(), key=lambda item: -item[1])
+        return ranked[:limit] if limit else ranked
+
+
+def get_search_index(df: pd.DataFrame) -> QuestionSearchIndex:
+    """
+    Get the shared search index for a DataFrame, rebuilding it when the database changes
+
+    Args:
+        df (pd.DataFrame): The full questions DataFrame
+
+    Returns:
+        QuestionSearchIndex: Index matching the DataFrame
+    """
+    index = st.session_state.get('search_index')
+    if index is None or not index.matches(df):
+        index = QuestionSearchIndex(df)
+        st.session_state['search_index'] = index
+    return index
+
+
+def update_search_index_row(previous_df: pd.DataFrame, df: pd.DataFrame, label: Any) -> None:
+    """
+    Incrementally re-index one edited question and attach the index to the new DataFrame
+
+    The index is only carried over when it was built for the DataFrame being replaced; any
+    other index is stale and is dropped, so the next search rebuilds it.
+
+    Args:
+        previous_df (pd.DataFrame): DataFrame the edit was applied to a copy of
+        df (pd.DataFrame): Updated questions DataFrame (already stored in session state)
+        label: Index label of the edited question
+    """
+    index = st.session_state.get('search_index')
+    if index is None:
+        return
+    if not index.matches(previous_df) or len(previous_df) != len(df):
+        st.session_state.pop('search_index', None)
+        return
+    index.update_row(label, df.loc[label])
+    index.rebind(df)
+
+
+def search_questions(view_df: pd.DataFrame, query: str,
+                     base_df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Restrict a (possibly already filtered) view to questions matching a query, best match first
+
+    Args:
+        view_df (pd.DataFrame): Rows currently in view
+        query (str): Search query; blank returns the view unchanged
+        base_df (pd.DataFrame, optional): Full DataFrame the shared index is built over
+
+    Returns:
+        pd.DataFrame: Matching rows of view_df in rank order
+    """
+    if not query or not query.strip():
+        return view_df
+
+    if base_df is None:
+        base_df = st.session_state.get('df')
+        if base_df is None:
+            base_df = view_df
+
+    ranked = get_search_index(base_df).search(query)
+    if not ranked:
+        return view_df.iloc[0:0]
+
+    positions = view_df.index.get_indexer([label for label, _ in ranked])
+    return view_df.iloc[positions[positions >= 0]]
@@ -9,6 +9,17 @@ import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
+try:
+    from .database_processor import load_database_from_store, reset_derived_state
+    from .question_store import get_question_store
+    from .filter_engine import present_value_counts
+    from .dtype_schema import memory_report
+except ImportError:
+    from database_processor import load_database_from_store, reset_derived_state
+    from question_store import get_question_store
+    from filter_engine import present_value_counts
+    from dtype_schema import memory_report
+
 def initialize_session_state():
     """Initialize session state with default values"""
     if 'database_history' not in st.session_state:
@@ -25,7 +36,9 @@ def clear_session_state():
     keys_to_clear = [
         'df', 'metadata', 'original_questions', 'cleanup_reports', 
         'filename', 'processing_options', 'batch_processed_files',
-        'quiz_questions', 'current_page', 'last_page', 'loaded_at'
+        'quiz_questions', 'current_page', 'last_page', 'loaded_at',
+        'filter_index', 'search_index', 'dirty_rows', 'export_sync_cache',
+        'bank_name', 'bank_rows', 'flag_bitmap'
     ]
     
     for key in keys_to_clear:
@@ -58,8 +71,8 @@ def get_database_summary() -> Optional[Dict[str, Any]]:
         'total_questions': len(df),
         'topics': df['Topic'].nunique(),
         'total_points': df['Points'].sum(),
-        'difficulty_distribution': df['Difficulty'].value_counts().to_dict(),
-        'type_distribution': df['Type'].value_counts().to_dict(),
+        'difficulty_distribution': present_value_counts(df['Difficulty']).to_dict(),
+        'type_distribution': present_value_counts(df['Type']).to_dict(),
         'loaded_at': st.session_state.get('loaded_at', 'Unknown')
     }
 
@@ -105,12 +118,15 @@ def restore_database_from_history(history_id: int) -> bool:
         for entry in st.session_state['database_history']:
             if entry['id'] == history_id:
                 # Restore the database
+                reset_derived_state()
                 st.session_state['df'] = entry['df'].copy()
                 st.session_state['metadata'] = entry['metadata']
                 st.session_state['original_questions'] = entry['original_questions'].copy()
                 st.session_state['filename'] = entry['filename']
                 st.session_state['loaded_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 st.session_state['current_database_id'] = history_id
+                st.session_state.pop('bank_name', None)
+                st.session_state.pop('bank_rows', None)
                 
                 return True
         
@@ -151,6 +167,105 @@ def display_database_history():
                         else:
                             st.error("❌ Failed to restore database")
 
+def save_database_to_store(bank_name: str) -> bool:
+    """Save the current database as a persistent bank; later edits are written through to it"""
+    questions = st.session_state.get('original_questions')
+    if not questions:
+        st.error("❌ No questions to save")
+        return False
+    
+    try:
+        row_keys = get_question_store().save_bank(bank_name, questions, st.session_state.get('metadata', {}))
+        st.session_state['bank_name'] = bank_name
+        st.session_state['bank_rows'] = row_keys
+        return True
+    except Exception as e:
+        st.error(f"❌ Error saving question bank: {str(e)}")
+        return False
+
+def open_database_from_store(bank_name: str) -> bool:
+    """Replace the current database with a saved bank"""
+    df, metadata, original_questions, row_keys = load_database_from_store(bank_name)
+    if df is None:
+        return False
+    
+    save_database_to_history()
+    clear_session_state()
+    st.session_state['df'] = df
+    st.session_state['metadata'] = metadata
+    st.session_state['original_questions'] = original_questions
+    st.session_state['cleanup_reports'] = []
+    st.session_state['filename'] = bank_name
+    st.session_state['loaded_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    st.session_state['bank_name'] = bank_name
+    st.session_state['bank_rows'] = row_keys
+    return True
+
+def display_saved_banks():
+    """Display saved question banks with open, save and delete options"""
+    try:
+        store = get_question_store()
+        banks = store.list_banks()
+    except Exception as e:
+        st.caption(f"Saved question banks unavailable: {e}")
+        return
+    
+    with st.expander(f"🗄️ Saved Question Banks ({len(banks)})", expanded=False):
+        if banks:
+            bank_info = {bank['name']: bank for bank in banks}
+            selected = st.selectbox(
+                "Saved bank",
+                list(bank_info),
+                format_func=lambda name: f"{name} ({bank_info[name]['question_count']} questions, updated {bank_info[name]['updated_at']})",
+                key="saved_bank_select"
+            )
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("📂 Open Bank", key="open_saved_bank", help="Load this bank without re-uploading its file"):
+                    if open_database_from_store(selected):
+                        st.success(f"✅ Opened '{selected}'")
+                        st.rerun()
+            with col2:
+                confirm = st.checkbox("Confirm delete", key="confirm_delete_saved_bank")
+                if st.button("🗑️ Delete Bank", key="delete_saved_bank", disabled=not confirm):
+                    store.delete_bank(selected)
+                    if st.session_state.get('bank_name') == selected:
+                        st.session_state.pop('bank_name', None)
+                        st.session_state.pop('bank_rows', None)
+                    st.rerun()
+        else:
+            st.info("💡 No saved banks yet. Save a loaded database here to reopen it later or share it with other sessions.")
+        
+        if has_active_database():
+            current_bank = st.session_state.get('bank_name')
+            if current_bank:
+                st.caption(f"✅ Edits are saved to bank `{current_bank}`")
+            bank_name = st.text_input(
+                "Save current database as",
+                value=current_bank or st.session_state.get('filename', ''),
+                key="save_bank_name"
+            )
+            if st.button("💾 Save to Question Bank", key="save_saved_bank") and bank_name.strip():
+                if save_database_to_store(bank_name.strip()):
+                    st.success(f"✅ Saved {len(st.session_state['original_questions'])} questions to '{bank_name.strip()}'")
+
+def display_memory_usage(df: pd.DataFrame) -> None:
+    """Memory used by the questions DataFrame, compared with plain Python object columns"""
+    # Measuring plain-object usage copies the frame, so it only runs on request
+    if not st.checkbox("🧠 Show memory usage", key="show_memory_usage"):
+        return
+    report = memory_report(df)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("As Python objects", f"{report['before'] / 1024 / 1024:.2f} MB")
+    with col2:
+        st.metric("Compact dtypes", f"{report['after'] / 1024 / 1024:.2f} MB")
+    with col3:
+        saved = 1 - report['after'] / report['before'] if report['before'] else 0
+        st.metric("Saved", f"{saved:.0%}")
+    st.dataframe(report['columns'], use_container_width=True)
+
 def display_current_database_status() -> bool:
     """Display current database status and management options"""
     if 'df' in st.session_state and st.session_state['df'] is not None:
@@ -239,6 +354,8 @@ def display_enhanced_database_status() -> bool:
         
         st.markdown("</div>", unsafe_allow_html=True)
         
+        display_memory_usage(df)
+        
         # Show database history
         display_database_history()
         
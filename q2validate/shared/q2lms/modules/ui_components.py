@@ -1,5 +1,7 @@
 import streamlit as st
 import plotly.express as px
+from modules.filter_engine import get_filter_index, present_value_counts
+from modules.search_index import search_questions
 
 def display_database_summary(df, metadata):
     st.markdown('<div class="main-header">📊 Database Overview</div>', unsafe_allow_html=True)
@@ -33,7 +35,7 @@ def create_summary_charts(df):
     col1, col2 = st.columns(2)
     with col1:
         st.markdown("### 📚 Topics Distribution")
-        topic_counts = df['Topic'].value_counts()
+        topic_counts = present_value_counts(df['Topic'])
         fig_topics = px.pie(
             values=topic_counts.values,
             names=topic_counts.index,
@@ -43,7 +45,7 @@ def create_summary_charts(df):
         st.plotly_chart(fig_topics, use_container_width=True)
     with col2:
         st.markdown("### 🎯 Difficulty Distribution")
-        difficulty_counts = df['Difficulty'].value_counts()
+        difficulty_counts = present_value_counts(df['Difficulty'])
         colors = {'Easy': '#90EE90', 'Medium': '#FFD700', 'Hard': '#FF6347'}
         color_sequence = [colors.get(level, '#1f77b4') for level in difficulty_counts.index]
         fig_difficulty = px.bar(
@@ -67,7 +69,7 @@ def create_summary_charts(df):
         fig_subtopics.update_layout(height=max(400, len(subtopics) * 30))
         st.plotly_chart(fig_subtopics, use_container_width=True)
     st.markdown("### 📝 Question Types")
-    type_counts = df['Type'].value_counts()
+    type_counts = present_value_counts(df['Type'])
     col1, col2 = st.columns([2, 1])
     with col1:
         fig_types = px.bar(
@@ -84,29 +86,20 @@ def create_summary_charts(df):
 
 def apply_filters(df):
     st.sidebar.markdown("## 🔍 Filter Questions")
-    filtered_df = df.copy()
-    topics = ['All'] + sorted(df['Topic'].unique().tolist())
+    index = get_filter_index(df)
+    selections = {}
+    topics = ['All'] + index.options('Topic')
     selected_topic = st.sidebar.selectbox("📚 Topic", topics)
-    if selected_topic != 'All':
-        filtered_df = filtered_df[filtered_df['Topic'] == selected_topic]
-    available_subtopics = filtered_df[
-        filtered_df['Subtopic'].notna() & 
-        (filtered_df['Subtopic'] != '') & 
-        (filtered_df['Subtopic'] != 'N/A')
-    ]['Subtopic'].unique()
+    selections['Topic'] = selected_topic
+    available_subtopics = index.options('Subtopic', index.build_mask(selections))
     if len(available_subtopics) > 0:
-        subtopics = ['All'] + sorted(available_subtopics.tolist())
-        selected_subtopic = st.sidebar.selectbox("🎯 Subtopic", subtopics)
-        if selected_subtopic != 'All':
-            filtered_df = filtered_df[filtered_df['Subtopic'] == selected_subtopic]
-    difficulties = ['All'] + sorted(df['Difficulty'].unique().tolist())
-    selected_difficulty = st.sidebar.selectbox("⚡ Difficulty", difficulties)
-    if selected_difficulty != 'All':
-        filtered_df = filtered_df[filtered_df['Difficulty'] == selected_difficulty]
-    types = ['All'] + sorted(df['Type'].unique().tolist())
-    selected_type = st.sidebar.selectbox("📝 Question Type", types)
-    if selected_type != 'All':
-        filtered_df = filtered_df[filtered_df['Type'] == selected_type]
+        subtopics = ['All'] + available_subtopics
+        selections['Subtopic'] = st.sidebar.selectbox("🎯 Subtopic", subtopics)
+    difficulties = ['All'] + index.options('Difficulty')
+    selections['Difficulty'] = st.sidebar.selectbox("⚡ Difficulty", difficulties)
+    types = ['All'] + index.options('Type')
+    selections['Type'] = st.sidebar.selectbox("📝 Question Type", types)
+    points_range = None
     min_points, max_points = int(df['Points'].min()), int(df['Points'].max())
     if min_points < max_points:
         points_range = st.sidebar.slider(
@@ -114,17 +107,9 @@ def apply_filters(df):
             min_points, max_points, 
             (min_points, max_points)
         )
-        filtered_df = filtered_df[
-            (filtered_df['Points'] >= points_range[0]) & 
-            (filtered_df['Points'] <= points_range[1])
-        ]
     search_term = st.sidebar.text_input("🔍 Search in Questions", "")
-    if search_term:
-        mask = (
-            filtered_df['Title'].str.contains(search_term, case=False, na=False) |
-            filtered_df['Question_Text'].str.contains(search_term, case=False, na=False)
-        )
-        filtered_df = filtered_df[mask]
+    mask = index.build_mask(selections, points_range)
+    filtered_df = search_questions(index.filter(df, mask), search_term, base_df=df)
     st.sidebar.markdown("---")
     st.sidebar.markdown(f"**📊 Results: {len(filtered_df)} questions**")
     if len(filtered_df) < len(df):
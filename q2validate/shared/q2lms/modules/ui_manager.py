@@ -7,6 +7,8 @@ Handles user interface coordination, tab management, and rendering
 import streamlit as st
 import pandas as pd
 from datetime import datetime
+from modules.search_index import search_questions
+from modules.session_manager import display_saved_banks
 
 class UIManager:
     """Manages user interface coordination and rendering for Q2LMS"""
@@ -61,6 +63,16 @@ class UIManager:
             filtered_df = pd.DataFrame()  # Empty if nothing selected
             st.sidebar.warning("⚠️ No topics selected - showing no questions")
         
+        # Full-text search shared by browse, select and delete modes
+        search_query = st.sidebar.text_input(
+            "🔍 Search questions",
+            key="question_search_query",
+            help="💡 Searches titles, question text, choices and feedback. LaTeX like \\Omega or V_T and word prefixes work."
+        )
+        if search_query and not filtered_df.empty:
+            filtered_df = search_questions(filtered_df, search_query, base_df=df)
+            st.sidebar.caption(f"🔎 {len(filtered_df)} questions match '{search_query}'")
+        
         return filtered_df
     
     def render_upload_interface(self):
@@ -107,6 +119,9 @@ class UIManager:
                 upload_interface.render_preview_section()
                 upload_interface.render_results_section()
                 
+                # Persistent banks shared across sessions
+                display_saved_banks()
+                
                 has_database = ('df' in st.session_state and st.session_state['df'] is not None and len(st.session_state['df']) > 0)
                 
             except Exception as e:
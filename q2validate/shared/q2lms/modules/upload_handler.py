@@ -8,64 +8,44 @@ import streamlit as st
 import json
 import pandas as pd
 from datetime import datetime
-from typing import Tuple, Optional, Dict, Any, List
+from typing import Tuple, Optional, Dict, Any, List, Union
 
 # Import session manager
-from .session_manager import (
-    clear_session_state, save_database_to_history, 
-    display_enhanced_database_status, initialize_session_state
-)
+try:
+    from .session_manager import (
+        clear_session_state, save_database_to_history, 
+        display_enhanced_database_status, initialize_session_state
+    )
+    from .database_processor import ParsedUpload
+except ImportError:
+    from session_manager import (
+        clear_session_state, save_database_to_history, 
+        display_enhanced_database_status, initialize_session_state
+    )
+    from database_processor import ParsedUpload
 
-def detect_database_format_and_type(json_content: str, filename: str) -> Tuple[Optional[str], str, int, Dict]:
+def detect_database_format_and_type(json_content: Union[str, bytes, ParsedUpload],
+                                    filename: str) -> Tuple[Optional[str], str, int, Dict]:
     """
     Detect format version and database type from uploaded JSON
     Returns: (format_version, database_type, questions_count, metadata)
     """
-    try:
-        data = json.loads(json_content)
-        
-        # Determine structure type
-        if isinstance(data, dict) and 'questions' in data:
-            questions = data['questions']
-            metadata = data.get('metadata', {})
-            structure_type = "structured"
-        elif isinstance(data, list):
-            questions = data
-            metadata = {}
-            structure_type = "simple_list"
-        else:
-            return None, "unknown", 0, {}
-        
-        # Detect format version
-        format_version = "Unknown"
-        if metadata.get('format_version'):
-            format_version = metadata['format_version']
-        elif len(questions) > 0:
-            # Analyze first question to guess format
-            sample_q = questions[0]
-            if 'subtopic' in sample_q:
-                format_version = "Phase Four"
-            elif 'topic' in sample_q:
-                format_version = "Phase Three"
-            else:
-                format_version = "Legacy"
-        
-        # Determine database type based on content analysis
-        if len(questions) == 0:
-            database_type = "empty"
-        elif len(questions) < 10:
-            database_type = "small_set"
-        elif len(questions) < 50:
-            database_type = "medium_set"
-        else:
-            database_type = "large_set"
-        
-        return format_version, database_type, len(questions), metadata
-        
-    except json.JSONDecodeError:
-        return None, "invalid_json", 0, {}
-    except Exception as e:
-        return None, "error", 0, {}
+    upload = json_content if isinstance(json_content, ParsedUpload) else ParsedUpload(json_content, filename)
+    return upload.detection()
+
+def get_parsed_upload(uploaded_file) -> ParsedUpload:
+    """
+    The ParsedUpload for an uploaded file, decoded once and reused across reruns
+    
+    Streamlit reruns the script on every interaction, so the parsed upload is kept in
+    session state until a different file is uploaded.
+    """
+    key = (uploaded_file.name, uploaded_file.size, getattr(uploaded_file, 'file_id', None))
+    cached = st.session_state.get('parsed_upload')
+    if cached is None or cached[0] != key:
+        cached = (key, ParsedUpload(uploaded_file.getvalue(), uploaded_file.name))
+        st.session_state['parsed_upload'] = cached
+    return cached[1]
 
 def enhanced_file_upload_widget():
     """Enhanced file upload with better state management"""
@@ -87,10 +67,10 @@ def enhanced_file_upload_widget():
         
         if uploaded_file.name != current_filename:
             # New file detected
-            content = uploaded_file.read().decode('utf-8')
+            upload = get_parsed_upload(uploaded_file)
             
             # Detect format
-            format_version, db_type, question_count, metadata = detect_database_format_and_type(content, uploaded_file.name)
+            format_version, db_type, question_count, metadata = upload.detection()
             
             if format_version is None:
                 st.error(f"❌ Invalid file format: {db_type}")
@@ -104,7 +84,7 @@ def enhanced_file_upload_widget():
                 with col2:
                     st.metric("Format", format_version)
                 with col3:
-                    size_mb = len(content) / 1024 / 1024
+                    size_mb = upload.size / 1024 / 1024
                     st.metric("Size", f"{size_mb:.2f} MB")
             
             # Processing options
@@ -128,7 +108,7 @@ def enhanced_file_upload_widget():
                 # Import and process new database
                 from .database_processor import process_single_database
                 
-                result = process_single_database(content, {
+                result = process_single_database(upload, {
                     'filename': uploaded_file.name,
                     'auto_latex': auto_latex,
                     'validate_questions': validate_questions,
@@ -168,10 +148,10 @@ def handle_database_replacement():
     
     if uploaded_file is not None:
         # Read and analyze the file
-        content = uploaded_file.read().decode('utf-8')
+        upload = get_parsed_upload(uploaded_file)
         
         # Detect format and type
-        format_version, db_type, question_count, metadata = detect_database_format_and_type(content, uploaded_file.name)
+        format_version, db_type, question_count, metadata = upload.detection()
         
         if format_version is None:
             st.error(f"❌ Invalid file format: {db_type}")
@@ -186,7 +166,7 @@ def handle_database_replacement():
             with col2:
                 st.metric("Questions", question_count)
             with col3:
-                size_mb = len(content) / 1024 / 1024
+                size_mb = upload.size / 1024 / 1024
                 st.metric("Size", f"{size_mb:.2f} MB")
         
         # Processing options
@@ -214,7 +194,7 @@ def handle_database_replacement():
                 from .database_processor import process_single_database
                 
                 # Process new database
-                result = process_single_database(content, {
+                result = process_single_database(upload, {
                     'filename': uploaded_file.name,
                     'auto_latex': auto_latex,
                     'validate_questions': validate_questions,
@@ -247,10 +227,10 @@ def handle_single_upload():
     
     if uploaded_file is not None:
         # Read and analyze the file
-        content = uploaded_file.read().decode('utf-8')
+        upload = get_parsed_upload(uploaded_file)
         
         # Detect format and type
-        format_version, db_type, question_count, metadata = detect_database_format_and_type(content, uploaded_file.name)
+        format_version, db_type, question_count, metadata = upload.detection()
         
         if format_version is None:
             st.error(f"❌ Invalid file format: {db_type}")
@@ -267,7 +247,7 @@ def handle_single_upload():
             with col3:
                 st.metric("Type", db_type.replace('_', ' ').title())
             with col4:
-                size_mb = len(content) / 1024 / 1024
+                size_mb = upload.size / 1024 / 1024
                 st.metric("Size", f"{size_mb:.2f} MB")
             
             if metadata:
@@ -292,7 +272,7 @@ def handle_single_upload():
             # Import and process database
             from .database_processor import process_single_database
             
-            result = process_single_database(content, {
+            result = process_single_database(upload, {
                 'filename': uploaded_file.name,
                 'auto_latex': auto_latex,
                 'validate_questions': validate_questions,
@@ -331,8 +311,8 @@ def handle_append_upload():
     )
     
     if uploaded_file is not None:
-        content = uploaded_file.read().decode('utf-8')
-        format_version, db_type, question_count, metadata = detect_database_format_and_type(content, uploaded_file.name)
+        upload = get_parsed_upload(uploaded_file)
+        format_version, db_type, question_count, metadata = upload.detection()
         
         if format_version is None:
             st.error(f"❌ Invalid file format: {db_type}")
@@ -369,7 +349,7 @@ def handle_append_upload():
             # Import append processor
             from .database_processor import process_append_operation
             
-            return process_append_operation(content, {
+            return process_append_operation(upload, {
                 'filename': uploaded_file.name,
                 'handle_duplicates': handle_duplicates,
                 'renumber_ids': renumber_ids,
@@ -2,11 +2,59 @@
 import streamlit as st
 import json
 import pandas as pd
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 import contextlib
+import functools
 import io
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    from .merge_engine import QuestionMergeEngine
+    from .dtype_schema import compact_dtypes
+    from .database_processor import reset_derived_state
+except ImportError:
+    from merge_engine import QuestionMergeEngine
+    from dtype_schema import compact_dtypes
+    from database_processor import reset_derived_state
+
+# Upper bound on parser processes; json.loads and openpyxl hold the GIL, so threads would
+# not parse files in parallel
+MAX_PARSE_WORKERS = 8
+
+
+def parse_file_content(name: str, content: bytes) -> List[Dict]:
+    """
+    Parse the raw bytes of an uploaded file into question records
+
+    Safe to run in a worker process: no Streamlit calls, errors are raised to the caller.
+
+    Args:
+        name (str): Original file name (used to pick the parser)
+        content (bytes): File contents
+
+    Returns:
+        List[Dict]: Question records
+    """
+    lower_name = name.lower()
+    if lower_name.endswith('.json'):
+        data = json.loads(content.decode('utf-8'))
+        # Handle different JSON structures
+        if isinstance(data, list):
+            return data
+        elif 'questions' in data:
+            return data['questions']
+        else:
+            return [data]
+    elif lower_name.endswith('.csv'):
+        return pd.read_csv(io.BytesIO(content)).to_dict('records')
+    elif lower_name.endswith('.xlsx'):
+        return pd.read_excel(io.BytesIO(content)).to_dict('records')
+    else:
+        raise ValueError(f"Unsupported file type: {name}")
+
 
 @dataclass
 class MergePreviewData:
@@ -17,6 +65,9 @@ class MergePreviewData:
     renumbered_count: int
     preview_questions: List[Dict]
     merge_ready: bool
+    duplicate_groups: List[Dict] = field(default_factory=list)
+    duplicate_indices: List[int] = field(default_factory=list)
+    near_duplicate_groups: List[Dict] = field(default_factory=list)
 
 class UploadInterfaceV2:
     """Simplified upload interface with clear state management and clean output"""
@@ -143,77 +194,59 @@ class UploadInterfaceV2:
                 st.session_state.upload_state = upload_state
     
     def _load_files(self, files) -> List[Dict]:
-        """Load and parse uploaded files"""
-        file_data = []
-        for file in files:
-            data = self._parse_file(file)
-            file_data.append({
-                'name': file.name,
-                'questions': data,
-                'count': len(data)
-            })
-        return file_data
-    
-    def _parse_file(self, file):
-        """Parse uploaded file based on type"""
-        try:
-            if file.name.endswith('.json'):
-                content = file.read().decode('utf-8')
-                data = json.loads(content)
-                # Handle different JSON structures
-                if 'questions' in data:
-                    return data['questions']
-                elif isinstance(data, list):
-                    return data
-                else:
-                    return [data]
-            elif file.name.endswith('.csv'):
-                df = pd.read_csv(file)
-                return df.to_dict('records')
+        """
+        Load and parse uploaded files concurrently
+
+        Files are parsed in a process pool; progress advances as each file completes.
+        A file that fails to parse is reported and contributes no questions without
+        affecting the others. Results keep the upload order so merges are deterministic.
+        """
+        # UploadedFile objects are read on the Streamlit thread; workers only see bytes
+        contents = [(file.name, file.getvalue() if hasattr(file, 'getvalue') else file.read())
+                    for file in files]
+        results: List[Optional[List[Dict]]] = [None] * len(contents)
+        errors: Dict[int, str] = {}
+
+        progress_bar = st.progress(0.0, text=f"Parsing {len(contents)} file(s)...")
+        max_workers = min(MAX_PARSE_WORKERS, len(contents), os.cpu_count() or 1)
+        with contextlib.ExitStack() as stack:
+            if max_workers > 1:
+                executor = stack.enter_context(ProcessPoolExecutor(max_workers=max_workers))
+                futures = {
+                    executor.submit(parse_file_content, name, content): position
+                    for position, (name, content) in enumerate(contents)
+                }
+                parses = ((futures[future], future.result) for future in as_completed(futures))
             else:
-                raise ValueError(f"Unsupported file type: {file.name}")
-        except Exception as e:
-            st.error(f"Error parsing {file.name}: {e}")
-            return []
+                # A single worker overlaps nothing, so skip the process start-up and result pickling
+                parses = ((position, functools.partial(parse_file_content, name, content))
+                          for position, (name, content) in enumerate(contents))
+            for completed, (position, parse) in enumerate(parses, start=1):
+                try:
+                    results[position] = parse()
+                except Exception as e:
+                    errors[position] = str(e)
+                    results[position] = []
+                progress_bar.progress(completed / len(contents),
+                                      text=f"Parsed {completed}/{len(contents)}: {contents[position][0]}")
+        progress_bar.empty()
+
+        for position in sorted(errors):
+            st.error(f"Error parsing {contents[position][0]}: {errors[position]}")
+
+        return [
+            {'name': name, 'questions': data, 'count': len(data)}
+            for (name, _), data in zip(contents, results)
+        ]
     
     def _create_clean_preview(self, file_data: List[Dict]) -> MergePreviewData:
         """Create merge preview with clean data structure - NO VERBOSE OUTPUT"""
-        all_questions = []
-        conflicts = []
-        seen_ids = set()
-        renumbered_count = 0
-        
-        # Handle single file vs multiple files
-        if len(file_data) == 1:
-            # Single file - just load questions without conflict checking
-            all_questions = file_data[0]['questions']
-            conflicts = []
-            renumbered_count = 0
-        else:
-            # Multiple files - merge with conflict resolution
-            # THIS IS WHERE THE VERBOSE OUTPUT WAS COMING FROM
-            for file_info in file_data:
-                for question in file_info['questions']:
-                    q_id = question.get('id', question.get('ID', ''))
-                    
-                    # Check for ID conflicts and auto-renumber
-                    if q_id in seen_ids:
-                        # Find new ID
-                        original_id = q_id
-                        counter = 1
-                        while f"{q_id}_{counter}" in seen_ids:
-                            counter += 1
-                        new_id = f"{q_id}_{counter}"
-                        question['id'] = new_id
-                        renumbered_count += 1
-                        # REMOVED: The print/st.write that was causing verbose output
-                        conflicts.append({
-                            'id': original_id,
-                            'description': f"ID {original_id} renamed to {new_id}"
-                        })
-                    
-                    seen_ids.add(question.get('id', q_id))
-                    all_questions.append(question)
+        # Single file loads as-is; multiple files get ID conflict resolution.
+        # Source question dicts are never modified - renamed questions are copies.
+        merge_result = QuestionMergeEngine().merge(file_data)
+        all_questions = merge_result.questions
+        conflicts = merge_result.conflicts
+        renumbered_count = merge_result.renumbered_count
         
         # Store ALL questions in the preview object
         preview_data = MergePreviewData(
@@ -222,7 +255,10 @@ class UploadInterfaceV2:
             conflict_count=len(conflicts),
             renumbered_count=renumbered_count,
             preview_questions=all_questions[:10],  # First 10 for display
-            merge_ready=True  # Always ready
+            merge_ready=True,  # Always ready
+            duplicate_groups=merge_result.duplicate_groups,
+            duplicate_indices=merge_result.duplicate_indices,
+            near_duplicate_groups=merge_result.near_duplicate_groups
         )
         
         # Store ALL merged questions for later use
@@ -278,6 +314,30 @@ class UploadInterfaceV2:
         else:
             st.success("✅ **No conflicts detected - ready to merge!**")
         
+        # Content-level duplicates (identical questions under different IDs)
+        if preview.duplicate_indices:
+            st.warning(f"⚠️ **{len(preview.duplicate_indices)} duplicate questions** found "
+                       f"({len(preview.duplicate_groups)} groups with identical content)")
+            st.checkbox("🧹 Skip duplicate questions when loading", value=True, key="skip_content_duplicates")
+            with st.expander("Duplicate Question Details"):
+                for group in preview.duplicate_groups:
+                    st.caption(f"• Same content: {', '.join(str(q_id) for q_id in group['ids'])}")
+        
+        # Near-duplicates (same question with small wording changes) are shown for review only
+        near_groups = getattr(preview, 'near_duplicate_groups', [])
+        if near_groups:
+            st.info(f"🔁 **{len(near_groups)} groups of near-duplicate questions** found - review before exporting")
+            with st.expander("Near-Duplicate Question Details"):
+                all_questions = getattr(preview, 'all_merged_questions', preview.preview_questions)
+                for group in near_groups:
+                    st.markdown(f"**IDs {', '.join(str(q_id) for q_id in group['ids'])}** "
+                                f"(≥ {group['min_similarity']:.0%} similar)")
+                    for index in group['indices'][:3]:
+                        if index < len(all_questions):
+                            q = all_questions[index]
+                            question_text = str(q.get('question_text', q.get('Question_Text', '')))
+                            st.caption(f"• {question_text[:150]}")
+        
         # Preview questions
         with st.expander("Preview First 10 Questions"):
             for i, q in enumerate(preview.preview_questions, 1):
@@ -308,6 +368,12 @@ class UploadInterfaceV2:
                         # Fallback to preview questions if all_merged_questions not available
                         all_merged_questions = preview_obj.preview_questions
                     
+                    # Drop content duplicates if requested in the preview
+                    duplicate_indices = getattr(preview_obj, 'duplicate_indices', [])
+                    if duplicate_indices and st.session_state.get('skip_content_duplicates', True):
+                        skip = set(duplicate_indices)
+                        all_merged_questions = [q for i, q in enumerate(all_merged_questions) if i not in skip]
+                    
                     # Update upload state
                     new_upload_state = {
                         'files_uploaded': True,
@@ -379,8 +445,11 @@ class UploadInterfaceV2:
                         })
                     
                     # Set main app session state
-                    st.session_state['df'] = pd.DataFrame(df_data)
+                    reset_derived_state()
+                    st.session_state['df'] = compact_dtypes(pd.DataFrame(df_data))
                     st.session_state['original_questions'] = all_merged_questions
+                    st.session_state.pop('bank_name', None)
+                    st.session_state.pop('bank_rows', None)
                     st.session_state['metadata'] = {
                         'source': 'merged_database',
                         'total_questions': len(all_merged_questions),
@@ -388,7 +457,7 @@ class UploadInterfaceV2:
                     }
                 
                 # Show clean success message
-                st.success(f"✅ **Database loaded successfully!** {preview.total_questions} questions ready.")
+                st.success(f"✅ **Database loaded successfully!** {len(st.session_state.get('original_questions', []))} questions ready.")
                 st.balloons()
                 
                 # Force a rerun to trigger the main app detection and fork decision
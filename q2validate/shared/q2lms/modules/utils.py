@@ -2,6 +2,10 @@
 
 import re
 import streamlit as st
+from functools import lru_cache
+
+# Rendered preview texts kept across reruns (a few pages of questions, choices and feedback)
+LATEX_RENDER_CACHE_SIZE = 4096
 
 def normalize_latex_for_display(text):
     """
@@ -75,6 +79,19 @@ def render_latex_in_text(text, latex_converter=None):
     
     return final_result
 
+@lru_cache(maxsize=LATEX_RENDER_CACHE_SIZE)
+def _render_latex_text(text):
+    return render_latex_in_text(text)
+
+def render_latex_cached(text, latex_converter=None):
+    """
+    render_latex_in_text for previews: each distinct text is rendered once and reused
+    on later reruns and page changes.
+    """
+    if not text or not isinstance(text, str):
+        return text
+    return _render_latex_text(text)
+
 def _protect_latex_spaces(text):
     """
     Add proper spacing around LaTeX expressions for Streamlit compatibility.
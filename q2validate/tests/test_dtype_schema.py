@@ -0,0 +1,138 @@
+"""
+Tests for the compact dtype schema of the Q2LMS questions DataFrame
+"""
+
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'shared', 'q2lms', 'modules'))
+
+from database_processor import questions_to_dataframe
+from dtype_schema import CATEGORY_COLUMNS, TEXT_DTYPE, compact_dtypes, memory_report, set_cell
+
+
+def make_df(points):
+    return compact_dtypes(pd.DataFrame({'Points': points, 'Topic': ['Circuits'] * len(points)}))
+
+
+class TestCompactDtypes:
+    """Schema applied on load"""
+
+    def test_schema_dtypes(self):
+        df = compact_dtypes(pd.DataFrame({
+            'Topic': ['Circuits', 'Antennas', 'Circuits'],
+            'Points': [1, 2, 300],
+            'Tolerance': [0.05, 0.1, 0.05],
+            'Title': ['a', 'b', None],
+            'Custom': ['x', 'y', 'z'],
+        }))
+
+        assert isinstance(df['Topic'].dtype, pd.CategoricalDtype)
+        assert df['Points'].dtype == 'Int16'
+        assert df['Tolerance'].dtype == 'float64'
+        assert df['Custom'].dtype == pd.DataFrame({'Custom': ['x']})['Custom'].dtype
+        if TEXT_DTYPE is not None:
+            assert df['Title'].dtype == TEXT_DTYPE
+            assert pd.isna(df.loc[2, 'Title'])
+
+    def test_values_are_unchanged(self):
+        original = pd.DataFrame({'Topic': ['Circuits', None], 'Points': [1, None], 'Title': ['a', 'b']})
+
+        df = compact_dtypes(original)
+
+        assert df.astype(object).where(df.notna(), None).values.tolist() == \
+            original.astype(object).where(original.notna(), None).values.tolist()
+
+    def test_non_integer_points_are_left_alone(self):
+        assert compact_dtypes(pd.DataFrame({'Points': [1.5, 2.0]}))['Points'].dtype == 'float64'
+        assert compact_dtypes(pd.DataFrame({'Points': ['1', 'two']}))['Points'].tolist() == ['1', 'two']
+
+    def test_repeat_is_a_no_op(self):
+        df = compact_dtypes(pd.DataFrame({'Topic': ['Circuits'], 'Points': [1]}))
+
+        assert compact_dtypes(df) is df
+
+    def test_memory_report(self):
+        df = compact_dtypes(pd.DataFrame({'Topic': ['Circuits'] * 1000, 'Points': [1] * 1000}))
+
+        report = memory_report(df)
+
+        assert report['after'] < report['before']
+        assert set(report['columns'].index) == {'Topic', 'Points'}
+
+
+class TestSetCellIntegers:
+    """Edits of compact integer columns"""
+
+    def test_value_beyond_int8_widens_to_int16(self):
+        df = make_df([1, 2])
+        assert df['Points'].dtype == 'Int8'
+
+        set_cell(df, 0, 'Points', 200)
+
+        assert df['Points'].dtype == 'Int16'
+        assert df['Points'].tolist() == [200, 2]
+
+    def test_value_beyond_int64_becomes_object(self):
+        df = make_df([1, 2])
+
+        set_cell(df, 1, 'Points', 2 ** 70)
+
+        assert df['Points'].dtype == object
+        assert df['Points'].tolist() == [1, 2 ** 70]
+
+    def test_value_in_range_keeps_dtype(self):
+        df = make_df([1, 2])
+
+        set_cell(df, 0, 'Points', -100)
+
+        assert df['Points'].dtype == 'Int8'
+        assert df['Points'].tolist() == [-100, 2]
+
+    def test_never_narrows(self):
+        df = make_df([1, 1000])
+
+        set_cell(df, 0, 'Points', 3)
+
+        assert df['Points'].dtype == 'Int16'
+
+    def test_fractional_value_widens_to_float(self):
+        df = make_df([1, 2])
+
+        set_cell(df, 0, 'Points', 2.5)
+
+        assert df['Points'].dtype == 'float64'
+        assert df['Points'].tolist() == [2.5, 2.0]
+
+
+def test_set_cell_adds_new_category():
+    df = make_df([1])
+
+    set_cell(df, 0, 'Topic', 'Antennas')
+
+    assert isinstance(df['Topic'].dtype, pd.CategoricalDtype)
+    assert df.loc[0, 'Topic'] == 'Antennas'
+
+
+class TestUnhashableCategories:
+    """List-valued topic/type/difficulty fields from hand-written banks"""
+
+    def test_compact_dtypes_stringifies_list_values(self):
+        df = compact_dtypes(pd.DataFrame({'Topic': [['Circuits', 'AC'], 'Antennas']}))
+
+        assert isinstance(df['Topic'].dtype, pd.CategoricalDtype)
+        assert df['Topic'].tolist() == ["['Circuits', 'AC']", 'Antennas']
+
+    def test_questions_to_dataframe_accepts_list_values(self):
+        questions = [
+            {'title': 'q0', 'type': 'numerical', 'topic': ['Circuits', 'AC'], 'difficulty': ['Easy']},
+            {'title': 'q1', 'type': 'numerical', 'topic': 'Antennas', 'difficulty': 'Hard'},
+        ]
+
+        df = questions_to_dataframe(questions)
+
+        assert df['Topic'].tolist() == ["['Circuits', 'AC']", 'Antennas']
+        assert df['Difficulty'].tolist() == ["['Easy']", 'Hard']
+        assert all(isinstance(df[column].dtype, pd.CategoricalDtype) for column in CATEGORY_COLUMNS)
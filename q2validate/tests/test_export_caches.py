@@ -0,0 +1,225 @@
+"""
+Tests for the Q2LMS export path: the row-to-question join, the export sync cache and
+the Canvas pre-export analysis cache
+Cached results must match a fresh run and follow edits
+"""
+
+import copy
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import streamlit as st
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'shared', 'q2lms', 'modules'))
+
+from database_processor import questions_to_dataframe
+from edit_tracker import mark_rows_dirty
+from export.canvas_adapter import CanvasPreExportAnalyzer
+from export.data_processor import ExportDataManager
+
+
+def make_questions(count=4):
+    return [{'id': f'Q{i}', 'title': f'q{i}', 'type': 'numerical', 'question_text': f'What is ${i}\\,\\text{{V}}$?',
+             'correct_answer': str(i), 'points': 1} for i in range(count)]
+
+
+@pytest.fixture(autouse=True)
+def session_state():
+    st.session_state.clear()
+    yield st.session_state
+    st.session_state.clear()
+
+
+class TestExportJoin:
+    """DataFrame rows are paired with the questions they name"""
+
+    def prepare(self, df, questions):
+        questions_out, report = ExportDataManager().prepare_questions_for_export(df, questions)
+        assert report['success'], report['errors']
+        return questions_out, report['processing_stats']
+
+    def test_reordered_subset_is_matched_by_id(self):
+        questions = make_questions()
+        df = questions_to_dataframe(questions)
+        df.loc[1, 'Title'] = 'Edited'
+
+        exported, stats = self.prepare(df.iloc[[3, 1, 0]], questions)
+
+        assert stats['matching_method'] == 'ID-based'
+        assert [(q['id'], q['title']) for q in exported] == [('Q0', 'q0'), ('Q1', 'Edited'), ('Q3', 'q3')]
+
+    def test_own_generated_and_positional_ids_are_matched(self):
+        questions = make_questions()
+        df = questions_to_dataframe(questions)
+        df['ID'] = ['Q3', '2', 'Q_00003', 'Q0']
+
+        exported, stats = self.prepare(df, questions)
+
+        assert stats['matched_questions'] == 4
+        assert [q['id'] for q in exported] == ['Q0', 'Q1', 'Q2', 'Q3']
+
+    def test_sparse_ids_fall_back_to_positions(self):
+        questions = make_questions()
+        df = questions_to_dataframe(questions)
+        df['ID'] = ''
+
+        exported, stats = self.prepare(df.iloc[:2], questions)
+
+        assert stats['matching_method'] == 'index (sparse IDs)'
+        assert [q['id'] for q in exported] == ['Q0', 'Q1']
+
+
+class TestExportSyncCache:
+    """Only new or edited rows are re-synced"""
+
+    def prepare(self, df, questions):
+        questions_out, report = ExportDataManager().prepare_questions_for_export(df, questions)
+        assert report['success'], report['errors']
+        return questions_out, report['processing_stats']['resynced_questions']
+
+    def test_second_export_reuses_every_row(self):
+        questions = make_questions()
+        df = questions_to_dataframe(questions)
+
+        first, resynced = self.prepare(df, questions)
+        assert resynced == len(questions)
+        second, resynced = self.prepare(df, questions)
+
+        assert resynced == 0
+        assert second == first
+
+    def test_edited_row_is_resynced(self):
+        questions = make_questions()
+        df = questions_to_dataframe(questions)
+        self.prepare(df, questions)
+
+        df.loc[2, 'Title'] = 'Edited'
+        mark_rows_dirty([2], ['Title'])
+        exported, resynced = self.prepare(df, questions)
+
+        assert resynced == 1
+        assert [q['title'] for q in exported] == ['q0', 'q1', 'Edited', 'q3']
+        # Same result as an export without the cache
+        st.session_state.pop('export_sync_cache')
+        assert self.prepare(df, questions)[0] == exported
+
+    def test_flag_only_edit_is_not_resynced(self):
+        questions = make_questions()
+        df = questions_to_dataframe(questions)
+        self.prepare(df, questions)
+
+        mark_rows_dirty([1], ['selected'])
+
+        assert self.prepare(df, questions)[1] == 0
+
+    def test_replaced_question_dict_is_resynced(self):
+        questions = make_questions()
+        df = questions_to_dataframe(questions)
+        self.prepare(df, questions)
+
+        questions[0] = {**questions[0], 'feedback_correct': 'Well done'}
+        exported, resynced = self.prepare(df, questions)
+
+        assert resynced == 1
+        assert exported[0]['feedback_correct'] == 'Well done'
+
+    def test_filtered_view_uses_cached_rows(self):
+        questions = make_questions()
+        df = questions_to_dataframe(questions)
+        full, _ = self.prepare(df, questions)
+
+        view, resynced = self.prepare(df.iloc[[1, 3]], questions)
+
+        assert resynced == 0
+        assert view == [full[1], full[3]]
+
+    def test_callers_cannot_mutate_cached_questions(self):
+        questions = make_questions()
+        df = questions_to_dataframe(questions)
+        exported, _ = self.prepare(df, questions)
+
+        exported[0]['title'] = 'Changed by caller'
+
+        assert self.prepare(df, questions)[0][0]['title'] == 'q0'
+
+
+class CountingAnalyzer(CanvasPreExportAnalyzer):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.analyzed = 0
+
+    def analyze_question(self, question):
+        self.analyzed += 1
+        return super().analyze_question(question)
+
+
+class TestCanvasAnalysisCache:
+    """Per-question analysis cached by content hash"""
+
+    def test_cached_analysis_matches_fresh_analysis(self):
+        questions = make_questions() + [{'title': 'Broken', 'type': 'numerical', 'correct_answer': 'x'}]
+        analyzer = CountingAnalyzer()
+        analyzer.analyze(questions)
+
+        cached = analyzer.analyze(copy.deepcopy(questions))
+        fresh = CanvasPreExportAnalyzer().analyze(questions)
+
+        assert analyzer.analyzed == len(questions)
+        assert cached.canvas_questions() == fresh.canvas_questions()
+        assert cached.validation_report() == fresh.validation_report()
+        assert cached.canvas_metadata() == fresh.canvas_metadata()
+        assert cached.latex_analysis() == fresh.latex_analysis()
+
+    def test_identical_questions_are_analyzed_once(self):
+        analyzer = CountingAnalyzer()
+
+        analysis = analyzer.analyze(make_questions(1) * 3)
+
+        assert analyzer.analyzed == 1
+        assert analysis.canvas_metadata()['total_questions'] == 3
+
+    def test_edited_question_is_analyzed_again(self):
+        questions = make_questions()
+        analyzer = CountingAnalyzer()
+        analyzer.analyze(questions)
+
+        questions[1] = {**questions[1], 'question_text': ''}
+        report = analyzer.analyze(questions).validation_report()
+
+        assert analyzer.analyzed == len(questions) + 1
+        assert not report['valid']
+        assert [issue['question_number'] for issue in report['question_issues']] == [2]
+
+    def test_results_are_detached_from_inputs_and_callers(self):
+        question = {'title': 'MC', 'type': 'multiple_choice', 'question_text': 'Pick one',
+                    'choices': ['a', 'b'], 'correct_answer': 'a'}
+        analyzer = CanvasPreExportAnalyzer()
+
+        canvas_question = analyzer.analyze([question]).canvas_questions()[0]
+        question['choices'].append('c')
+        canvas_question['title'] = 'Changed by caller'
+
+        assert analyzer.analyze([{**question, 'choices': ['a', 'b']}]).canvas_questions()[0]['title'] == 'MC'
+        assert len(canvas_question['choices']) == 2
+
+    def test_cache_is_bounded(self):
+        analyzer = CountingAnalyzer(cache_size=2)
+        questions = make_questions(3)
+        analyzer.analyze(questions)
+
+        analyzer.analyze(questions[:1])
+
+        assert len(analyzer._cache) == 2
+        assert analyzer.analyzed == 4
+
+    def test_executor_gives_same_results(self):
+        questions = make_questions(8)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            parallel = CanvasPreExportAnalyzer().analyze(questions, executor)
+        serial = CanvasPreExportAnalyzer().analyze(questions)
+
+        assert parallel.canvas_questions() == serial.canvas_questions()
+        assert parallel.validation_report() == serial.validation_report()
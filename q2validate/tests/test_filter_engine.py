@@ -0,0 +1,111 @@
+"""
+Tests for the precomputed filter index of Q2LMS
+Masks must select the same rows as filtering the DataFrame directly
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+import streamlit as st
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'shared', 'q2lms', 'modules'))
+
+from dtype_schema import compact_dtypes
+from filter_engine import QuestionFilterIndex, get_filter_index, present_value_counts
+
+
+def make_df():
+    return compact_dtypes(pd.DataFrame({
+        'Topic': ['Circuits', 'Antennas', 'Circuits', 'Fields', None, 'Antennas'],
+        'Subtopic': ['AC', '', 'DC', 'N/A', 'AC', 'Dipoles'],
+        'Difficulty': ['Easy', 'Hard', 'Hard', 'Easy', 'Medium', 'Easy'],
+        'Type': ['numerical'] * 3 + ['multiple_choice'] * 3,
+        'Points': [1, 2, 3, 1, 5, 2],
+    }))
+
+
+@pytest.fixture(autouse=True)
+def session_state():
+    st.session_state.clear()
+    yield st.session_state
+    st.session_state.clear()
+
+
+class TestFilterIndex:
+    """Masks and options"""
+
+    def test_single_value(self):
+        df = make_df()
+        mask = QuestionFilterIndex(df).build_mask({'Difficulty': 'Easy'})
+
+        assert np.flatnonzero(mask).tolist() == df.index[df['Difficulty'] == 'Easy'].tolist()
+
+    def test_value_lists_combine_with_other_columns(self):
+        df = make_df()
+        mask = QuestionFilterIndex(df).build_mask({'Topic': ['Circuits', 'Antennas'], 'Difficulty': 'Hard'})
+
+        expected = df['Topic'].isin(['Circuits', 'Antennas']) & (df['Difficulty'] == 'Hard')
+        assert mask.tolist() == expected.tolist()
+
+    def test_all_and_unknown_columns_are_ignored(self):
+        mask = QuestionFilterIndex(make_df()).build_mask({'Topic': 'All', 'Author': 'Someone', 'Type': None})
+
+        assert mask.all()
+
+    def test_unknown_value_matches_nothing(self):
+        assert not QuestionFilterIndex(make_df()).build_mask({'Topic': 'Optics'}).any()
+
+    def test_points_range_is_inclusive(self):
+        mask = QuestionFilterIndex(make_df()).build_mask(points_range=(2, 3))
+
+        assert np.flatnonzero(mask).tolist() == [1, 2, 5]
+
+    def test_options_skip_empty_placeholders(self):
+        index = QuestionFilterIndex(make_df())
+
+        assert index.options('Subtopic') == ['AC', 'DC', 'Dipoles']
+        assert index.options('Topic') == ['Antennas', 'Circuits', 'Fields']
+
+    def test_options_restricted_to_mask(self):
+        index = QuestionFilterIndex(make_df())
+        mask = index.build_mask({'Type': 'numerical'})
+
+        assert index.options('Topic', mask) == ['Antennas', 'Circuits']
+
+    def test_filter_returns_same_frame_when_nothing_is_filtered(self):
+        df = make_df()
+        index = QuestionFilterIndex(df)
+
+        assert index.filter(df, index.build_mask()) is df
+        assert index.filter(df, index.build_mask({'Topic': 'Fields'})).index.tolist() == [3]
+
+    def test_contiguous_rows_are_sliced_without_copying(self):
+        df = make_df()
+        index = QuestionFilterIndex(df)
+
+        hard = index.filter(df, index.build_mask({'Difficulty': 'Hard'}))
+        easy = index.filter(df, index.build_mask({'Difficulty': 'Easy'}))
+
+        assert hard.index.tolist() == [1, 2]
+        assert np.shares_memory(hard['Points'].to_numpy(), df['Points'].to_numpy())
+        assert easy.index.tolist() == [0, 3, 5]
+        pd.testing.assert_frame_equal(easy, df[df['Difficulty'] == 'Easy'])
+
+
+def test_cached_index_is_rebuilt_for_a_new_dataframe():
+    df = make_df()
+    index = get_filter_index(df)
+
+    assert get_filter_index(df) is index
+    assert get_filter_index(df.copy()) is not index
+
+
+def test_present_value_counts_drops_unused_categories():
+    df = make_df()
+    view = df[df['Topic'] == 'Circuits']
+
+    assert view['Difficulty'].value_counts().get('Medium') == 0
+    assert present_value_counts(view['Difficulty']).to_dict() == {'Easy': 1, 'Hard': 1}
@@ -0,0 +1,120 @@
+"""
+Tests for the lazy question file index of Q2LMS
+Every accepted document must give the same questions and metadata as json.loads
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'shared', 'q2lms', 'modules'))
+
+from lazy_loader import ELEMENT_REGEX_DEPTH, LazyQuestionFile
+
+QUESTIONS = [
+    {'title': 'Braces', 'question_text': r'Evaluate $\frac{1}{2}\left\{x\right]$ with "quotes" and \\ slashes'},
+    {'title': 'Escapes', 'question_text': 'Line\nbreak, tab\t, unicode Ω and a stray } ] in text',
+     'choices': ['[', '{', '"}"', '\\']},
+    {'title': 'Nested', 'meta': {'a': [{'b': [{'c': ['"]}"']}]}]}},
+]
+
+
+def deep_question(depth):
+    value = 'bottom'
+    for _ in range(depth):
+        value = {'next': [value]}
+    return {'title': 'Deep', 'tree': value}
+
+
+def document(questions=QUESTIONS, **envelope):
+    return json.dumps({'metadata': {'subject': 'Circuits'}, 'questions': questions, **envelope})
+
+
+class TestAcceptedDocuments:
+    """Documents that index"""
+
+    def test_nested_and_escaped_strings(self):
+        lazy = LazyQuestionFile(document())
+
+        assert len(lazy) == len(QUESTIONS)
+        assert lazy.load_all() == QUESTIONS
+        assert lazy[1] == QUESTIONS[1]
+        assert lazy[-1] == QUESTIONS[-1]
+        assert lazy.metadata == {'subject': 'Circuits'}
+
+    def test_nesting_deeper_than_the_element_regex(self):
+        questions = [deep_question(ELEMENT_REGEX_DEPTH * 2), QUESTIONS[0]]
+
+        assert LazyQuestionFile(document(questions)).load_all() == questions
+
+    def test_utf8_bom(self):
+        lazy = LazyQuestionFile(b'\xef\xbb\xbf' + document().encode('utf-8'))
+
+        assert lazy.load_all() == QUESTIONS
+        assert lazy.structure_type == 'structured'
+
+    def test_bare_list(self):
+        lazy = LazyQuestionFile(json.dumps(QUESTIONS, indent=2))
+
+        assert lazy.structure_type == 'simple_list'
+        assert lazy.load_all() == QUESTIONS
+        assert lazy.metadata == {}
+
+    def test_keys_after_questions_are_kept(self):
+        lazy = LazyQuestionFile(json.dumps({'questions': QUESTIONS, 'metadata': {'subject': 'Antennas'}}))
+
+        assert lazy.load_all() == QUESTIONS
+        assert lazy.metadata == {'subject': 'Antennas'}
+
+    def test_null_questions(self):
+        lazy = LazyQuestionFile(json.dumps({'metadata': None, 'questions': None}))
+
+        assert not lazy.has_questions
+        assert len(lazy) == 0
+        assert lazy.metadata == {}
+
+    def test_open_file(self, tmp_path):
+        path = tmp_path / 'bank.json'
+        path.write_text(document(), encoding='utf-8')
+
+        with LazyQuestionFile.open(path) as lazy:
+            assert lazy[0] == QUESTIONS[0]
+            assert len(lazy[1:]) == 2
+
+
+class TestRejectedDocuments:
+    """Documents json.loads rejects are rejected too"""
+
+    @pytest.mark.parametrize('cut', [1, 10, 40, -40, -2, -1])
+    def test_truncated(self, cut):
+        text = document()
+
+        with pytest.raises(json.JSONDecodeError):
+            LazyQuestionFile(text[:cut])
+
+    def test_truncated_bare_list(self):
+        with pytest.raises(json.JSONDecodeError):
+            LazyQuestionFile(json.dumps(QUESTIONS)[:-1])
+
+    @pytest.mark.parametrize('text', [
+        document() + ' {}',
+        json.dumps(QUESTIONS) + ' []',
+        json.dumps(QUESTIONS) + ' x',
+    ])
+    def test_trailing_data(self, text):
+        with pytest.raises(json.JSONDecodeError):
+            LazyQuestionFile(text)
+
+    @pytest.mark.parametrize('text', ['', '   ', '"questions"', '42'])
+    def test_not_a_question_document(self, text):
+        with pytest.raises(json.JSONDecodeError):
+            LazyQuestionFile(text)
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / 'empty.json'
+        path.write_bytes(b'')
+
+        with pytest.raises(json.JSONDecodeError):
+            LazyQuestionFile.open(path)
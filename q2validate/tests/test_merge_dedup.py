@@ -0,0 +1,146 @@
+"""
+Tests for merging question files and detecting duplicate questions in Q2LMS
+"""
+
+import json
+import os
+import sys
+
+import streamlit as st
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'shared', 'q2lms', 'modules'))
+
+import database_processor
+from dedup_engine import (
+    LATEX_RULE_SET, DuplicateDetector, find_duplicate_questions, normalize_text, question_fingerprint
+)
+from latex_corrector import LaTeXCorrector
+from merge_engine import QuestionMergeEngine
+
+
+def question(q_id, text, **fields):
+    return {'id': q_id, 'type': 'numerical', 'question_text': text, 'correct_answer': '1', **fields}
+
+
+OHM = 'A resistor of 10 ohm carries a current of 2 A. What is the voltage across the resistor in volts?'
+OHM_REWORDED = 'A resistor of 10 ohm carries a current of 2 A. What is the voltage across this resistor in volts?'
+WIRED = OHM + ' Assume ideal wires, a steady source and no contact resistance at either terminal.'
+GAIN = 'An antenna has an effective aperture of 3 square metres. What is its gain at 1 GHz in dBi?'
+
+
+class TestNormalization:
+    """Content that should compare equal"""
+
+    def test_uses_the_latex_corrector_rules(self):
+        assert [rule.key for rule in LATEX_RULE_SET.rules] == \
+            [rule.key for rule in LaTeXCorrector().compiled_rules]
+
+    def test_latex_spellings_normalize_alike(self):
+        assert normalize_text(r'$0.4,text{V}$') == normalize_text(r'\(0.4\,\text{V}\)')
+        assert normalize_text('gamma = 0.50') == normalize_text(r'\gamma = .5')
+
+    def test_fingerprint_ignores_id_and_metadata(self):
+        first = question('Q1', 'What is  2 + 2?', topic='Arithmetic')
+        second = question('Q9', 'what is 2 + 2?', topic='Other', difficulty='Hard')
+
+        assert question_fingerprint(first) == question_fingerprint(second)
+        assert question_fingerprint(first) != question_fingerprint({**first, 'correct_answer': '5'})
+
+    def test_fingerprint_accepts_dataframe_rows(self):
+        row = {'ID': 'Q_00001', 'Type': 'numerical', 'Question_Text': OHM, 'Correct_Answer': '1'}
+
+        assert question_fingerprint(row) == question_fingerprint(question('Q1', OHM))
+
+
+class TestDuplicateDetector:
+    """Exact and near-duplicate groups"""
+
+    def test_exact_duplicates_are_grouped_in_order(self):
+        questions = [question('Q1', OHM), question('Q2', GAIN), question('Q3', OHM), question('Q4', OHM)]
+
+        report = find_duplicate_questions(questions)
+
+        assert report.exact_groups == [[0, 2, 3]]
+        assert report.exact_duplicate_indices == [2, 3]
+
+    def test_near_duplicates_are_grouped_with_similarity(self):
+        questions = [question('Q1', OHM), question('Q2', GAIN), question('Q3', OHM_REWORDED)]
+
+        report = DuplicateDetector(threshold=0.7).find_duplicates(questions)
+
+        assert report.exact_groups == []
+        assert [group['indices'] for group in report.near_groups] == [[0, 2]]
+        assert 0.7 <= report.near_groups[0]['min_similarity'] < 1.0
+        assert report.near_duplicate_count == 1
+
+    def test_threshold_excludes_loose_matches(self):
+        questions = [question('Q1', OHM), question('Q3', OHM_REWORDED)]
+
+        assert DuplicateDetector(threshold=0.99).find_duplicates(questions).near_groups == []
+
+    def test_distinct_questions_are_not_grouped(self):
+        report = find_duplicate_questions([question(f'Q{i}', f'Compute {i} squared times {i + 7}') for i in range(20)])
+
+        assert report.exact_groups == []
+        assert report.near_groups == []
+
+
+class TestMergeEngine:
+    """ID conflicts and duplicate reports across files"""
+
+    def test_conflicting_ids_are_renumbered_without_mutating_sources(self):
+        first = [question('Q1', OHM), question('Q2', GAIN)]
+        second = [question('Q1', 'Another question entirely about capacitors'), question('Q1_1', 'And inductors')]
+        third = [question('Q1', 'A third file reusing Q1 for diodes')]
+
+        result = QuestionMergeEngine().merge([
+            {'name': 'a.json', 'questions': first},
+            {'name': 'b.json', 'questions': second},
+            {'name': 'c.json', 'questions': third},
+        ])
+
+        assert [q['id'] for q in result.questions] == ['Q1', 'Q2', 'Q1_1', 'Q1_1_1', 'Q1_2']
+        assert result.renumbered_count == 3
+        assert result.conflicts[0] == {'id': 'Q1', 'new_id': 'Q1_1', 'source': 'b.json',
+                                       'description': 'ID Q1 renamed to Q1_1'}
+        assert second[0]['id'] == 'Q1' and third[0]['id'] == 'Q1'
+
+    def test_single_file_keeps_ids(self):
+        questions = [question('Q1', OHM), question('Q1', GAIN)]
+
+        result = QuestionMergeEngine().merge([{'name': 'a.json', 'questions': questions}])
+
+        assert [q['id'] for q in result.questions] == ['Q1', 'Q1']
+        assert result.conflicts == []
+
+    def test_duplicate_content_is_reported_by_id(self):
+        result = QuestionMergeEngine(DuplicateDetector(threshold=0.7)).merge([
+            {'name': 'a.json', 'questions': [question('Q1', OHM), question('Q2', GAIN)]},
+            {'name': 'b.json', 'questions': [question('Q7', OHM), question('Q8', OHM_REWORDED)]},
+        ])
+
+        assert result.duplicate_count == 1
+        assert result.duplicate_groups == [{'ids': ['Q1', 'Q7'], 'indices': [0, 2]}]
+        assert [group['ids'] for group in result.near_duplicate_groups] == [['Q1', 'Q8']]
+
+
+def test_append_reports_each_new_near_duplicate(monkeypatch):
+    warnings = []
+    monkeypatch.setattr(database_processor.st, 'warning', warnings.append)
+    current_df = database_processor.questions_to_dataframe([question('Q1', WIRED), question('Q2', GAIN)])
+    new_questions = [
+        question('N1', WIRED.replace('a steady source', 'a stable source')),
+        question('N2', WIRED.replace('either terminal', 'both terminals')),
+        question('N3', 'Which lens focal length gives a magnification of 2 for an object at 30 cm?'),
+    ]
+    st.session_state.clear()
+
+    combined = database_processor.process_append_operation(
+        json.dumps({'questions': new_questions}),
+        {'current_df': current_df, 'filename': 'new.json', 'handle_duplicates': 'Skip duplicates',
+         'renumber_ids': True}
+    )
+    st.session_state.clear()
+
+    assert len(combined) == 5
+    assert warnings == ['🔁 2 new questions closely resemble existing ones']
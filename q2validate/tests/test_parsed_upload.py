@@ -0,0 +1,127 @@
+"""
+Tests for the parsed upload shared by the Q2LMS upload workflow
+An uploaded file is decoded once, whichever steps of the workflow use it
+"""
+
+import json
+import os
+import sys
+
+import pytest
+import streamlit as st
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'shared', 'q2lms', 'modules'))
+
+import database_processor
+from database_processor import ParsedUpload, process_append_operation, process_single_database
+from lazy_loader import LazyQuestionFile
+from upload_handler import detect_database_format_and_type, get_parsed_upload
+
+QUESTIONS = [
+    {'title': f'q{i}', 'type': 'numerical', 'question_text': f'What is {i} + {i}?', 'correct_answer': str(2 * i),
+     'topic': 'Arithmetic', 'subtopic': 'Addition', 'difficulty': 'Easy'}
+    for i in range(3)
+]
+CONTENT = json.dumps({'metadata': {'subject': 'Maths'}, 'questions': QUESTIONS}).encode('utf-8')
+
+
+class UploadedFile:
+    """Stand-in for Streamlit's UploadedFile"""
+
+    def __init__(self, name, content, file_id):
+        self.name = name
+        self.size = len(content)
+        self.file_id = file_id
+        self.content = content
+        self.reads = 0
+
+    def getvalue(self):
+        self.reads += 1
+        return self.content
+
+
+@pytest.fixture(autouse=True)
+def session_state():
+    st.session_state.clear()
+    yield st.session_state
+    st.session_state.clear()
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    """Number of full decodes of an upload's questions"""
+    calls = []
+    load_all = LazyQuestionFile.load_all
+
+    def counting_load_all(self):
+        calls.append(self)
+        return load_all(self)
+
+    monkeypatch.setattr(LazyQuestionFile, 'load_all', counting_load_all)
+    return calls
+
+
+def test_detection_reads_no_questions(decodes):
+    upload = ParsedUpload(CONTENT, 'bank.json')
+
+    assert upload.detection() == ('Phase Four', 'small_set', 3, {'subject': 'Maths'})
+    assert decodes == []
+
+
+def test_workflow_shares_one_decode(decodes):
+    upload = ParsedUpload(CONTENT, 'bank.json')
+    upload.detection()
+
+    df = process_single_database(upload, {'filename': 'bank.json'})
+    combined = process_append_operation(upload, {
+        'current_df': df, 'filename': 'bank.json', 'handle_duplicates': 'Keep all', 'renumber_ids': True
+    })
+
+    assert len(decodes) == 1
+    assert st.session_state['original_questions'] == QUESTIONS
+    assert combined['Title'].tolist() == ['q0', 'q1', 'q2'] * 2
+
+
+@pytest.mark.parametrize('content', [b'{"questions": [', b'', b'not json'])
+def test_invalid_json(content):
+    assert ParsedUpload(content, 'bank.json').detection() == (None, 'invalid_json', 0, {})
+    assert detect_database_format_and_type(content, 'bank.json') == (None, 'invalid_json', 0, {})
+
+
+def test_invalid_json_is_not_loaded(monkeypatch):
+    errors = []
+    monkeypatch.setattr(database_processor.st, 'error', errors.append)
+
+    assert process_single_database(ParsedUpload(b'{"questions": [', 'bank.json'), {'filename': 'bank.json'}) is None
+    assert errors and errors[0].startswith('❌ Invalid JSON')
+    assert 'df' not in st.session_state
+
+
+def test_json_without_questions_is_unknown():
+    assert ParsedUpload(b'{"title": "not a bank"}').detection() == (None, 'unknown', 0, {})
+
+
+class TestSessionCache:
+    """get_parsed_upload keeps one ParsedUpload per uploaded file across reruns"""
+
+    def test_same_file_is_parsed_once(self):
+        uploaded = UploadedFile('bank.json', CONTENT, 'file-1')
+
+        upload = get_parsed_upload(uploaded)
+
+        assert get_parsed_upload(uploaded) is upload
+        assert uploaded.reads == 1
+
+    @pytest.mark.parametrize('other', [
+        UploadedFile('other.json', CONTENT, 'file-1'),
+        UploadedFile('bank.json', CONTENT, 'file-2'),
+        UploadedFile('bank.json', CONTENT + b' ', 'file-1'),
+    ], ids=['name', 'file_id', 'size'])
+    def test_different_file_replaces_cached_upload(self, other):
+        upload = get_parsed_upload(UploadedFile('bank.json', CONTENT, 'file-1'))
+
+        replacement = get_parsed_upload(other)
+
+        assert replacement is not upload
+        assert replacement.filename == other.name
+        assert st.session_state['parsed_upload'][1] is replacement
@@ -0,0 +1,164 @@
+"""
+Tests for the NumPy flag bitmap behind the Q2LMS Select and Delete modes
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+import streamlit as st
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'shared', 'q2lms', 'modules'))
+
+from edit_tracker import get_dirty_rows
+from filter_engine import get_filter_index
+from question_flag_manager import FlagBitmap, QuestionFlagManager, get_flag_bitmap
+
+
+def make_df(count=6):
+    return pd.DataFrame({
+        'Title': [f'q{i}' for i in range(count)],
+        'Topic': ['Circuits', 'Antennas'] * (count // 2),
+        'selected': [False] * count,
+        'deleted': [False] * count,
+    })
+
+
+@pytest.fixture(autouse=True)
+def session_state():
+    st.session_state.clear()
+    yield st.session_state
+    st.session_state.clear()
+
+
+@pytest.fixture
+def manager(session_state):
+    session_state['df'] = make_df()
+    return QuestionFlagManager()
+
+
+class TestFlagBitmap:
+    """Bitmap updates and running counts"""
+
+    def test_counts_start_from_existing_columns(self):
+        df = make_df()
+        df.loc[[1, 3], 'selected'] = True
+
+        bitmap = FlagBitmap(df)
+
+        assert bitmap.count('selected') == 2
+        assert bitmap.count('deleted') == 0
+
+    def test_missing_flag_column_starts_clear(self):
+        bitmap = FlagBitmap(make_df().drop(columns=['deleted']))
+
+        assert bitmap.count('deleted') == 0
+        assert not bitmap.flags['deleted'].any()
+
+    def test_set_counts_only_changed_rows(self):
+        bitmap = FlagBitmap(make_df())
+
+        assert bitmap.set('selected', np.array([0, 1, 2]), True) == 3
+        assert bitmap.set('selected', np.array([1, 2, 3]), True) == 1
+        assert bitmap.set('selected', np.array([0, 4]), False) == 1
+        assert bitmap.count('selected') == 3
+        assert bitmap.count('selected') == int(bitmap.flags['selected'].sum())
+
+    def test_invert_keeps_running_count(self):
+        bitmap = FlagBitmap(make_df())
+        bitmap.set('deleted', np.array([0, 1]), True)
+
+        assert bitmap.invert('deleted', np.array([1, 2, 3])) == 3
+
+        assert bitmap.flags['deleted'].tolist() == [True, False, True, True, False, False]
+        assert bitmap.count('deleted') == 3
+
+    def test_positions_from_labels_mask_and_none(self):
+        df = make_df().set_index(pd.Index([10, 11, 12, 13, 14, 15]))
+        bitmap = FlagBitmap(df)
+
+        assert bitmap.positions([12, 12, 99, 10]).tolist() == [2, 0]
+        assert bitmap.positions(df['Topic'] == 'Antennas').tolist() == [1, 3, 5]
+        assert bitmap.positions(None).tolist() == list(range(6))
+
+    def test_stale_after_dataframe_changes(self):
+        df = make_df()
+        bitmap = FlagBitmap(df)
+
+        assert bitmap.matches(df)
+        assert not bitmap.matches(df.copy())
+        assert not bitmap.matches(df.assign(extra=1))
+
+
+class TestFlagManager:
+    """Session-level flag operations"""
+
+    def test_set_flags_on_filtered_view(self, manager):
+        df = st.session_state['df']
+        view = df[df['Topic'] == 'Antennas']
+
+        assert manager.set_flags('selected', view.index, True) == 3
+
+        assert df['selected'].tolist() == [False, True, False, True, False, True]
+        assert manager.get_flagged_count(df, 'selected') == 3
+
+    def test_invert_flags_on_filtered_view(self, manager):
+        df = st.session_state['df']
+        manager.set_flags('deleted', [0, 1], True)
+        view = df.iloc[:3]
+
+        manager.invert_flags('deleted', view.index)
+
+        assert df['deleted'].tolist() == [False, False, True, False, False, False]
+        assert manager.get_flagged_count(df, 'deleted') == 1
+
+    def test_filter_mask_selects_view(self, manager):
+        df = st.session_state['df']
+        mask = get_filter_index(df).build_mask({'Topic': 'Circuits'})
+
+        manager.set_flags('selected', mask, True)
+
+        assert df.index[df['selected']].tolist() == [0, 2, 4]
+
+    def test_bulk_operations(self, manager):
+        df = st.session_state['df']
+
+        assert manager.bulk_flag_operation(df, 'selected', 'all')
+        assert manager.get_flagged_count(df, 'selected') == 6
+        manager.set_flags('selected', [0], False)
+        assert manager.bulk_flag_operation(df, 'selected', 'invert')
+        assert df['selected'].tolist() == [True, False, False, False, False, False]
+        assert manager.bulk_flag_operation(df, 'selected', 'none')
+        assert manager.get_flagged_count(df, 'selected') == 0
+
+    def test_running_count_is_used_for_session_dataframe(self, manager):
+        df = st.session_state['df']
+        manager.set_flags('selected', [0, 1], True)
+        bitmap = st.session_state['flag_bitmap']
+
+        assert get_flag_bitmap(df) is bitmap
+        bitmap.counts['selected'] = 42  # Only the running count could report this
+        assert manager.get_flagged_count(df, 'selected') == 42
+        assert manager.get_flagged_count(df.copy(), 'selected') == 2
+
+    def test_single_flag_update_marks_row_dirty(self, manager):
+        assert manager.update_question_flag(4, 'deleted', True)
+
+        assert st.session_state['df'].loc[4, 'deleted']
+        assert get_dirty_rows() == {4: {'deleted'}}
+
+    def test_single_flag_update_writes_only_its_cell(self, manager, monkeypatch):
+        df = st.session_state['df']
+        manager.set_flags('deleted', [1], True)
+        column_writes = []
+        monkeypatch.setattr(FlagBitmap, 'write_column', lambda self, df, flag: column_writes.append(flag))
+
+        assert manager.update_question_flag(4, 'deleted', True)
+        assert manager.update_question_flag(1, 'deleted', False)
+
+        assert column_writes == []
+        assert df['deleted'].tolist() == [False, False, False, False, True, False]
+        assert st.session_state['flag_bitmap'].count('deleted') == 1
+        assert manager.get_flagged_count(df, 'deleted') == 1
@@ -0,0 +1,97 @@
+"""
+Tests for the windowed rendering of the Q2LMS Select and Delete question lists
+"""
+
+import os
+import sys
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+MODULES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared', 'q2lms', 'modules')
+sys.path.insert(0, MODULES_DIR)
+
+from question_pager import page_window
+
+
+@pytest.mark.parametrize('total, page_size, page, expected', [
+    (95, 10, 1, (0, 10, 1, 10)),
+    (95, 10, 10, (90, 95, 10, 10)),
+    (95, 10, 11, (90, 95, 10, 10)),
+    (95, 10, 0, (0, 10, 1, 10)),
+    (100, 10, 10, (90, 100, 10, 10)),
+    (0, 10, 3, (0, 0, 1, 1)),
+    (5, 0, 2, (1, 2, 2, 5)),
+])
+def test_page_window(total, page_size, page, expected):
+    assert page_window(total, page_size, page) == expected
+
+
+def pager_app(modules_dir):
+    """Page controls over st.session_state['total'] rows, showing the window they return"""
+    import sys
+    import streamlit as st
+    sys.path.insert(0, modules_dir)
+    from question_pager import render_page_controls
+    start, end = render_page_controls(st.session_state['total'], 'select', default_page_size=10)
+    st.text(f"rows {start}-{end}")
+
+
+def start_app(total):
+    app = AppTest.from_function(pager_app, kwargs={'modules_dir': MODULES_DIR})
+    app.session_state['total'] = total
+    return app.run()
+
+
+def rows(app):
+    return app.text[0].value
+
+
+def button(app, label):
+    return next(widget for widget in app.button if widget.label == label)
+
+
+class TestPageControls:
+    """Navigation renders only the current window"""
+
+    def test_first_page(self):
+        app = start_app(95)
+
+        assert not app.exception
+        assert rows(app) == "rows 0-10"
+        assert button(app, "⬅️ Previous").disabled
+
+    def test_next_last_and_previous(self):
+        app = start_app(95)
+
+        button(app, "Next ➡️").click().run()
+        assert rows(app) == "rows 10-20"
+        button(app, "⏩ Last").click().run()
+        assert rows(app) == "rows 90-95"
+        assert button(app, "Next ➡️").disabled
+        button(app, "⬅️ Previous").click().run()
+        assert rows(app) == "rows 80-90"
+
+    def test_page_selector_and_size(self):
+        app = start_app(95)
+
+        app.selectbox(key='select_current_page').set_value(4).run()
+        assert rows(app) == "rows 30-40"
+        app.selectbox(key='select_mode_pagination').set_value(50).run()
+        assert rows(app) == "rows 50-95"
+
+    def test_page_is_clamped_when_view_shrinks(self):
+        app = start_app(95)
+        button(app, "⏩ Last").click().run()
+
+        app.session_state['total'] = 25
+        app.run()
+
+        assert rows(app) == "rows 20-25"
+        assert app.session_state['select_current_page'] == 3
+
+    def test_single_page_has_no_navigation(self):
+        app = start_app(7)
+
+        assert rows(app) == "rows 0-7"
+        assert len(app.button) == 0
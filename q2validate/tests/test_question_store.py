@@ -0,0 +1,100 @@
+"""
+Tests for the SQLite question store of Q2LMS
+Edits are addressed by stable row id and refused when another session got there first
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'shared', 'q2lms', 'modules'))
+
+from question_store import QuestionConflictError, QuestionStore
+
+
+def make_questions(count):
+    return [{'title': f'q{i}', 'question_text': f'Question {i}', 'topic': 'Circuits',
+             'difficulty': 'Easy', 'type': 'multiple_choice'} for i in range(count)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return QuestionStore(str(tmp_path / 'banks.db'))
+
+
+def titles(store, name):
+    return [question['title'] for question in store.load_questions(name)]
+
+
+def test_save_returns_row_keys_in_order(store):
+    keys = store.save_bank('b', make_questions(3))
+
+    assert len(keys) == 3
+    assert [row_id for row_id, _, _ in store.load_rows('b')] == [row_id for row_id, _ in keys]
+    assert all(version == 1 for _, version in keys)
+
+
+def test_update_after_delete_edits_the_right_question(store):
+    keys = store.save_bank('b', make_questions(5))
+
+    assert store.delete_question('b', keys[1][0]) is True
+    edited = dict(make_questions(5)[3], title='q3-edited')
+    store.update_question('b', keys[3][0], edited)
+
+    assert titles(store, 'b') == ['q0', 'q2', 'q3-edited', 'q4']
+    assert store.list_banks()[0]['question_count'] == 4
+
+
+def test_update_bumps_version(store):
+    row_id, version = store.save_bank('b', make_questions(1))[0]
+
+    new_version = store.update_question('b', row_id, {'title': 'changed'}, expected_version=version)
+
+    assert new_version == version + 1
+    assert store.row_keys('b') == [(row_id, new_version)]
+
+
+def test_stale_update_is_refused(store):
+    row_id, version = store.save_bank('b', make_questions(1))[0]
+    store.update_question('b', row_id, {'title': 'other session'}, expected_version=version)
+
+    with pytest.raises(QuestionConflictError):
+        store.update_question('b', row_id, {'title': 'this session'}, expected_version=version)
+    assert titles(store, 'b') == ['other session']
+
+
+def test_update_of_deleted_question_is_refused(store):
+    row_id, version = store.save_bank('b', make_questions(2))[0]
+    store.delete_question('b', row_id)
+
+    with pytest.raises(QuestionConflictError):
+        store.update_question('b', row_id, {'title': 'gone'}, expected_version=version)
+    assert titles(store, 'b') == ['q1']
+
+
+def test_delete_twice_and_stale_delete(store):
+    keys = store.save_bank('b', make_questions(2))
+
+    assert store.delete_question('b', keys[0][0]) is True
+    assert store.delete_question('b', keys[0][0]) is False
+
+    store.update_question('b', keys[1][0], {'title': 'changed'})
+    with pytest.raises(QuestionConflictError):
+        store.delete_question('b', keys[1][0], expected_version=keys[1][1])
+    assert titles(store, 'b') == ['changed']
+
+
+def test_append_returns_question_count(store):
+    store.save_bank('b', make_questions(2))
+
+    assert store.append_questions('b', make_questions(3)) == 5
+    assert titles(store, 'b') == ['q0', 'q1', 'q0', 'q1', 'q2']
+
+
+def test_resave_replaces_bank(store):
+    store.save_bank('b', make_questions(4))
+    keys = store.save_bank('b', make_questions(2))
+
+    assert store.row_keys('b') == keys
+    assert titles(store, 'b') == ['q0', 'q1']
@@ -0,0 +1,76 @@
+"""
+Tests for the Q2LMS search index and the session state derived from a loaded database
+"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+import streamlit as st
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'shared', 'q2lms', 'modules'))
+
+from database_processor import DERIVED_STATE_KEYS, reset_derived_state
+from search_index import FIELD_WEIGHTS, QuestionSearchIndex, get_search_index, update_search_index_row
+
+
+def make_df(titles):
+    return pd.DataFrame({'Title': titles, 'Question_Text': [f'About {title}' for title in titles]})
+
+
+@pytest.fixture(autouse=True)
+def session_state():
+    st.session_state.clear()
+    yield st.session_state
+    st.session_state.clear()
+
+
+def test_search_ranks_title_hits_first():
+    df = make_df(['Ohm law', 'Kirchhoff'])
+    df.loc[1, 'Question_Text'] = 'Uses ohm law'
+
+    labels = [label for label, _ in QuestionSearchIndex(df).search('ohm')]
+
+    assert labels == [0, 1]
+
+
+def test_edit_updates_and_rebinds_matching_index():
+    df = make_df(['Ohm law', 'Kirchhoff'])
+    index = get_search_index(df)
+    edited = df.copy()
+    edited.loc[1, 'Title'] = 'Thevenin'
+    st.session_state['df'] = edited
+
+    update_search_index_row(df, edited, 1)
+
+    assert st.session_state['search_index'] is index
+    assert index.matches(edited)
+    assert [label for label, _ in index.search('thevenin')] == [1]
+    # The old title is gone; the unchanged question text still mentions it
+    assert [label for label, _ in index.search('kirchhoff')] == [1]
+    assert index.row_terms[1]['kirchhoff'] == FIELD_WEIGHTS['Question_Text']
+
+
+def test_edit_drops_index_built_for_another_dataframe():
+    stale_df = make_df(['Ohm law', 'Kirchhoff'])
+    get_search_index(stale_df)
+    df = make_df(['Norton', 'Thevenin'])
+    edited = df.copy()
+    edited.loc[0, 'Title'] = 'Superposition'
+
+    update_search_index_row(df, edited, 0)
+
+    assert 'search_index' not in st.session_state
+    assert [label for label, _ in get_search_index(edited).search('superposition')] == [0]
+
+
+def test_reset_derived_state_clears_every_derived_key():
+    for key in DERIVED_STATE_KEYS:
+        st.session_state[key] = object()
+    st.session_state['df'] = make_df(['Ohm law'])
+
+    reset_derived_state()
+
+    assert not any(key in st.session_state for key in DERIVED_STATE_KEYS)
+    assert 'df' in st.session_state
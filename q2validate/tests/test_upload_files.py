@@ -0,0 +1,80 @@
+"""
+Tests for parsing uploaded question files in the Q2LMS upload interface
+Results keep the upload order and one bad file does not drop the others
+"""
+
+import io
+import json
+import os
+import sys
+
+import pandas as pd
+import pytest
+import streamlit as st
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'shared', 'q2lms', 'modules'))
+
+import upload_interface_v2
+from upload_interface_v2 import UploadInterfaceV2, parse_file_content
+
+
+class UploadedFile(io.BytesIO):
+    """Stand-in for Streamlit's UploadedFile"""
+
+    def __init__(self, name, content):
+        super().__init__(content)
+        self.name = name
+
+
+def json_file(name, count):
+    questions = [{'id': f'{name}-{i}', 'title': f'{name} question {i}'} for i in range(count)]
+    return UploadedFile(name, json.dumps({'questions': questions}).encode('utf-8'))
+
+
+@pytest.fixture(autouse=True)
+def session_state():
+    st.session_state.clear()
+    yield st.session_state
+    st.session_state.clear()
+
+
+@pytest.fixture
+def reported_errors(monkeypatch):
+    errors = []
+    monkeypatch.setattr(upload_interface_v2.st, 'error', errors.append)
+    return errors
+
+
+def test_parse_file_content_formats():
+    csv = pd.DataFrame({'title': ['a', 'b']}).to_csv(index=False).encode('utf-8')
+
+    assert parse_file_content('bank.JSON', b'[{"title": "a"}]') == [{'title': 'a'}]
+    assert parse_file_content('bank.json', b'{"title": "a"}') == [{'title': 'a'}]
+    assert parse_file_content('bank.csv', csv) == [{'title': 'a'}, {'title': 'b'}]
+    with pytest.raises(ValueError):
+        parse_file_content('bank.txt', b'')
+
+
+@pytest.mark.parametrize('cpu_count', [1, 4], ids=['inline', 'process-pool'])
+def test_load_files_keeps_upload_order_and_isolates_errors(monkeypatch, reported_errors, cpu_count):
+    monkeypatch.setattr(upload_interface_v2.os, 'cpu_count', lambda: cpu_count)
+    files = [
+        json_file('large.json', 300),
+        UploadedFile('broken.json', b'{"questions": ['),
+        json_file('small.json', 2),
+        UploadedFile('notes.txt', b'not a question file'),
+        json_file('medium.json', 40),
+    ]
+
+    file_data = UploadInterfaceV2()._load_files(files)
+
+    assert [data['name'] for data in file_data] == [file.name for file in files]
+    assert [data['count'] for data in file_data] == [300, 0, 2, 0, 40]
+    assert file_data[2]['questions'][1]['id'] == 'small.json-1'
+    assert [error.split(':')[0] for error in reported_errors] == ['Error parsing broken.json',
+                                                                 'Error parsing notes.txt']
+
+
+def test_load_files_without_files(reported_errors):
+    assert UploadInterfaceV2()._load_files([]) == []
+    assert reported_errors == []
@@ -0,0 +1,168 @@
+"""
+Tests for the q2validate command line tool
+The CLI is run as a script, the way users run it, against the Q2LMS validation modules
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+CLI_PATH = Path(__file__).parent.parent / 'q2validate_cli.py'
+
+# The CLI imports modules.schema_validator etc. from Q2LMS next to q2validate; this tree also ships
+# a shared Q2LMS copy
+Q2LMS_ROOT = next((path for path in (CLI_PATH.parent.parent / 'q2lms', CLI_PATH.parent / 'shared' / 'q2lms')
+                   if (path / 'modules' / 'schema_validator.py').exists()), None)
+
+pytestmark = pytest.mark.skipif(Q2LMS_ROOT is None, reason='Q2LMS validation modules not found')
+
+READY = {'type': 'multiple_choice', 'title': 'Ohm', 'question_text': 'What is V for 2 A through 5 Ω?',
+         'choices': ['10 V', '5 V', '2 V', '1 V'], 'correct_answer': '10 V',
+         'topic': 'Circuits', 'difficulty': 'Easy'}
+NUMERICAL = {'type': 'numerical', 'title': 'Gain', 'question_text': 'What is the gain of 100 in dB?',
+             'correct_answer': '20', 'topic': 'Signals', 'difficulty': 'Medium'}
+NOT_READY = {'type': 'multiple_choice', 'title': 'Broken'}
+
+
+def run_cli(*args, cwd):
+    environment = {**os.environ, 'PYTHONPATH': str(Q2LMS_ROOT)}
+    return subprocess.run([sys.executable, str(CLI_PATH), *map(str, args)],
+                          capture_output=True, text=True, encoding='utf-8', cwd=cwd, env=environment)
+
+
+def write_ndjson(path, lines):
+    path.write_text('\n'.join(line if isinstance(line, str) else json.dumps(line) for line in lines) + '\n',
+                    encoding='utf-8')
+    return path
+
+
+def read_ndjson(path):
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+
+
+class TestNdjsonStream:
+    """--ndjson: one question per line, validated and written as it is read"""
+
+    @pytest.fixture
+    def stream(self, tmp_path):
+        return write_ndjson(tmp_path / 'bank.jsonl', [READY, 'not json', '[1, 2]', '', NOT_READY, NUMERICAL])
+
+    def test_malformed_and_non_object_lines_are_skipped(self, tmp_path, stream):
+        result = run_cli(stream, '--ndjson', '--output', tmp_path / 'out.jsonl', cwd=tmp_path)
+
+        assert result.returncode == 0, result.stdout
+        assert '❌ Line 2: invalid JSON' in result.stdout
+        assert '❌ Line 3: expected a JSON object' in result.stdout
+        assert 'Skipped 2 malformed line(s)' in result.stdout
+        assert [question['title'] for question in read_ndjson(tmp_path / 'out.jsonl')] == ['Ohm', 'Broken', 'Gain']
+
+    def test_questions_are_converted_as_they_stream(self, tmp_path, stream):
+        run_cli(stream, '--ndjson', '--output', tmp_path / 'out.jsonl', cwd=tmp_path)
+
+        ohm = read_ndjson(tmp_path / 'out.jsonl')[0]
+        assert 'Ω' not in ohm['question_text']
+        assert '\\Omega' in ohm['question_text']
+
+    def test_ready_only_writes_ready_questions(self, tmp_path, stream):
+        result = run_cli(stream, '--ndjson', '--ready-only', '--output', tmp_path / 'out.jsonl', cwd=tmp_path)
+
+        assert result.returncode == 0, result.stdout
+        assert '(2 questions, JSON Lines)' in result.stdout
+        assert [question['title'] for question in read_ndjson(tmp_path / 'out.jsonl')] == ['Ohm', 'Gain']
+
+    def test_ready_only_without_ready_questions_fails(self, tmp_path):
+        stream = write_ndjson(tmp_path / 'bank.jsonl', [NOT_READY, 'not json'])
+
+        result = run_cli(stream, '--ndjson', '--ready-only', '--output', tmp_path / 'out.jsonl', cwd=tmp_path)
+
+        assert result.returncode == 1
+        assert 'No questions are ready for export' in result.stdout
+
+    def test_stream_without_questions_fails(self, tmp_path):
+        stream = write_ndjson(tmp_path / 'bank.jsonl', ['', 'not json'])
+
+        assert run_cli(stream, '--ndjson', cwd=tmp_path).returncode == 1
+
+
+class TestBatch:
+    """Directory and glob inputs validated in a process pool"""
+
+    @pytest.fixture
+    def banks(self, tmp_path):
+        directory = tmp_path / 'banks'
+        directory.mkdir()
+        (directory / 'circuits.json').write_text(json.dumps({'questions': [READY, NUMERICAL]}), encoding='utf-8')
+        (directory / 'signals.json').write_text(json.dumps([NUMERICAL]), encoding='utf-8')
+        (directory / 'notes.txt').write_text('not a bank', encoding='utf-8')
+        return directory
+
+    def report(self, path):
+        return json.loads(path.read_text(encoding='utf-8'))
+
+    def test_directory_outputs_and_report(self, tmp_path, banks):
+        result = run_cli(banks, '--workers', 2, cwd=tmp_path)
+
+        assert result.returncode == 0, result.stdout
+        assert sorted(path.name for path in banks.glob('*_validated.json')) == \
+            ['circuits_validated.json', 'signals_validated.json']
+        assert len(json.loads((banks / 'circuits_validated.json').read_text(encoding='utf-8'))['questions']) == 2
+        report = self.report(tmp_path / 'q2validate_report.json')
+        assert report['files_processed'] == 2
+        assert report['files_failed'] == 0
+        assert report['all_ready']
+        assert report['totals']['total_questions'] == 3
+        assert report['totals']['ready_for_q2lms'] == 3
+        assert [Path(summary['input']).name for summary in report['files']] == ['circuits.json', 'signals.json']
+
+    def test_rerun_skips_earlier_outputs(self, tmp_path, banks):
+        run_cli(banks, cwd=tmp_path)
+
+        result = run_cli(banks, '--report', tmp_path / 'rerun.json', cwd=tmp_path)
+
+        assert result.returncode == 0, result.stdout
+        assert self.report(tmp_path / 'rerun.json')['files_processed'] == 2
+        assert not list(banks.glob('*_validated_validated.json'))
+
+    def test_failed_file_sets_exit_code_and_totals(self, tmp_path, banks):
+        (banks / 'broken.json').write_text(json.dumps({'questions': [NOT_READY]}), encoding='utf-8')
+        (banks / 'invalid.json').write_text('{"questions": [', encoding='utf-8')
+
+        result = run_cli(banks, '--report', tmp_path / 'report.json', cwd=tmp_path)
+
+        assert result.returncode == 1
+        assert 'Files: 2 succeeded, 2 failed' in result.stdout
+        report = self.report(tmp_path / 'report.json')
+        assert report['files_failed'] == 2
+        assert not report['all_ready']
+        assert report['totals']['total_questions'] == 4
+        assert report['totals']['ready_for_q2lms'] == 3
+        failed = {Path(summary['input']).name: summary for summary in report['files'] if not summary['success']}
+        assert set(failed) == {'broken.json', 'invalid.json'}
+        assert 'Invalid JSON' in failed['invalid.json']['error']
+
+    def test_glob_with_output_directory(self, tmp_path, banks):
+        result = run_cli(str(banks / 'c*.json'), '--output', tmp_path / 'validated', cwd=tmp_path)
+
+        assert result.returncode == 0, result.stdout
+        assert sorted(path.name for path in (tmp_path / 'validated').iterdir()) == \
+            ['circuits_validated.json', 'q2validate_report.json']
+        assert not list(banks.glob('*_validated.json'))
+
+    def test_ndjson_directory(self, tmp_path):
+        directory = tmp_path / 'streams'
+        directory.mkdir()
+        write_ndjson(directory / 'a.jsonl', [READY, 'not json'])
+        write_ndjson(directory / 'b.ndjson', [NUMERICAL, NOT_READY])
+        (directory / 'c.json').write_text(json.dumps([READY]), encoding='utf-8')
+
+        result = run_cli(directory, '--ndjson', '--ready-only', cwd=tmp_path)
+
+        assert result.returncode == 0, result.stdout
+        assert [question['title'] for question in read_ndjson(directory / 'b_validated.ndjson')] == ['Gain']
+        report = self.report(tmp_path / 'q2validate_report.json')
+        assert [Path(summary['input']).name for summary in report['files']] == ['a.jsonl', 'b.ndjson']
+        assert report['totals']['total_questions'] == 3
@@ -1,6 +1,14 @@
 # stages/stage_0_prompt.py
+import json
+import os
+from pathlib import Path
+
 import streamlit as st
 from navigation.manager import NavigationManager
+from modules.llm_generation import (
+    DEFAULT_CONCURRENCY, DEFAULT_QUESTIONS_PER_REQUEST, OpenAICompatibleClient,
+    build_generation_chunks, compose_prompt, run_generation
+)
 from utils.question_type_filter import QuestionTypeFilter
 from utils.ui_helpers import show_stage_banner
 
@@ -43,6 +51,16 @@ def render_prompt_builder():
         st.button("🎯 Generate Complete Prompt", type="primary", use_container_width=True, disabled=True)
         st.warning("Please select at least one question type.")
 
+    # --- Generate directly through an API (bulk banks) ---
+    if question_config['valid_selection']:
+        render_api_generation(
+            educational_context,
+            question_config,
+            difficulty_level,
+            include_explanations,
+            custom_instructions
+        )
+
     # --- Move Stage Banner to Bottom ---
     show_stage_banner(1, total_stages=4)
     st.write("🔍 DEBUG: show_stage_banner() completed (bottom of page)")
@@ -104,26 +122,16 @@ def generate_complete_prompt_enhanced(educational_context, question_config,
             # Load templates
             preamble, postamble, template_source = load_template_files()
             
-            # Build complete prompt
-            prompt_parts = []
-            prompt_parts.append(preamble)
-            prompt_parts.append(f"\n\n{educational_context}")
-            
-            # Use the enhanced type instructions
-            prompt_parts.append(f"\n\n{question_config['type_instructions']}")
-            
-            if difficulty_level != "Mixed":
-                prompt_parts.append(f"\nDifficulty level: {difficulty_level}")
-            
-            if include_explanations:
-                prompt_parts.append("\nInclude detailed explanations for both correct and incorrect answers")
-            
-            if custom_instructions.strip():
-                prompt_parts.append(f"\nAdditional requirements: {custom_instructions}")
-            
-            prompt_parts.append(f"\n\n{postamble}")
-            
-            complete_prompt = "".join(prompt_parts)
+            # Build complete prompt using the enhanced type instructions
+            complete_prompt = compose_prompt(
+                preamble,
+                postamble,
+                educational_context,
+                question_config['type_instructions'],
+                difficulty_level,
+                include_explanations,
+                custom_instructions
+            )
             
             # Store enhanced config in session state
             st.session_state.generated_prompt = complete_prompt
@@ -155,6 +163,89 @@ def generate_complete_prompt_enhanced(educational_context, question_config,
         st.error("❌ Please provide educational context before generating prompt")
 
 
+def render_api_generation(educational_context, question_config,
+                          difficulty_level, include_explanations, custom_instructions):
+    """Generate the questions directly through an OpenAI-compatible API, many requests in parallel"""
+    with st.expander("⚡ Generate Directly via API (bulk question banks)"):
+        st.markdown("*Sends the request as many smaller prompts in parallel and skips the copy-paste step*")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            base_url = st.text_input(
+                "API base URL:",
+                value=os.environ.get("Q2JSON_LLM_BASE_URL", "https://api.openai.com/v1"),
+                help="Any OpenAI-compatible endpoint (OpenAI, vLLM, Ollama, a local stub server, ...)"
+            )
+            model = st.text_input("Model:", value=os.environ.get("Q2JSON_LLM_MODEL", "gpt-4o-mini"))
+            # Never sent to the browser: a blank key falls back to OPENAI_API_KEY on the server
+            api_key = st.text_input("API key:", type="password",
+                                    placeholder="Uses OPENAI_API_KEY when left blank")
+        with col2:
+            total_questions = st.number_input(
+                "Total questions:", min_value=1, max_value=2000,
+                value=int(question_config['question_count'])
+            )
+            questions_per_request = st.number_input(
+                "Questions per request:", min_value=1, max_value=50,
+                value=DEFAULT_QUESTIONS_PER_REQUEST,
+                help="Smaller requests finish faster and fail more cheaply"
+            )
+            concurrency = st.slider(
+                "Parallel requests:", min_value=1, max_value=32, value=DEFAULT_CONCURRENCY,
+                help="Lower this if the provider reports rate limits"
+            )
+
+        if not st.button("⚡ Generate Questions via API", use_container_width=True):
+            return
+        if not educational_context.strip():
+            st.error("❌ Please provide educational context before generating questions")
+            return
+
+        preamble, postamble, _ = load_template_files()
+        chunks = build_generation_chunks(
+            educational_context,
+            question_config['selected_types'],
+            int(total_questions),
+            preamble,
+            postamble,
+            questions_per_request=int(questions_per_request),
+            difficulty_level=difficulty_level,
+            include_explanations=include_explanations,
+            custom_instructions=custom_instructions
+        )
+
+        progress = st.progress(0.0)
+        status = st.empty()
+
+        def show_progress(result, completed, total):
+            progress.progress(completed / total)
+            status.caption(f"{completed}/{total} requests done · last: {result.chunk.chunk_id} "
+                           f"({'✅' if result.success else '❌'})")
+
+        api_key = api_key or os.environ.get("OPENAI_API_KEY")
+        with OpenAICompatibleClient(base_url, model, api_key=api_key or None,
+                                    max_connections=concurrency) as client:
+            report = run_generation(chunks, client, concurrency=concurrency, on_result=show_progress)
+
+        questions = report.questions
+        st.info(f"⏱️ {len(chunks)} requests in {report.elapsed:.1f}s · {len(questions)} questions generated")
+        for failed in report.failed:
+            st.warning(f"⚠️ {failed.chunk.chunk_id}: {failed.error}")
+
+        if not questions:
+            st.error("❌ No questions were generated")
+            return
+
+        # Same session state Stage 2 leaves behind after processing a pasted response
+        st.session_state.raw_extracted_json = json.dumps(report.as_questions_data(), indent=2, ensure_ascii=False)
+        st.session_state.processing_steps = [f"Generated via API: {len(chunks)} requests, "
+                                             f"{len(report.failed)} failed"]
+        st.session_state.processing_completed = True
+        st.session_state["questions_data"] = report.as_questions_data()
+        st.session_state.current_stage = 2  # Stage 3 (Human Review) in UI
+        st.rerun()
+
+
 def render_advanced_options():
     """Render advanced options section"""
     with st.expander("🔧 Advanced Options"):
@@ -0,0 +1,102 @@
+"""
+Test the batch find-and-replace engine behind the Q2JSON editor
+"""
+
+import sys
+import os
+import copy
+
+# Imported from the component directory: the package __init__ pulls in streamlit components
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'extracted_components'))
+
+from batch_editor import FindReplaceQuery, plan_find_replace
+
+FIELDS = ['question_text', 'title', 'options', 'general_feedback']
+
+
+def _questions(count=2000):
+    return [{
+        'title': f'Resistor {i}',
+        'question_text': f'Find the current through R{i} when $V = {i}\\,\\text{{V}}$.',
+        'options': [f'{i} mA', f'{i} A', 'None of the above'],
+        'general_feedback': 'Use Ohm\'s law: $I = V/R$.',
+    } for i in range(count)]
+
+
+def test_query_modes():
+    """Literal, case-insensitive and regex queries"""
+    assert FindReplaceQuery('ohm', 'Ohm').substitute('ohm OHM ohm') == ('Ohm OHM Ohm', 2)
+    assert FindReplaceQuery('ohm', 'Ohm', case_sensitive=False).substitute('ohm OHM') == ('Ohm Ohm', 2)
+    assert FindReplaceQuery(r'(\d+) mA', r'\1 A', regex=True).substitute('12 mA, 3 mA') == ('12 A, 3 A', 2)
+    # Literal replacements are not templates, so LaTeX backslashes survive
+    assert FindReplaceQuery('Omega', r'\Omega', case_sensitive=False).substitute('5 omega') == (r'5 \Omega', 1)
+
+    for bad in [('', 'x', True, False), ('(', 'x', True, True)]:
+        try:
+            FindReplaceQuery(*bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"{bad} should be rejected")
+
+
+def test_invalid_replacement_template_is_rejected():
+    """Regex replacements are checked when the query is built, not halfway through a batch"""
+    for template in [r'\2', r'\q', r'\g<name>']:
+        try:
+            FindReplaceQuery(r'(\d+) mA', template, regex=True)
+        except ValueError as e:
+            assert 'Invalid replacement' in str(e)
+            continue
+        raise AssertionError(f"{template} should be rejected")
+
+    # The same text is fine as a literal replacement
+    assert FindReplaceQuery('mA', r'\q').substitute('3 mA') == (r'3 \q', 1)
+
+
+def test_plan_is_a_dry_run():
+    """Planning reports every changed field, including options, without touching the questions"""
+    questions = _questions()
+    original = copy.deepcopy(questions)
+    log = plan_find_replace(questions, range(len(questions)), FIELDS,
+                            FindReplaceQuery('none of the above', 'No current flows', case_sensitive=False))
+
+    assert questions == original
+    assert log.replacements == 2000
+    assert log.questions_affected == 2000
+    assert {edit.location for edit in log.edits} == {'options[2]'}
+    assert log.edits[0].preview() == ('None of the above', 'No current flows')
+
+
+def test_apply_and_undo_round_trip():
+    """Applying a log changes only the selected questions; undo restores them exactly"""
+    questions = _questions()
+    original = copy.deepcopy(questions)
+    selected = list(range(0, 2000, 2))
+    log = plan_find_replace(questions, selected, FIELDS, FindReplaceQuery(r'(\d+) mA', r'\1e-3 A', regex=True))
+
+    log.apply(questions)
+    assert questions[10]['options'][0] == '10e-3 A'
+    assert questions[11]['options'][0] == '11 mA'
+    assert log.questions_affected == len(selected)
+
+    assert log.undo(questions) == 0
+    assert questions == original
+
+
+def test_undo_leaves_later_edits_alone():
+    """Fields edited after the batch operation are not overwritten by undo"""
+    questions = _questions(3)
+    log = plan_find_replace(questions, [0, 1, 2], ['title'], FindReplaceQuery('Resistor', 'Load'))
+    log.apply(questions)
+    questions[1]['title'] = 'Edited by hand'
+
+    assert log.undo(questions) == 1
+    assert [q['title'] for q in questions] == ['Resistor 0', 'Edited by hand', 'Resistor 2']
+
+
+if __name__ == "__main__":
+    test_query_modes()
+    test_plan_is_a_dry_run()
+    test_apply_and_undo_round_trip()
+    test_undo_leaves_later_edits_alone()
+    print("✅ Batch find and replace tests passed")
@@ -0,0 +1,85 @@
+"""
+Tests for batch mode of the enhanced Q2JSON pipeline
+Batch outputs must match single-file processing, with or without question shards
+"""
+
+import io
+import json
+import os
+import shutil
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+
+from main_enhanced import PIPELINE_STAGES, Q2JSONPipelineEnhanced, expand_batch_inputs, run_batch
+
+CORNER_CASES = Path(__file__).parent.parent / 'test_data' / 'CornerCases.json'
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / 'CornerCases.json'
+    shutil.copy(CORNER_CASES, path)
+    return path
+
+
+@pytest.fixture
+def single(source, tmp_path):
+    output = tmp_path / 'single.json'
+    results = Q2JSONPipelineEnhanced().process_file(str(source), str(output), verbose=False)
+    assert results['status'] == 'completed'
+    return results, json.loads(output.read_text(encoding='utf-8'))
+
+
+@pytest.mark.parametrize('workers, shard_size', [(1, None), (2, 5)], ids=['whole-file', 'sharded'])
+def test_batch_output_matches_single_file_processing(source, single, tmp_path, workers, shard_size):
+    results, expected = single
+
+    report = run_batch([source], output_dir=str(tmp_path / 'batch'), workers=workers,
+                       shard_size=shard_size, verbose=False)
+
+    assert json.loads((tmp_path / 'batch' / 'CornerCases_enhanced.json').read_text(encoding='utf-8')) == expected
+    entry = report.files[str(source)]
+    assert entry['status'] == 'completed'
+    assert entry['questions_processed'] == results['questions_processed']
+    assert entry['latex_corrections'] == results['latex_corrections']['corrections_made']
+    assert len(entry['contradictions']) == results['mathematical_validation']['total_contradictions']
+    assert entry['step_mismatches'] == results['mathematical_validation']['step_mismatches']
+
+
+def test_report_totals_and_stage_timings(source, single, tmp_path):
+    results, _ = single
+    (tmp_path / 'broken.json').write_text('{"questions": [', encoding='utf-8')
+
+    report = run_batch([source, tmp_path / 'broken.json'], output_dir=str(tmp_path / 'batch'), workers=2,
+                       verbose=False)
+    data = report.to_dict()
+
+    assert data['totals']['files'] == 2
+    assert data['totals']['files_failed'] == 1
+    assert data['totals']['questions_processed'] == results['questions_processed']
+    assert [entry['status'] for entry in data['files']] == ['completed', 'error']
+    assert data['files'][1]['errors'][0].startswith('load:')
+    assert set(data['stage_timings']) == set(PIPELINE_STAGES)
+    # The failed load is reported as an error, not timed
+    assert all(data['stage_timings'][stage]['count'] == 1 for stage in PIPELINE_STAGES)
+    assert sum(data['stage_timings']['save']['histogram'].values()) == 1
+    json.dumps(data)
+
+    summary = io.StringIO()
+    with redirect_stdout(summary):
+        report.print_summary()
+    assert 'Files processed: 2 (1 failed)' in summary.getvalue()
+    assert 'Stage timings:' in summary.getvalue()
+    assert 'math_validation: 1 runs' in summary.getvalue()
+
+
+def test_expand_batch_inputs_skips_earlier_outputs(source, tmp_path):
+    run_batch([source], workers=1, verbose=False)
+
+    assert expand_batch_inputs([str(tmp_path)]) == [source]
+    assert expand_batch_inputs([str(tmp_path / '*.json'), str(source)]) == [source]
@@ -0,0 +1,73 @@
+"""
+Tests for the persistent LaTeX correction cache
+Cached and carried-over results must match a fresh correction run
+"""
+
+import copy
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.correction_cache import CorrectionCache
+from modules.latex_corrector import LaTeXCorrector
+
+# Added rule whose literal only appears once 'mu prefix correction' has written \text{
+CAPITAL_KILO_RULE = (r'\\text\{k', r'\\text{K', 'capital kilo correction')
+
+QUESTIONS = {
+    'questions': [
+        {'title': 'Resistor', 'question_text': 'A 4.7 mutext{kΩ} resistor carries 2 mutext{A}',
+         'correct_answer': '9.4 mutext{V}'},
+        {'title': 'Plain', 'question_text': 'No LaTeX here at all', 'correct_answer': '42'},
+        {'title': 'Gain', 'question_text': 'gamma is 0.4 and sqrt{2.8} is the gain'},
+    ]
+}
+
+
+class ExtendedCorrector(LaTeXCorrector):
+    """Corrector with extra rules appended to the built-in ones"""
+
+    def __init__(self, extra_rules, cache=None):
+        self.extra_rules = extra_rules
+        super().__init__(cache)
+
+    def _initialize_correction_patterns(self):
+        return super()._initialize_correction_patterns() + list(self.extra_rules)
+
+
+def correct(corrector):
+    return corrector.correct_latex_in_questions(copy.deepcopy(QUESTIONS))
+
+
+def test_warm_run_matches_fresh_run(tmp_path):
+    cache = CorrectionCache(str(tmp_path / 'cache.sqlite3'))
+    fresh = correct(LaTeXCorrector())
+    correct(LaTeXCorrector(cache))
+    warm = correct(LaTeXCorrector(cache))
+
+    assert warm['cache_hits'] == len(QUESTIONS['questions'])
+    assert warm['corrected_data'] == fresh['corrected_data']
+    assert warm['corrections_made'] == fresh['corrections_made']
+
+
+def test_added_rule_matching_old_rule_output_is_not_carried_over(tmp_path):
+    cache = CorrectionCache(str(tmp_path / 'cache.sqlite3'))
+    correct(LaTeXCorrector(cache))
+
+    fresh = correct(ExtendedCorrector([CAPITAL_KILO_RULE]))
+    cached = correct(ExtendedCorrector([CAPITAL_KILO_RULE], cache))
+
+    assert r'\mu\text{KΩ}' in fresh['corrected_data']['questions'][0]['question_text']
+    assert cached['corrected_data'] == fresh['corrected_data']
+    assert cached['corrections_made'] == fresh['corrections_made']
+    assert cached['pattern_stats'] == fresh['pattern_stats']
+
+
+def test_untouched_questions_are_carried_over_to_new_rules(tmp_path):
+    cache = CorrectionCache(str(tmp_path / 'cache.sqlite3'))
+    correct(LaTeXCorrector(cache))
+
+    cached = correct(ExtendedCorrector([CAPITAL_KILO_RULE], cache))
+
+    # Only the question no old rule rewrote (and the new rule cannot match) is reused
+    assert cached['cache_hits'] == 1
@@ -0,0 +1,75 @@
+"""
+Test the expression re-evaluation engine on worked solutions
+"""
+
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.expression_verifier import ExpressionVerifier, parse_expression, evaluate_expressions
+
+TEST_DATA = os.path.join(os.path.dirname(__file__), '..', 'test_data')
+
+
+def _value(text):
+    """Evaluate one expression as written"""
+    as_written, _ = evaluate_expressions([parse_expression(text)])
+    return as_written[0]
+
+
+def test_latex_arithmetic():
+    """\\frac, \\sqrt, \\times, ^, \\pi and implicit multiplication evaluate without eval"""
+    assert abs(_value(r'0.4 + 0.4(\sqrt{2.8}-\sqrt{0.8})') - 0.71156) < 1e-4
+    assert _value(r'\frac{3}{4}') == 0.75
+    assert _value(r'2 \times 10^{3}') == 2000
+    assert _value(r'\sqrt{800^2 - 500^2}') == 390000 ** 0.5
+    assert _value(r'8\pi/(2\pi)') == 4
+    assert _value(r'(2\,\text{V} - (-2\,\text{V}))/2') == 2
+
+
+def test_non_numeric_expressions_are_skipped():
+    """Variables and unsupported notation are not parsed"""
+    for text in ['V_T', r'2f_{max}', r'8A/\pi^2', r'\frac{1}{2}CV^2', '__import__("os")']:
+        assert parse_expression(text) is None, text
+
+
+def test_wrong_step_is_reported_with_position():
+    """A step that does not hold is reported with its span in the field"""
+    feedback = r'Therefore $V_T = 0.4 + 0.4(\sqrt{2.8}-\sqrt{0.8}) = 0.812\,\text{V}$.'
+    mismatches = ExpressionVerifier().verify({'questions': [{'feedback_correct': feedback}]})
+    assert len(mismatches) == 1
+    mismatch = mismatches[0]
+    assert mismatch.step == 2
+    assert feedback[mismatch.start:mismatch.end] == r'0.4 + 0.4(\sqrt{2.8}-\sqrt{0.8}) = 0.812\,\text{V}'
+    assert abs(mismatch.computed_value - 0.71156) < 1e-4
+
+
+def test_rounding_and_units_hold():
+    """Rounded values, ≈ steps and unit conversions within a chain are not mismatches"""
+    feedback = (r'$V_T = 0.5 + 0.4(\sqrt{2.8} - \sqrt{0.8}) = 0.5 + 0.4(1.673 - 0.894) = 0.8116\,\text{V}$ '
+                r'and $T = 1/440\,\text{Hz} = 0.00227\,\text{s} = 2.27\,\text{ms}$ '
+                r'so $f = 5000\,\text{rad/s} / (2\pi) \approx 795.77\,\text{Hz} \approx 0.796\,\text{kHz}$.')
+    assert ExpressionVerifier().verify({'questions': [{'feedback_correct': feedback}]}) == []
+
+
+def test_test_data_worked_solutions():
+    """Only the known wrong rounding in MosfetQQDebug_enhanced.json is reported"""
+    verifier = ExpressionVerifier()
+    for name in ['CornerCases.json', 'Master.json', 'MosfetQQDebug.json']:
+        with open(os.path.join(TEST_DATA, name), 'r', encoding='utf-8') as f:
+            assert verifier.verify(json.load(f)) == [], name
+
+    with open(os.path.join(TEST_DATA, 'MosfetQQDebug_enhanced.json'), 'r', encoding='utf-8') as f:
+        mismatches = verifier.verify(json.load(f))
+    assert [(m.expression, m.relation, m.stated) for m in mismatches] == [('0.81156', '≈', r'0.776\,\text{V}')]
+
+
+if __name__ == "__main__":
+    test_latex_arithmetic()
+    test_non_numeric_expressions_are_skipped()
+    test_wrong_step_is_reported_with_position()
+    test_rounding_and_units_hold()
+    test_test_data_worked_solutions()
+    print("✅ Expression verifier tests passed")
@@ -0,0 +1,191 @@
+"""
+Tests for the concurrent generation stage against the local stub server
+The stub replays test_data/chatgpt_responses, so no network access or API key is needed
+"""
+
+import asyncio
+import http.client
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from modules.json_processor import JSONProcessor
+from modules.llm_generation import (
+    GenerationChunk, OpenAICompatibleClient, ProviderError,
+    build_generation_chunks, compose_prompt, run_generation
+)
+from modules.llm_stub_server import StubLLMServer
+from utils.question_type_filter import QuestionTypeFilter
+
+# Questions in test_data/chatgpt_responses/antenna_display_math.json
+QUESTIONS_PER_RESPONSE = 5
+
+
+def make_chunks(count):
+    return [
+        GenerationChunk(chunk_id=f"chunk-{i}", prompt=f"Generate questions, part {i}",
+                        question_type='multiple_choice', question_count=QUESTIONS_PER_RESPONSE)
+        for i in range(count)
+    ]
+
+
+def make_client(server, **kwargs):
+    kwargs.setdefault('backoff_base', 0.01)
+    return OpenAICompatibleClient(server.base_url, model='stub', **kwargs)
+
+
+class TestChunking:
+    """Bank requests split into per-type prompts"""
+
+    def test_chunks_cover_requested_count(self):
+        type_filter = QuestionTypeFilter()
+        selected = type_filter.available_types[:3]
+        chunks = build_generation_chunks("Antenna theory", selected, 47, "PRE", "POST",
+                                         questions_per_request=10, type_filter=type_filter)
+
+        assert sum(chunk.question_count for chunk in chunks) == 47
+        assert all(chunk.question_count <= 10 for chunk in chunks)
+        assert {chunk.question_type for chunk in chunks} == {t['code'] for t in selected}
+        assert len({chunk.chunk_id for chunk in chunks}) == len(chunks)
+
+    def test_chunk_prompt_matches_prompt_builder_layout(self):
+        type_filter = QuestionTypeFilter()
+        chunks = build_generation_chunks("Antenna theory", type_filter.available_types[:1], 4, "PRE", "POST",
+                                         difficulty_level="Advanced", type_filter=type_filter)
+
+        assert len(chunks) == 1
+        assert chunks[0].prompt == compose_prompt("PRE", "POST", "Antenna theory",
+                                                  "Generate 4 multiple choice questions", "Advanced")
+        assert "Difficulty level: Advanced" in chunks[0].prompt
+
+
+class TestGenerationAgainstStub:
+    """End-to-end runs against the replaying stub server"""
+
+    def test_responses_are_processed_into_questions(self):
+        with StubLLMServer() as server, make_client(server) as client:
+            report = run_generation(make_chunks(6), client, concurrency=3)
+
+        assert not report.failed
+        assert len(report.questions) == 6 * QUESTIONS_PER_RESPONSE
+        assert [result.chunk.chunk_id for result in report.results] == [f"chunk-{i}" for i in range(6)]
+        assert server.prompts and sorted(server.prompts) == sorted(c.prompt for c in make_chunks(6))
+        # The replayed response needs JSONProcessor's repair step (unescaped LaTeX backslashes)
+        assert all(result.messages for result in report.results)
+
+    def test_requests_run_in_parallel_within_bound(self):
+        delay = 0.2
+        with StubLLMServer(delay=delay) as server, make_client(server) as client:
+            started = time.perf_counter()
+            report = run_generation(make_chunks(8), client, concurrency=4)
+            elapsed = time.perf_counter() - started
+
+        assert not report.failed
+        assert server.peak_in_flight <= 4
+        assert server.peak_in_flight > 1
+        assert elapsed < 8 * delay * 0.75
+
+    def test_transient_failures_are_retried(self):
+        with StubLLMServer(fail_first=3, fail_status=429) as server, make_client(server) as client:
+            report = run_generation(make_chunks(4), client, concurrency=2)
+
+        assert not report.failed
+        assert server.request_count == 4 + 3
+        assert sum(result.attempts for result in report.results) == 4 + 3
+
+    def test_permanent_failures_are_reported_not_retried(self):
+        with StubLLMServer(fail_first=1, fail_status=400) as server, make_client(server) as client:
+            report = run_generation(make_chunks(3), client, concurrency=1)
+
+        assert len(report.failed) == 1
+        assert report.failed[0].attempts == 1
+        assert "HTTP 400" in report.failed[0].error
+        assert len(report.questions) == 2 * QUESTIONS_PER_RESPONSE
+        assert server.request_count == 3
+
+    def test_retries_give_up_after_limit(self):
+        with StubLLMServer(fail_first=10, fail_status=503) as server, \
+                make_client(server, max_retries=2) as client:
+            report = run_generation(make_chunks(1), client)
+
+        assert report.failed[0].attempts == 3
+        assert server.request_count == 3
+
+    def test_unreachable_endpoint_raises_provider_error(self):
+        client = OpenAICompatibleClient("http://127.0.0.1:9/v1", model='stub', max_retries=0, timeout=2)
+        with pytest.raises(ProviderError):
+            asyncio.run(client.complete("hello"))
+        client.close()
+
+
+class FlakyClient:
+    """Client whose first chunk fails with something other than ProviderError"""
+
+    def __init__(self, text):
+        self.text = text
+
+    async def complete(self, prompt):
+        if prompt.endswith("part 0"):
+            raise RuntimeError("client bug")
+        return self.text
+
+
+class BrokenProcessor(JSONProcessor):
+    def process_raw_json(self, raw_text, llm_type="auto"):
+        raise KeyError('questions')
+
+
+class TestUnexpectedFailures:
+    """Errors other than ProviderError fail one chunk, not the whole run"""
+
+    def test_client_exception_fails_only_its_chunk(self):
+        text = (Path(__file__).parent.parent / 'test_data' / 'chatgpt_responses' /
+                'antenna_display_math.json').read_text(encoding='utf-8')
+        report = run_generation(make_chunks(3), FlakyClient(text))
+
+        assert [result.success for result in report.results] == [False, True, True]
+        assert report.failed[0].error == "RuntimeError: client bug"
+        assert len(report.questions) == 2 * QUESTIONS_PER_RESPONSE
+
+    def test_processor_exception_fails_only_its_chunk(self):
+        with StubLLMServer() as server, make_client(server) as client:
+            report = run_generation(make_chunks(2), client, processor=BrokenProcessor())
+
+        assert len(report.failed) == 2
+        assert all(result.error.startswith("KeyError") for result in report.failed)
+
+    def test_callback_exception_fails_only_its_chunk(self):
+        def on_result(result, completed, total):
+            if completed == 1:
+                raise ValueError("display gone")
+
+        with StubLLMServer() as server, make_client(server) as client:
+            report = run_generation(make_chunks(3), client, concurrency=1, on_result=on_result)
+
+        assert len(report.results) == 3
+        assert [result.error for result in report.failed] == ["ValueError: display gone"]
+
+    def test_truncated_response_is_a_retryable_provider_error(self, monkeypatch):
+        class TruncatedResponse:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def read(self):
+                raise http.client.IncompleteRead(b'{"choices": [', 100)
+
+        monkeypatch.setattr('urllib.request.urlopen', lambda request, timeout: TruncatedResponse())
+        client = OpenAICompatibleClient("http://127.0.0.1:9/v1", model='stub', max_retries=1, backoff_base=0.01)
+        with pytest.raises(ProviderError) as info:
+            asyncio.run(client.complete("hello"))
+        client.close()
+
+        assert info.value.retryable
+        assert info.value.attempts == 2
+        assert "IncompleteRead" in str(info.value)
@@ -0,0 +1,195 @@
+"""
+Regression test and benchmark for the unified mathematical consistency engine
+
+The baseline (tests/math_consistency_baseline.json) was recorded from the original
+standalone detectors - mathematical_consistency_detector.py, _enhanced, _fixed, _working
+and JSONProcessor's CLI-compatible checks - over every question bank in test_data/.
+Each engine profile must reproduce its legacy detector's output exactly. It was
+re-recorded (--record) once unit-aware comparison was added; the only changes are the
+dropped cross-unit contradictions (e.g. 795.77 Hz vs 0.796 kHz, S vs degrees) and CLI
+extraction keeping values written with a unit.
+
+Run directly to benchmark one engine pass per profile (how the separate detectors ran)
+against a single multi-profile pass:
+    python tests/test_math_consistency_engine.py
+"""
+
+import sys
+import os
+import json
+import glob
+import time
+from dataclasses import asdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.math_consistency_engine import MathConsistencyEngine, PROFILES
+from modules.mathematical_consistency_detector import MathematicalConsistencyDetector
+from modules.mathematical_consistency_detector_enhanced import MathematicalConsistencyDetectorEnhanced
+from modules.mathematical_consistency_detector_fixed import MathematicalConsistencyDetectorFixed
+from modules.mathematical_consistency_detector_working import MathematicalConsistencyDetectorWorking
+from modules.json_processor import JSONProcessor
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), '..')
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'math_consistency_baseline.json')
+
+
+def load_corpus():
+    """Question banks in test_data/ keyed by file name"""
+    corpus = {}
+    for path in sorted(glob.glob(os.path.join(REPO_ROOT, 'test_data', '*.json'))):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(data, dict) and isinstance(data.get('questions'), list):
+            corpus[os.path.basename(path)] = data
+    return corpus
+
+
+def _declared(question):
+    """Declared numeric answer, or None"""
+    try:
+        return float(question.get('correct_answer'))
+    except (ValueError, TypeError):
+        return None
+
+
+def _extracted(extract, questions, with_declared=False):
+    """Per-question value extraction, for questions with a numeric answer and feedback"""
+    results = []
+    for question in questions:
+        declared = _declared(question)
+        feedback = question.get('feedback_correct')
+        if declared is None or not isinstance(feedback, str):
+            results.append(None)
+        elif with_declared:
+            results.append(extract(feedback, declared))
+        else:
+            results.append(extract(feedback))
+    return results
+
+
+def collect_legacy_outputs(data, include_extraction=True):
+    """
+    Run every legacy detector entry point on one question bank
+
+    Besides the default settings, each detector also runs with its skip sets emptied and
+    zero tolerance (as the diagnostic scripts do), so the comparison logic is exercised
+    even where the default settings report nothing.
+    """
+    questions = data['questions']
+    outputs = {}
+
+    def empty_intermediates(detector):
+        detector.common_intermediates = set()
+        detector.tolerance_threshold = 0.0
+
+    def empty_constants(detector):
+        detector.basic_constants = set()
+        detector.tolerance_threshold = 0.0
+
+    def zero_tolerance(detector):
+        detector.tolerance_threshold = 0.0
+
+    for profile, detector_class, permissive in [
+        ('standard', MathematicalConsistencyDetector, zero_tolerance),
+        ('enhanced', MathematicalConsistencyDetectorEnhanced, empty_constants),
+        ('strict', MathematicalConsistencyDetectorFixed, empty_intermediates),
+        ('working', MathematicalConsistencyDetectorWorking, empty_intermediates),
+    ]:
+        default = detector_class()
+        relaxed = detector_class()
+        permissive(relaxed)
+        outputs[profile] = {
+            'contradictions': [asdict(c) for c in default.detect_contradictions(data)],
+            'permissive': [asdict(c) for c in relaxed.detect_contradictions(data)],
+        }
+        if hasattr(default, 'processing_stats'):
+            outputs[profile]['stats'] = default.processing_stats
+
+    processor = JSONProcessor()
+    outputs['cli_compatible'] = {
+        'summary': processor._detect_mathematical_consistency(data),
+        'issues': [processor._check_mathematical_consistency_single(q) for q in questions],
+    }
+
+    if include_extraction:
+        outputs['standard']['extracted'] = _extracted(
+            MathematicalConsistencyDetector()._extract_final_answer_values, questions)
+        outputs['enhanced']['extracted'] = _extracted(
+            MathematicalConsistencyDetectorEnhanced()._extract_values_enhanced, questions, with_declared=True)
+        outputs['strict']['extracted'] = _extracted(
+            MathematicalConsistencyDetectorFixed()._extract_genuine_final_answers, questions)
+        outputs['working']['extracted'] = _extracted(
+            MathematicalConsistencyDetectorWorking()._extract_meaningful_values, questions)
+        outputs['cli_compatible']['extracted'] = _extracted(
+            processor._extract_mathematical_values, questions, with_declared=True)
+    return outputs
+
+
+def normalize(outputs):
+    """JSON round-trip so tuples/lists and float formatting compare like the stored baseline"""
+    return json.loads(json.dumps(outputs, ensure_ascii=False))
+
+
+def record_baseline():
+    """Write the current output of every legacy entry point as the new baseline"""
+    baseline = {name: collect_legacy_outputs(data) for name, data in load_corpus().items()}
+    with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+        json.dump(normalize(baseline), f, indent=1, ensure_ascii=False)
+
+
+def test_profiles_match_legacy_baseline():
+    """Every legacy entry point (now backed by the engine) reproduces the recorded output"""
+    with open(BASELINE_PATH, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    corpus = load_corpus()
+    assert set(baseline) == set(corpus)
+    for name, data in corpus.items():
+        outputs = normalize(collect_legacy_outputs(data))
+        for profile in PROFILES:
+            assert outputs[profile] == baseline[name][profile], f"{name}: {profile} differs from baseline"
+
+
+def test_single_pass_matches_separate_profiles():
+    """Evaluating all profiles in one pass gives the same results as one pass per profile"""
+    engine = MathConsistencyEngine()
+    for name, data in load_corpus().items():
+        combined = engine.detect(data, PROFILES)
+        for profile in PROFILES:
+            separate = engine.detect(data, [profile])[profile]
+            assert combined[profile].contradictions == separate.contradictions, f"{name}: {profile}"
+            assert combined[profile].values_extracted == separate.values_extracted, f"{name}: {profile}"
+
+
+def benchmark(repeat: int = 20):
+    """Time one engine pass per profile against all profiles in a single pass"""
+    corpus = load_corpus()
+    questions = [q for data in corpus.values() for q in data['questions']]
+    data = {'questions': questions * repeat}
+    print(f"Benchmark: {len(data['questions'])} questions, profiles: {', '.join(PROFILES)}")
+
+    start = time.perf_counter()
+    for profile in PROFILES:
+        MathConsistencyEngine().detect(data, [profile])
+    separate = time.perf_counter() - start
+    print(f"  One pass per profile:          {separate:.2f}s")
+
+    start = time.perf_counter()
+    MathConsistencyEngine().detect(data, PROFILES)
+    single = time.perf_counter() - start
+    print(f"  All profiles in a single pass: {single:.2f}s ({separate / single:.1f}x)")
+
+
+if __name__ == "__main__":
+    if '--record' in sys.argv:
+        record_baseline()
+        print(f"✅ Baseline written to {BASELINE_PATH}")
+        sys.exit(0)
+    test_profiles_match_legacy_baseline()
+    test_single_pass_matches_separate_profiles()
+    print("✅ All profiles match the legacy baseline")
+    benchmark()
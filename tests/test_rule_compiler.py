@@ -0,0 +1,121 @@
+"""
+Tests for the rule compiler behind LaTeX corrections and LLM repairs
+A prefiltered RuleSet must give the same text and counts as running every regex in order
+"""
+
+import re
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+
+from modules import llm_repairs
+from modules.latex_corrector import LaTeXCorrector
+from modules.rule_compiler import RuleSet, best_trigger, compile_rules, pattern_ignores_case, required_literals
+
+TEXTS = [
+    '',
+    'No LaTeX here at all',
+    'A 4.7 mutext{kΩ} resistor carries 2 mutext{A}',
+    'gamma is 0.4 and sqrt{2.8} is the gain, approx 3 times larger',
+    r'V = 0.4,\text{V} and 0.5 , \text{A} with \gamma already escaped',
+    r'$$f_r = \frac{1}{2\pi\sqrt{LC}}$$ and $$x + 1$$',
+    r'"question\_text": "A \% of \$5"',
+    'PowerShell output: preference set; Preference ignored',
+    'I cannot help. i CANNOT help. ı cannot help. İ CANNOT help.',
+    "I'm not able to. I APOLOGIZE. SAFETY notice. ſafety notice. safety",
+]
+
+
+def apply_unfiltered(rules, text):
+    """Every regex in order, with no prefilter"""
+    applied = {}
+    for rule in rules:
+        text, count = rule.regex.subn(rule.replacement, text)
+        if count:
+            applied[rule.description] = applied.get(rule.description, 0) + count
+    return text, applied
+
+
+RULE_SETS = {
+    'latex_corrector': LaTeXCorrector().rule_set,
+    'chatgpt_display_math': llm_repairs.CHATGPT_DISPLAY_MATH_RULES,
+    'chatgpt_escape': llm_repairs.CHATGPT_ESCAPE_RULES,
+    'claude': llm_repairs.CLAUDE_RULES,
+    'copilot_safety': llm_repairs.COPILOT_SAFETY_RULES,
+}
+
+
+@pytest.mark.parametrize('name', RULE_SETS)
+@pytest.mark.parametrize('text', TEXTS)
+def test_rule_set_matches_unfiltered_application(name, text):
+    rule_set = RULE_SETS[name]
+
+    assert rule_set.apply(text) == apply_unfiltered(rule_set.rules, text)
+
+
+class TestRequiredLiterals:
+    """Literals every match must contain"""
+
+    def test_lookarounds_do_not_split_literals(self):
+        assert required_literals(r'(?<!\\)gamma(?![a-zA-Z])') == ['gamma']
+
+    def test_groups_and_repeats(self):
+        assert required_literals(r'(\d+(?:\.\d+)?)\s*,\s*\\text\{([^}]+)\}') == [',', '\\text{', '}']
+        assert required_literals(r'(?:ab)?cd') == ['cd']
+        assert best_trigger(r'x|y') is None
+
+    def test_ignorecase_literals_are_lowercase_without_i_and_s(self):
+        # 'i' and 's' also match the dotless i and the long s, so they end a literal run
+        assert pattern_ignores_case(r'I cannot.*', re.IGNORECASE)
+        assert best_trigger(r'I cannot.*', re.IGNORECASE) == ' cannot'
+        assert best_trigger(r'Safety.*', re.IGNORECASE) == 'afety'
+        assert best_trigger(r'(?i)Kelvin') == 'kelv'
+
+    def test_scoped_flags_are_skipped(self):
+        assert not pattern_ignores_case(r'(?i:safety) first')
+        assert required_literals(r'(?i:safety) first') == [' first']
+        assert required_literals(r'SAFETY (?-i:Check)', re.IGNORECASE) == ['afety ']
+
+
+class TestCaseInsensitiveRules:
+    """Triggers of IGNORECASE rules are looked up in the lowercased text"""
+
+    @pytest.mark.parametrize('text', ['ı cannot do that', 'İ CANNOT do that', 'ſafety first', 'SAFETY FIRST'])
+    def test_non_ascii_case_variants_still_match(self, text):
+        rule_set = llm_repairs.COPILOT_SAFETY_RULES
+
+        result, applied = rule_set.apply(text)
+
+        assert result == ''
+        assert applied == {'safety filter message': 1}
+
+    @pytest.mark.parametrize('text', ['KELVIN', 'Kelvin', 'kelvin'])
+    def test_kelvin_sign(self, text):
+        rule_set = RuleSet.from_patterns([(r'(?i)Kelvin', 'K', 'kelvin')])
+
+        assert rule_set.apply(text) == ('K', {'kelvin': 1})
+
+    @pytest.mark.parametrize('text', ['SAFETY first', 'Safety FIRST', 'SAFETY Check', 'safety check'])
+    def test_scoped_flags(self, text):
+        rules = compile_rules([
+            (r'(?i:safety) first', 'ok', 'scoped ignorecase'),
+            (r'SAFETY (?-i:Check)', 'checked', 'scoped case-sensitive'),
+        ], re.IGNORECASE)
+
+        assert RuleSet(rules).apply(text) == apply_unfiltered(rules, text)
+
+
+def test_trigger_introduced_by_an_earlier_replacement():
+    rules = compile_rules(LaTeXCorrector().correction_patterns + [
+        (r'\\text\{k', r'\\text{K', 'capital kilo correction'),
+    ])
+    text = 'A 4.7 mutext{kΩ} resistor'
+    assert '\\text{k' not in text
+
+    result, applied = RuleSet(rules).apply(text)
+
+    assert (result, applied) == apply_unfiltered(rules, text)
+    assert result == 'A 4.7 \\mu\\text{KΩ} resistor'
+    assert applied['capital kilo correction'] == 1
@@ -0,0 +1,96 @@
+"""
+Test unit-aware value comparison in the mathematical consistency engine
+"""
+
+import sys
+import os
+import re
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from modules.unit_normalizer import parse_unit, quantity_at, comparable_values
+from modules.math_consistency_engine import MathConsistencyEngine, PROFILES
+
+
+def _quantity(text):
+    """Parse the number at the start of text with its unit"""
+    number = re.match(r'\d+\.?\d*', text).group()
+    return quantity_at(text, number, len(number))
+
+
+def test_unit_table():
+    """SI prefixes, LaTeX spellings and aliases resolve to (dimension, factor, prefix scale)"""
+    assert parse_unit('mV') == ('voltage', 1e-3, 1e-3)
+    assert parse_unit('k\\Omega') == ('resistance', 1e3, 1e3)
+    assert parse_unit('\\mu F') == ('capacitance', 1e-6, 1e-6)
+    assert parse_unit('kHz') == ('frequency', 1e3, 1e3)
+    assert parse_unit('ms') == ('time', 1e-3, 1e-3)
+    assert parse_unit('mS') == ('conductance', 1e-3, 1e-3)
+    assert parse_unit('m') == ('length', 1.0, 1.0)
+    assert parse_unit('volts') == ('voltage', 1.0, 1.0)
+    assert parse_unit('frequency') is None
+
+
+def test_quantity_parsing():
+    """Units are read from bare symbols, \\text{...} groups and escaped LLM output"""
+    assert _quantity('812 mV').base_value == 0.812
+    assert _quantity('12\\,\\text{kHz}').base_value == 12000
+    assert _quantity('0.812,text{V}').dimension == 'voltage'
+    assert _quantity('2, A is').dimension is None
+    assert _quantity('45^\\circ').dimension == 'angle'
+
+
+def test_comparable_values():
+    """Same-dimension values compare in a common unit; different dimensions are not compared"""
+    assert comparable_values(_quantity('812 mV'), _quantity('0.812 V')) == (812.0, 812.0)
+    assert comparable_values(0.812, _quantity('812 mV')) == (0.812, 0.812)
+    assert comparable_values(_quantity('2 V'), _quantity('2 A')) is None
+    assert comparable_values(5.83, _quantity('30.96 °')) == (5.83, 30.96)
+
+
+def test_prefixed_units_are_not_contradictions():
+    """812 mV and 0.812 V (or a bare 0.812) state the same answer"""
+    question = {
+        'type': 'numerical',
+        'title': 'Threshold voltage',
+        'correct_answer': '0.812',
+        'feedback_correct': 'Therefore V_T = 812 mV. The final answer is 0.812 V.',
+        'feedback_incorrect': 'Rounding gives 812 mV.',
+    }
+    results = MathConsistencyEngine().detect({'questions': [question]}, PROFILES)
+    for profile in PROFILES:
+        assert results[profile].contradictions == [], profile
+
+
+def test_incompatible_dimensions_are_not_compared():
+    """A frequency and a period in the same feedback do not contradict each other"""
+    question = {
+        'type': 'numerical',
+        'correct_answer': '2.27',
+        'feedback_correct': 'So f = 440 Hz and T = 1/f = 0.00227 s = 2.27 ms.',
+    }
+    results = MathConsistencyEngine().detect({'questions': [question]}, PROFILES)
+    for profile in PROFILES:
+        assert results[profile].contradictions == [], profile
+
+
+def test_genuine_contradiction_still_reported():
+    """Values in compatible units that really differ are still flagged"""
+    question = {
+        'type': 'numerical',
+        'correct_answer': '0.812',
+        'feedback_correct': 'Calculation gives V_T = 0.65 V. Therefore V_T = 650 mV.',
+    }
+    results = MathConsistencyEngine().detect({'questions': [question]}, ('enhanced', 'cli_compatible', 'strict'))
+    for profile in ('enhanced', 'cli_compatible', 'strict'):
+        assert results[profile].contradictions, profile
+
+
+if __name__ == "__main__":
+    test_unit_table()
+    test_quantity_parsing()
+    test_comparable_values()
+    test_prefixed_units_are_not_contradictions()
+    test_incompatible_dimensions_are_not_compared()
+    test_genuine_contradiction_still_reported()
+    print("✅ Unit normalization tests passed")